@@ -18,12 +18,14 @@ Notes:
 
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 from src.visualization import plot_visualization
 from src.technical_indicators import *
 from src.analytics import *
 from src.config import *
 from src.helper import *
+from src.streamlit_adapter import apply_selected_technical_indicators_with_alerts, cached_range_index
+from src.range_index import RangeStatsIndex
+from src.market_data import get_provider
 
 
 # Set up Streamlit app
@@ -72,7 +74,7 @@ elif source_option == "Fetch from yfinance API":
     )
     if api:
         # Fetch stock data using yfinance API if api is provided
-        data = yf.Ticker(api).history(period=period_option_for_data)
+        data = get_provider().history(api, period=period_option_for_data)
         stock_name = api.upper()
         
         if data.empty:
@@ -109,6 +111,10 @@ if data is not None and verify_data_format(data.reset_index()):
     start_date , end_date = st.session_state["date_range"]
     data_filtered = filter_dataframe_by_date_range(data, start_date, end_date)
     
+    # Built once per loaded history, answer streak, best trade and summary queries for any date range
+    range_index = cached_range_index(stock_name, data)
+    range_stats_index = cached_range_index(stock_name, data, RangeStatsIndex)
+    
     
     # Default date will always be 1Y or 3Y
     # Filter the date here in the dataframe
@@ -124,6 +130,7 @@ if data is not None and verify_data_format(data.reset_index()):
     
     st.sidebar.subheader("Price Trend Highlights")
     show_upward_and_downward_trends = st.sidebar.checkbox("Show Upward and Downward Trends 📈", value=False)
+    show_range_statistics = st.sidebar.checkbox("Show Range Statistics 📋", value=False)
 
     
     st.sidebar.subheader("Trade Signals")
@@ -131,12 +138,13 @@ if data is not None and verify_data_format(data.reset_index()):
     show_sell_signals = st.sidebar.checkbox("Show Sell Signals 🔴", value=False)
 
     # Data processing ( Technical Indicators are applied to dataframe )
-    df_processed = apply_selected_technical_indicators(data_filtered, selected_technical_indicators)
+    df_processed = apply_selected_technical_indicators_with_alerts(data_filtered, selected_technical_indicators)
     
     
     # Implement trade signals and trend highlights here
     if show_upward_and_downward_trends:
-        df_processed, longest_up_streak, longest_down_streak = calculate_upward_and_Downward_runs(df_processed)  
+        longest_up_streak = range_index.longest_run_between(start_date, end_date, "up")
+        longest_down_streak = range_index.longest_run_between(start_date, end_date, "down")
         column_to_display_upward_streak , column_to_display_downward_streak = st.columns(2)
 
 
@@ -145,13 +153,29 @@ if data is not None and verify_data_format(data.reset_index()):
         column_to_display_downward_streak.metric("📉 Longest Downward Streak", f"{longest_down_streak       ['length']} days", f"From {longest_down_streak['start'].date()} to {longest_down_streak['end'].date()}  ", border=True,delta_color='inverse')
 
 
+    if show_range_statistics:
+        range_statistics = range_stats_index.stats_between(start_date, end_date)
+        column_to_display_mean, column_to_display_std, column_to_display_vwap, column_to_display_volume = st.columns(4)
+        column_to_display_mean.metric("Average Close", f"${range_statistics['mean']:.2f}", border=True)
+        column_to_display_std.metric("Close Standard Deviation", f"${range_statistics['std']:.2f}", border=True)
+        column_to_display_vwap.metric("Range VWAP", f"${range_statistics['vwap']:.2f}", border=True)
+        column_to_display_volume.metric("Total Volume", f"{range_statistics['total_volume']:,.0f}", border=True)
+
+
     if show_buy_signals or show_sell_signals:
         df_processed, max_profit, num_buys = max_profit_calculation(df_processed)
 
         
-        column_to_display_buy_and_sell, column_to_display_max_profit = st.columns(2)
+        best_trade = range_index.best_trade_between(start_date, end_date)
+
+        
+        column_to_display_buy_and_sell, column_to_display_max_profit, column_to_display_best_trade = st.columns(3)
         column_to_display_buy_and_sell.metric("Total Buy and Sell Signals", f"{num_buys}      buys", "", border=True)
         column_to_display_max_profit.metric("Maximum Theoretical Profit (No transaction fees)", f"${max_profit:.2f}", border=True)
+        if best_trade["buy"] is not None:
+            column_to_display_best_trade.metric("Best Single Trade", f"${best_trade['profit']:.2f}", f"Buy {best_trade['buy'].date()}, sell {best_trade['sell'].date()}", border=True)
+        else:
+            column_to_display_best_trade.metric("Best Single Trade", "$0.00", "No profitable trade", border=True)
         
     #stock_name = api.upper() if api else uploaded_file.name.split('.csv')[0] if uploaded_file else "Uploaded Data"
     fig = plot_visualization(df=df_processed, stock_name=stock_name, type_of_chart=type_of_chart_selected, indicators=selected_technical_indicators, show_buy_signals=show_buy_signals, show_sell_signals=show_sell_signals, show_upward_and_downward_trends=show_upward_and_downward_trends)
@@ -23,8 +23,9 @@ from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import List, Dict, Any
 from src.analytics import calculate_daily_returns, calculate_networth
+from src.market_snapshot import build_market_snapshot
+from src.config import MARKET_SNAPSHOT_TTL_SECONDS
 import os
-import yfinance as yf
 import numpy as np
 
 import pandas as pd
@@ -66,6 +67,11 @@ def load_portfolio(portfolio_name: str):
             return data
     return []
     
+#fetch prices, currencies and FX rates for all holdings in one batched download, shared by net worth and daily returns
+@st.cache_data(show_spinner=False, ttl=MARKET_SNAPSHOT_TTL_SECONDS)
+def load_market_snapshot(tickers: tuple):
+    return build_market_snapshot(list(tickers), target_currency="SGD")
+    
 #save portfolio data to json file, translate python dictionary into json format and write to file
 def save_portfolio(portfolio_name, new_stock_holding):
     portfolio_path = USER_DATA_DIR / f"portfolio_{portfolio_name}.json"
@@ -190,10 +196,19 @@ if portfolio_name:
         st.rerun()
 
 
+#One market snapshot per render, used by both calculate_networth and calculate_daily_returns
+    #If it cannot be fetched, market_snapshot stays None and each function handles the fetch (and its errors) itself
+    market_snapshot = None
+    if not stock_dataframe.empty:
+        try:
+            market_snapshot = load_market_snapshot(tuple(sorted(stock_dataframe["ticker"].astype(str).str.upper().unique())))
+        except Exception as e:
+            st.error(f"Could not fetch market data: {e}")
+
 #Calculate and display net worth for every stock holding with def calculate_networth
     st.sidebar.header("Net Worth Summary (SGD)")
     if not stock_dataframe.empty:
-        net_worth_data = calculate_networth(stock_dataframe)
+        net_worth_data = calculate_networth(stock_dataframe, market_snapshot)
         if net_worth_data:
             net_worth_table = net_worth_data.get("table")
             total_invested = float(net_worth_data.get("total_invested_value_in_sgd", 0.0))
@@ -204,6 +219,9 @@ if portfolio_name:
             if net_worth_table is not None and not net_worth_table.empty:
 
                 df = net_worth_table.copy()
+                if "fx_rate_missing" in df.columns and df["fx_rate_missing"].any():
+                    unconverted = ", ".join(df.loc[df["fx_rate_missing"], "ticker"].unique())
+                    st.sidebar.warning(f"No FX rate for {unconverted}, their values are shown unconverted.")
                 if "profit_loss" not in df.columns:
                     print(df)
                     print('fal')
@@ -229,7 +247,7 @@ if portfolio_name:
 #Daily returns UI on sidebar (api data to get current stock price and calculate daily returns)
     st.sidebar.header("Daily Returns")
     if not stock_dataframe.empty:
-        daily_returns = calculate_daily_returns(stock_dataframe)
+        daily_returns = calculate_daily_returns(stock_dataframe, market_snapshot)
         if daily_returns:
             for ticker, values in daily_returns.items():
                 daily_return = values['daily_return']
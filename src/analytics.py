@@ -6,9 +6,12 @@ Purpose:
     upward and downward trends, maximum profit calculations, and daily returns.
 
 Functions:
-    - calculate_upward_and_Downward_runs(df: pd.DataFrame) -> tuple[pd.DataFrame,dict,dict]
+    - calculate_trend_runs(df: pd.DataFrame) -> pd.DataFrame
+    - calculate_upward_and_Downward_runs(df: pd.DataFrame, return_runs: bool=False) -> tuple[pd.DataFrame,dict,dict]
     - max_profit_calculation(df: pd.DataFrame) -> tuple[pd.DataFrame, float, int]
-    - calculate_daily_returns(stock_dataframe: pd.DataFrame) -> dict
+    - max_profit_with_constraints(df: pd.DataFrame, max_transactions: int=None, fee: float=0.0, cooldown: int=0) -> tuple[pd.DataFrame, float, int]
+    - calculate_networth(stock_dataframe: pd.DataFrame, snapshot: MarketSnapshot=None) -> dict
+    - calculate_daily_returns(stock_dataframe: pd.DataFrame, snapshot: MarketSnapshot=None) -> dict
 
 Notes:
     Each function modifies the input DataFrame in-place by adding new columns
@@ -21,14 +24,51 @@ import numpy as np
 import timeit
 import os
 import talib
-import yfinance as yf
 from datetime import date , timedelta
 from src.config import *
 from src.ticker_utils import *
+from src.market_snapshot import MarketSnapshot, build_market_snapshot
+from src.analytics_engine import streak_lengths, trend_runs_arrays, greedy_signals_arrays, optimal_trades_arrays
 
 
 
-def calculate_upward_and_Downward_runs(df: pd.DataFrame) -> tuple[pd.DataFrame,dict,dict]:
+def calculate_trend_runs(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    This function lists every upward and downward run of the closing prices.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing stock data with a 'Close' column.
+
+    Returns:
+        pd.DataFrame: One row per run in time order, with columns 'direction' ('up' or 'down'), 'start' and 'end'
+        (index labels of the first and last close of the run), 'length' (number of moves) and 'return' (end close / start close - 1).
+    
+    Notes:
+        - Runs come from run-length encoding np.sign(np.diff(close)) in src/analytics_engine.py.
+        - Top-k queries are plain DataFrame operations on the result, e.g. runs[runs['direction'] == 'up'].nlargest(5, 'length').
+        
+    """
+    runs = trend_runs_arrays(df["Close"].to_numpy(dtype=float))
+    return pd.DataFrame({
+        "direction": np.where(runs["direction"] > 0, "up", "down"),
+        "start": df.index[runs["start"]],
+        "end": df.index[runs["end"]],
+        "length": runs["length"],
+        "return": runs["return"],
+    })
+
+
+def _longest_run(runs: pd.DataFrame, direction: str) -> dict:
+    """Length, start and end of the first longest run in one direction (length 0 and None dates if there is none)."""
+    candidates = runs[runs["direction"] == direction]
+    if candidates.empty:
+        return {"length": 0, "start": None, "end": None}
+    # idxmax returns the first maximum, the same run the loop implementation kept
+    longest = candidates.loc[candidates["length"].idxmax()]
+    return {"length": int(longest["length"]), "start": longest["start"], "end": longest["end"]}
+
+
+def calculate_upward_and_Downward_runs(df: pd.DataFrame, return_runs: bool=False) -> tuple[pd.DataFrame,dict,dict]:
     """
     This function calculates the upward and downward trends in stock prices.
     It identifies consecutive days of price increases (upward trends) and decreases (downward trends),
@@ -36,64 +76,39 @@ def calculate_upward_and_Downward_runs(df: pd.DataFrame) -> tuple[pd.DataFrame,d
 
     Args:
         df (pd.DataFrame): DataFrame containing stock data with a 'Close' column.
+        return_runs (bool, optional): Also return the table of all runs (see calculate_trend_runs). Defaults to False.
 
     Returns:
         tuple: A tuple containing:
             - pd.DataFrame: The original DataFrame with additional columns for upward and downward trends.
             - dict: A dictionary with details of the longest upward trend (length, start date, end date).
             - dict: A dictionary with details of the longest downward trend (length, start date, end date).
+            - pd.DataFrame: The table of all runs, only if return_runs is True.
     
     Notes:
         - The function adds two new columns to the DataFrame: 'Up_Trend' and 'Down_Trend',
           which indicate the length of the current upward or downward trend at each row.
+        - The columns and the run table are computed with vectorized run-length encoding (src/analytics_engine.py),
+          so the function makes a few passes over NumPy arrays instead of a Python loop over every row.
         
     """
-    
-    df["Up_Trend"] = 0
-    df["Down_Trend"] = 0
-
-    up_streak = 0
-    up_start_date = None
-
-    down_streak = 0
-    down_start_date = None
-
-    longest_up = {"length": 0, "start": None, "end": None}
-    longest_down = {"length": 0, "start": None, "end": None}
-
-
-    for i in range(1, len(df)):
-        if df["Close"].iloc[i] > df["Close"].iloc[i-1]:
-            if up_streak == 0:
-                up_start_date = df.index[i-1]
-                
-            up_streak += 1
-            df.iloc[i, df.columns.get_loc("Up_Trend")] = up_streak
-            
-            # Update longest up streak if needed
-            if up_streak > longest_up["length"]:
-                longest_up["length"] = up_streak
-                longest_up["start"] = up_start_date
-                longest_up["end"] = df.index[i]
-        else:
-            up_streak = 0
-
-        if df["Close"].iloc[i] < df["Close"].iloc[i-1]:
-            if down_streak == 0:
-                down_start_date = df.index[i-1]
-                
-            down_streak += 1
-            df.iloc[i, df.columns.get_loc("Down_Trend")] = down_streak
-            
-            # Update longest down streak if needed
-            if down_streak > longest_down["length"]:
-                longest_down["length"] = down_streak
-                longest_down["start"] = down_start_date
-                longest_down["end"] = df.index[i]
-        else:
-            down_streak = 0
-    
-    
+    close = df["Close"].to_numpy(dtype=float)
+    change = np.diff(close)
+
+    # The first row has no previous close, so it is never part of a streak
+    up_trend = np.zeros(len(df), dtype=int)
+    down_trend = np.zeros(len(df), dtype=int)
+    up_trend[1:] = streak_lengths(change > 0)
+    down_trend[1:] = streak_lengths(change < 0)
+    df["Up_Trend"] = up_trend
+    df["Down_Trend"] = down_trend
+
+    runs = calculate_trend_runs(df)
+    longest_up = _longest_run(runs, "up")
+    longest_down = _longest_run(runs, "down")
+
+    if return_runs:
+        return df, longest_up, longest_down, runs
     return df, longest_up, longest_down
 
 
@@ -118,25 +133,59 @@ def max_profit_calculation(df: pd.DataFrame) -> tuple[pd.DataFrame, float, int]:
         - The greedy algorithm buys on days when the price increases compared to the previous day
           and sells on the next day, accumulating profit from each transaction.
         - The function returns the total profit and the number of buy signals generated.
+        - The signals are computed with array operations (see greedy_signals_arrays), so long intraday
+          histories do not need a Python loop.
         
     """
     
-    profit = 0
-    
-    df["Buy_Signal"] = False
-    df["Sell_Signal"] = False
-    
-    for i in range(1, len(df)):
-        if df["Close"].iloc[i] > df["Close"].iloc[i-1]:
-            df.iloc[i-1, df.columns.get_loc("Buy_Signal")] = True
-            df.iloc[i, df.columns.get_loc("Sell_Signal")] = True
-            profit += df["Close"].iloc[i] - df["Close"].iloc[i-1]
+    buy, sell, profit = greedy_signals_arrays(df["Close"].to_numpy(dtype=float))
     
+    df["Buy_Signal"] = buy
+    df["Sell_Signal"] = sell
     
     return df, profit , df["Buy_Signal"].sum()
 
+
+def max_profit_with_constraints(df: pd.DataFrame, max_transactions: int=None, fee: float=0.0, cooldown: int=0) -> tuple[pd.DataFrame, float, int]:
+    """
+    This function calculates the maximum profit under realistic trading constraints: a limited number of
+    transactions, a fee per transaction and a cooldown after each sell.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing stock data with a 'Close' column.
+        max_transactions (int, optional): Maximum number of buy/sell pairs. None means unlimited.
+        fee (float, optional): Cost charged once per completed buy/sell pair. Defaults to 0.0.
+        cooldown (int, optional): Number of rows to wait after a sell before buying again. Defaults to 0.
+
+    Returns:
+        tuple: A tuple containing:
+            - pd.DataFrame: The original DataFrame with 'Buy_Signal' and 'Sell_Signal' columns.
+            - float: The maximum profit after fees.
+            - int: The number of transactions (buy signals).
+
+    Raises:
+        ValueError: If max_transactions is smaller than 1, or fee or cooldown is negative.
+
+    Notes:
+        - Unlike max_profit_calculation(), each transaction holds the stock over a whole rising stretch,
+          so the signals can be drawn with add_trading_signals() like the greedy ones.
+        - Uses optimal_trades_arrays: O(n * k) dynamic programming for k transactions, an O(n) state machine run on
+          blocks of days when unlimited.
+    """
+    if max_transactions is not None and max_transactions < 1:
+        raise ValueError("max_transactions must be at least 1")
+    if fee < 0 or cooldown < 0:
+        raise ValueError("fee and cooldown must not be negative")
+
+    buy, sell, profit = optimal_trades_arrays(df["Close"].to_numpy(dtype=float), max_transactions, fee, cooldown)
+
+    df["Buy_Signal"] = buy
+    df["Sell_Signal"] = sell
+
+    return df, profit, df["Buy_Signal"].sum()
+
 #Calculate and display net worth for every stock holding and comparing to close stock price
-def calculate_networth(stock_dataframe: pd.DataFrame):
+def calculate_networth(stock_dataframe: pd.DataFrame, snapshot: MarketSnapshot=None):
     """
     This function calculates the user's total net worth in SGD based on their stock holdings.
     It computes invested value, current market value, and profit/loss for each stock while 
@@ -151,11 +200,13 @@ def calculate_networth(stock_dataframe: pd.DataFrame):
                 - 'ticker': Stock ticker symbol (e.g., 'AAPL', 'TSLA').
                 - 'price_per_share': Purchase price per share in the original currency.
                 - 'quantity': Number of shares owned.
+        snapshot (MarketSnapshot, optional): Prices, currencies and FX rates to value the holdings with.
+            Defaults to None, which fetches a snapshot with build_market_snapshot().
     
     Returns:
         dict: A dictionary containing:
             - 'table' (pd.DataFrame): DataFrame with additional computed columns such as 
-              invested value, current value, currency, and converted SGD values.
+              invested value, current value, currency, converted SGD values and profit/loss per lot.
             - 'total_invested_value_in_sgd' (float): Total invested amount converted to SGD.
             - 'total_current_value_in_sgd' (float): Current total market value in SGD.
             - 'profit_loss' (float): Absolute profit or loss in SGD.
@@ -167,13 +218,17 @@ def calculate_networth(stock_dataframe: pd.DataFrame):
 
     Notes:
         - All tickers are automatically capitalized for consistency.
-        - The function uses helper utilities such as `categorize_tickers()`, 
-          `get_prices()`, `resolve_unknown_currency()`, and `convert_current_prices_to_sgd()`
-          to retrieve and process pricing and FX data.
+        - Prices, currencies and FX rates come from a MarketSnapshot (src/market_snapshot.py), fetched in one
+          batched yf.download(). Pass the same snapshot to calculate_daily_returns() to avoid a second fetch.
         - Prices are fetched using the latest available close prices (within 5 days of the 
           current date).
         - Any missing or non-numeric data in price or quantity fields will be coerced to NaN 
           and treated as zero during calculations.
+        - Prices and currencies are read once per distinct ticker and gathered back onto the lots with the
+          factorized ticker codes, and the FX conversion uses gather_fx_rates(), so large portfolios
+          (100k+ lots) are valued with array operations instead of per-row lambdas.
+        - Lots whose currency has no FX rate (e.g. a failed FX download) keep their unconverted invested value,
+          are marked True in the table's 'fx_rate_missing' column and raise a MissingFXRateWarning.
         - The results assume no transaction costs, taxes, or dividends are included.
     """
     if stock_dataframe.empty:
@@ -200,35 +255,40 @@ def calculate_networth(stock_dataframe: pd.DataFrame):
     net_worth["invested_value"] = net_worth["price_per_share"] * net_worth["quantity"]
     total_invested = float(net_worth["invested_value"].sum())
 
-    #Pull latest close for each ticker
-    ticker_list = net_worth["ticker"].tolist()
-    d = date.today() - timedelta(days=5)
-    
-
-    ticker_currency  = categorize_tickers(tickers_list=ticker_list, exchange_map=EXCHANGE_MAP)
-    
-    prices_data = get_prices(tickers_list=ticker_list)
-
-    ticker_currency = resolve_unknown_currency(tickers_list=ticker_list, ticker_currency=ticker_currency)
+    #Fetch once per distinct ticker, the values are gathered back onto every lot below
+    ticker_codes, unique_tickers = pd.factorize(net_worth["ticker"])
+    ticker_list = unique_tickers.tolist()
 
-    current_prices = get_prices_and_currency(tickers_list=ticker_list, ticker_prices=prices_data, ticker_currency=ticker_currency)
- 
-    
+    if snapshot is None:
+        try:
+            snapshot = build_market_snapshot(ticker_list, target_currency="SGD")
+        except Exception as e:
+            print(f"Error fetching market snapshot: {e}")
+            snapshot = MarketSnapshot(target_currency="SGD")
 
-    current_prices = convert_current_prices_to_sgd(current_prices)
 
+    #One value per distinct ticker (missing values are NaN), indexed by the factorized ticker codes
+    price_sgd_by_ticker = np.array([snapshot.converted_price(ticker) for ticker in ticker_list], dtype=float)
+    currency_by_ticker = np.array([snapshot.currency.get(ticker) for ticker in ticker_list], dtype=object)
 
-    net_worth["current_price_in_sgd"] = net_worth["ticker"].map(lambda x: current_prices[x]['price_sgd'])
-    net_worth["current_invested_value_sgd"] = net_worth["current_price_in_sgd"] * net_worth["quantity"]
-    
+    quantity = net_worth["quantity"].to_numpy(dtype=float)
+    net_worth["current_price_in_sgd"] = price_sgd_by_ticker[ticker_codes]
+    net_worth["current_invested_value_sgd"] = price_sgd_by_ticker[ticker_codes] * quantity
     
     
-    net_worth["currency"] = net_worth["ticker"].map(lambda x: current_prices[x]["currency"])
-    unique_currencies = net_worth["currency"].unique().tolist()
     
-    fx_rates = get_fx_rates(unique_currencies, target_currency="SGD")
+    net_worth["currency"] = currency_by_ticker[ticker_codes]
     
-    net_worth = convert_invested_values(net_worth, fx_rates)
+    #Currencies without a rate are not converted (rate 1.0), the same as get_fx_rates() on a failed fetch.
+    #Those lots are flagged in 'fx_rate_missing' and a MissingFXRateWarning names the currencies
+    net_worth = convert_invested_values(net_worth, snapshot.fx_rates)
+
+    #Profit/loss per lot
+    current_value = net_worth["current_invested_value_sgd"].to_numpy(dtype=float)
+    invested_value = net_worth["invested_value_sgd"].to_numpy(dtype=float)
+    net_worth["profit_loss"] = current_value - invested_value
+    with np.errstate(divide="ignore", invalid="ignore"):
+        net_worth["profit_loss_percentage"] = np.where(invested_value > 0, (current_value - invested_value) / invested_value * 100.0, np.nan)
     
 
     total_current_value_in_SGD = float(net_worth["current_invested_value_sgd"].sum(skipna=True))
@@ -246,7 +306,7 @@ def calculate_networth(stock_dataframe: pd.DataFrame):
         "profit_loss_percentage": profit_loss_percentage,
     }
 
-def calculate_daily_returns(stock_dataframe: pd.DataFrame) -> dict:
+def calculate_daily_returns(stock_dataframe: pd.DataFrame, snapshot: MarketSnapshot=None) -> dict:
     """
     This function calculates the daily percentage returns for each stock in the given DataFrame
     based on their most recent closing prices. It retrieves recent price data using the Yahoo 
@@ -257,6 +317,8 @@ def calculate_daily_returns(stock_dataframe: pd.DataFrame) -> dict:
         stock_dataframe (pd.DataFrame):
             A DataFrame containing stock holdings with at least the following column:
                 - 'ticker': Stock ticker symbol (e.g., 'AAPL', 'TSLA', 'MSFT').
+        snapshot (MarketSnapshot, optional): Prices, currencies and FX rates, e.g. the one already used by
+            calculate_networth(). Defaults to None, which fetches a snapshot with build_market_snapshot().
 
     Returns:
         dict: A dictionary where each key is a stock ticker and each value is another dictionary containing:
@@ -281,8 +343,8 @@ def calculate_daily_returns(stock_dataframe: pd.DataFrame) -> dict:
         - Handles both single and multiple tickers gracefully from the `yfinance` response.
         - Any tickers with insufficient or missing price data will have `daily_return` and `value`
           set to `None`.
-        - Uses helper functions such as `categorize_tickers()`, `resolve_unknown_currency()`, 
-          and `convert_current_prices_to_sgd()` to handle multi-currency conversions.
+        - The last two closes, currencies and FX rates come from one MarketSnapshot (src/market_snapshot.py),
+          which is fetched with a single batched yf.download() for the tickers and FX pairs.
         - The final output expresses all prices in Singapore Dollars (SGD) for uniform comparison.
         - Assumes no transaction costs, dividends, or fees are included in the calculations.
     """
@@ -290,43 +352,23 @@ def calculate_daily_returns(stock_dataframe: pd.DataFrame) -> dict:
     try:
         if not stock_dataframe.empty:
             tickers = stock_dataframe['ticker'].tolist()
-            #d = date(2025, 9, 22) 
-            d = date.today() - timedelta(days=5)
-            api_data = yf.download(tickers, start=d,interval="1d", group_by='ticker', threads=True)
+            if snapshot is None:
+                snapshot = build_market_snapshot(tickers, target_currency="SGD")
             
             for ticker in tickers:
-                try:
-                    #Handle single vs multi-ticker frame
-                    if isinstance(api_data.columns, pd.MultiIndex):
-                        close = api_data[ticker]["Close"]
-                    else:
-                        close = api_data["Close"]
-
-                    close = close.dropna()
-                    if len(close) < 2:
-                        daily_returns[ticker] = {"daily_return": None, "value": None}
-                        continue
-
-                    latest_close   = close.iloc[-1]
-                    previous_close = close.iloc[-2]
-                    daily_return = (latest_close - previous_close) / previous_close * 100
-                    daily_returns[ticker] = {"daily_return": float(daily_return), "value": float(latest_close)}
-                except Exception as e:
-                    daily_returns[ticker] = {"daily_return": None, "value": None}
-            # Step 2: Attach currency and convert to SGD
-            ticker_currency = categorize_tickers(tickers_list=tickers, exchange_map=EXCHANGE_MAP)
-            ticker_currency = resolve_unknown_currency(tickers_list=tickers, ticker_currency=ticker_currency)
-            
-            # Build price+currency dict to convert
-            combined_data = {t: {"price": daily_returns[t]["value"], "currency": ticker_currency.get(t)} for t in tickers if t in daily_returns}
-            sgd_converted = convert_current_prices_to_sgd(combined_data)
-
-            # Step 3: Update with SGD values
-            for ticker in tickers:
-                if ticker in daily_returns and ticker in sgd_converted:
-                    sgd_value = sgd_converted[ticker]["price_sgd"]
-                    daily_returns[ticker]["value_sgd"] = sgd_value
-                    daily_returns[ticker]["currency"] = "SGD"
+                daily_return = snapshot.daily_return(ticker)
+                if np.isnan(daily_return):
+                    daily_returns[ticker] = {"daily_return": None, "value": None, "value_sgd": None, "currency": "SGD"}
+                    continue
+
+                # The SGD value is None when the FX rate is unavailable
+                value_sgd = snapshot.converted_price(ticker)
+                daily_returns[ticker] = {
+                    "daily_return": float(daily_return),
+                    "value": snapshot.price(ticker),
+                    "value_sgd": None if np.isnan(value_sgd) else float(value_sgd),
+                    "currency": "SGD",
+                }
 
     except Exception as e:
         print(f"Error occurred at calculate_daily_returns: {e}")
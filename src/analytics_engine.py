@@ -0,0 +1,411 @@
+"""
+analytics_engine.py
+
+Purpose:
+    This module contains the vectorized NumPy engine behind the analytics functions in
+    src/analytics.py (trend runs and trading signals). Every function works on plain
+    NumPy arrays, so no per-row pandas indexing (.iloc) is needed.
+
+Functions:
+    - streak_lengths(mask: np.ndarray) -> np.ndarray
+    - run_length_encode(values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]
+    - trend_runs_arrays(close: np.ndarray) -> dict
+    - greedy_signals_arrays(close: np.ndarray) -> tuple[np.ndarray, np.ndarray, float]
+    - optimal_trades_arrays(close: np.ndarray, max_transactions: int=None, fee: float=0.0, cooldown: int=0) -> tuple[np.ndarray, np.ndarray, float]
+
+Notes:
+    - Trend runs are found by run-length encoding np.sign(np.diff(close)), so a long
+      history costs a handful of array passes instead of a Python loop over every row.
+    - The trade search has no loop over days: the unlimited state machine steps through all blocks of days
+      at once, and the limited layers run on chunks of days that stay in the CPU cache.
+    - Row numbers are positions (0 based), the pandas wrappers map them back to the index.
+"""
+
+
+import numpy as np
+
+
+def streak_lengths(mask: np.ndarray) -> np.ndarray:
+    """
+    This function counts, for every position, how many consecutive True values end there.
+
+    Args:
+        mask (np.ndarray): 1-D boolean array.
+
+    Returns:
+        np.ndarray: Integer array, 0 where mask is False and 1, 2, 3, ... along each run of True values.
+
+    Notes:
+        - A running count (cumsum) minus the count reached at the last False position,
+          carried forward with np.maximum.accumulate.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    counts = np.cumsum(mask)
+    at_last_reset = np.maximum.accumulate(np.where(mask, 0, counts))
+    return counts - at_last_reset
+
+
+def run_length_encode(values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    This function splits an array into runs of equal consecutive values.
+
+    Args:
+        values (np.ndarray): 1-D array.
+
+    Returns:
+        tuple: A tuple containing the start position, the length and the value of every run.
+
+    Notes:
+        - NaN never equals NaN, so every NaN is a run of its own.
+    """
+    values = np.asarray(values)
+    if values.shape[0] == 0:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int), values[:0]
+
+    boundaries = np.ones(values.shape[0], dtype=bool)
+    boundaries[1:] = values[1:] != values[:-1]
+    starts = np.flatnonzero(boundaries)
+    lengths = np.diff(np.append(starts, values.shape[0]))
+    return starts, lengths, values[starts]
+
+
+def trend_runs_arrays(close: np.ndarray) -> dict:
+    """
+    This function finds every upward and downward run of a price series.
+
+    Args:
+        close (np.ndarray): 1-D array of closing prices.
+
+    Returns:
+        dict: A dictionary of equal length arrays, one entry per run in time order:
+            - 'direction': 1 for an upward run, -1 for a downward run.
+            - 'start': Row of the close the run starts from (the day before the first move).
+            - 'end': Row of the last close of the run.
+            - 'length': Number of consecutive up (or down) moves.
+            - 'return': close[end] / close[start] - 1.
+
+    Notes:
+        - Unchanged or NaN prices end a run, the same as the loop implementation (NaN comparisons are False).
+    """
+    close = np.asarray(close, dtype=float)
+    direction = np.sign(np.diff(close))
+    starts, lengths, values = run_length_encode(direction)
+
+    trend = (values == 1) | (values == -1)
+    starts, lengths, values = starts[trend], lengths[trend], values[trend]
+    ends = starts + lengths
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = close[ends] / close[starts] - 1
+
+    return {
+        "direction": values.astype(int),
+        "start": starts,
+        "end": ends,
+        "length": lengths,
+        "return": returns,
+    }
+
+
+def greedy_signals_arrays(close: np.ndarray) -> tuple[np.ndarray, np.ndarray, float]:
+    """
+    This function calculates the greedy (unlimited transactions, no fees) buy and sell markers.
+
+    Args:
+        close (np.ndarray): 1-D array of closing prices.
+
+    Returns:
+        tuple: A tuple containing the buy markers, the sell markers (boolean arrays) and the total profit.
+
+    Notes:
+        - Every day-over-day increase is one trade: buy on the previous day, sell on the day of the increase.
+    """
+    close = np.asarray(close, dtype=float)
+    change = np.diff(close)
+    rising = change > 0
+
+    buy = np.zeros(close.shape[0], dtype=bool)
+    sell = np.zeros(close.shape[0], dtype=bool)
+    buy[:-1] = rising
+    sell[1:] = rising
+    return buy, sell, float(change[rising].sum())
+
+
+# Days per chunk of the chunked trade passes, small enough for every array of a chunk to stay in the CPU cache
+TRADE_CHUNK_DAYS = 1 << 15
+
+
+def _last_set(packed: np.ndarray, day: int) -> int:
+    """The last day <= day whose bit is set in an np.packbits array, searched backwards in growing windows (-1 if none)."""
+    # In a packed byte the first day is the highest bit, so the last set day is the lowest set bit
+    end = day >> 3
+    head = int(packed[end]) >> (7 - (day & 7))
+    if head:
+        return day - ((head & -head).bit_length() - 1)
+    window = 8
+    while end > 0:
+        low = max(0, end - window)
+        found = np.flatnonzero(packed[low:end])
+        if found.size:
+            byte = int(packed[low + found[-1]])
+            return 8 * (low + int(found[-1])) + 8 - (byte & -byte).bit_length()
+        end = low
+        window *= 8
+    return -1
+
+
+def _turning_points(close: np.ndarray) -> np.ndarray:
+    """The valid days that are not strictly between a lower and a higher neighbour (no trade without cooldown needs them)."""
+    missing = np.isnan(close)
+    valid = np.flatnonzero(~missing) if missing.any() else None
+    prices = close if valid is None else close[valid]
+    n = prices.shape[0]
+    keep = np.ones(n, dtype=bool)
+    # Two changes in the same direction have a positive product (an underflow to 0 only keeps a day too many)
+    for first in range(1, n - 1, TRADE_CHUNK_DAYS):
+        last = min(first + TRADE_CHUNK_DAYS, n - 1)
+        change = prices[first:last] - prices[first - 1:last - 1]
+        change *= prices[first + 1:last + 1] - prices[first:last]
+        np.less_equal(change, 0, out=keep[first:last])
+    days = np.flatnonzero(keep)
+    return days if valid is None else valid[days]
+
+
+def _limited_trades(close: np.ndarray, max_transactions: int, fee: float, cooldown: int) -> tuple[np.ndarray, np.ndarray, float]:
+    """At most max_transactions trades, one dynamic programming layer per transaction, computed chunk by chunk."""
+    n = close.shape[0]
+    lag = cooldown + 1
+    chunk = TRADE_CHUNK_DAYS * (1 + lag // TRADE_CHUNK_DAYS)
+
+    # cash[j] holds the best cash with at most j transactions on the current chunk, after the lag days before it.
+    # Before the first day every layer has no cash and no holding.
+    cash = np.zeros((max_transactions + 1, lag + chunk))
+    hold_carry = np.full(max_transactions + 1, -np.inf)
+    hold = np.empty(chunk)
+
+    # Only the decision bits of each layer are kept (packed): where selling raises the cash and where buying
+    # raises the holding value
+    decisions = np.zeros((max_transactions, 2, -(-n // 8)), dtype=np.uint8)
+    grows = np.empty(chunk, dtype=bool)
+    size = 0
+    for first in range(0, n, chunk):
+        if first:
+            cash[:, :lag] = cash[:, size:size + lag].copy()
+        size = min(chunk, n - first)
+        price = close[first:first + size]
+        sell_value = price - fee
+        packed = slice(first >> 3, (first >> 3) + -(-size // 8))
+
+        for j in range(1, max_transactions + 1):
+            # Holding after buying on day t: the cash of one transaction less, cooldown + 1 days earlier, minus the price
+            # (NaN prices give NaN, which np.fmax skips)
+            np.subtract(cash[j - 1, :size], price, out=hold[:size])
+            hold[0] = np.fmax(hold[0], hold_carry[j])
+            np.fmax.accumulate(hold[:size], out=hold[:size])
+
+            # Cash on day t: the cash of the day before, or selling what was held since an earlier day
+            today = cash[j, lag - 1:lag + size]
+            today[1] = hold_carry[j] + sell_value[0]
+            np.add(hold[:size - 1], sell_value[1:], out=today[2:])
+            np.fmax.accumulate(today, out=today)
+
+            np.greater(today[1:], today[:-1], out=grows[:size])
+            decisions[j - 1, 0, packed] = np.packbits(grows[:size])
+            grows[0] = hold[0] > hold_carry[j]
+            np.greater(hold[1:size], hold[:size - 1], out=grows[1:size])
+            decisions[j - 1, 1, packed] = np.packbits(grows[:size])
+            hold_carry[j] = hold[size - 1]
+
+    profit = float(cash[max_transactions, lag + size - 1])
+
+    # Walk back through the layers from the last day: the cash comes from the last sell up to that day (none left
+    # when it never grew), and its holding from the last buy before the sell
+    buy = np.zeros(n, dtype=bool)
+    sell = np.zeros(n, dtype=bool)
+    day = n - 1
+    for sell_grows, hold_grows in decisions[::-1]:
+        sell_day = _last_set(sell_grows, day) if day >= 0 else -1
+        if sell_day < 0:
+            break
+        buy_day = _last_set(hold_grows, sell_day - 1)
+        buy[buy_day] = True
+        sell[sell_day] = True
+        day = buy_day - 1 - cooldown
+
+    return buy, sell, profit
+
+
+def _to_blocks(values: np.ndarray, blocks: int) -> np.ndarray:
+    """Lay a series out as (days per block, blocks), padded with NaN: row j holds day j of every block."""
+    n = values.shape[0]
+    width = -(-n // blocks)
+    rows = np.empty((width, blocks), dtype=values.dtype)
+    full = n // width
+    rows.T[:full] = values[:full * width].reshape(full, width)
+    if full < blocks:
+        rows.T[full, :n - full * width] = values[full * width:]
+        rows.T[full, n - full * width:] = np.nan
+        rows.T[full + 1:] = np.nan
+    return rows
+
+
+def _unlimited_trades(close: np.ndarray, fee: float, cooldown: int) -> tuple[np.ndarray, np.ndarray, float]:
+    """Any number of trades, with a fee or a cooldown: the holding / cash state machine, run on all blocks of days at once."""
+    n = close.shape[0]
+    blocks = max(1, min(n, int(np.sqrt(8 * n))))
+    # NaN prices (and the padding) give NaN values, which np.fmax skips and comparisons reject
+    prices = _to_blocks(close, blocks)
+    width = prices.shape[0]
+    size = cooldown + 2
+
+    # The state after a day is (holding, cash, cash of the cooldown days before): a max-plus linear map of the
+    # state before it. The map of every block (its days composed) is built on all blocks at once.
+    none, zero = np.full(blocks, -np.inf), np.zeros(blocks)
+    transfer = [[zero if row == column else none for column in range(size)] for row in range(size)]
+    for j in range(width):
+        sell_value = prices[j] - fee
+        holding = [np.fmax(hold, earlier - prices[j]) for hold, earlier in zip(transfer[0], transfer[-1])]
+        selling = [np.fmax(cash, hold + sell_value) for cash, hold in zip(transfer[1], transfer[0])]
+        transfer = [holding, selling] + transfer[1:-1]
+
+    # The state at the start of every block, one block after the other
+    state = [-np.inf] + [0.0] * (size - 1)
+    starts = []
+    for matrix in np.array(transfer).transpose(2, 0, 1).tolist():
+        starts.append(state)
+        state = [max(value + current for value, current in zip(row, state)) for row in matrix]
+    starts = np.array(starts).T
+    profit = state[1]
+
+    # Run the state machine from those starts and keep where selling raises the cash and buying the holding value.
+    # cash[0] is today's cash, cash[-1] the cash a buy on the next day starts from.
+    hold, cash = starts[0], list(starts[1:])
+    sold = np.empty((width, blocks), dtype=bool)
+    bought = np.empty((width, blocks), dtype=bool)
+    for j in range(width):
+        sell_cash = hold + (prices[j] - fee)
+        buy_hold = cash[-1] - prices[j]
+        np.greater(sell_cash, cash[0], out=sold[j])
+        np.greater(buy_hold, hold, out=bought[j])
+        hold = np.fmax(hold, buy_hold)
+        cash = [np.fmax(cash[0], sell_cash)] + cash[:-1]
+
+    # Walk back from the last day in cash. States: 0 in cash, 1 holding, -k with k more cooldown days to skip.
+    # A day maps the state after it to the state before it, the same on every block: a sell leads back to
+    # holding, a buy to the cooldown before it (or to cash), and each cooldown day to one day less.
+    back_from_buy = np.int8(1 + cooldown)
+
+    def before(state, j):
+        previous = state + ((state == 0) & sold[j])
+        previous -= ((state == 1) & bought[j]) * back_from_buy
+        if cooldown:
+            previous += state < 0
+        return previous
+
+    # The state before every block for each state after it, then the state after every block, one block after the other
+    # (ordered 0, 1, -cooldown, ..., -1, so that a state is also its index in the list)
+    maps = [np.full(blocks, state, dtype=np.int8) for state in [0, 1] + list(range(-cooldown, 0))]
+    for j in reversed(range(width)):
+        maps = [before(state, j) for state in maps]
+    ends = np.empty(blocks, dtype=np.int8)
+    state = 0
+    for block, mapped in reversed(list(enumerate(np.array(maps).T.tolist()))):
+        ends[block] = state
+        state = mapped[state]
+
+    # Sells happen on the days left in cash, buys on the days left holding
+    state = ends
+    for j in reversed(range(width)):
+        previous = before(state, j)
+        sold[j] &= state == 0
+        bought[j] &= state == 1
+        state = previous
+
+    buy = bought.T.reshape(-1)[:n]
+    sell = sold.T.reshape(-1)[:n]
+    return buy, sell, profit
+
+
+def _rising_runs(close: np.ndarray) -> tuple[np.ndarray, np.ndarray, float]:
+    """Any number of trades, no fee and no cooldown: buy at the start and sell at the end of every rising run."""
+    n = close.shape[0]
+    buy = np.zeros(n, dtype=bool)
+    sell = np.zeros(n, dtype=bool)
+
+    # Missing prices can be held through, so runs are found on the valid days only
+    missing = np.isnan(close)
+    valid = np.flatnonzero(~missing) if missing.any() else None
+    prices = close if valid is None else close[valid]
+    if prices.shape[0] < 2:
+        return buy, sell, 0.0
+    change = np.diff(prices)
+    rising = change > 0
+    starts = np.empty(prices.shape[0], dtype=bool)
+    ends = np.empty(prices.shape[0], dtype=bool)
+    starts[:-1] = rising
+    starts[-1] = False
+    starts[1:-1] &= ~rising[:-1]
+    ends[0] = False
+    ends[1:] = rising
+    ends[1:-1] &= ~rising[1:]
+    if valid is None:
+        buy, sell = starts, ends
+    else:
+        buy[valid[starts]] = True
+        sell[valid[ends]] = True
+    return buy, sell, float(np.sum(change, where=rising))
+
+
+def optimal_trades_arrays(close: np.ndarray, max_transactions: int=None, fee: float=0.0, cooldown: int=0) -> tuple[np.ndarray, np.ndarray, float]:
+    """
+    This function finds the most profitable set of non-overlapping trades under trading constraints.
+
+    Args:
+        close (np.ndarray): 1-D array of closing prices.
+        max_transactions (int, optional): Maximum number of buy/sell pairs. None means unlimited.
+        fee (float, optional): Cost charged once per completed trade. Defaults to 0.0.
+        cooldown (int, optional): Days that must pass after a sell before the next buy. Defaults to 0 (buy again the next day).
+
+    Returns:
+        tuple: A tuple containing the buy markers, the sell markers (boolean arrays) and the total profit after fees.
+
+    Notes:
+        - Limited transactions: dynamic programming over the number of transactions. With best cash C[j-1] after at
+          most j-1 trades, the best holding value of trade j is a prefix maximum of C[j-1][t - 1 - cooldown] - price[t],
+          and C[j] is a prefix maximum of holding + price - fee. Each layer is two np.fmax.accumulate passes, run chunk
+          by chunk (TRADE_CHUNK_DAYS), so the cost is O(n * k) array work. Only 2 bits per day and layer are kept for
+          recovering the trades.
+        - Unlimited transactions (or max_transactions >= n // 2) need no layers: without fee and cooldown every rising
+          run is one trade (a few array passes). Otherwise the holding / cash state machine is a max-plus linear map per
+          day, so the days are split into about sqrt(8 * n) blocks and every step handles the same day of all blocks:
+          one pass builds the map of each block, the state at each block start follows block by block, and two more
+          passes run the state machine and walk the trades back.
+        - Without a cooldown only the local highs and lows can be traded, so both cases skip the other days.
+        - NaN prices can neither be bought nor sold.
+    """
+    close = np.asarray(close, dtype=float)
+    n = close.shape[0]
+    if n < 2:
+        return np.zeros(n, dtype=bool), np.zeros(n, dtype=bool), 0.0
+
+    if max_transactions is None or max_transactions >= n // 2:
+        if fee == 0 and cooldown == 0:
+            return _rising_runs(close)
+
+    limited = max_transactions is not None and max_transactions < n // 2
+    if cooldown:
+        if limited:
+            return _limited_trades(close, max_transactions, fee, cooldown)
+        return _unlimited_trades(close, fee, cooldown)
+
+    # Without a cooldown, buys are at local lows and sells at local highs, so the other days are skipped
+    days = _turning_points(close)
+    if limited:
+        bought, sold, profit = _limited_trades(close[days], max_transactions, fee, cooldown)
+    else:
+        bought, sold, profit = _unlimited_trades(close[days], fee, cooldown)
+    buy = np.zeros(n, dtype=bool)
+    sell = np.zeros(n, dtype=bool)
+    buy[days[bought]] = True
+    sell[days[sold]] = True
+    return buy, sell, profit
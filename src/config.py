@@ -10,6 +10,8 @@ Notes:
     the list of stock tickers to track, and default date ranges for data fetching.
 """
 
+import os
+from pathlib import Path
 
 
 """
@@ -37,6 +39,11 @@ EMA12 = "EMA12"
 EMA26 = "EMA26"
 RSI_14 = "RSI"
 MACD = "MACD"
+DONCHIAN_20 = "Donchian 20"
+STOCHASTIC = "Stochastic"
+WILLIAMS_R = "Williams %R"
+VWAP_MONTHLY = "Monthly VWAP"
+VWAP_20 = "VWAP 20"
 
 # Available Technical Indicators for Selection
 TECHNICAL_INDICATOR_OPTIONS = [
@@ -47,7 +54,12 @@ TECHNICAL_INDICATOR_OPTIONS = [
     EMA12,
     EMA26,
     RSI_14,
-    MACD
+    MACD,
+    DONCHIAN_20,
+    STOCHASTIC,
+    WILLIAMS_R,
+    VWAP_MONTHLY,
+    VWAP_20
 ]
 
 # =============================================================================
@@ -55,8 +67,8 @@ TECHNICAL_INDICATOR_OPTIONS = [
 # =============================================================================
 
 # Subplot Configuration
-SEPARATE_SUBPLOT_INDICATORS = [MACD, RSI_14]
-OVERLAY_INDICATORS = [SMA_20, SMA_50, SMA_200, EMA12, EMA26, VWAP]
+SEPARATE_SUBPLOT_INDICATORS = [MACD, RSI_14, STOCHASTIC, WILLIAMS_R]
+OVERLAY_INDICATORS = [SMA_20, SMA_50, SMA_200, EMA12, EMA26, VWAP, DONCHIAN_20, VWAP_MONTHLY, VWAP_20]
 
 # Technical Indicator Visualization Configuration
 INDICATOR_VISUAL_CONFIG = {
@@ -90,11 +102,35 @@ INDICATOR_VISUAL_CONFIG = {
         'color': 'vwap',
         'label': VWAP
     },
+    VWAP_MONTHLY: {
+        'indicator': 'VWAP_M',
+        'color': 'vwap_monthly',
+        'label': VWAP_MONTHLY
+    },
+    VWAP_20: {
+        'indicator': 'VWAP_20',
+        'color': 'vwap_20',
+        'label': VWAP_20
+    },
     RSI_14: {
         'label': RSI_14
     },
     MACD: {
         'label': MACD
+    },
+    DONCHIAN_20: {
+        'lines': [('Donchian_Upper', 'donchian_band'), ('Donchian_Lower', 'donchian_band'), ('Donchian_Middle', 'donchian_middle')],
+        'label': DONCHIAN_20
+    },
+    STOCHASTIC: {
+        'lines': [('Stochastic_K', 'stochastic_k'), ('Stochastic_D', 'stochastic_d')],
+        'levels': [(80, 'rsi_overbought', 'Overbought'), (20, 'rsi_oversold', 'Oversold')],
+        'label': STOCHASTIC
+    },
+    WILLIAMS_R: {
+        'lines': [('Williams_R', 'williams_r')],
+        'levels': [(-20, 'rsi_overbought', 'Overbought'), (-80, 'rsi_oversold', 'Oversold')],
+        'label': WILLIAMS_R
     }
 }
 
@@ -112,6 +148,8 @@ COLORS = {
     'ema_12': '#FFA500',
     'ema_26': '#9370DB',
     'vwap': '#FFD700',
+    'vwap_monthly': '#F0E68C',
+    'vwap_20': '#DAA520',
     
     # MACD
     'macd': '#FFA500',
@@ -125,6 +163,13 @@ COLORS = {
     'rsi_oversold': '#44FF44',
     'rsi_center': '#888888',
     
+    # Channels and Oscillators
+    'donchian_band': '#20B2AA',
+    'donchian_middle': '#708090',
+    'stochastic_k': '#FFA500',
+    'stochastic_d': '#00BFFF',
+    'williams_r': '#DA70D6',
+    
     # Trading Signals
     'buy_signal': '#00FF00',
     'sell_signal': '#FF0000',
@@ -135,6 +180,16 @@ COLORS = {
     'text': '#FFFFFF'
 }
 
+# =============================================================================
+# INDICATOR CACHE CONFIGURATION
+# =============================================================================
+
+# Memory budget for cached indicator columns (in bytes), least recently used entries are evicted first
+INDICATOR_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Optional folder for the on-disk cache tier. None keeps the cache in memory only.
+INDICATOR_CACHE_DIR = None
+
 # =============================================================================
 # DATA FETCHING CONFIGURATION
 # =============================================================================
@@ -166,6 +221,87 @@ TICKERS = [
     "C6L.SI"    # Singapore Airlines 
 ]
 
+# Seconds a cached forex rate is fresh. Older rates are still returned while they are refreshed in the background.
+FX_CACHE_TTL_SECONDS = 60 * 60
+
+# Optional file persisting the forex cache across restarts (.json, or .db/.sqlite for SQLite). None keeps it in memory only.
+FX_CACHE_PATH = None
+
+# Every currency is quoted against this pivot currency once, other cross rates are derived from those quotes
+FX_PIVOT_CURRENCY = "USD"
+
+# Days before the first stored FX quote that are not downloaded again (weekends and holidays have no quotes)
+FX_HISTORY_BACKFILL_DAYS = 7
+
+# Price columns converted by the historical FX conversion (src/fx_history.py). Volume is left unchanged.
+FX_HISTORY_PRICE_COLUMNS = ("Open", "High", "Low", "Close")
+
+# Seconds a portfolio market snapshot (prices and FX rates) is reused by the Portfolio Tracker page
+MARKET_SNAPSHOT_TTL_SECONDS = 300
+
+# File of the ticker metadata catalog (currency, exchange, quote type, name). None keeps it in memory only.
+TICKER_CATALOG_PATH = str(Path(__file__).resolve().parent.parent / "data" / "ticker_catalog.json")
+
+# Seconds a failed ticker metadata lookup is remembered before it is retried
+TICKER_CATALOG_NEGATIVE_TTL_SECONDS = 24 * 60 * 60
+
+# Threads used to look up the metadata of several unknown tickers at once
+TICKER_CATALOG_WORKERS = 8
+
+# Columns and types of the binary price store (src/price_store.py), the same columns as the data/CSV files
+PRICE_STORE_COLUMNS = (
+    ("Date", "datetime64[ns]"),
+    ("Close", "float64"),
+    ("High", "float64"),
+    ("Low", "float64"),
+    ("Open", "float64"),
+    ("Volume", "int64"),
+)
+
+# Bytes reserved for the header of a price store file
+PRICE_STORE_HEADER_SIZE = 1024
+
+# Free rows reserved when a price store file is written, so daily appends do not rewrite the file
+PRICE_STORE_GROWTH_ROWS = 256
+
+# Concurrent universe refresh (src/universe_refresh.py, used by src/run_loader.py)
+REFRESH_WORKERS = 16                    # Threads refreshing tickers at the same time
+REFRESH_RETRIES = 3                     # Retries after a failed request
+REFRESH_BACKOFF_SECONDS = 1.0           # Scale of the jittered exponential backoff between retries
+REFRESH_MAX_BACKOFF_SECONDS = 30.0      # Longest wait between retries
+REFRESH_TIMEOUT_SECONDS = 120.0         # Seconds a ticker task may take, retries included
+REFRESH_BATCH_DOWNLOAD = True           # Download histories in batched multi-ticker requests first
+BATCH_DOWNLOAD_SIZE = 100               # Most tickers in one batched history request
+
+# Requests per second allowed per host. Hosts not listed use REFRESH_DEFAULT_RATE.
+YAHOO_HOST = "query2.finance.yahoo.com"
+REFRESH_HOST_RATE_LIMITS = {YAHOO_HOST: 8.0}
+REFRESH_DEFAULT_RATE = 2.0
+
+# Market data source (src/market_data.py): 'yfinance', 'replay' (offline, from fixture files) or 'record'
+# (yfinance, with every result saved as a fixture). The environment variable of the same name overrides it.
+MARKET_DATA_PROVIDER = os.environ.get("MARKET_DATA_PROVIDER", "yfinance")
+
+# Folders searched for '{symbol}.csv' replay fixtures, in order (MARKET_DATA_REPLAY_DIRS overrides it, separated by os.pathsep)
+MARKET_DATA_REPLAY_DIRS = os.environ.get(
+    "MARKET_DATA_REPLAY_DIRS",
+    os.pathsep.join(str(Path(__file__).resolve().parent.parent / "data" / folder) for folder in ("CSV", "FX")),
+).split(os.pathsep)
+
+# Folder the 'record' provider writes its fixtures to
+MARKET_DATA_RECORD_DIR = os.environ.get("MARKET_DATA_RECORD_DIR", str(Path(__file__).resolve().parent.parent / "data" / "FIXTURES"))
+
+# Seconds yfinance waits for a response before a download or history request fails. It ends hung requests,
+# which REFRESH_TIMEOUT_SECONDS only stops waiting for, so keep it well below that.
+MARKET_DATA_TIMEOUT_SECONDS = 30.0
+
+# Synthetic OHLCV universes for load and scaling tests (src/synthetic_data.py)
+SYNTHETIC_SEED = 42                     # Seed of the default universe
+SYNTHETIC_START_DATE = "1990-01-01"     # First date of every synthetic history
+SYNTHETIC_CHUNK_ROWS = 100_000          # Most rows generated and held in memory at once
+SYNTHETIC_BLOCK_ROWS = 65_536           # Rows per random stream, fixed so the data does not depend on the chunk size
+SYNTHETIC_DIR = str(Path(__file__).resolve().parent.parent / "data" / "SYNTHETIC")
+
 # Default start date for historical data
 START_DATE = "2024-01-01"
 END_DATE = "2026-01-01"
@@ -5,23 +5,34 @@ Purpose:
     This module handles data fetching from Yahoo Finance and saving it locally as CSV files.
 
 Functions:
-    - fetch_stock_data(ticker: str, start: str, end: str, save: bool=True) -> pd.DataFrame
+    - fetch_stock_data(ticker: str, start: str, end: str, save: bool=True, return_history: bool=True, require_data: bool=False) -> pd.DataFrame
+    - fetch_stock_data_batch(tickers: list, start: str, end: str, save: bool=True, batch_size: int=BATCH_DOWNLOAD_SIZE) -> dict
+    - metadata_filename(filename: str) -> str
+    - rebuild_csv_metadata(filename: str) -> dict
+    - load_csv_metadata(filename: str) -> dict
+    - history_rows(ticker: str) -> int
     - fetch_latest_price(ticker: str, save: bool=True) -> float
 
 
 Notes:
-    Each function interacts with the yfinance library to retrieve stock data and
-    saves it in a structured format for further analysis.
+    Each function retrieves stock data through the market data provider (src/market_data.py,
+    yfinance by default) and saves it in a structured format for further analysis.
     CSV files are stored under the data folder.
+    Each history CSV has a sidecar metadata file (last date, row count, size and checksum), so
+    updates append only the new rows and never parse or rewrite the whole file.
 """
 
 
 from pathlib import Path
-import yfinance as yf
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import os
+import json
+import zlib
 from src.config import *
+from src.price_store import open_price_store
+from src.market_data import get_provider
 
 # -----------------------------
 # Relative path to CSV folder
@@ -37,12 +48,193 @@ except Exception as e:
     print(f"Error setting up data directory: {e}")
 
 
+# -----------------------------
+# CSV metadata sidecar
+# -----------------------------
+def metadata_filename(filename: str) -> str:
+    """
+    This function returns the sidecar metadata file of a CSV file ('{ticker}.csv.meta.json').
+
+    Args:
+        filename (str): The CSV file.
+
+    Returns:
+        str: The sidecar file path.
+    """
+    return f"{filename}.meta.json"
+
+
+def _file_checksum(filename: str, size: int=None) -> int:
+    """CRC32 of the first 'size' bytes of a file (the whole file if size is None)."""
+    checksum = 0
+    remaining = os.path.getsize(filename) if size is None else size
+    with open(filename, "rb") as file:
+        while remaining > 0:
+            chunk = file.read(min(remaining, 1 << 20))
+            if not chunk:
+                break
+            checksum = zlib.crc32(chunk, checksum)
+            remaining -= len(chunk)
+    return checksum
+
+
+def _write_metadata(filename: str, metadata: dict) -> None:
+    """Write the sidecar to a temporary file and rename it, so it is replaced in one step."""
+    temp_filename = metadata_filename(filename) + ".tmp"
+    with open(temp_filename, "w") as file:
+        json.dump(metadata, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_filename, metadata_filename(filename))
+
+
+def rebuild_csv_metadata(filename: str) -> dict:
+    """
+    This function reads a whole CSV file once and writes its sidecar metadata.
+
+    Args:
+        filename (str): The CSV file.
+
+    Returns:
+        dict: 'last_date' ('YYYY-MM-DD'), 'rows', 'columns', 'size' (bytes) and 'checksum' (CRC32 of the file).
+    """
+    existing = pd.read_csv(filename, parse_dates=["Date"])
+    metadata = {
+        "last_date": existing["Date"].max().strftime("%Y-%m-%d") if not existing.empty else None,
+        "rows": len(existing),
+        "columns": list(existing.columns),
+        "size": os.path.getsize(filename),
+        "checksum": _file_checksum(filename),
+    }
+    _write_metadata(filename, metadata)
+    return metadata
+
+
+def load_csv_metadata(filename: str):
+    """
+    This function returns the sidecar metadata of a CSV file, checked against the file.
+
+    Args:
+        filename (str): The CSV file.
+
+    Returns:
+        dict or None: The metadata (see rebuild_csv_metadata()), or None if the CSV file does not exist.
+
+    Notes:
+        - If the file has the size recorded in the sidecar, the sidecar is used without reading the CSV.
+        - An append records its final size in the sidecar ('pending_size') before it writes any row. A file
+          longer than recorded, but not past 'pending_size', holds an append that was not committed (e.g. the
+          process was killed). If the recorded part still matches the checksum, the extra bytes are cut off.
+        - A missing or unreadable sidecar, or a file that does not match it (e.g. rows added by git or another
+          tool), is rebuilt from the CSV, so rows written outside fetch_stock_data() are kept.
+    """
+    if not os.path.exists(filename):
+        return None
+    try:
+        with open(metadata_filename(filename), "r") as file:
+            metadata = json.load(file)
+        pending_size = metadata.pop("pending_size", None)
+        size = os.path.getsize(filename)
+        if size == metadata["size"]:
+            return metadata
+        if (pending_size is not None and metadata["size"] < size <= pending_size
+                and _file_checksum(filename, metadata["size"]) == metadata["checksum"]):
+            with open(filename, "r+b") as file:
+                file.truncate(metadata["size"])
+            _write_metadata(filename, metadata)
+            print(f"Rolled back an unfinished update of {filename}")
+            return metadata
+    except (OSError, ValueError, KeyError):
+        pass
+    return rebuild_csv_metadata(filename)
+
+
+def _append_csv_rows(filename: str, new_data: pd.DataFrame, metadata: dict) -> dict:
+    """
+    Append rows to a CSV file and commit them in its sidecar.
+
+    Notes:
+        - The sidecar first records the size the file will have ('pending_size'), then the rows are written
+          (and synced), then the sidecar with the new size and checksum is replaced in one step. Until then
+          the rows are not part of the file (load_csv_metadata() cuts them off), so a crash at any point
+          leaves a valid file.
+    """
+    rows = new_data.reindex(columns=metadata["columns"]).to_csv(index=False, header=False).encode()
+    with open(filename, "r+b") as file:
+        file.seek(metadata["size"])
+        # A file written by another tool may not end with a newline
+        if metadata["size"] > 0:
+            file.seek(metadata["size"] - 1)
+            if file.read(1) != b"\n":
+                rows = b"\n" + rows
+        _write_metadata(filename, {**metadata, "pending_size": metadata["size"] + len(rows)})
+        file.write(rows)
+        file.truncate()
+        file.flush()
+        os.fsync(file.fileno())
+
+    metadata = {
+        **metadata,
+        "last_date": pd.Timestamp(new_data["Date"].max()).strftime("%Y-%m-%d"),
+        "rows": metadata["rows"] + len(new_data),
+        "size": metadata["size"] + len(rows),
+        "checksum": zlib.crc32(rows, metadata["checksum"]),
+    }
+    _write_metadata(filename, metadata)
+    return metadata
+
+
+def _write_csv(filename: str, data: pd.DataFrame) -> dict:
+    """Write a new CSV file (to a temporary file first, then renamed) and its sidecar."""
+    temp_filename = filename + ".tmp"
+    data.to_csv(temp_filename, index=False)
+    os.replace(temp_filename, filename)
+    return rebuild_csv_metadata(filename)
+
+
+def _plan_update(ticker: str, start: str) -> tuple:
+    """The CSV file, its metadata, its last date and the first date to download for a ticker."""
+    filename = os.path.join(DATA_DIR, f"{ticker}.csv")
+
+    # If CSV exists, update only from the last date recorded in its sidecar
+    metadata = load_csv_metadata(filename)
+    if metadata is not None and metadata["last_date"] is not None:
+        last_date = pd.Timestamp(metadata["last_date"])
+        new_start = (last_date + timedelta(days=1)).strftime("%Y-%m-%d")
+    else:
+        last_date = None
+        new_start = start
+    return filename, metadata, last_date, new_start
+
+
+def _save_new_rows(ticker: str, filename: str, metadata, new_data: pd.DataFrame) -> None:
+    """Write a new CSV file or append to the existing one, and keep a migrated binary store in step."""
+    if metadata is None or metadata["rows"] == 0:
+        # New files get the column order of the data/CSV files
+        ordered = [name for name, _ in PRICE_STORE_COLUMNS if name in new_data.columns]
+        _write_csv(filename, new_data[ordered + [column for column in new_data.columns if column not in ordered]])
+    else:
+        _append_csv_rows(filename, new_data, metadata)
+    print(f"✅ {ticker} data updated in {filename}")
+
+    # Keep a migrated binary store in step, writing only the new rows
+    store = open_price_store(ticker)
+    if store is not None:
+        store.append(new_data)
+
+
+def _expected_days(new_start: str, end: str) -> int:
+    """Weekdays from new_start up to end that have already ended, which a download should return (market holidays aside)."""
+    last = min(pd.Timestamp(end), pd.Timestamp(datetime.today().date()))
+    if pd.Timestamp(new_start) >= last:
+        return 0
+    return int(np.busday_count(pd.Timestamp(new_start).date(), last.date()))
 
 
 # -----------------------------
 # Fetch historical data
 # -----------------------------
-def fetch_stock_data(ticker: str, start =START_DATE, end=END_DATE, save: bool=True) -> pd.DataFrame:
+def fetch_stock_data(ticker: str, start =START_DATE, end=END_DATE, save: bool=True, return_history: bool=True, require_data: bool=False) -> pd.DataFrame:
     """
     This function fetches historical stock data from Yahoo Finance for a given ticker symbol
     and saves it as a CSV file in the data/CSV directory. If the CSV file already exists,
@@ -53,49 +245,136 @@ def fetch_stock_data(ticker: str, start =START_DATE, end=END_DATE, save: bool=Tr
         start (str): The start date for fetching historical data in 'YYYY-MM-DD' format.
         end (str): The end date for fetching historical data in 'YYYY-MM-DD' format.
         save (bool): If True, saves the fetched data to a CSV file. Default is True.
-        
+        return_history (bool): If True, returns the whole history. If False, returns only the new rows, and the CSV file is not parsed. Default is True.
+        require_data (bool): If True, a download that returns no rows for past weekdays raises LookupError instead of
+            returning the stored history unchanged. Default is False.
 
     Returns:
         pd.DataFrame: A DataFrame containing the historical stock data fetched from Yahoo Finance for the specified date range.
+
+    Raises:
+        LookupError: If require_data is True and the provider returned no new rows although weekdays since the
+            last stored date have ended (a failed fetch, or a market holiday being the only missing day).
     
     Notes:
-        - The function checks if a CSV file for the ticker already exists. If it does, it loads the existing data and fetches only new data from the last date in the existing file to avoid duplicates.
-        - The function uses the yfinance library to fetch stock data.
+        - The last stored date is read from the sidecar metadata file ('{ticker}.csv.meta.json': last date, row count, size and checksum), so the CSV is not parsed to find it. Only new data from the day after it is fetched, to avoid duplicates.
+        - New rows are appended to the CSV file instead of rewriting it, and committed by replacing the sidecar (see _append_csv_rows()), so a crash never leaves a partial file.
+        - The data is fetched through the market data provider (src/market_data.py, yfinance by default).
         - The CSV files are stored in the data/CSV directory with filenames in the format '{ticker}.csv'.
         - If the fetched data contains a MultiIndex (which can happen with some yfinance queries), the function flattens the columns to a single level.
+        - If the ticker has a binary store file (data/STORE, see src/price_store.py), the new rows are appended to it as well.
     """
-    filename = os.path.join(DATA_DIR, f"{ticker}.csv")
-    
-    # If CSV exists, load it and update only from the last date
-    if os.path.exists(filename):
-        existing = pd.read_csv(filename, parse_dates=["Date"])
-        last_date = existing["Date"].max()
-        new_start = (last_date + timedelta(days=1)).strftime("%Y-%m-%d")
-    else:
-        existing = pd.DataFrame()
-        new_start = start
+    filename, metadata, last_date, new_start = _plan_update(ticker, start)
 
     # Only fetch if we need new data
     if new_start <= end:
-        new_data = yf.download(ticker, start=new_start, end=end, progress=False)
+        new_data = get_provider().download(ticker, start=new_start, end=end)
         if isinstance(new_data.columns, pd.MultiIndex):
             ## remove the header from csv file
             new_data.columns = [col[0] for col in new_data.columns] 
         new_data.reset_index(inplace=True)
+        if last_date is not None and not new_data.empty:
+            new_data = new_data[pd.to_datetime(new_data["Date"]) > last_date]
+        if require_data and new_data.empty and _expected_days(new_start, end) > 0:
+            raise LookupError(f"No data returned for {ticker} from {new_start}")
     else:
         new_data = pd.DataFrame()
 
+    if save and not new_data.empty:
+        _save_new_rows(ticker, filename, metadata, new_data)
+
+    if not return_history:
+        return new_data
+
+    existing = pd.read_csv(filename, parse_dates=["Date"]) if os.path.exists(filename) else pd.DataFrame()
+    if save or new_data.empty:
+        return existing
     # Merge old + new data
-    if not new_data.empty:
-        combined = pd.concat([existing, new_data], ignore_index=True)
-    else:
-        combined = existing
+    return pd.concat([existing, new_data], ignore_index=True) if not existing.empty else new_data
 
-    if save and not combined.empty:
-        combined.to_csv(filename, index=False)
-        print(f"✅ {ticker} data updated in {filename}")
+def fetch_stock_data_batch(tickers: list, start=START_DATE, end=END_DATE, save: bool=True, batch_size: int=BATCH_DOWNLOAD_SIZE) -> dict:
+    """
+    This function brings the stored histories of many tickers up to date with as few yfinance requests as possible.
+
+    Args:
+        tickers (list): The stock ticker symbols.
+        start (str): The start date for tickers without a CSV file, in 'YYYY-MM-DD' format.
+        end (str): The end date for fetching historical data in 'YYYY-MM-DD' format.
+        save (bool): If True, appends the new rows to the CSV files. Default is True.
+        batch_size (int): Most tickers in one request. Default is BATCH_DOWNLOAD_SIZE.
+
+    Returns:
+        dict: Ticker -> DataFrame of its new rows (empty if it was already up to date). Tickers whose
+        request failed, or that got no rows for weekdays that have ended, are left out, so callers can
+        retry them with fetch_stock_data().
+
+    Notes:
+        - Tickers are grouped by the first date they need (the day after their last stored date), and every
+          group is downloaded with one yf.download() call per batch_size tickers.
+        - The (ticker, field) columns of the result are split per ticker. Rows where a ticker has no data
+          (other tickers traded that day) are dropped, then the rows are appended as in fetch_stock_data().
+    """
+    plans, groups, results = {}, {}, {}
+    for ticker in dict.fromkeys(tickers):
+        plans[ticker] = _plan_update(ticker, start)
+        new_start = plans[ticker][3]
+        if new_start <= end:
+            groups.setdefault(new_start, []).append(ticker)
+        else:
+            results[ticker] = pd.DataFrame()
+
+    for new_start, group in groups.items():
+        for first in range(0, len(group), batch_size):
+            batch = group[first:first + batch_size]
+            try:
+                data = get_provider().download(batch, start=new_start, end=end, group_by="ticker")
+            except Exception as e:
+                print(f"Could not fetch {len(batch)} tickers from {new_start}: {e}")
+                continue
+
+            for ticker in batch:
+                filename, metadata, last_date, _ = plans[ticker]
+                if isinstance(data.columns, pd.MultiIndex):
+                    if ticker not in data.columns.get_level_values(0):
+                        new_data = pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+                    else:
+                        new_data = data[ticker].dropna(how="all")
+                else:
+                    new_data = data.dropna(how="all")
+                new_data = new_data.rename_axis("Date").reset_index()
+                new_data.columns.name = None
+                # Aligning tickers on shared dates turns Volume into floats
+                if "Volume" in new_data.columns and new_data["Volume"].notna().all():
+                    new_data["Volume"] = new_data["Volume"].astype("int64")
+                if last_date is not None and not new_data.empty:
+                    new_data = new_data[pd.to_datetime(new_data["Date"]) > last_date]
+                if new_data.empty and _expected_days(new_start, end) > 0:
+                    # Nothing came back for days that should have data, left out so the caller retries it
+                    continue
+
+                if save and not new_data.empty:
+                    _save_new_rows(ticker, filename, metadata, new_data)
+                results[ticker] = new_data.reset_index(drop=True)
+
+    return results
+
+
+def history_rows(ticker: str) -> int:
+    """
+    This function returns the number of rows of a ticker's stored history.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+
+    Returns:
+        int: The row count recorded in the sidecar of '{ticker}.csv', or 0 if the ticker has no CSV file.
+
+    Notes:
+        - The count comes from load_csv_metadata(), so the CSV is not parsed.
+    """
+    metadata = load_csv_metadata(os.path.join(DATA_DIR, f"{ticker}.csv"))
+    return 0 if metadata is None else metadata["rows"]
 
-    return combined
 
 # -----------------------------
 # Fetch latest price
@@ -114,13 +393,12 @@ def fetch_latest_price(ticker: str, save: bool =True) -> float:
         float: The latest stock price fetched from Yahoo Finance.
     
     Notes:
-        - The function uses the yfinance library to fetch the latest stock price.
+        - The latest price is fetched through the market data provider (src/market_data.py, yfinance by default).
         - The CSV file is stored in the data/CSV directory with the filename format '{ticker}_latest.csv'.
         - If the CSV file already exists, it appends the new price only if the date is not already present to avoid duplicates.
     """
-    stock = yf.Ticker(ticker)
-    todays_data = stock.history(period="1d")
-    latest_price = todays_data["Close"][0]
+    todays_data = get_provider().history(ticker, period="1d")
+    latest_price = todays_data["Close"].iloc[0]
 
     if save:
         filename = os.path.join(DATA_DIR, f"{ticker}_latest.csv")
@@ -0,0 +1,127 @@
+"""
+fx_engine.py
+
+Purpose:
+    This module contains the cross rate engine for forex conversion. Every currency is quoted once
+    against a single pivot currency (USD by default, e.g. 'USDSGD=X' is SGD per USD), and any
+    currency -> target rate is derived from two of those quotes:
+
+        rate(currency -> target) = per_pivot[target] / per_pivot[currency]
+
+    so N currencies need N quotes for every target instead of one pair download per (currency, target).
+
+Classes:
+    - CrossRateTable(pivot_rates: dict, pivot: str=FX_PIVOT_CURRENCY)
+
+Functions:
+    - cross_rate_matrix(per_pivot: np.ndarray) -> np.ndarray
+
+Notes:
+    - The module does no network calls. src/ticker_utils.py downloads the pivot quotes.
+    - Missing, zero or negative quotes are dropped, so rates that need them come out as NaN.
+"""
+
+
+import numpy as np
+import pandas as pd
+from src.config import *
+
+
+def cross_rate_matrix(per_pivot: np.ndarray) -> np.ndarray:
+    """
+    This function builds the matrix of every cross rate from the pivot quotes.
+
+    Args:
+        per_pivot (np.ndarray): Units of each currency per one unit of the pivot.
+
+    Returns:
+        np.ndarray: matrix[i, j] is the rate converting one unit of currency i into currency j.
+    """
+    per_pivot = np.asarray(per_pivot, dtype=np.float64)
+    return per_pivot[np.newaxis, :] / per_pivot[:, np.newaxis]
+
+
+class CrossRateTable:
+    """
+    Cross rates between all currencies quoted against one pivot currency.
+
+    Attributes:
+        pivot (str): The pivot currency (its own quote is 1.0).
+        currencies (list): The currencies with a valid quote, the pivot first.
+        per_pivot (np.ndarray): Units of each currency per one unit of the pivot, in the order of currencies.
+    """
+
+    def __init__(self, pivot_rates: dict, pivot: str=FX_PIVOT_CURRENCY):
+        self.pivot = pivot
+        quotes = {pivot: 1.0}
+        for currency, rate in pivot_rates.items():
+            if currency != pivot and rate is not None and np.isfinite(rate) and rate > 0:
+                quotes[currency] = float(rate)
+        self.currencies = list(quotes)
+        self.per_pivot = np.fromiter(quotes.values(), dtype=np.float64, count=len(quotes))
+        self._positions = pd.Index(self.currencies)
+
+    def __contains__(self, currency) -> bool:
+        return currency in self._positions
+
+    def matrix(self) -> pd.DataFrame:
+        """
+        Return every cross rate.
+
+        Returns:
+            pd.DataFrame: Rows are the currencies converted from, columns the currencies converted to.
+        """
+        return pd.DataFrame(cross_rate_matrix(self.per_pivot), index=self.currencies, columns=self.currencies)
+
+    def rates_to(self, currencies, target_currency: str) -> np.ndarray:
+        """
+        Return the rate of every entry of a currency column into one target currency.
+
+        Args:
+            currencies (array-like): Currency codes (duplicates and unknown codes are allowed).
+            target_currency (str): The currency to convert to.
+
+        Returns:
+            np.ndarray: The rates as floats, 1.0 where the currency is the target and NaN where a quote is missing.
+        """
+        currencies = np.asarray(currencies, dtype=object)
+        # Position -1 (unknown currency) reads the extra NaN slot at the end
+        quotes = np.append(self.per_pivot, np.nan)
+        positions = self._positions.get_indexer(currencies)
+        target_position = self._positions.get_indexer([target_currency])[0]
+        rates = quotes[target_position] / quotes[positions]
+        rates[currencies == target_currency] = 1.0
+        return rates
+
+    def rate(self, currency: str, target_currency: str) -> float:
+        """Rate converting one unit of currency into target_currency, NaN if a quote is missing."""
+        return float(self.rates_to([currency], target_currency)[0])
+
+    def to_dict(self, currencies: list, target_currency: str) -> dict:
+        """
+        Return the rates of several currencies into one target currency.
+
+        Args:
+            currencies (list): Currency codes.
+            target_currency (str): The currency to convert to.
+
+        Returns:
+            dict: Currency -> rate, only for the currencies whose rate is known.
+        """
+        currencies = list(dict.fromkeys(currencies))
+        rates = self.rates_to(currencies, target_currency)
+        return {currency: float(rate) for currency, rate in zip(currencies, rates) if not np.isnan(rate)}
+
+    def convert(self, amounts, currencies, target_currency: str) -> np.ndarray:
+        """
+        Convert amounts in mixed currencies into one target currency.
+
+        Args:
+            amounts (array-like): The amounts.
+            currencies (array-like): The currency of every amount.
+            target_currency (str): The currency to convert to.
+
+        Returns:
+            np.ndarray: The converted amounts, NaN where a quote is missing.
+        """
+        return np.asarray(amounts, dtype=np.float64) * self.rates_to(currencies, target_currency)
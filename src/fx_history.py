@@ -0,0 +1,244 @@
+"""
+fx_history.py
+
+Purpose:
+    This module keeps a local history of daily forex quotes and converts whole price histories
+    into one currency. Every currency is stored as its daily quote against the pivot currency
+    (e.g. data/FX/USDSGD=X.csv for the default USD pivot), so any currency pair can be derived
+    per day the same way as the latest rates in src/fx_engine.py.
+
+Functions:
+    - fx_history_filename(symbol: str, directory=None) -> str
+    - update_fx_history(currencies: list, start: str=START_DATE, end: str=END_DATE, pivot: str=FX_PIVOT_CURRENCY, save: bool=True, directory=None) -> pd.DataFrame
+    - load_fx_history(currencies: list, pivot: str=FX_PIVOT_CURRENCY, directory=None) -> pd.DataFrame
+    - asof_rates(dates, quotes: pd.DataFrame, currency: str, target_currency: str="SGD", pivot: str=FX_PIVOT_CURRENCY) -> np.ndarray
+    - convert_history(df: pd.DataFrame, currency: str, target_currency: str="SGD", quotes: pd.DataFrame=None, columns: tuple=FX_HISTORY_PRICE_COLUMNS) -> pd.DataFrame
+
+Notes:
+    - The CSV files are updated like fetch_stock_data() updates data/CSV: only the days after the
+      last stored date are downloaded. All currencies that need an update share one yf.download() call.
+    - Rates are joined "as of" each row's calendar day: the last quote on or before that day is used,
+      so weekends and FX holidays take the previous quote. Days before the first quote get NaN.
+    - Quote frames have one column per currency (units per pivot unit) and a DatetimeIndex of days.
+      The pivot has no column, its quote is always 1.0.
+"""
+
+
+from pathlib import Path
+import os
+import numpy as np
+import pandas as pd
+from datetime import timedelta
+from src.config import *
+from src.market_data import get_provider
+from src.range_index import calendar_days
+from src.ticker_utils import pivot_quote_symbols
+
+# -----------------------------
+# Relative path to FX folder
+# -----------------------------
+try:
+    FX_DIR = Path(__file__).resolve().parent.parent / "data" / "FX"
+    os.makedirs(FX_DIR, exist_ok=True)
+except Exception as e:
+    print(f"Error setting up FX data directory: {e}")
+
+
+def fx_history_filename(symbol: str, directory=None) -> str:
+    """
+    This function returns the CSV file of one pivot quote symbol.
+
+    Args:
+        symbol (str): The yfinance symbol (e.g. 'USDSGD=X').
+        directory (str or Path, optional): The folder of the files. Defaults to data/FX.
+
+    Returns:
+        str: The file path.
+    """
+    return os.path.join(FX_DIR if directory is None else directory, f"{symbol}.csv")
+
+
+def _close_column(data: pd.DataFrame, symbol: str) -> pd.Series:
+    """The Close column of one symbol in a yf.download() result (empty if it is missing)."""
+    if isinstance(data.columns, pd.MultiIndex):
+        if symbol not in data.columns.get_level_values(0):
+            return pd.Series(dtype=np.float64)
+        close = data[symbol]["Close"]
+    elif "Close" in data.columns:
+        close = data["Close"]
+    else:
+        return pd.Series(dtype=np.float64)
+    close = pd.to_numeric(close, errors="coerce").dropna()
+    return close[close > 0]
+
+
+def update_fx_history(currencies: list, start: str=START_DATE, end: str=END_DATE, pivot: str=FX_PIVOT_CURRENCY, save: bool=True, directory=None) -> pd.DataFrame:
+    """
+    This function brings the stored quote history of several currencies up to date and returns it.
+
+    Args:
+        currencies (list): Currency codes (invalid codes such as 'UNKNOWN' are skipped).
+        start (str): The first date the history should cover, in 'YYYY-MM-DD' format.
+        end (str): The end date of the download in 'YYYY-MM-DD' format.
+        pivot (str): The pivot currency. Default is FX_PIVOT_CURRENCY.
+        save (bool): If True, writes the updated CSV files. Default is True.
+        directory (str or Path, optional): The folder of the files. Defaults to data/FX.
+
+    Returns:
+        pd.DataFrame: Quotes per day, one column per currency (the pivot itself has no column).
+
+    Notes:
+        - A file is only extended with days after its last stored date and, if start is more than
+          FX_HISTORY_BACKFILL_DAYS before its first stored date, with the days from start up to that date.
+        - The missing days of all files are downloaded together, in one yf.download() call for the new days
+          (from the earliest missing day) and one for the earlier days, if any file needs them.
+        - If a download fails, the stored history is returned unchanged.
+    """
+    symbols = pivot_quote_symbols(currencies, pivot)
+    existing, windows = {}, {"new": {}, "earlier": {}}
+
+    # If the CSV exists, load it and update only the days before its first or after its last date
+    for currency, symbol in symbols.items():
+        filename = fx_history_filename(symbol, directory)
+        if os.path.exists(filename):
+            existing[currency] = pd.read_csv(filename, parse_dates=["Date"])
+            first_date = existing[currency]["Date"].min().strftime("%Y-%m-%d")
+            new_start = (existing[currency]["Date"].max() + timedelta(days=1)).strftime("%Y-%m-%d")
+            # Days just before the first quote are weekends or holidays without quotes, they are not asked for again
+            if pd.Timestamp(first_date) - pd.Timestamp(start) > timedelta(days=FX_HISTORY_BACKFILL_DAYS):
+                windows["earlier"][currency] = (start, first_date)
+        else:
+            existing[currency] = pd.DataFrame(columns=["Date", "Close"])
+            new_start = start
+        # Only fetch if we need new data
+        if new_start <= end:
+            windows["new"][currency] = (new_start, end)
+
+    for kind, needed in windows.items():
+        if not needed:
+            continue
+        download_symbols = [symbols[currency] for currency in needed]
+        window_start = min(first for first, _ in needed.values())
+        window_end = max(last for _, last in needed.values())
+        try:
+            data = get_provider().download(download_symbols, start=window_start, end=window_end, interval="1d", group_by="ticker")
+        except Exception as e:
+            print(f"Could not fetch FX history for {download_symbols}: {e}")
+            continue
+
+        for currency, (first, last) in needed.items():
+            close = _close_column(data, symbols[currency])
+            days = pd.DatetimeIndex(calendar_days(pd.DatetimeIndex(close.index)))
+            new_data = pd.DataFrame({"Date": days, "Close": close.to_numpy()})
+            new_data = new_data[new_data["Date"] >= pd.Timestamp(first)]
+            if kind == "earlier":
+                new_data = new_data[new_data["Date"] < pd.Timestamp(last)]
+            if new_data.empty:
+                continue
+
+            # Merge old + new data, in date order
+            parts = [new_data, existing[currency]] if kind == "earlier" else [existing[currency], new_data]
+            combined = pd.concat(parts, ignore_index=True) if not existing[currency].empty else new_data
+            existing[currency] = combined
+            if save:
+                combined.to_csv(fx_history_filename(symbols[currency], directory), index=False)
+                print(f"✅ {symbols[currency]} history updated")
+
+    return _quote_frame(existing)
+
+
+def load_fx_history(currencies: list, pivot: str=FX_PIVOT_CURRENCY, directory=None) -> pd.DataFrame:
+    """
+    This function reads the stored quote history of several currencies without downloading.
+
+    Args:
+        currencies (list): Currency codes.
+        pivot (str): The pivot currency. Default is FX_PIVOT_CURRENCY.
+        directory (str or Path, optional): The folder of the files. Defaults to data/FX.
+
+    Returns:
+        pd.DataFrame: Quotes per day, one column per currency (the pivot itself has no column).
+        Currencies without a stored file are left out.
+    """
+    histories = {}
+    for currency, symbol in pivot_quote_symbols(currencies, pivot).items():
+        filename = fx_history_filename(symbol, directory)
+        if os.path.exists(filename):
+            histories[currency] = pd.read_csv(filename, parse_dates=["Date"])
+    return _quote_frame(histories)
+
+
+def _quote_frame(histories: dict) -> pd.DataFrame:
+    """Combine per currency Date/Close frames into one frame of quotes (one column per currency)."""
+    columns = {currency: history.drop_duplicates("Date", keep="last").set_index("Date")["Close"].astype(np.float64)
+               for currency, history in histories.items() if not history.empty}
+    return pd.DataFrame(columns).sort_index() if columns else pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+
+
+def _asof_quotes(days: np.ndarray, quotes: pd.DataFrame, currency: str, pivot: str) -> np.ndarray:
+    """The last quote of a currency on or before each day (NaN before its first quote or if it is missing)."""
+    if currency == pivot:
+        return np.ones(len(days))
+    if currency not in quotes.columns:
+        return np.full(len(days), np.nan)
+    quote = quotes[currency].dropna()
+    quote_days = calendar_days(pd.DatetimeIndex(quote.index))
+    positions = np.searchsorted(quote_days, days, side="right") - 1
+    # Position -1 (a day before the first quote) reads the extra NaN slot at the end
+    values = np.append(quote.to_numpy(dtype=np.float64), np.nan)
+    return values[positions]
+
+
+def asof_rates(dates, quotes: pd.DataFrame, currency: str, target_currency: str="SGD", pivot: str=FX_PIVOT_CURRENCY) -> np.ndarray:
+    """
+    This function returns the rate converting currency into target_currency as of each date.
+
+    Args:
+        dates (array-like): The dates of the rows to convert (time zone aware dates keep their local day).
+        quotes (pd.DataFrame): Quotes per day from update_fx_history() or load_fx_history().
+        currency (str): The currency converted from.
+        target_currency (str): The currency converted to. Default is "SGD".
+        pivot (str): The currency the quotes are against. Default is FX_PIVOT_CURRENCY.
+
+    Returns:
+        np.ndarray: One rate per date. 1.0 if both currencies are the same, NaN where a quote is missing.
+    """
+    days = calendar_days(pd.DatetimeIndex(dates))
+    if currency == target_currency:
+        return np.ones(len(days))
+    return _asof_quotes(days, quotes, target_currency, pivot) / _asof_quotes(days, quotes, currency, pivot)
+
+
+def convert_history(df: pd.DataFrame, currency: str, target_currency: str="SGD", quotes: pd.DataFrame=None, columns: tuple=FX_HISTORY_PRICE_COLUMNS) -> pd.DataFrame:
+    """
+    This function converts the price columns of a whole history into another currency.
+
+    Args:
+        df (pd.DataFrame): The history, with a DatetimeIndex or a 'Date' column (e.g. a data/CSV file).
+        currency (str): The currency of the prices.
+        target_currency (str): The currency to convert to. Default is "SGD".
+        quotes (pd.DataFrame, optional): Quotes per day. If None, the stored history of both currencies
+            is updated to cover the dates of df.
+        columns (tuple): The price columns to convert. Columns missing from df are skipped. Default is Open/High/Low/Close.
+
+    Returns:
+        pd.DataFrame: A copy of df with the price columns converted and an 'FX_Rate' column. Other columns (e.g. Volume) are unchanged.
+
+    Notes:
+        - All price columns are multiplied by the per day rates in one aligned array multiplication.
+    """
+    dates = pd.to_datetime(df["Date"]) if "Date" in df.columns else df.index
+    if quotes is None:
+        first, last = pd.DatetimeIndex(dates).min(), pd.DatetimeIndex(dates).max()
+        # Start a week early so the first rows have a quote as of their day
+        start = (first - timedelta(days=7)).strftime("%Y-%m-%d")
+        end = (last + timedelta(days=1)).strftime("%Y-%m-%d")
+        quotes = update_fx_history([currency, target_currency], start=start, end=end)
+
+    converted = df.copy()
+    rates = asof_rates(dates, quotes, currency, target_currency)
+    price_columns = [column for column in columns if column in converted.columns]
+    if price_columns:
+        converted[price_columns] = converted[price_columns].to_numpy(dtype=np.float64) * rates[:, np.newaxis]
+    converted["FX_Rate"] = rates
+    return converted
@@ -17,7 +17,6 @@ Notes:
 
 
 import pandas as pd
-import streamlit as st
 
 
 def filter_dataframe_by_date_range(df: pd.DataFrame, start_date: pd.Timestamp, end_date: pd.Timestamp) -> pd.DataFrame:
@@ -0,0 +1,231 @@
+"""
+indicator_cache.py
+
+Purpose:
+    This module caches computed technical indicator columns. Entries are keyed on the
+    content of the input price arrays plus the indicator name and parameters, so a
+    Streamlit rerun on identical data returns the columns without recomputing them.
+
+Classes:
+    - IndicatorCache(max_bytes: int=INDICATOR_CACHE_MAX_BYTES, disk_dir=INDICATOR_CACHE_DIR)
+
+Functions:
+    - array_fingerprint(values: np.ndarray) -> str
+    - indicator_cache_key(indicator: str, input_fingerprints: dict) -> str
+    - cached_compute_selected_indicators(df: pd.DataFrame, selected_indicators: list, cache: IndicatorCache=None) -> dict
+
+Notes:
+    - The memory tier is an LRU (collections.OrderedDict) limited by a byte budget.
+    - The optional disk tier stores one .npz file per entry and is checked on a memory miss,
+      so results survive a restart of the Streamlit server.
+    - Keys use BLAKE2b over the raw bytes of the input arrays, which is much faster than the indicators.
+"""
+
+
+import hashlib
+import os
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from src.config import *
+from src.indicator_planner import build_indicator_plan, compute_selected_indicators, indicator_outputs, input_array
+
+
+def array_fingerprint(values: np.ndarray) -> str:
+    """
+    This function returns a content hash of a NumPy array.
+
+    Args:
+        values (np.ndarray): The array to hash.
+
+    Returns:
+        str: A hex digest that changes whenever the values, dtype or shape change.
+    """
+    values = np.ascontiguousarray(values)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str((values.dtype.str, values.shape)).encode())
+    # Hash the raw bytes, so dtypes without a buffer format (e.g. datetime64) work too
+    digest.update(values.view(np.uint8).data if values.size else b"")
+    return digest.hexdigest()
+
+
+def indicator_cache_key(indicator: str, input_fingerprints: dict) -> str:
+    """
+    This function builds the cache key of one indicator.
+
+    Args:
+        indicator (str): The indicator name (a key of TECHNICAL_INDICATORS).
+        input_fingerprints (dict): A dictionary mapping each input column the indicator reads to its fingerprint.
+
+    Returns:
+        str: The cache key.
+
+    Notes:
+        - The output columns and nodes (which carry the parameters, e.g. ("ema", 12)) are part of the key,
+          so changing an indicator's parameters never returns stale columns.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((indicator, indicator_outputs(indicator), sorted(input_fingerprints.items()))).encode())
+    return digest.hexdigest()
+
+
+class IndicatorCache:
+    """
+    LRU cache of indicator columns with a byte budget and an optional on-disk tier.
+
+    Attributes:
+        max_bytes (int): Memory budget for the cached arrays.
+        disk_dir (str or None): Folder of the disk tier, or None to keep the cache in memory only.
+        hits (int): Lookups answered from memory.
+        disk_hits (int): Lookups answered from the disk tier.
+        misses (int): Lookups that had to be computed.
+        evictions (int): Entries dropped from memory to stay within max_bytes.
+    """
+
+    def __init__(self, max_bytes: int=INDICATOR_CACHE_MAX_BYTES, disk_dir=INDICATOR_CACHE_DIR):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.npz")
+
+    def _store_in_memory(self, key: str, columns: dict) -> None:
+        size = sum(values.nbytes for values in columns.values())
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (columns, size)
+        self.current_bytes += size
+
+        # Evict least recently used entries until the budget is met
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+    def get(self, key: str):
+        """
+        Look up a cached entry.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            dict or None: A dictionary of column name -> array (copies), or None on a miss.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            columns = self._entries[key][0]
+            return {column: values.copy() for column, values in columns.items()}
+
+        if self.disk_dir is not None and os.path.exists(self._disk_path(key)):
+            with np.load(self._disk_path(key)) as stored:
+                columns = {column: stored[column] for column in stored.files}
+            self._store_in_memory(key, columns)
+            self.disk_hits += 1
+            return {column: values.copy() for column, values in columns.items()}
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, columns: dict) -> None:
+        """
+        Store the columns of one entry in memory and, if enabled, on disk.
+
+        Args:
+            key (str): The cache key.
+            columns (dict): A dictionary of column name -> array.
+        """
+        columns = {column: np.array(values, dtype=float) for column, values in columns.items()}
+        self._store_in_memory(key, columns)
+
+        if self.disk_dir is not None:
+            # Write to a temporary file and rename, so a crash never leaves a partial entry
+            temp_path = self._disk_path(key) + ".tmp.npz"
+            np.savez(temp_path, **columns)
+            os.replace(temp_path, self._disk_path(key))
+
+    def clear(self) -> None:
+        """Drop all memory entries and reset the counters. The disk tier is kept."""
+        self._entries.clear()
+        self.current_bytes = 0
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: 'hits', 'disk_hits', 'misses', 'evictions', 'entries', 'bytes' and 'hit_rate'.
+        """
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+
+# Process wide cache used by apply_selected_technical_indicators
+INDICATOR_CACHE = IndicatorCache()
+
+
+def cached_compute_selected_indicators(df: pd.DataFrame, selected_indicators: list, cache: IndicatorCache=None) -> dict:
+    """
+    This function computes the columns of the selected indicators, reusing cached results.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing stock data with necessary columns.
+        selected_indicators (list): List of technical indicators to apply.
+        cache (IndicatorCache, optional): The cache to use. Defaults to the process wide INDICATOR_CACHE.
+
+    Returns:
+        dict: A dictionary mapping each output column name to its values, the same as compute_selected_indicators().
+
+    Notes:
+        - Each input column is hashed once per call. Indicators that miss are computed together in one plan,
+          so they still share intermediates.
+    """
+    if cache is None:
+        cache = INDICATOR_CACHE
+
+    fingerprints = {}
+    keys = {}
+    for indicator in selected_indicators:
+        needed = [node[1] for node in build_indicator_plan([indicator]) if node[0] == "input"]
+        for column in needed:
+            if column not in fingerprints and column in df.columns:
+                fingerprints[column] = array_fingerprint(input_array(df, column))
+        keys[indicator] = indicator_cache_key(indicator, {column: fingerprints.get(column) for column in needed})
+
+    cached = {indicator: cache.get(keys[indicator]) for indicator in selected_indicators}
+    missing = [indicator for indicator in selected_indicators if cached[indicator] is None]
+
+    if missing:
+        computed = compute_selected_indicators(df, missing)
+        for indicator in missing:
+            cached[indicator] = {column: computed[column] for column, _ in indicator_outputs(indicator)}
+            cache.put(keys[indicator], cached[indicator])
+
+    columns = {}
+    for indicator in selected_indicators:
+        columns.update(cached[indicator])
+    return columns
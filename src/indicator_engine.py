@@ -0,0 +1,833 @@
+"""
+indicator_engine.py
+
+Purpose:
+    This module contains the vectorized NumPy engine behind the technical indicator
+    functions in src/technical_indicators.py. Every function works on plain NumPy
+    arrays, so no per-row pandas indexing (.iloc) or Python list loops are needed.
+
+Functions:
+    - linear_recurrence(x: np.ndarray, decay, init=0.0) -> np.ndarray
+    - seeded_smoothing(values: np.ndarray, window: int, alpha: float) -> np.ndarray
+    - prefix_sum_array(values: np.ndarray) -> np.ndarray
+    - sma_from_prefix(prefix: np.ndarray, window: int) -> np.ndarray
+    - sma_array(values: np.ndarray, window: int) -> np.ndarray
+    - ema_array(values: np.ndarray, window: int) -> np.ndarray
+    - sma_windows_array(values: np.ndarray, windows: list) -> np.ndarray
+    - ema_windows_array(values: np.ndarray, windows: list) -> np.ndarray
+    - wilder_array(values: np.ndarray, window: int) -> np.ndarray
+    - gains_array(price_change: np.ndarray) -> np.ndarray
+    - losses_array(price_change: np.ndarray) -> np.ndarray
+    - rsi_from_averages(avg_gains: np.ndarray, avg_losses: np.ndarray) -> np.ndarray
+    - rsi_array(close: np.ndarray, window: int) -> np.ndarray
+    - signal_array(macd: np.ndarray, start: int, signal_period: int=9) -> np.ndarray
+    - macd_arrays(close: np.ndarray, short_period: int=12, long_period: int=26, signal_period: int=9) -> tuple
+    - typical_price_array(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray
+    - vwap_from_price_volume(price_volume: np.ndarray, volume: np.ndarray) -> np.ndarray
+    - vwap_array(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> np.ndarray
+    - rolling_max_array(values: np.ndarray, window: int) -> np.ndarray
+    - rolling_min_array(values: np.ndarray, window: int) -> np.ndarray
+    - donchian_arrays(high: np.ndarray, low: np.ndarray, window: int=20) -> tuple
+    - stochastic_from_extremes(highest: np.ndarray, lowest: np.ndarray, close: np.ndarray) -> np.ndarray
+    - williams_r_from_extremes(highest: np.ndarray, lowest: np.ndarray, close: np.ndarray) -> np.ndarray
+    - stochastic_signal_array(percent_k: np.ndarray, smooth_period: int=3) -> np.ndarray
+    - stochastic_arrays(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int=14, smooth_period: int=3) -> tuple
+    - williams_r_array(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int=14) -> np.ndarray
+    - period_keys(dates: np.ndarray, period: str) -> np.ndarray
+    - segment_starts(keys: np.ndarray) -> np.ndarray
+    - segmented_cumsum(values: np.ndarray, starts: np.ndarray) -> np.ndarray
+    - anchored_vwap_array(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, starts: np.ndarray) -> np.ndarray
+    - anchored_vwap_from_price_volume(price_volume: np.ndarray, volume: np.ndarray, starts: np.ndarray) -> np.ndarray
+    - rolling_vwap_from_price_volume(price_volume: np.ndarray, volume: np.ndarray, window: int) -> np.ndarray
+    - rolling_vwap_array(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, window: int) -> np.ndarray
+
+Notes:
+    - The time axis is always axis 0 and missing values are returned as NaN. A 2-D input
+      is treated as one independent series per column (dates x tickers).
+    - SMA uses a prefix sum, so every window average costs two lookups instead of a re-sum.
+    - EMA and Wilder smoothing are first order linear recurrences. They are solved in
+      fixed size blocks with a matrix product, so the Python level work is O(n / block).
+    - Rolling highs and lows (Donchian, Stochastic, Williams %R) use block prefix/suffix
+      scans, so they are O(n) for any window instead of O(n * window).
+    - Anchored VWAP restarts its sums at period boundaries found with np.diff on period keys,
+      using one cumsum over all rows (segmented_cumsum) instead of a groupby.
+    - Intermediate steps (prefix sums, gains/losses, typical price) are separate functions
+      so that src/indicator_planner.py can compute them once and share them.
+    - The functions reproduce the values of the original loop based implementations,
+      which can be checked with validation/validation.py against TA-Lib.
+"""
+
+
+import numpy as np
+
+
+# Number of rows solved together in one matrix product by linear_recurrence
+RECURRENCE_BLOCK_SIZE = 64
+
+# Number of windows computed together by the multi-window functions
+WINDOW_CHUNK_SIZE = 32
+
+# Calendar periods an anchored VWAP can reset on: day, week (from Monday) and month
+VWAP_ANCHOR_PERIODS = ("D", "W", "M")
+
+
+def linear_recurrence(x: np.ndarray, decay, init=0.0) -> np.ndarray:
+    """
+    This function solves the recurrence y[i] = decay * y[i-1] + x[i] along axis 0, with y[-1] = init.
+
+    Args:
+        x (np.ndarray): Input values. Axis 0 is time, any trailing axes are independent series.
+        decay (float or np.ndarray): Decay factor, either a scalar or one value per trailing series.
+        init (float or np.ndarray, optional): Value of y before the first row. Defaults to 0.0.
+
+    Returns:
+        np.ndarray: Array of the same shape as x with the recurrence values.
+
+    Notes:
+        - The input is split into blocks of RECURRENCE_BLOCK_SIZE rows. Inside a block the
+          response to x is a lower triangular matrix of decay powers, applied to all blocks at once.
+        - The value carried from one block into the next is itself a recurrence with decay ** block,
+          which is solved recursively, so the function never loops row by row.
+        - All multipliers are powers of decay, so for 0 <= decay <= 1 the method is numerically stable.
+        - x must not contain NaN values, because a NaN would spread through its whole block.
+    """
+    x = np.asarray(x, dtype=float)
+    shape = x.shape
+    n = shape[0]
+
+    if n == 0:
+        return x.copy()
+
+    # Work on a (rows, series) matrix and restore the original shape at the end
+    series = x.reshape(n, -1)
+    num_series = series.shape[1]
+    init = np.broadcast_to(np.asarray(init, dtype=float), shape[1:]).reshape(num_series)
+
+    decay = np.asarray(decay, dtype=float)
+    scalar_decay = decay.ndim == 0
+    if not scalar_decay:
+        decay = np.broadcast_to(decay, shape[1:]).reshape(num_series)
+
+    block = min(RECURRENCE_BLOCK_SIZE, n)
+    num_blocks = -(-n // block)
+    padded = np.zeros((num_blocks * block, num_series))
+    padded[:n] = series
+    blocks = padded.reshape(num_blocks, block, num_series)
+
+    # powers[j] = decay ** j for j = 0..block, one column per series (or a single shared column)
+    powers = decay ** np.arange(block + 1)[:, None]
+
+    # Lower triangular response matrix: response[j, m] = decay ** (j - m) for m <= j
+    lag = np.arange(block)[:, None] - np.arange(block)[None, :]
+    lower = (lag >= 0)[:, :, None]
+    response = np.where(lower, powers[np.clip(lag, 0, None)], 0.0)
+
+    # Within-block values assuming nothing is carried in from the previous block
+    if scalar_decay:
+        local = np.matmul(response[:, :, 0], blocks)
+    else:
+        # One batched matrix product per series: (series, block, block) @ (series, block, num_blocks)
+        local = np.matmul(response.transpose(2, 0, 1), blocks.transpose(2, 1, 0)).transpose(2, 1, 0)
+
+    # Value carried into each block from the end of the previous block
+    if num_blocks == 1:
+        carry_in = init[None, :]
+    else:
+        block_decay = powers[block, 0] if scalar_decay else powers[block]
+        block_ends = linear_recurrence(local[:, -1], block_decay, init)
+        carry_in = np.concatenate([init[None, :], block_ends[:-1]], axis=0)
+
+    result = local + powers[None, 1:, :] * carry_in[:, None, :]
+    return result.reshape(num_blocks * block, num_series)[:n].reshape(shape)
+
+
+def seeded_smoothing(values: np.ndarray, window: int, alpha: float) -> np.ndarray:
+    """
+    This function applies exponential smoothing seeded with the simple average of the first window values.
+
+    Args:
+        values (np.ndarray): 1-D array of input values, or a 2-D array with one series per column.
+        window (int): Number of values averaged for the seed.
+        alpha (float): Smoothing factor. Each step computes (1 - alpha) * previous + alpha * value.
+
+    Returns:
+        np.ndarray: Array of smoothed values. The first (window - 1) rows are NaN.
+
+    Notes:
+        - The seed is placed at index (window - 1), the same as the loop implementations.
+        - The seed uses a sequential sum (cumsum), which matches Python's built-in sum().
+        - A NaN input makes that entry and every later entry NaN, matching the original
+          behaviour where NaN propagated through the smoothing loop.
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.shape[0]
+    smoothed = np.full(values.shape, np.nan)
+
+    if window < 1 or n < window:
+        return smoothed
+
+    seed = np.cumsum(values[:window], axis=0)[-1] / window
+    smoothed[window - 1] = seed
+
+    # NaN propagates forward, so every row from the first NaN onwards is poisoned
+    remaining = values[window:]
+    poisoned = np.logical_or.accumulate(np.isnan(remaining), axis=0) | np.isnan(seed)
+
+    body = linear_recurrence(alpha * np.where(poisoned, 0.0, remaining), 1.0 - alpha, np.nan_to_num(seed))
+    body[poisoned] = np.nan
+    smoothed[window:] = body
+    return smoothed
+
+
+def prefix_sum_array(values: np.ndarray) -> np.ndarray:
+    """
+    This function returns the prefix sums of an array, with a leading row of zeros.
+
+    Args:
+        values (np.ndarray): 1-D array of prices, or a 2-D array with one series per column.
+
+    Returns:
+        np.ndarray: Array with one more row than values, where row i is the sum of the first i values.
+
+    Notes:
+        - NaN prices count as 0, the same as pandas' Series.sum() used by the original SMA.
+        - One prefix sum can serve any number of SMA windows (see sma_from_prefix).
+    """
+    values = np.asarray(values, dtype=float)
+    prefix = np.zeros((values.shape[0] + 1,) + values.shape[1:])
+    np.cumsum(np.nan_to_num(values, nan=0.0), axis=0, out=prefix[1:])
+    return prefix
+
+
+def sma_from_prefix(prefix: np.ndarray, window: int) -> np.ndarray:
+    """
+    This function calculates the Simple Moving Average (SMA) from a prefix sum array.
+
+    Args:
+        prefix (np.ndarray): Output of prefix_sum_array().
+        window (int): The window size for calculating the SMA.
+
+    Returns:
+        np.ndarray: Array of SMA values. The first (window - 1) rows are NaN.
+    """
+    n = prefix.shape[0] - 1
+    averages = np.full((n,) + prefix.shape[1:], np.nan)
+
+    if window < 1 or n < window:
+        return averages
+
+    averages[window - 1:] = (prefix[window:] - prefix[:-window]) / window
+    return averages
+
+
+def sma_array(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    This function calculates the Simple Moving Average (SMA) of an array using a prefix sum.
+
+    Args:
+        values (np.ndarray): 1-D array of prices, or a 2-D array with one series per column.
+        window (int): The window size for calculating the SMA.
+
+    Returns:
+        np.ndarray: Array of SMA values. The first (window - 1) rows are NaN.
+
+    Notes:
+        - NaN prices count as 0 in the window sum, the same as pandas' Series.sum() used
+          by the original implementation.
+        - Each window sum is the difference of two prefix sums, so the whole array is O(n).
+    """
+    return sma_from_prefix(prefix_sum_array(values), window)
+
+
+def ema_array(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    This function calculates the Exponential Moving Average (EMA) of an array.
+
+    Args:
+        values (np.ndarray): 1-D array of prices, or a 2-D array with one series per column.
+        window (int): The window size for calculating the EMA.
+
+    Returns:
+        np.ndarray: Array of EMA values. The first (window - 1) rows are NaN.
+
+    Notes:
+        - The first EMA is the average of the first 'window' prices, then k = 2 / (window + 1).
+    """
+    return seeded_smoothing(values, window, 2.0 / (window + 1))
+
+
+def sma_windows_array(values: np.ndarray, windows: list) -> np.ndarray:
+    """
+    This function calculates the Simple Moving Average (SMA) of one price series for many windows at once.
+
+    Args:
+        values (np.ndarray): 1-D array of prices.
+        windows (list): The window sizes, e.g. range(5, 251).
+
+    Returns:
+        np.ndarray: Array of shape (len(values), len(windows)). Column j holds the SMA for windows[j].
+
+    Notes:
+        - A single prefix sum is shared by every window; each window is then one subtraction of shifted slices.
+        - Column j matches sma_array(values, windows[j]).
+    """
+    values = np.asarray(values, dtype=float)
+    windows = np.asarray(windows, dtype=int)
+    n = values.shape[0]
+
+    prefix = prefix_sum_array(values)
+    averages = np.full((n, len(windows)), np.nan)
+    for j, window in enumerate(windows):
+        if 1 <= window <= n:
+            averages[window - 1:, j] = (prefix[window:] - prefix[:-window]) / window
+    return averages
+
+
+def ema_windows_array(values: np.ndarray, windows: list) -> np.ndarray:
+    """
+    This function calculates the Exponential Moving Average (EMA) of one price series for many windows at once.
+
+    Args:
+        values (np.ndarray): 1-D array of prices.
+        windows (list): The window sizes, e.g. range(5, 251).
+
+    Returns:
+        np.ndarray: Array of shape (len(values), len(windows)). Column j holds the EMA for windows[j].
+
+    Notes:
+        - All windows run as one batched recurrence (linear_recurrence with one decay per column).
+        - Each column's seed (the average of its first 'window' prices) is injected as the input at row window - 1,
+          so every column starts at its own row inside the same recurrence.
+        - Column j matches ema_array(values, windows[j]), including NaN propagation.
+    """
+    values = np.asarray(values, dtype=float)
+    windows = np.asarray(windows, dtype=int)
+    n = values.shape[0]
+    num_windows = len(windows)
+
+    # Windows that fit in the data are moved to the front, so each chunk writes a contiguous slice
+    order = np.argsort(~((windows >= 1) & (windows <= n)), kind="stable")
+    w = windows[order]
+    usable = int(np.count_nonzero((w >= 1) & (w <= n)))
+
+    w = w[:usable]
+    alpha = 2.0 / (w + 1)
+
+    # Sequential sums give the same seeds as Python's built-in sum()
+    seeds = np.cumsum(values)[w - 1] / w
+
+    # NaN propagates forward, so only the rows before the first NaN carry values
+    nan_rows = np.flatnonzero(np.isnan(values))
+    first_nan = nan_rows[0] if len(nan_rows) else n
+
+    clean = np.nan_to_num(values, nan=0.0)
+    smoothed = np.full((n, num_windows), np.nan)
+
+    # Windows are processed in chunks so the temporaries stay small on long histories
+    for first in range(0, usable, WINDOW_CHUNK_SIZE):
+        chunk = slice(first, min(first + WINDOW_CHUNK_SIZE, usable))
+        inputs = clean[:, None] * alpha[None, chunk]
+        for j, window in enumerate(w[chunk]):
+            # Rows before the seed carry nothing, the seed row carries the seed itself
+            inputs[:window, j] = 0.0
+            inputs[window - 1, j] = seeds[first + j] if window - 1 < first_nan else 0.0
+
+        result = linear_recurrence(inputs, 1.0 - alpha[chunk])
+        for j, window in enumerate(w[chunk]):
+            result[:window - 1, j] = np.nan
+            result[max(first_nan, window - 1):, j] = np.nan
+        smoothed[:, chunk] = result
+
+    # Put the columns back in the order of the requested windows
+    if not np.array_equal(order, np.arange(num_windows)):
+        smoothed[:, order] = smoothed.copy()
+    return smoothed
+
+
+def wilder_array(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    This function applies Wilder's smoothing, avg[i] = (avg[i-1] * (window - 1) + value[i]) / window.
+
+    Args:
+        values (np.ndarray): 1-D array of values (e.g. gains or losses), or a 2-D array with one series per column.
+        window (int): The smoothing window.
+
+    Returns:
+        np.ndarray: Array of smoothed values. The first (window - 1) rows are NaN.
+    """
+    return seeded_smoothing(values, window, 1.0 / window)
+
+
+def gains_array(price_change: np.ndarray) -> np.ndarray:
+    """Positive price changes, 0 elsewhere."""
+    return np.where(price_change > 0, price_change, 0.0)
+
+
+def losses_array(price_change: np.ndarray) -> np.ndarray:
+    """Size of non-positive price changes, 0 for gains. A NaN change gives a NaN loss."""
+    return np.where(price_change > 0, 0.0, -price_change)
+
+
+def rsi_from_averages(avg_gains: np.ndarray, avg_losses: np.ndarray) -> np.ndarray:
+    """
+    This function turns Wilder-smoothed average gains and losses into RSI values.
+
+    Args:
+        avg_gains (np.ndarray): Smoothed gains, one row per price change.
+        avg_losses (np.ndarray): Smoothed losses, one row per price change.
+
+    Returns:
+        np.ndarray: RSI values with one more row than the inputs (the first row has no price change and is NaN).
+    """
+    rsi = np.full((avg_gains.shape[0] + 1,) + avg_gains.shape[1:], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gains / avg_losses
+        rsi[1:] = np.where(avg_losses == 0, 100.0, 100 - (100 / (1 + rs)))
+    return rsi
+
+
+def rsi_array(close: np.ndarray, window: int) -> np.ndarray:
+    """
+    This function calculates the Relative Strength Index (RSI) of an array of closing prices.
+
+    Args:
+        close (np.ndarray): 1-D array of closing prices, or a 2-D array with one series per column.
+        window (int): The window size for calculating the RSI.
+
+    Returns:
+        np.ndarray: Array of RSI values. The first (window) rows are NaN.
+
+    Notes:
+        - Gains and losses are split from the price changes with np.where, then smoothed with wilder_array.
+        - When the average loss is 0 the RSI is 100, the same as treating RS as infinite.
+        - A NaN price change counts as a NaN loss, so the RSI is NaN from that point on.
+    """
+    close = np.asarray(close, dtype=float)
+
+    if window < 1 or close.shape[0] < window + 1:
+        return np.full(close.shape, np.nan)
+
+    price_change = np.diff(close, axis=0)
+    avg_gains = wilder_array(gains_array(price_change), window)
+    avg_losses = wilder_array(losses_array(price_change), window)
+    return rsi_from_averages(avg_gains, avg_losses)
+
+
+def signal_array(macd: np.ndarray, start: int, signal_period: int=9) -> np.ndarray:
+    """
+    This function calculates the MACD signal line.
+
+    Args:
+        macd (np.ndarray): MACD line values.
+        start (int): Row of the first MACD value, i.e. max(short_period, long_period) - 1.
+        signal_period (int, optional): The signal line EMA period. Defaults to 9.
+
+    Returns:
+        np.ndarray: Array of signal line values.
+
+    Notes:
+        - Follows pandas' ewm(span=signal_period, adjust=False, min_periods=signal_period), the same as
+          calculate_MACD: it starts at the first MACD value and is reported after signal_period values.
+    """
+    signal = np.full(macd.shape, np.nan)
+
+    if signal_period >= 1 and macd.shape[0] > start:
+        alpha = 2.0 / (signal_period + 1)
+        first = macd[start]
+        signal[start] = first
+        signal[start + 1:] = linear_recurrence(alpha * np.nan_to_num(macd[start + 1:]), 1.0 - alpha, np.nan_to_num(first))
+        signal[np.isnan(macd)] = np.nan
+        signal[:start + signal_period - 1] = np.nan
+
+    return signal
+
+
+def macd_arrays(close: np.ndarray, short_period: int=12, long_period: int=26, signal_period: int=9) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    This function calculates the MACD line, signal line and histogram of an array of closing prices.
+
+    Args:
+        close (np.ndarray): 1-D array of closing prices, or a 2-D array with one series per column.
+        short_period (int, optional): The short-term EMA period. Defaults to 12.
+        long_period (int, optional): The long-term EMA period. Defaults to 26.
+        signal_period (int, optional): The signal line EMA period. Defaults to 9.
+
+    Returns:
+        tuple: A tuple containing the MACD line, the signal line and the MACD histogram arrays.
+
+    Notes:
+        - Intended for gap-free input. A NaN price makes the rest of that series NaN.
+    """
+    close = np.asarray(close, dtype=float)
+    macd = ema_array(close, short_period) - ema_array(close, long_period)
+    signal = signal_array(macd, max(short_period, long_period) - 1, signal_period)
+    return macd, signal, macd - signal
+
+
+def typical_price_array(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Typical price (High + Low + Close) / 3, the price used by VWAP."""
+    return (np.asarray(high, dtype=float) + np.asarray(low, dtype=float) + np.asarray(close, dtype=float)) / 3
+
+
+def vwap_from_price_volume(price_volume: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """
+    This function calculates the cumulative VWAP from price x volume and volume arrays.
+
+    Args:
+        price_volume (np.ndarray): Typical price multiplied by volume.
+        volume (np.ndarray): Volumes with the same shape.
+
+    Returns:
+        np.ndarray: Array of VWAP values.
+
+    Notes:
+        - NaN rows are skipped in the cumulative sums and reported as NaN, like pandas' cumsum().
+    """
+    total_vol = np.cumsum(np.nan_to_num(np.asarray(volume, dtype=float), nan=0.0), axis=0)
+    total_vol_price = np.cumsum(np.nan_to_num(price_volume, nan=0.0), axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = total_vol_price / total_vol
+    vwap[np.isnan(price_volume)] = np.nan
+    return vwap
+
+
+def vwap_array(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """
+    This function calculates the cumulative Volume Weighted Average Price (VWAP) from the first row.
+
+    Args:
+        high (np.ndarray): High prices (1-D, or 2-D with one series per column).
+        low (np.ndarray): Low prices with the same shape as high.
+        close (np.ndarray): Closing prices with the same shape as high.
+        volume (np.ndarray): Volumes with the same shape as high.
+
+    Returns:
+        np.ndarray: Array of VWAP values.
+
+    Notes:
+        - Typical price is (High + Low + Close) / 3, the same as calculate_VWAP.
+    """
+    volume = np.asarray(volume, dtype=float)
+    return vwap_from_price_volume(typical_price_array(high, low, close) * volume, volume)
+
+
+def _rolling_extreme(values: np.ndarray, window: int, ufunc, fill: float) -> np.ndarray:
+    """
+    Rolling maximum or minimum along axis 0 with the van Herk / Gil-Werman method.
+
+    The rows are split into blocks of 'window' rows. A window ending at row i is covered exactly by
+    the suffix scan of the block where it starts and the prefix scan of the block where it ends,
+    so every output is one comparison of two precomputed scans: O(n) for any window size.
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.shape[0]
+    result = np.full(values.shape, np.nan)
+    if window < 1 or window > n:
+        return result
+
+    # Pad to whole blocks with a value that never wins the comparison
+    series = values.reshape(n, -1)
+    num_blocks = -(-n // window)
+    padded = np.full((num_blocks * window, series.shape[1]), fill)
+    padded[:n] = series
+    blocks = padded.reshape(num_blocks, window, -1)
+
+    # NaN is carried along by the scans, so any window containing a NaN gives NaN (like pandas' rolling)
+    prefix = ufunc.accumulate(blocks, axis=1).reshape(-1, series.shape[1])
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1, series.shape[1])
+
+    extreme = ufunc(suffix[:n - window + 1], prefix[window - 1:n])
+    result.reshape(n, -1)[window - 1:] = extreme
+    return result
+
+
+def rolling_max_array(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    This function calculates the highest value over the last 'window' rows.
+
+    Args:
+        values (np.ndarray): 1-D array of values, or a 2-D array with one series per column.
+        window (int): The window size.
+
+    Returns:
+        np.ndarray: Array of rolling maxima. The first window - 1 rows are NaN.
+
+    Notes:
+        - Runs in O(n) regardless of the window size, the vectorized equivalent of a monotonic deque.
+        - A window containing a NaN gives NaN, the same as pandas' rolling(window).max().
+    """
+    return _rolling_extreme(values, window, np.maximum, -np.inf)
+
+
+def rolling_min_array(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    This function calculates the lowest value over the last 'window' rows.
+
+    Args:
+        values (np.ndarray): 1-D array of values, or a 2-D array with one series per column.
+        window (int): The window size.
+
+    Returns:
+        np.ndarray: Array of rolling minima. The first window - 1 rows are NaN.
+
+    Notes:
+        - Runs in O(n) regardless of the window size, the vectorized equivalent of a monotonic deque.
+        - A window containing a NaN gives NaN, the same as pandas' rolling(window).min().
+    """
+    return _rolling_extreme(values, window, np.minimum, np.inf)
+
+
+def donchian_arrays(high: np.ndarray, low: np.ndarray, window: int=20) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    This function calculates the Donchian channel.
+
+    Args:
+        high (np.ndarray): High prices (1-D, or 2-D with one series per column).
+        low (np.ndarray): Low prices with the same shape as high.
+        window (int, optional): The channel length. Defaults to 20.
+
+    Returns:
+        tuple: A tuple containing the upper band (highest high), lower band (lowest low) and middle line arrays.
+    """
+    upper = rolling_max_array(high, window)
+    lower = rolling_min_array(low, window)
+    return upper, lower, (upper + lower) / 2
+
+
+def stochastic_from_extremes(highest: np.ndarray, lowest: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    This function calculates the Stochastic %K line, 100 * (Close - lowest low) / (highest high - lowest low).
+
+    Args:
+        highest (np.ndarray): Rolling highest high.
+        lowest (np.ndarray): Rolling lowest low.
+        close (np.ndarray): Closing prices.
+
+    Returns:
+        np.ndarray: Array of %K values between 0 and 100.
+
+    Notes:
+        - A flat window (highest == lowest) has no range to compare against and gives NaN.
+    """
+    price_range = highest - lowest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(price_range > 0, 100 * (np.asarray(close, dtype=float) - lowest) / price_range, np.nan)
+
+
+def williams_r_from_extremes(highest: np.ndarray, lowest: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    This function calculates Williams %R, -100 * (highest high - Close) / (highest high - lowest low).
+
+    Args:
+        highest (np.ndarray): Rolling highest high.
+        lowest (np.ndarray): Rolling lowest low.
+        close (np.ndarray): Closing prices.
+
+    Returns:
+        np.ndarray: Array of %R values between -100 and 0.
+
+    Notes:
+        - A flat window (highest == lowest) gives NaN, the same as stochastic_from_extremes.
+    """
+    price_range = highest - lowest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(price_range > 0, -100 * (highest - np.asarray(close, dtype=float)) / price_range, np.nan)
+
+
+def stochastic_signal_array(percent_k: np.ndarray, smooth_period: int=3) -> np.ndarray:
+    """
+    This function calculates the Stochastic %D line, the simple moving average of %K.
+
+    Args:
+        percent_k (np.ndarray): %K values.
+        smooth_period (int, optional): The number of %K values averaged. Defaults to 3.
+
+    Returns:
+        np.ndarray: Array of %D values.
+
+    Notes:
+        - Unlike sma_array (which counts NaN as 0), any NaN in the window gives NaN, so the warm-up rows
+          and flat windows of %K carry over to %D.
+    """
+    percent_k = np.asarray(percent_k, dtype=float)
+    percent_d = sma_array(np.nan_to_num(percent_k, nan=0.0), smooth_period)
+    percent_d[rolling_max_array(np.isnan(percent_k).astype(float), smooth_period) > 0] = np.nan
+    return percent_d
+
+
+def stochastic_arrays(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int=14, smooth_period: int=3) -> tuple[np.ndarray, np.ndarray]:
+    """
+    This function calculates the Stochastic Oscillator %K and %D lines.
+
+    Args:
+        high (np.ndarray): High prices (1-D, or 2-D with one series per column).
+        low (np.ndarray): Low prices with the same shape as high.
+        close (np.ndarray): Closing prices with the same shape as high.
+        window (int, optional): The look-back period of %K. Defaults to 14.
+        smooth_period (int, optional): The %D averaging period. Defaults to 3.
+
+    Returns:
+        tuple: A tuple containing the %K and %D arrays.
+    """
+    percent_k = stochastic_from_extremes(rolling_max_array(high, window), rolling_min_array(low, window), close)
+    return percent_k, stochastic_signal_array(percent_k, smooth_period)
+
+
+def williams_r_array(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int=14) -> np.ndarray:
+    """
+    This function calculates Williams %R.
+
+    Args:
+        high (np.ndarray): High prices (1-D, or 2-D with one series per column).
+        low (np.ndarray): Low prices with the same shape as high.
+        close (np.ndarray): Closing prices with the same shape as high.
+        window (int, optional): The look-back period. Defaults to 14.
+
+    Returns:
+        np.ndarray: Array of %R values between -100 and 0.
+    """
+    return williams_r_from_extremes(rolling_max_array(high, window), rolling_min_array(low, window), close)
+
+
+def period_keys(dates: np.ndarray, period: str) -> np.ndarray:
+    """
+    This function maps each timestamp to an integer key of its calendar period.
+
+    Args:
+        dates (np.ndarray): Array of datetime64 values.
+        period (str): 'D' (day), 'W' (week starting on Monday) or 'M' (month).
+
+    Returns:
+        np.ndarray: Integer array, equal for rows in the same period and increasing with time.
+
+    Raises:
+        ValueError: If the period is not one of VWAP_ANCHOR_PERIODS.
+    """
+    days = np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+    if period == "D":
+        return days
+    if period == "W":
+        # 1970-01-01 was a Thursday, shifting by 3 days makes every key start on a Monday
+        return (days + 3) // 7
+    if period == "M":
+        return np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[M]").astype(np.int64)
+    raise ValueError(f"Unknown VWAP anchor period '{period}', expected one of {VWAP_ANCHOR_PERIODS}")
+
+
+def segment_starts(keys: np.ndarray) -> np.ndarray:
+    """
+    This function marks the first row of every run of equal keys.
+
+    Args:
+        keys (np.ndarray): Group keys in time order along axis 0, e.g. the output of period_keys().
+            A 2-D array gives separate segments per column.
+
+    Returns:
+        np.ndarray: Boolean array, True where a new segment starts (always True on the first row).
+    """
+    keys = np.asarray(keys)
+    starts = np.ones(keys.shape, dtype=bool)
+    starts[1:] = np.diff(keys, axis=0) != 0
+    return starts
+
+
+def segmented_cumsum(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    This function calculates a cumulative sum along axis 0 that restarts at every segment start.
+
+    Args:
+        values (np.ndarray): 1-D array of values, or a 2-D array with one series per column.
+        starts (np.ndarray): Boolean array, True on the first row of each segment. Either 1-D (shared by
+            every column) or the same shape as values.
+
+    Returns:
+        np.ndarray: Array of the same shape with the running sum inside each segment.
+
+    Notes:
+        - One cumsum over all rows, minus the total reached just before the segment started.
+          The offset of each row is found by carrying the segment start index forward with
+          np.maximum.accumulate, so there is no loop over segments.
+        - NaN values count as 0.
+    """
+    values = np.nan_to_num(np.asarray(values, dtype=float), nan=0.0)
+    n = values.shape[0]
+    if n == 0:
+        return values
+
+    totals = np.cumsum(values, axis=0)
+    before = np.concatenate([np.zeros((1,) + values.shape[1:]), totals[:-1]], axis=0)
+
+    # Index of the first row of the segment each row belongs to
+    starts = np.asarray(starts, dtype=bool)
+    starts = starts.reshape(starts.shape + (1,) * (values.ndim - starts.ndim))
+    rows = np.arange(n).reshape((n,) + (1,) * (values.ndim - 1))
+    segment_first = np.maximum.accumulate(np.where(starts, rows, 0), axis=0)
+    return totals - np.take_along_axis(before, np.broadcast_to(segment_first, values.shape), axis=0)
+
+
+def anchored_vwap_from_price_volume(price_volume: np.ndarray, volume: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Anchored VWAP from price x volume and volume arrays, see anchored_vwap_array."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = segmented_cumsum(price_volume, starts) / segmented_cumsum(volume, starts)
+    vwap[np.isnan(price_volume)] = np.nan
+    return vwap
+
+
+def anchored_vwap_array(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    This function calculates the VWAP accumulated from the start of each segment (anchored VWAP).
+
+    Args:
+        high (np.ndarray): High prices (1-D, or 2-D with one series per column).
+        low (np.ndarray): Low prices with the same shape as high.
+        close (np.ndarray): Closing prices with the same shape as high.
+        volume (np.ndarray): Volumes with the same shape as high.
+        starts (np.ndarray): Boolean array, True on the rows where the VWAP resets,
+            e.g. segment_starts(period_keys(dates, 'M')). 1-D, or the same shape as high.
+
+    Returns:
+        np.ndarray: Array of anchored VWAP values. Rows with a NaN price or volume are NaN.
+    """
+    volume = np.asarray(volume, dtype=float)
+    price_volume = typical_price_array(high, low, close) * volume
+    return anchored_vwap_from_price_volume(price_volume, volume, starts)
+
+
+def rolling_vwap_from_price_volume(price_volume: np.ndarray, volume: np.ndarray, window: int) -> np.ndarray:
+    """Rolling VWAP from price x volume and volume arrays, see rolling_vwap_array."""
+    vwap = np.full(np.shape(price_volume), np.nan)
+    n = vwap.shape[0]
+    if window < 1 or window > n:
+        return vwap
+
+    # Window sums are differences of two prefix sums
+    price_volume_prefix = prefix_sum_array(price_volume)
+    volume_prefix = prefix_sum_array(volume)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap[window - 1:] = ((price_volume_prefix[window:] - price_volume_prefix[:-window])
+                             / (volume_prefix[window:] - volume_prefix[:-window]))
+    vwap[np.isnan(price_volume)] = np.nan
+    return vwap
+
+
+def rolling_vwap_array(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, window: int) -> np.ndarray:
+    """
+    This function calculates the VWAP over the last 'window' rows.
+
+    Args:
+        high (np.ndarray): High prices (1-D, or 2-D with one series per column).
+        low (np.ndarray): Low prices with the same shape as high.
+        close (np.ndarray): Closing prices with the same shape as high.
+        volume (np.ndarray): Volumes with the same shape as high.
+        window (int): The number of rows in each window.
+
+    Returns:
+        np.ndarray: Array of rolling VWAP values. The first window - 1 rows are NaN.
+
+    Notes:
+        - Window sums of price x volume and of volume come from prefix sums, so each row is O(1).
+        - NaN values count as 0 in the window sums, the same as calculate_SMA.
+    """
+    volume = np.asarray(volume, dtype=float)
+    return rolling_vwap_from_price_volume(typical_price_array(high, low, close) * volume, volume, window)
@@ -0,0 +1,285 @@
+"""
+indicator_planner.py
+
+Purpose:
+    This module plans the computation of several technical indicators together. The
+    selected indicators are expanded into a dependency graph (DAG) of intermediate
+    series, and every intermediate is computed exactly once in topological order.
+
+Functions:
+    - indicator_outputs(indicator: str) -> list
+    - build_indicator_plan(selected_indicators: list) -> list
+    - execute_plan(plan: list, inputs: dict) -> dict
+    - input_array(df: pd.DataFrame, column: str) -> np.ndarray
+    - compute_selected_indicators(df: pd.DataFrame, selected_indicators: list) -> dict
+
+Notes:
+    - Shared intermediates include the EMAs (EMA12/EMA26 and the MACD legs), the price
+      differences, the gains/losses used by RSI, the prefix sum used by every SMA window
+      and the typical price used by VWAP. Stochastic and Williams %R with the same window share
+      the rolling highest high and lowest low.
+    - A node is a tuple: the node kind followed by its parameters, e.g. ("ema", 12).
+      Input columns are ("input", "Close") and so on.
+    - The indicators and their parameters are read from the TECHNICAL_INDICATORS dictionary in
+      src/technical_indicators.py, FUNCTION_OUTPUTS only maps each indicator function to its nodes.
+    - The values are computed by src/indicator_engine.py, so they are the same as the
+      single indicator functions in src/technical_indicators.py.
+"""
+
+
+from graphlib import TopologicalSorter
+import numpy as np
+import pandas as pd
+from src.config import *
+from src.indicator_engine import (
+    prefix_sum_array, sma_from_prefix, ema_array, wilder_array, gains_array, losses_array,
+    rsi_from_averages, signal_array, typical_price_array, vwap_from_price_volume,
+    rolling_max_array, rolling_min_array, stochastic_from_extremes, stochastic_signal_array, williams_r_from_extremes,
+    period_keys, segment_starts, anchored_vwap_from_price_volume, rolling_vwap_from_price_volume,
+)
+
+
+"""
+    NODE_DEPENDENCIES maps a node kind to a function returning the nodes it depends on.
+    NODE_FUNCTIONS maps a node kind to the function computing it. The function is called with the values
+    of the dependencies first, followed by the node parameters.
+"""
+
+NODE_DEPENDENCIES = {
+    "input": lambda column: (),
+    "prefix_sum": lambda: (("input", "Close"),),
+    "sma": lambda window: (("prefix_sum",),),
+    "ema": lambda window: (("input", "Close"),),
+    "price_change": lambda: (("input", "Close"),),
+    "gains": lambda: (("price_change",),),
+    "losses": lambda: (("price_change",),),
+    "avg_gain": lambda window: (("gains",),),
+    "avg_loss": lambda window: (("losses",),),
+    "rsi": lambda window: (("avg_gain", window), ("avg_loss", window), ("input", "Close")),
+    "macd": lambda short, long: (("ema", short), ("ema", long)),
+    "signal": lambda short, long, period: (("macd", short, long),),
+    "histogram": lambda short, long, period: (("macd", short, long), ("signal", short, long, period)),
+    "typical_price": lambda: (("input", "High"), ("input", "Low"), ("input", "Close")),
+    "price_volume": lambda: (("typical_price",), ("input", "Volume")),
+    "vwap": lambda: (("price_volume",), ("input", "Volume")),
+    "rolling_max": lambda window: (("input", "High"),),
+    "rolling_min": lambda window: (("input", "Low"),),
+    "donchian_middle": lambda window: (("rolling_max", window), ("rolling_min", window)),
+    "stochastic_k": lambda window: (("rolling_max", window), ("rolling_min", window), ("input", "Close")),
+    "stochastic_d": lambda window, period: (("stochastic_k", window),),
+    "williams_r": lambda window: (("rolling_max", window), ("rolling_min", window), ("input", "Close")),
+    "period_starts": lambda period: (("input", "Date"),),
+    "anchored_vwap": lambda period: (("price_volume",), ("input", "Volume"), ("period_starts", period)),
+    "rolling_vwap": lambda window: (("price_volume",), ("input", "Volume")),
+}
+
+NODE_FUNCTIONS = {
+    "prefix_sum": prefix_sum_array,
+    "sma": sma_from_prefix,
+    "ema": ema_array,
+    "price_change": lambda close: np.diff(close, axis=0),
+    "gains": gains_array,
+    "losses": losses_array,
+    "avg_gain": wilder_array,
+    "avg_loss": wilder_array,
+    # The first row has no price change; slicing keeps an empty input empty
+    "rsi": lambda avg_gains, avg_losses, close, window: rsi_from_averages(avg_gains, avg_losses)[:close.shape[0]],
+    "macd": lambda short_ema, long_ema, short, long: short_ema - long_ema,
+    "signal": lambda macd, short, long, period: signal_array(macd, max(short, long) - 1, period),
+    "histogram": lambda macd, signal, short, long, period: macd - signal,
+    "typical_price": typical_price_array,
+    "price_volume": lambda typical_price, volume: typical_price * volume,
+    "vwap": vwap_from_price_volume,
+    "rolling_max": rolling_max_array,
+    "rolling_min": rolling_min_array,
+    "donchian_middle": lambda highest, lowest, window: (highest + lowest) / 2,
+    "stochastic_k": lambda highest, lowest, close, window: stochastic_from_extremes(highest, lowest, close),
+    "stochastic_d": lambda percent_k, window, period: stochastic_signal_array(percent_k, period),
+    "williams_r": lambda highest, lowest, close, window: williams_r_from_extremes(highest, lowest, close),
+    "period_starts": lambda dates, period: segment_starts(period_keys(dates, period)),
+    "anchored_vwap": lambda price_volume, volume, starts, period: anchored_vwap_from_price_volume(price_volume, volume, starts),
+    "rolling_vwap": rolling_vwap_from_price_volume,
+}
+
+
+def _price_column(column: str) -> str:
+    # The nodes read the Close column, other price columns are not planned
+    if column != "Close":
+        raise ValueError(f"The indicator planner only computes indicators of 'Close', not '{column}'")
+    return column
+
+
+def _ema_outputs(window: int, column: str="Close", ema_col: str=None) -> list:
+    _price_column(column)
+    return [(ema_col or f"EMA_{window}", ("ema", window))]
+
+
+def _macd_outputs(short_period: int=12, long_period: int=26, signal_period: int=9, column: str="Close") -> list:
+    _price_column(column)
+    # calculate_MACD also adds the two EMA legs as columns
+    return [
+        (f"EMA_{short_period}", ("ema", short_period)),
+        (f"EMA_{long_period}", ("ema", long_period)),
+        ("MACD", ("macd", short_period, long_period)),
+        ("Signal_Line", ("signal", short_period, long_period, signal_period)),
+        ("MACD_Histogram", ("histogram", short_period, long_period, signal_period)),
+    ]
+
+
+"""
+    FUNCTION_OUTPUTS maps each indicator function of src/technical_indicators.py (by name) to a function taking the
+    same parameters and returning the (column name, node) pairs the indicator function adds to the DataFrame.
+    The indicators themselves and their parameters come from the TECHNICAL_INDICATORS dictionary, see indicator_outputs().
+"""
+
+FUNCTION_OUTPUTS = {
+    "calculate_SMA": lambda window: [(f"SMA_{window}", ("sma", window))],
+    "calculate_RSI": lambda window: [("RSI", ("rsi", window))],
+    "calculate_EMA": _ema_outputs,
+    "calculate_MACD": _macd_outputs,
+    "calculate_VWAP": lambda: [("VWAP", ("vwap",))],
+    "calculate_Donchian": lambda window=20: [
+        ("Donchian_Upper", ("rolling_max", window)),
+        ("Donchian_Lower", ("rolling_min", window)),
+        ("Donchian_Middle", ("donchian_middle", window)),
+    ],
+    "calculate_Stochastic": lambda window=14, smooth_period=3: [
+        ("Stochastic_K", ("stochastic_k", window)),
+        ("Stochastic_D", ("stochastic_d", window, smooth_period)),
+    ],
+    "calculate_Williams_R": lambda window=14: [("Williams_R", ("williams_r", window))],
+    "calculate_anchored_VWAP": lambda anchor="M": [(f"VWAP_{anchor}", ("anchored_vwap", anchor))],
+    "calculate_rolling_VWAP": lambda window=20: [(f"VWAP_{window}", ("rolling_vwap", window))],
+}
+
+
+def indicator_outputs(indicator: str) -> list:
+    """
+    This function lists the columns an indicator adds and the nodes computing them.
+
+    Args:
+        indicator (str): The indicator name, a key of the TECHNICAL_INDICATORS dictionary in src/technical_indicators.py.
+
+    Returns:
+        list: (column name, node) pairs, in the order the indicator function adds the columns.
+
+    Notes:
+        - The entry of TECHNICAL_INDICATORS is a functools.partial, its function name picks the FUNCTION_OUTPUTS
+          entry and its parameters are passed on, so the planner follows any change to the registry.
+    """
+    # Imported here, src/technical_indicators.py imports this module
+    from src.technical_indicators import TECHNICAL_INDICATORS
+
+    function = TECHNICAL_INDICATORS[indicator]
+    return FUNCTION_OUTPUTS[function.func.__name__](*function.args, **function.keywords)
+
+
+def build_indicator_plan(selected_indicators: list) -> list:
+    """
+    This function builds the ordered list of nodes needed to compute the selected indicators.
+
+    Args:
+        selected_indicators (list): List of technical indicators. Each indicator should be a key in the TECHNICAL_INDICATORS dictionary.
+
+    Returns:
+        list: Every required node once, in an order where each node comes after its dependencies.
+
+    Notes:
+        - The graph is built by walking the dependencies of the output nodes, and ordered with graphlib.TopologicalSorter.
+        - Nodes shared by several indicators (e.g. ("ema", 12) for EMA12 and MACD) appear only once.
+    """
+    graph = {}
+    pending = [node for indicator in selected_indicators for _, node in indicator_outputs(indicator)]
+
+    while pending:
+        node = pending.pop()
+        if node in graph:
+            continue
+        dependencies = NODE_DEPENDENCIES[node[0]](*node[1:])
+        graph[node] = dependencies
+        pending.extend(dependencies)
+
+    return list(TopologicalSorter(graph).static_order())
+
+
+def execute_plan(plan: list, inputs: dict) -> dict:
+    """
+    This function computes every node of a plan in order.
+
+    Args:
+        plan (list): Output of build_indicator_plan().
+        inputs (dict): A dictionary mapping input column names (e.g. 'Close') to NumPy arrays.
+
+    Returns:
+        dict: A dictionary mapping every node of the plan to its computed array.
+
+    Raises:
+        ValueError: If the plan needs an input column that is not in inputs.
+    """
+    values = {}
+    for node in plan:
+        kind, params = node[0], node[1:]
+        if kind == "input":
+            if params[0] not in inputs:
+                raise ValueError(f"DataFrame must contain column '{params[0]}'")
+            values[node] = inputs[params[0]]
+            continue
+
+        dependencies = NODE_DEPENDENCIES[kind](*params)
+        values[node] = NODE_FUNCTIONS[kind](*[values[dependency] for dependency in dependencies], *params)
+    return values
+
+
+def input_array(df: pd.DataFrame, column: str) -> np.ndarray:
+    """
+    This function reads one input column of the DataFrame as a NumPy array.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing stock data.
+        column (str): The column name, e.g. 'Close' or 'Date'.
+
+    Returns:
+        np.ndarray: A datetime64[ns] array for 'Date', otherwise a float array.
+
+    Notes:
+        - Price columns are coerced to numbers, the same as calculate_EMA does for 'Close'.
+        - Timezone aware dates keep their local wall time, so day, week and month boundaries follow the exchange's calendar.
+    """
+    if column == "Date":
+        dates = pd.to_datetime(df[column])
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        return dates.to_numpy(dtype="datetime64[ns]")
+    return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+
+
+def compute_selected_indicators(df: pd.DataFrame, selected_indicators: list) -> dict:
+    """
+    This function computes the columns of all selected indicators with shared intermediates.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing stock data with necessary columns.
+        selected_indicators (list): List of technical indicators to apply.
+
+    Returns:
+        dict: A dictionary mapping each output column name (e.g. 'SMA_20', 'Signal_Line') to its values,
+        in the same order the single indicator functions would add them.
+
+    Notes:
+        - Only the input columns needed by the plan are read from the DataFrame.
+        - Input columns are read with input_array().
+    """
+    plan = build_indicator_plan(selected_indicators)
+
+    inputs = {}
+    for node in plan:
+        if node[0] == "input" and node[1] in df.columns:
+            inputs[node[1]] = input_array(df, node[1])
+
+    values = execute_plan(plan, inputs)
+
+    columns = {}
+    for indicator in selected_indicators:
+        for column, node in indicator_outputs(indicator):
+            columns[column] = values[node]
+    return columns
@@ -0,0 +1,395 @@
+"""
+market_data.py
+
+Purpose:
+    This module contains the market data providers. Every price, history and metadata request of the
+    project goes through the provider returned by get_provider(), so the data source can be switched
+    between yfinance and local fixtures without touching the callers.
+
+Classes:
+    - MarketDataProvider
+    - YFinanceProvider(timeout: float=MARKET_DATA_TIMEOUT_SECONDS)
+    - ReplayProvider(directories=MARKET_DATA_REPLAY_DIRS)
+    - RecordingProvider(upstream: MarketDataProvider, directory=MARKET_DATA_RECORD_DIR)
+
+Functions:
+    - create_provider(name: str=MARKET_DATA_PROVIDER) -> MarketDataProvider
+    - get_provider() -> MarketDataProvider
+    - set_provider(provider: MarketDataProvider) -> MarketDataProvider
+    - use_provider(provider: MarketDataProvider) (context manager)
+
+Notes:
+    - Providers return the same shapes as yfinance: download() gives (field, ticker) columns, or
+      (ticker, field) columns with group_by="ticker", history() a Date indexed frame and info() a dict.
+    - ReplayProvider serves fixtures in the data/CSV format (Date, Close, High, Low, Open, Volume), one
+      file per symbol, so the existing data/CSV and data/FX files can be replayed as they are. Periods
+      are counted back from the last fixture date instead of today, so replays are deterministic.
+    - RecordingProvider passes requests to another provider and merges what it returns into fixture
+      files, which ReplayProvider can serve later.
+    - YFinanceProvider downloads a single symbol with Ticker().history(), so the run_loader thread pool
+      downloads in parallel. Only multi-symbol yf.download() calls, which share module globals inside
+      yfinance, are made one at a time (YF_DOWNLOAD_LOCK).
+    - The provider is picked with MARKET_DATA_PROVIDER ('yfinance', 'replay' or 'record'), which can
+      be set with the environment variable of the same name, e.g. MARKET_DATA_PROVIDER=replay pytest.
+"""
+
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import pandas as pd
+import yfinance as yf
+from src.config import *
+
+# yf.download() keeps its results in module globals, so concurrent multi-symbol downloads are made
+# one at a time. Single symbols (the run_loader thread pool) and yf.Ticker().history() do not need this.
+YF_DOWNLOAD_LOCK = threading.Lock()
+
+# The columns of the fixture files, in the data/CSV order
+FIXTURE_COLUMNS = ["Close", "High", "Low", "Open", "Volume"]
+
+# Offsets of the yfinance periods, counted back from the last date of a fixture
+_PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1), "3mo": pd.DateOffset(months=3), "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1), "2y": pd.DateOffset(years=2), "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+
+def _symbols(symbols) -> list:
+    """The symbols of a request as a list without duplicates ('AAPL' or ['AAPL', 'MSFT'])."""
+    if isinstance(symbols, str):
+        symbols = symbols.replace(",", " ").split()
+    return list(dict.fromkeys(symbols))
+
+
+class MarketDataProvider(ABC):
+    """
+    Interface of a market data source. Subclasses implement download(), history() and info(), which are
+    abstract, so a provider missing one of them cannot be created.
+    """
+
+    @abstractmethod
+    def download(self, symbols, start=None, end=None, period=None, interval: str="1d", group_by: str="column") -> pd.DataFrame:
+        """
+        Downloads the OHLCV history of one or more symbols, like yf.download().
+
+        Args:
+            symbols (str or list): The symbols.
+            start (str, optional): First date, inclusive ('YYYY-MM-DD').
+            end (str, optional): Last date, exclusive ('YYYY-MM-DD').
+            period (str, optional): A yfinance period ('5d', '1mo', 'max', ...), used when start is None.
+            interval (str): The bar interval. Default is "1d".
+            group_by (str): "column" for (field, ticker) columns, "ticker" for (ticker, field) columns.
+
+        Returns:
+            pd.DataFrame: Date indexed rows of every symbol, NaN where a symbol has no data that day.
+        """
+
+    @abstractmethod
+    def history(self, ticker: str, period: str="1mo", interval: str="1d", start=None, end=None) -> pd.DataFrame:
+        """
+        Returns the OHLCV history of one ticker, like yf.Ticker(ticker).history().
+
+        Args:
+            ticker (str): The ticker symbol.
+            period (str): A yfinance period, used when start is None. Default is "1mo".
+            interval (str): The bar interval. Default is "1d".
+            start (str, optional): First date, inclusive.
+            end (str, optional): Last date, exclusive.
+
+        Returns:
+            pd.DataFrame: Date indexed Close, High, Low, Open and Volume columns (empty if there is no data).
+        """
+
+    @abstractmethod
+    def info(self, ticker: str) -> dict:
+        """
+        Returns the metadata of one ticker, like yf.Ticker(ticker).info.
+
+        Args:
+            ticker (str): The ticker symbol.
+
+        Returns:
+            dict: The yfinance info fields ('currency', 'exchange', 'quoteType', 'longName', ...), empty if unknown.
+        """
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Market data from Yahoo Finance through the yfinance library.
+
+    Attributes:
+        timeout (float): Seconds a download or history request may wait for a response. yfinance has no
+            timeout for info(), which uses its session defaults.
+    """
+
+    def __init__(self, timeout: float=MARKET_DATA_TIMEOUT_SECONDS):
+        self.timeout = timeout
+
+    def download(self, symbols, start=None, end=None, period=None, interval: str="1d", group_by: str="column") -> pd.DataFrame:
+        kwargs = {"start": start, "end": end, "period": period}
+        kwargs = {key: value for key, value in kwargs.items() if value is not None}
+        names = _symbols(symbols)
+        if len(names) == 1:
+            return self._download_one(names[0], interval, group_by, kwargs)
+        with YF_DOWNLOAD_LOCK:
+            return yf.download(names, interval=interval, group_by=group_by, progress=False, timeout=self.timeout, **kwargs)
+
+    def _download_one(self, symbol: str, interval: str, group_by: str, kwargs: dict) -> pd.DataFrame:
+        """
+        One symbol in the shape of yf.download(), from the Ticker().history() request that yf.download() makes for it.
+        It uses none of the module globals, so it needs no lock and downloads from the thread pool overlap.
+        """
+        data = yf.Ticker(symbol).history(interval=interval, actions=False, auto_adjust=True, timeout=self.timeout, **kwargs)
+        if data.empty:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+        # Like yf.download(): daily bars without time zone, intraday bars in UTC
+        if interval[-1] in "mh":
+            data.index = pd.to_datetime(data.index, utc=True)
+        elif getattr(data.index, "tz", None) is not None:
+            data.index = data.index.tz_localize(None)
+        data = pd.concat({symbol.upper(): data}, axis=1, names=["Ticker", "Price"]).rename_axis("Date")
+        if group_by == "column":
+            data.columns = data.columns.swaplevel(0, 1)
+            data = data.sort_index(axis=1, level=0)
+        return data
+
+    def history(self, ticker: str, period: str="1mo", interval: str="1d", start=None, end=None) -> pd.DataFrame:
+        if start is not None:
+            return yf.Ticker(ticker).history(start=start, end=end, interval=interval, timeout=self.timeout)
+        return yf.Ticker(ticker).history(period=period, interval=interval, timeout=self.timeout)
+
+    def info(self, ticker: str) -> dict:
+        return yf.Ticker(ticker).info or {}
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Market data served from fixture files, without network access.
+
+    Attributes:
+        directories (list): Folders searched in order for '{symbol}.csv' fixtures and 'info.json'.
+
+    Notes:
+        - Fixtures are read once and kept in memory, so repeated requests cost no file reads.
+        - Only daily bars are stored, other intervals raise ValueError.
+        - Symbols without a fixture are left out of download() results, as yfinance leaves failed symbols empty.
+    """
+
+    def __init__(self, directories=MARKET_DATA_REPLAY_DIRS):
+        if isinstance(directories, (str, os.PathLike)):
+            directories = [directories]
+        self.directories = [str(directory) for directory in directories]
+        self._frames = {}
+        self._info = None
+        self._lock = threading.Lock()
+
+    def _fixture(self, symbol: str) -> pd.DataFrame:
+        """The full fixture of a symbol (empty if no directory has one)."""
+        with self._lock:
+            if symbol not in self._frames:
+                frame = pd.DataFrame(columns=FIXTURE_COLUMNS, index=pd.DatetimeIndex([], name="Date"))
+                for directory in self.directories:
+                    path = os.path.join(directory, f"{symbol}.csv")
+                    if os.path.exists(path):
+                        frame = pd.read_csv(path, parse_dates=["Date"], index_col="Date").sort_index()
+                        frame = frame[[column for column in FIXTURE_COLUMNS if column in frame.columns]]
+                        break
+                self._frames[symbol] = frame
+            return self._frames[symbol]
+
+    def _window(self, frame: pd.DataFrame, start, end, period, interval: str) -> pd.DataFrame:
+        """The rows of a fixture in the requested date range."""
+        if interval != "1d":
+            raise ValueError(f"Replay fixtures hold daily bars only, not interval '{interval}'")
+        if frame.empty:
+            return frame
+        if start is not None or end is not None:
+            if start is not None:
+                frame = frame[frame.index >= pd.Timestamp(start)]
+            if end is not None:
+                frame = frame[frame.index < pd.Timestamp(end)]
+            return frame
+
+        period = period or "max"
+        last = frame.index[-1]
+        if period == "max":
+            return frame
+        if period == "ytd":
+            return frame[frame.index >= pd.Timestamp(year=last.year, month=1, day=1)]
+        if period.endswith("d") and period[:-1].isdigit():
+            return frame.iloc[-int(period[:-1]):]
+        if period in _PERIOD_OFFSETS:
+            return frame[frame.index > last - _PERIOD_OFFSETS[period]]
+        raise ValueError(f"Unknown period: {period}")
+
+    def download(self, symbols, start=None, end=None, period=None, interval: str="1d", group_by: str="column") -> pd.DataFrame:
+        frames = {}
+        for symbol in _symbols(symbols):
+            frame = self._window(self._fixture(symbol), start, end, period, interval)
+            if not frame.empty:
+                frames[symbol] = frame
+        if not frames:
+            return pd.DataFrame()
+
+        data = pd.concat(frames, axis=1).sort_index()
+        data.index.name = "Date"
+        if group_by != "ticker":
+            data = data.swaplevel(axis=1)
+            data = data[[(field, symbol) for field in FIXTURE_COLUMNS for symbol in frames if (field, symbol) in data.columns]]
+        data.columns.names = ["Ticker", "Price"] if group_by == "ticker" else ["Price", "Ticker"]
+        return data
+
+    def history(self, ticker: str, period: str="1mo", interval: str="1d", start=None, end=None) -> pd.DataFrame:
+        return self._window(self._fixture(ticker), start, end, None if start is not None else period, interval).copy()
+
+    def info(self, ticker: str) -> dict:
+        with self._lock:
+            if self._info is None:
+                self._info = {}
+                for directory in reversed(self.directories):
+                    path = os.path.join(directory, "info.json")
+                    if os.path.exists(path):
+                        with open(path) as file:
+                            self._info.update(json.load(file))
+        return dict(self._info.get(ticker, {}))
+
+
+class RecordingProvider(MarketDataProvider):
+    """
+    Passes every request to another provider and records the results as fixtures.
+
+    Attributes:
+        upstream (MarketDataProvider): The provider answering the requests.
+        directory (str): The folder the fixtures are written to.
+
+    Notes:
+        - Downloaded rows are merged into '{symbol}.csv' (newer rows replace rows of the same date) and
+          info() results into 'info.json', so a replay of the folder returns what was recorded.
+    """
+
+    def __init__(self, upstream: MarketDataProvider, directory=MARKET_DATA_RECORD_DIR):
+        self.upstream = upstream
+        self.directory = str(directory)
+        self._lock = threading.Lock()
+
+    def _record(self, symbol: str, frame: pd.DataFrame):
+        """Merges the rows of one symbol into its fixture file."""
+        frame = frame[[column for column in FIXTURE_COLUMNS if column in frame.columns]].dropna(how="all")
+        if frame.empty:
+            return
+        frame = frame.copy()
+        frame.index = pd.DatetimeIndex(frame.index).tz_localize(None).normalize()
+        frame.index.name = "Date"
+        if "Volume" in frame.columns and frame["Volume"].notna().all():
+            frame["Volume"] = frame["Volume"].astype("int64")
+
+        path = os.path.join(self.directory, f"{symbol}.csv")
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            if os.path.exists(path):
+                existing = pd.read_csv(path, parse_dates=["Date"], index_col="Date")
+                frame = pd.concat([existing, frame])
+                frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+            frame.to_csv(path, date_format="%Y-%m-%d")
+
+    def download(self, symbols, start=None, end=None, period=None, interval: str="1d", group_by: str="column") -> pd.DataFrame:
+        data = self.upstream.download(symbols, start=start, end=end, period=period, interval=interval, group_by=group_by)
+        if data is None or data.empty:
+            return data
+        for symbol in _symbols(symbols):
+            if isinstance(data.columns, pd.MultiIndex):
+                level = 0 if group_by == "ticker" else 1
+                if symbol not in data.columns.get_level_values(level):
+                    continue
+                frame = data.xs(symbol, axis=1, level=level)
+            else:
+                frame = data
+            self._record(symbol, frame)
+        return data
+
+    def history(self, ticker: str, period: str="1mo", interval: str="1d", start=None, end=None) -> pd.DataFrame:
+        data = self.upstream.history(ticker, period=period, interval=interval, start=start, end=end)
+        self._record(ticker, data)
+        return data
+
+    def info(self, ticker: str) -> dict:
+        info = self.upstream.info(ticker)
+        path = os.path.join(self.directory, "info.json")
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            recorded = {}
+            if os.path.exists(path):
+                with open(path) as file:
+                    recorded = json.load(file)
+            recorded[ticker] = info
+            with open(path, "w") as file:
+                json.dump(recorded, file, indent=2, sort_keys=True, default=str)
+        return info
+
+
+def create_provider(name: str=MARKET_DATA_PROVIDER) -> MarketDataProvider:
+    """
+    This function creates the provider configured by name.
+
+    Args:
+        name (str): 'yfinance', 'replay' (fixtures in MARKET_DATA_REPLAY_DIRS) or 'record'
+            (yfinance, recorded into MARKET_DATA_RECORD_DIR). Default is MARKET_DATA_PROVIDER.
+
+    Returns:
+        MarketDataProvider: The provider.
+
+    Raises:
+        ValueError: If the name is not one of the above.
+    """
+    if name == "yfinance":
+        return YFinanceProvider()
+    if name == "replay":
+        return ReplayProvider()
+    if name == "record":
+        return RecordingProvider(YFinanceProvider())
+    raise ValueError(f"Unknown market data provider: {name}")
+
+
+_PROVIDER = None
+_PROVIDER_LOCK = threading.Lock()
+
+
+def get_provider() -> MarketDataProvider:
+    """Returns the process wide provider, created from MARKET_DATA_PROVIDER on first use."""
+    global _PROVIDER
+    with _PROVIDER_LOCK:
+        if _PROVIDER is None:
+            _PROVIDER = create_provider()
+        return _PROVIDER
+
+
+def set_provider(provider: MarketDataProvider) -> MarketDataProvider:
+    """
+    This function replaces the process wide provider.
+
+    Args:
+        provider (MarketDataProvider): The new provider. None creates it again from MARKET_DATA_PROVIDER on next use.
+
+    Returns:
+        MarketDataProvider: The previous provider (None if none was created yet).
+    """
+    global _PROVIDER
+    with _PROVIDER_LOCK:
+        previous, _PROVIDER = _PROVIDER, provider
+    return previous
+
+
+@contextmanager
+def use_provider(provider: MarketDataProvider):
+    """
+    Uses a provider inside a with block, e.g. a ReplayProvider in a benchmark, and restores the previous one after it.
+    """
+    previous = set_provider(provider)
+    try:
+        yield provider
+    finally:
+        set_provider(previous)
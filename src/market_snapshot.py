@@ -0,0 +1,131 @@
+"""
+market_snapshot.py
+
+Purpose:
+    This module contains the MarketSnapshot, the prices and FX rates needed to value a
+    portfolio, fetched in one batched yfinance download. calculate_networth() and
+    calculate_daily_returns() both read from the same snapshot, so a Portfolio Tracker
+    render makes one round trip instead of separate price and FX downloads per function.
+
+Classes:
+    - MarketSnapshot
+
+Functions:
+    - build_market_snapshot(tickers_list: list, target_currency: str="SGD", period: str="5d") -> MarketSnapshot
+
+Notes:
+    - Ticker currencies come from categorize_tickers() and resolve_unknown_currency() once per snapshot.
+    - The download holds the stock tickers and the pivot quotes ("USD<currency>=X" for the default pivot)
+      of the foreign currencies that are not already in the shared FX_CACHE (src/ticker_utils.py) and of
+      the target currency. Cross rates are derived from them and the quotes are added to FX_CACHE.
+    - A missing price or FX rate is stored as NaN and surfaces as None/NaN in the analytics results,
+      the same as the per-function fetches did. Invested values in a currency without a rate are left
+      unconverted by convert_invested_values(), which flags those rows and warns (MissingFXRateWarning).
+"""
+
+
+from dataclasses import dataclass, field
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from src.config import *
+from src.fx_engine import CrossRateTable
+from src.market_data import get_provider
+from src.ticker_utils import (
+    FX_CACHE, categorize_tickers, is_currency_code, last_closes, pivot_quote_symbols, read_pivot_rates,
+    resolve_unknown_currency,
+)
+
+
+@dataclass
+class MarketSnapshot:
+    """
+    Latest market data for a set of tickers, with the FX rates into one target currency.
+
+    Attributes:
+        latest_close (dict): Ticker -> latest close in the ticker's own currency (NaN if unavailable).
+        previous_close (dict): Ticker -> close of the trading day before (NaN if unavailable).
+        currency (dict): Ticker -> currency code (or 'UNKNOWN').
+        fx_rates (dict): Currency -> rate into target_currency (1.0 for the target itself, NaN if unavailable).
+        target_currency (str): The currency values are converted to.
+        fetched_at (datetime): When the snapshot was downloaded.
+    """
+    latest_close: dict = field(default_factory=dict)
+    previous_close: dict = field(default_factory=dict)
+    currency: dict = field(default_factory=dict)
+    fx_rates: dict = field(default_factory=dict)
+    target_currency: str = "SGD"
+    fetched_at: datetime = field(default_factory=datetime.now)
+
+    def fx_rate(self, currency) -> float:
+        """Rate from currency into the target currency, NaN if it is not in the snapshot."""
+        if currency == self.target_currency:
+            return 1.0
+        return float(self.fx_rates.get(currency, np.nan))
+
+    def price(self, ticker: str) -> float:
+        """Latest close of a ticker in its own currency, NaN if unavailable."""
+        return float(self.latest_close.get(str(ticker).upper(), np.nan))
+
+    def converted_price(self, ticker: str) -> float:
+        """Latest close of a ticker in the target currency, NaN if the price or the FX rate is unavailable."""
+        ticker = str(ticker).upper()
+        return self.price(ticker) * self.fx_rate(self.currency.get(ticker))
+
+    def daily_return(self, ticker: str) -> float:
+        """Percentage change between the previous and the latest close, NaN without two closes."""
+        ticker = str(ticker).upper()
+        previous = self.previous_close.get(ticker, np.nan)
+        return (self.price(ticker) - previous) / previous * 100
+
+
+def build_market_snapshot(tickers_list: list, target_currency: str="SGD", period: str="5d") -> MarketSnapshot:
+    """
+    Fetches the last two closes of every ticker and the FX rates of their currencies in one batched download.
+
+    Args:
+        tickers_list (list): A list of stock tickers (duplicates and lower case are allowed).
+        target_currency (str): The currency values are converted to. Default is "SGD".
+        period (str): The download period, long enough to hold two trading days. Default is "5d".
+
+    Returns:
+        MarketSnapshot: The prices, currencies and FX rates.
+
+    Raises:
+        Exception: Errors of yf.download() are not caught, so callers can tell a failed fetch from missing data.
+
+    Notes:
+        - One yf.download() call covers the stock tickers and the pivot quotes of the rates that FX_CACHE does not hold.
+        - Currencies without a valid code (e.g. 'UNKNOWN') get no FX pair, so their rate is NaN.
+    """
+    tickers = list(dict.fromkeys(str(ticker).upper() for ticker in tickers_list))
+    snapshot = MarketSnapshot(target_currency=target_currency)
+    if not tickers:
+        return snapshot
+
+    ticker_currency = categorize_tickers(tickers_list=tickers, exchange_map=EXCHANGE_MAP)
+    ticker_currency = resolve_unknown_currency(tickers_list=tickers, ticker_currency=ticker_currency)
+    snapshot.currency = {ticker: ticker_currency.get(ticker, "UNKNOWN") for ticker in tickers}
+
+    # Rates still in the shared FX cache are not downloaded again
+    foreign = [currency for currency in dict.fromkeys(snapshot.currency.values())
+               if is_currency_code(currency) and currency != target_currency]
+    cached_rates, missing = FX_CACHE.lookup(foreign, target_currency)
+    fx_symbols = pivot_quote_symbols(missing + [target_currency], pivot=FX_CACHE.pivot) if missing else {}
+
+    symbols = tickers + [symbol for symbol in fx_symbols.values() if symbol not in tickers]
+    data = get_provider().download(symbols, period=period, interval="1d", group_by="ticker")
+
+    for ticker in tickers:
+        closes = last_closes(data, ticker)
+        snapshot.latest_close[ticker] = closes[-1] if closes else np.nan
+        snapshot.previous_close[ticker] = closes[-2] if len(closes) > 1 else np.nan
+
+    snapshot.fx_rates = {target_currency: 1.0, **cached_rates}
+    if missing:
+        pivot_rates = read_pivot_rates(data, fx_symbols)
+        FX_CACHE.put_pivot_rates(pivot_rates)
+        rates = CrossRateTable(pivot_rates, pivot=FX_CACHE.pivot).rates_to(missing, target_currency)
+        snapshot.fx_rates.update(zip(missing, rates.tolist()))
+
+    return snapshot
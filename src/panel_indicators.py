@@ -0,0 +1,382 @@
+"""
+panel_indicators.py
+
+Purpose:
+    This module computes technical indicators for many tickers at once. Prices are held
+    in a 2-D panel (dates x tickers), either a NumPy array or a wide DataFrame, and each
+    indicator is computed for every column in one vectorized pass.
+
+Functions:
+    - build_price_panel(frames: dict, column: str="Close") -> pd.DataFrame
+    - load_price_panel(tickers: list=TICKERS, columns: tuple=PANEL_PRICE_COLUMNS) -> dict
+    - panel_SMA(close, window: int)
+    - panel_EMA(close, window: int)
+    - panel_RSI(close, window: int)
+    - panel_MACD(close, short_period: int=12, long_period: int=26, signal_period: int=9) -> dict
+    - panel_VWAP(high, low, close, volume)
+    - panel_Donchian(high, low, close, window: int=20) -> dict
+    - panel_Stochastic(high, low, close, window: int=14, smooth_period: int=3) -> dict
+    - panel_Williams_R(high, low, close, window: int=14)
+    - panel_anchored_VWAP(high, low, close, volume, period: str="M", dates=None)
+    - panel_rolling_VWAP(high, low, close, volume, window: int=20)
+    - calculate_panel_indicators(panel: dict, selected_indicators: list) -> dict
+
+Notes:
+    - A NaN close means the ticker has no bar on that date (not listed yet, or its exchange
+      was closed). Each column is computed on its own bars only, so C6L.SI next to US names
+      gives the same values as running the single-ticker functions on C6L.SI alone.
+    - Missing bars are handled by moving each column's valid rows to the top (a stable sort on
+      the NaN mask), computing on the aligned matrix and scattering the results back.
+    - Outputs have the same type as the input: a wide DataFrame in, a wide DataFrame out.
+"""
+
+
+import numpy as np
+import pandas as pd
+from functools import partial
+from src.config import *
+from src.indicator_engine import (
+    sma_array, ema_array, rsi_array, macd_arrays, vwap_array, donchian_arrays, stochastic_arrays, williams_r_array,
+    period_keys, segment_starts, anchored_vwap_array, rolling_vwap_array,
+)
+
+
+# Columns loaded for each ticker by load_price_panel
+PANEL_PRICE_COLUMNS = ("Close", "High", "Low", "Volume")
+
+
+def build_price_panel(frames: dict, column: str="Close") -> pd.DataFrame:
+    """
+    This function combines single-ticker DataFrames into a wide dates x tickers DataFrame.
+
+    Args:
+        frames (dict): A dictionary mapping each ticker to its stock data DataFrame.
+        column (str, optional): The price column to take from each DataFrame. Defaults to "Close".
+
+    Returns:
+        pd.DataFrame: A DataFrame indexed by the union of all dates, with one column per ticker.
+
+    Notes:
+        - DataFrames may hold dates either in a 'Date' column or in the index.
+        - Dates on which a ticker has no data are NaN, which the panel functions treat as missing bars.
+    """
+    columns = {}
+    for ticker, df in frames.items():
+        series = df.set_index("Date")[column] if "Date" in df.columns else df[column]
+        series.index = pd.to_datetime(series.index)
+        columns[ticker] = pd.to_numeric(series, errors="coerce")
+
+    panel = pd.concat(columns, axis=1).sort_index()
+    panel.index.name = "Date"
+    return panel
+
+
+def load_price_panel(tickers: list=TICKERS, columns: tuple=PANEL_PRICE_COLUMNS) -> dict:
+    """
+    This function loads the stored histories (data/STORE, or data/CSV) into one wide panel per price column.
+
+    Args:
+        tickers (list, optional): The tickers to load. Defaults to config.TICKERS.
+        columns (tuple, optional): The price columns to build panels for. Defaults to PANEL_PRICE_COLUMNS.
+
+    Returns:
+        dict: A dictionary mapping each column name (e.g. 'Close') to a wide dates x tickers DataFrame.
+
+    Notes:
+        - Tickers with a binary store file are memory mapped (see src/price_store.py), others are read from CSV.
+        - Tickers without a store or CSV file are skipped.
+    """
+    from src.price_store import load_price_history
+
+    frames = {}
+    for ticker in tickers:
+        history = load_price_history(ticker)
+        if not history.empty:
+            frames[ticker] = history
+
+    return {column: build_price_panel(frames, column) for column in columns}
+
+
+def _as_array(panel) -> np.ndarray:
+    """Return the panel values as a 2-D float array."""
+    values = panel.to_numpy(dtype=float) if isinstance(panel, pd.DataFrame) else np.asarray(panel, dtype=float)
+    if values.ndim != 2:
+        raise ValueError("Panel must be a 2-D dates x tickers array or DataFrame")
+    return values
+
+
+def _like(result: np.ndarray, template):
+    """Wrap a result array in the same type (and labels) as the template panel."""
+    if isinstance(template, pd.DataFrame):
+        return pd.DataFrame(result, index=template.index, columns=template.columns)
+    return result
+
+
+def _align_bars(valid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Row order that moves each column's valid bars to the top, and the bar count per column."""
+    order = np.argsort(~valid, axis=0, kind="stable")
+    return order, valid.sum(axis=0)
+
+
+def _restore_bars(aligned: np.ndarray, order: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Scatter results computed on aligned bars back to their original dates."""
+    rows = np.arange(aligned.shape[0])[:, None]
+    result = np.full(aligned.shape, np.nan)
+    np.put_along_axis(result, order, np.where(rows < counts, aligned, np.nan), axis=0)
+    return result
+
+
+def _apply_on_bars(function, close, *others):
+    """
+    Run an engine function on the panel with each column's missing bars removed.
+
+    The bars of a column are the rows where its close is not NaN. Other panels (e.g. volume)
+    are aligned with the same row order. The engine function must return one array or a tuple of arrays.
+    """
+    close_values = _as_array(close)
+    valid = ~np.isnan(close_values)
+
+    # Fast path: every ticker has a bar on every date
+    if valid.all():
+        return function(close_values, *[_as_array(other) for other in others])
+
+    order, counts = _align_bars(valid)
+    aligned = [np.take_along_axis(_as_array(panel), order, axis=0) for panel in (close,) + others]
+    result = function(*aligned)
+
+    if isinstance(result, tuple):
+        return tuple(_restore_bars(part, order, counts) for part in result)
+    return _restore_bars(result, order, counts)
+
+
+def panel_SMA(close, window: int):
+    """
+    This function calculates the Simple Moving Average (SMA) for every ticker in the panel.
+
+    Args:
+        close (np.ndarray or pd.DataFrame): Dates x tickers closing prices.
+        window (int): The window size for calculating the SMA.
+
+    Returns:
+        np.ndarray or pd.DataFrame: SMA values with the same shape and type as close.
+    """
+    return _like(_apply_on_bars(partial(sma_array, window=window), close), close)
+
+
+def panel_EMA(close, window: int):
+    """
+    This function calculates the Exponential Moving Average (EMA) for every ticker in the panel.
+
+    Args:
+        close (np.ndarray or pd.DataFrame): Dates x tickers closing prices.
+        window (int): The window size for calculating the EMA.
+
+    Returns:
+        np.ndarray or pd.DataFrame: EMA values with the same shape and type as close.
+    """
+    return _like(_apply_on_bars(partial(ema_array, window=window), close), close)
+
+
+def panel_RSI(close, window: int):
+    """
+    This function calculates the Relative Strength Index (RSI) for every ticker in the panel.
+
+    Args:
+        close (np.ndarray or pd.DataFrame): Dates x tickers closing prices.
+        window (int): The window size for calculating the RSI.
+
+    Returns:
+        np.ndarray or pd.DataFrame: RSI values with the same shape and type as close.
+    """
+    return _like(_apply_on_bars(partial(rsi_array, window=window), close), close)
+
+
+def panel_MACD(close, short_period: int=12, long_period: int=26, signal_period: int=9) -> dict:
+    """
+    This function calculates the MACD line, signal line and histogram for every ticker in the panel.
+
+    Args:
+        close (np.ndarray or pd.DataFrame): Dates x tickers closing prices.
+        short_period (int, optional): The short-term EMA period. Defaults to 12.
+        long_period (int, optional): The long-term EMA period. Defaults to 26.
+        signal_period (int, optional): The signal line EMA period. Defaults to 9.
+
+    Returns:
+        dict: A dictionary with 'MACD', 'Signal_Line' and 'MACD_Histogram' panels.
+    """
+    function = partial(macd_arrays, short_period=short_period, long_period=long_period, signal_period=signal_period)
+    macd, signal, histogram = _apply_on_bars(function, close)
+    return {
+        "MACD": _like(macd, close),
+        "Signal_Line": _like(signal, close),
+        "MACD_Histogram": _like(histogram, close),
+    }
+
+
+def panel_VWAP(high, low, close, volume):
+    """
+    This function calculates the cumulative Volume Weighted Average Price (VWAP) for every ticker in the panel.
+
+    Args:
+        high (np.ndarray or pd.DataFrame): Dates x tickers high prices.
+        low (np.ndarray or pd.DataFrame): Dates x tickers low prices.
+        close (np.ndarray or pd.DataFrame): Dates x tickers closing prices.
+        volume (np.ndarray or pd.DataFrame): Dates x tickers volumes.
+
+    Returns:
+        np.ndarray or pd.DataFrame: VWAP values with the same shape and type as close.
+
+    Notes:
+        - All four panels must share the same dates and ticker order.
+    """
+    function = lambda c, h, l, v: vwap_array(h, l, c, v)
+    return _like(_apply_on_bars(function, close, high, low, volume), close)
+
+
+def panel_Donchian(high, low, close, window: int=20) -> dict:
+    """
+    This function calculates the Donchian channel for every ticker in the panel.
+
+    Args:
+        high (np.ndarray or pd.DataFrame): Dates x tickers high prices.
+        low (np.ndarray or pd.DataFrame): Dates x tickers low prices.
+        close (np.ndarray or pd.DataFrame): Dates x tickers closing prices, used to find each ticker's bars.
+        window (int, optional): The channel length. Defaults to 20.
+
+    Returns:
+        dict: A dictionary with 'Donchian_Upper', 'Donchian_Lower' and 'Donchian_Middle' panels.
+    """
+    function = lambda c, h, l: donchian_arrays(h, l, window)
+    upper, lower, middle = _apply_on_bars(function, close, high, low)
+    return {
+        "Donchian_Upper": _like(upper, close),
+        "Donchian_Lower": _like(lower, close),
+        "Donchian_Middle": _like(middle, close),
+    }
+
+
+def panel_Stochastic(high, low, close, window: int=14, smooth_period: int=3) -> dict:
+    """
+    This function calculates the Stochastic Oscillator %K and %D for every ticker in the panel.
+
+    Args:
+        high (np.ndarray or pd.DataFrame): Dates x tickers high prices.
+        low (np.ndarray or pd.DataFrame): Dates x tickers low prices.
+        close (np.ndarray or pd.DataFrame): Dates x tickers closing prices.
+        window (int, optional): The look-back period of %K. Defaults to 14.
+        smooth_period (int, optional): The %D averaging period. Defaults to 3.
+
+    Returns:
+        dict: A dictionary with 'Stochastic_K' and 'Stochastic_D' panels.
+    """
+    function = lambda c, h, l: stochastic_arrays(h, l, c, window, smooth_period)
+    percent_k, percent_d = _apply_on_bars(function, close, high, low)
+    return {"Stochastic_K": _like(percent_k, close), "Stochastic_D": _like(percent_d, close)}
+
+
+def panel_Williams_R(high, low, close, window: int=14):
+    """
+    This function calculates Williams %R for every ticker in the panel.
+
+    Args:
+        high (np.ndarray or pd.DataFrame): Dates x tickers high prices.
+        low (np.ndarray or pd.DataFrame): Dates x tickers low prices.
+        close (np.ndarray or pd.DataFrame): Dates x tickers closing prices.
+        window (int, optional): The look-back period. Defaults to 14.
+
+    Returns:
+        np.ndarray or pd.DataFrame: Williams %R values with the same shape and type as close.
+    """
+    function = lambda c, h, l: williams_r_array(h, l, c, window)
+    return _like(_apply_on_bars(function, close, high, low), close)
+
+
+def panel_anchored_VWAP(high, low, close, volume, period: str="M", dates=None):
+    """
+    This function calculates the VWAP that resets every day, week or month for every ticker in the panel.
+
+    Args:
+        high (np.ndarray or pd.DataFrame): Dates x tickers high prices.
+        low (np.ndarray or pd.DataFrame): Dates x tickers low prices.
+        close (np.ndarray or pd.DataFrame): Dates x tickers closing prices.
+        volume (np.ndarray or pd.DataFrame): Dates x tickers volumes.
+        period (str, optional): 'D', 'W' or 'M'. Defaults to "M".
+        dates (array-like, optional): The date of each row. Defaults to the index of close when it is a DataFrame.
+
+    Returns:
+        np.ndarray or pd.DataFrame: Anchored VWAP values with the same shape and type as close.
+
+    Raises:
+        ValueError: If no dates are given and close is not a DataFrame.
+    """
+    if dates is None:
+        if not isinstance(close, pd.DataFrame):
+            raise ValueError("Dates are required for an anchored VWAP on a NumPy panel")
+        dates = close.index
+
+    # Period keys are aligned with each column's bars like the prices, so every ticker resets on its own bars
+    keys = period_keys(pd.to_datetime(dates).to_numpy(dtype="datetime64[ns]"), period)
+    key_panel = np.broadcast_to(keys[:, None], _as_array(close).shape)
+    function = lambda c, h, l, v, k: anchored_vwap_array(h, l, c, v, segment_starts(k))
+    return _like(_apply_on_bars(function, close, high, low, volume, key_panel), close)
+
+
+def panel_rolling_VWAP(high, low, close, volume, window: int=20):
+    """
+    This function calculates the VWAP over the last 'window' bars for every ticker in the panel.
+
+    Args:
+        high (np.ndarray or pd.DataFrame): Dates x tickers high prices.
+        low (np.ndarray or pd.DataFrame): Dates x tickers low prices.
+        close (np.ndarray or pd.DataFrame): Dates x tickers closing prices.
+        volume (np.ndarray or pd.DataFrame): Dates x tickers volumes.
+        window (int, optional): The number of bars in each window. Defaults to 20.
+
+    Returns:
+        np.ndarray or pd.DataFrame: Rolling VWAP values with the same shape and type as close.
+    """
+    function = lambda c, h, l, v: rolling_vwap_array(h, l, c, v, window)
+    return _like(_apply_on_bars(function, close, high, low, volume), close)
+
+
+def calculate_panel_indicators(panel: dict, selected_indicators: list) -> dict:
+    """
+    This function applies the selected technical indicators to every ticker in a price panel.
+
+    Args:
+        panel (dict): A dictionary mapping price columns ('Close', plus 'High', 'Low' and 'Volume' for VWAP and the channel indicators)
+            to dates x tickers arrays or wide DataFrames, e.g. the output of load_price_panel().
+        selected_indicators (list): List of technical indicators to apply. Each indicator should be a key in the PANEL_INDICATORS dictionary.
+
+    Returns:
+        dict: A dictionary mapping each output column name (e.g. 'SMA_20', 'RSI', 'Signal_Line') to its panel.
+
+    Notes:
+        - The output column names are the same as the columns added by src/technical_indicators.py.
+    """
+    results = {}
+    for indicator in selected_indicators:
+        results.update(PANEL_INDICATORS[indicator](panel))
+    return results
+
+
+"""
+    PANEL_INDICATORS mirrors the TECHNICAL_INDICATORS dictionary in src/technical_indicators.py. Each entry
+    takes the price panel dictionary and returns a dictionary of output column name -> panel.
+"""
+
+PANEL_INDICATORS = {
+    SMA_20: lambda panel: {"SMA_20": panel_SMA(panel["Close"], window=20)},
+    SMA_50: lambda panel: {"SMA_50": panel_SMA(panel["Close"], window=50)},
+    SMA_200: lambda panel: {"SMA_200": panel_SMA(panel["Close"], window=200)},
+    RSI_14: lambda panel: {"RSI": panel_RSI(panel["Close"], window=14)},
+    MACD: lambda panel: panel_MACD(panel["Close"], short_period=12, long_period=26, signal_period=9),
+    VWAP: lambda panel: {"VWAP": panel_VWAP(panel["High"], panel["Low"], panel["Close"], panel["Volume"])},
+    EMA12: lambda panel: {"EMA_12": panel_EMA(panel["Close"], window=12)},
+    EMA26: lambda panel: {"EMA_26": panel_EMA(panel["Close"], window=26)},
+    DONCHIAN_20: lambda panel: panel_Donchian(panel["High"], panel["Low"], panel["Close"], window=20),
+    STOCHASTIC: lambda panel: panel_Stochastic(panel["High"], panel["Low"], panel["Close"], window=14, smooth_period=3),
+    WILLIAMS_R: lambda panel: {"Williams_R": panel_Williams_R(panel["High"], panel["Low"], panel["Close"], window=14)},
+    VWAP_MONTHLY: lambda panel: {"VWAP_M": panel_anchored_VWAP(panel["High"], panel["Low"], panel["Close"], panel["Volume"], period="M")},
+    VWAP_20: lambda panel: {"VWAP_20": panel_rolling_VWAP(panel["High"], panel["Low"], panel["Close"], panel["Volume"], window=20)}
+}
@@ -0,0 +1,369 @@
+"""
+price_store.py
+
+Purpose:
+    This module contains a binary, columnar price store with one file per ticker under data/STORE.
+    Each file holds fixed width columns (datetime64 dates, float64 prices, int64 volume) behind a
+    small header, and is opened with np.memmap, so loading a long history reads no text and copies
+    nothing until the columns are used.
+
+Classes:
+    - PriceStore(path)
+
+Functions:
+    - store_filename(ticker: str, directory=None) -> str
+    - write_price_store(path, df: pd.DataFrame, capacity: int=None) -> PriceStore
+    - open_price_store(ticker: str, directory=None) -> PriceStore
+    - load_price_history(ticker: str, directory=None, csv_directory=None) -> pd.DataFrame
+    - migrate_csv_to_store(tickers: list=None, csv_directory=None, directory=None) -> list
+    - export_store_to_csv(ticker: str, filename=None, directory=None) -> str
+
+Notes:
+    - File layout: a header of PRICE_STORE_HEADER_SIZE bytes (magic bytes, then a JSON record with the
+      row count, the capacity and the column types), then every column as one block of 'capacity' values.
+    - Columns have room for 'capacity' rows, so appending new days writes only the new values and the
+      header. The row count in the header is written last, so a crash during an append leaves the
+      file at its previous length. A full file is rewritten with twice the capacity.
+    - The columns are those of the data/CSV files (PRICE_STORE_COLUMNS). Missing prices are stored as NaN
+      and missing volume as 0.
+    - Run 'python -m src.price_store migrate' to convert data/CSV, and
+      'python -m src.price_store export TICKER' to write a store back to CSV.
+"""
+
+
+from pathlib import Path
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+from src.config import *
+
+# -----------------------------
+# Relative path to store folder
+# -----------------------------
+try:
+    project_root = Path(__file__).resolve().parent.parent
+    STORE_DIR = project_root / "data" / "STORE"
+    CSV_DIR = project_root / "data" / "CSV"
+    os.makedirs(STORE_DIR, exist_ok=True)
+except Exception as e:
+    print(f"Error setting up price store directory: {e}")
+
+STORE_MAGIC = b"BBPSTORE"
+
+
+def store_filename(ticker: str, directory=None) -> str:
+    """
+    This function returns the store file of a ticker.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+        directory (str or Path, optional): The folder of the store files. Defaults to data/STORE.
+
+    Returns:
+        str: The file path.
+    """
+    return os.path.join(STORE_DIR if directory is None else directory, f"{ticker}.prices")
+
+
+def _column_arrays(df: pd.DataFrame) -> dict:
+    """Convert a history to one array per store column, in the store types."""
+    arrays = {}
+    for name, dtype in PRICE_STORE_COLUMNS:
+        if name == "Date":
+            dates = pd.DatetimeIndex(pd.to_datetime(df["Date"]))
+            dates = dates.tz_localize(None) if dates.tz is not None else dates
+            arrays[name] = dates.to_numpy(dtype=dtype)
+        elif name not in df.columns:
+            arrays[name] = np.zeros(len(df), dtype=dtype) if np.dtype(dtype).kind == "i" else np.full(len(df), np.nan, dtype=dtype)
+        elif np.dtype(dtype).kind == "i":
+            arrays[name] = pd.to_numeric(df[name], errors="coerce").fillna(0).to_numpy(dtype=dtype)
+        else:
+            arrays[name] = pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=dtype)
+    return arrays
+
+
+def _header_bytes(rows: int, capacity: int) -> bytes:
+    record = json.dumps({
+        "version": 1,
+        "rows": int(rows),
+        "capacity": int(capacity),
+        "columns": [[name, np.dtype(dtype).str] for name, dtype in PRICE_STORE_COLUMNS],
+    }).encode()
+    header = STORE_MAGIC + len(record).to_bytes(4, "little") + record
+    if len(header) > PRICE_STORE_HEADER_SIZE:
+        raise ValueError("Price store header does not fit in PRICE_STORE_HEADER_SIZE")
+    return header.ljust(PRICE_STORE_HEADER_SIZE, b"\0")
+
+
+class PriceStore:
+    """
+    One ticker's price history, memory mapped from its store file.
+
+    Attributes:
+        path (str): The store file.
+        rows (int): Number of stored rows.
+        capacity (int): Number of rows the columns have room for.
+        dtypes (dict): Column name -> numpy dtype.
+
+    Notes:
+        - columns() returns read only np.memmap views, so nothing is read from disk until values are used.
+          to_dataframe() wraps the same views without copying them.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        with open(self.path, "rb") as file:
+            header = file.read(PRICE_STORE_HEADER_SIZE)
+        if header[:len(STORE_MAGIC)] != STORE_MAGIC:
+            raise ValueError(f"Not a price store file: {self.path}")
+        length = int.from_bytes(header[len(STORE_MAGIC):len(STORE_MAGIC) + 4], "little")
+        record = json.loads(header[len(STORE_MAGIC) + 4:len(STORE_MAGIC) + 4 + length])
+        self.rows = record["rows"]
+        self.capacity = record["capacity"]
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in record["columns"]}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _offsets(self) -> dict:
+        offsets, offset = {}, PRICE_STORE_HEADER_SIZE
+        for name, dtype in self.dtypes.items():
+            offsets[name] = offset
+            offset += self.capacity * dtype.itemsize
+        return offsets
+
+    def columns(self, names: list=None) -> dict:
+        """
+        Return the stored columns as memory mapped arrays.
+
+        Args:
+            names (list, optional): The columns to map. Defaults to all columns.
+
+        Returns:
+            dict: Column name -> read only array of length rows.
+        """
+        names = list(self.dtypes) if names is None else names
+        if self.rows == 0:
+            return {name: np.empty(0, dtype=self.dtypes[name]) for name in names}
+        # One mapping of the file, every column is a typed view into it
+        raw = np.memmap(self.path, dtype=np.uint8, mode="r")
+        offsets = self._offsets()
+        return {name: raw[offsets[name]:offsets[name] + self.rows * self.dtypes[name].itemsize].view(self.dtypes[name])
+                for name in names}
+
+    @property
+    def last_date(self):
+        """The last stored date as a pd.Timestamp, or None if the store is empty."""
+        if self.rows == 0:
+            return None
+        return pd.Timestamp(self.columns(["Date"])["Date"][-1])
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Return the history in the layout of the data/CSV files.
+
+        Returns:
+            pd.DataFrame: 'Date' and the price columns, one row per stored day.
+
+        Notes:
+            - The columns are the read only memory mapped views of columns(), nothing is copied. Replacing a
+              column works as usual, but changing values in place raises ValueError, so copy() the frame first.
+        """
+        # Plain ndarray views of the memmaps, so pandas holds ordinary arrays
+        return pd.DataFrame({name: values.view(np.ndarray) for name, values in self.columns().items()}, copy=False)
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Append the rows of df dated after the last stored date.
+
+        Args:
+            df (pd.DataFrame): New rows with a 'Date' column and the price columns.
+
+        Returns:
+            int: Number of rows appended.
+
+        Notes:
+            - Values are written into the free room of each column, then the header with the new row count.
+            - If the columns are full, the file is rewritten with twice the needed capacity.
+        """
+        arrays = _column_arrays(df)
+        last_date = self.last_date
+        if last_date is not None:
+            keep = arrays["Date"] > np.datetime64(last_date)
+            arrays = {name: values[keep] for name, values in arrays.items()}
+        added = len(arrays["Date"])
+        if added == 0:
+            return 0
+
+        if self.rows + added > self.capacity:
+            combined = pd.concat([self.to_dataframe(), pd.DataFrame(arrays)], ignore_index=True)
+            rewritten = write_price_store(self.path, combined, capacity=2 * len(combined))
+            self.rows, self.capacity = rewritten.rows, rewritten.capacity
+            return added
+
+        offsets = self._offsets()
+        with open(self.path, "r+b") as file:
+            for name, values in arrays.items():
+                file.seek(offsets[name] + self.rows * self.dtypes[name].itemsize)
+                file.write(np.ascontiguousarray(values, dtype=self.dtypes[name]).tobytes())
+            file.flush()
+            os.fsync(file.fileno())
+            # The new row count is the commit point
+            file.seek(0)
+            file.write(_header_bytes(self.rows + added, self.capacity))
+            file.flush()
+            os.fsync(file.fileno())
+        self.rows += added
+        return added
+
+
+def write_price_store(path, df: pd.DataFrame, capacity: int=None) -> PriceStore:
+    """
+    This function writes a history to a store file (to a temporary file first, then renamed).
+
+    Args:
+        path (str or Path): The store file.
+        df (pd.DataFrame): The history with a 'Date' column and the price columns (e.g. a data/CSV file).
+        capacity (int, optional): Rows the columns have room for. Defaults to the row count plus PRICE_STORE_GROWTH_ROWS.
+
+    Returns:
+        PriceStore: The written store.
+    """
+    path = str(path)
+    df = df.sort_values("Date", kind="stable").drop_duplicates("Date", keep="last")
+    arrays = _column_arrays(df)
+    rows = len(df)
+    capacity = rows + PRICE_STORE_GROWTH_ROWS if capacity is None else max(capacity, rows)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(_header_bytes(rows, capacity))
+        for name, dtype in PRICE_STORE_COLUMNS:
+            block = np.zeros(capacity, dtype=dtype)
+            block[:rows] = arrays[name]
+            file.write(block.tobytes())
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    return PriceStore(path)
+
+
+def open_price_store(ticker: str, directory=None) -> PriceStore:
+    """
+    This function opens the store file of a ticker.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+        directory (str or Path, optional): The folder of the store files. Defaults to data/STORE.
+
+    Returns:
+        PriceStore: The store, or None if the ticker has no store file.
+    """
+    filename = store_filename(ticker, directory)
+    return PriceStore(filename) if os.path.exists(filename) else None
+
+
+def load_price_history(ticker: str, directory=None, csv_directory=None) -> pd.DataFrame:
+    """
+    This function loads the history of a ticker from its store file, or from its CSV file if it has no store file.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+        directory (str or Path, optional): The folder of the store files. Defaults to data/STORE.
+        csv_directory (str or Path, optional): The folder of the CSV files. Defaults to data/CSV.
+
+    Returns:
+        pd.DataFrame: The history in the layout of the data/CSV files, or an empty DataFrame if neither file exists.
+        A history from a store file is read only (see PriceStore.to_dataframe()).
+    """
+    store = open_price_store(ticker, directory)
+    if store is not None:
+        return store.to_dataframe()
+    filename = os.path.join(CSV_DIR if csv_directory is None else csv_directory, f"{ticker}.csv")
+    if os.path.exists(filename):
+        return pd.read_csv(filename, parse_dates=["Date"])
+    return pd.DataFrame()
+
+
+def migrate_csv_to_store(tickers: list=None, csv_directory=None, directory=None) -> list:
+    """
+    This function converts stored CSV histories into store files.
+
+    Args:
+        tickers (list, optional): The tickers to convert. Defaults to every '{ticker}.csv' history in the CSV folder.
+        csv_directory (str or Path, optional): The folder of the CSV files. Defaults to data/CSV.
+        directory (str or Path, optional): The folder of the store files. Defaults to data/STORE.
+
+    Returns:
+        list: The tickers that were converted.
+
+    Notes:
+        - Files without a 'Date' and 'Close' column (e.g. '{ticker}_latest.csv') are skipped.
+        - The CSV files are left in place.
+    """
+    csv_directory = CSV_DIR if csv_directory is None else csv_directory
+    if tickers is None:
+        tickers = sorted(name[:-len(".csv")] for name in os.listdir(csv_directory)
+                         if name.endswith(".csv") and not name.endswith("_latest.csv"))
+
+    migrated = []
+    for ticker in tickers:
+        filename = os.path.join(csv_directory, f"{ticker}.csv")
+        if not os.path.exists(filename):
+            continue
+        try:
+            df = pd.read_csv(filename)
+            if not {"Date", "Close"}.issubset(df.columns):
+                continue
+            write_price_store(store_filename(ticker, directory), df)
+            migrated.append(ticker)
+            print(f"✅ {ticker} migrated to {store_filename(ticker, directory)}")
+        except Exception as e:
+            print(f"Could not migrate {filename}: {e}")
+    return migrated
+
+
+def export_store_to_csv(ticker: str, filename=None, directory=None) -> str:
+    """
+    This function writes the store file of a ticker as a CSV file in the data/CSV layout.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+        filename (str or Path, optional): The CSV file to write. Defaults to data/CSV/{ticker}.csv.
+        directory (str or Path, optional): The folder of the store files. Defaults to data/STORE.
+
+    Returns:
+        str: The CSV file written.
+
+    Raises:
+        FileNotFoundError: If the ticker has no store file.
+
+    Notes:
+        - Dates are written as 'YYYY-MM-DD' when every timestamp is at midnight, otherwise with their time of day.
+        - The sidecar metadata of the CSV file is rebuilt (rebuild_csv_metadata() in src/data_loader.py), so the
+          next update does not append after a stale last date.
+    """
+    from src.data_loader import rebuild_csv_metadata
+
+    store = open_price_store(ticker, directory)
+    if store is None:
+        raise FileNotFoundError(f"No price store for ticker: {ticker}")
+    filename = os.path.join(CSV_DIR, f"{ticker}.csv") if filename is None else str(filename)
+    df = store.to_dataframe()
+    if (df["Date"] == df["Date"].dt.normalize()).all():
+        df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+    df.to_csv(filename, index=False)
+    rebuild_csv_metadata(filename)
+    return filename
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "migrate":
+        migrate_csv_to_store(sys.argv[2:] or None)
+    elif len(sys.argv) >= 3 and sys.argv[1] == "export":
+        for ticker in sys.argv[2:]:
+            print(f"✅ {ticker} exported to {export_store_to_csv(ticker)}")
+    else:
+        print("Usage: python -m src.price_store migrate [TICKER ...] | export TICKER [TICKER ...]")
@@ -0,0 +1,465 @@
+"""
+range_index.py
+
+Purpose:
+    This module contains range query indexes over the full price history of one ticker.
+    They are built once, after which the best single trade, the longest upward/downward
+    run and the summary statistics (mean, variance, VWAP, volume) of any date range are
+    answered without rescanning the data, so moving the date range in app.py costs a few
+    array lookups.
+
+Classes:
+    - RangeQueryIndex(close: np.ndarray, index=None)
+    - RangeStatsIndex(close: np.ndarray, volume: np.ndarray, high: np.ndarray=None, low: np.ndarray=None, index=None)
+
+Functions:
+    - calendar_days(index) -> np.ndarray
+    - date_positions(days: np.ndarray, start_date, end_date) -> tuple[int, int]
+    - sparse_table_argmax(values: np.ndarray) -> list
+    - sparse_table_query(values: np.ndarray, table: list, first: int, last: int) -> int
+
+Notes:
+    - Longest runs use a sparse table over the streak lengths (O(n log n) build, O(1) query).
+    - The best trade needs the buy before the sell, which is not an idempotent merge, so it uses
+      a segment tree of (min, max, best trade) nodes instead (O(n) build, O(log n) query).
+    - Both structures are built level by level with NumPy, the only Python loops are over the levels.
+    - Range statistics are differences of prefix sums (O(n) build, O(1) query).
+    - Results match calculate_upward_and_Downward_runs() and a brute force scan of the filtered data.
+"""
+
+
+import numpy as np
+import pandas as pd
+from src.analytics_engine import streak_lengths
+
+
+def calendar_days(index) -> np.ndarray:
+    """
+    This function returns the calendar day (midnight, datetime64[ns]) of every row of a date index.
+
+    Args:
+        index (pd.Index): Row labels of the history.
+
+    Returns:
+        np.ndarray or None: The days, or None if the index does not hold dates.
+
+    Notes:
+        - Time zone aware indexes (yfinance history) keep their local wall time, so a row belongs to
+          the same day as in filter_dataframe_by_date_range().
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        return None
+    days = index.tz_localize(None) if index.tz is not None else index
+    return days.normalize().to_numpy()
+
+
+def date_positions(days: np.ndarray, start_date, end_date) -> tuple[int, int]:
+    """
+    This function converts an inclusive date range to the first and last row positions.
+
+    Args:
+        days (np.ndarray): Sorted calendar days of the rows (see calendar_days()).
+        start_date: First calendar day of the range (date, str or Timestamp).
+        end_date: Last calendar day of the range (date, str or Timestamp).
+
+    Returns:
+        tuple: The first and last row (last < first if no row falls in the range).
+
+    Raises:
+        ValueError: If days is None (the index does not hold dates).
+
+    Notes:
+        - Uses the same calendar day comparison as filter_dataframe_by_date_range(), with a binary search.
+    """
+    if days is None:
+        raise ValueError("Range queries by date need a DatetimeIndex")
+    first = int(np.searchsorted(days, np.datetime64(pd.Timestamp(start_date).normalize(), "ns"), side="left"))
+    last = int(np.searchsorted(days, np.datetime64(pd.Timestamp(end_date).normalize(), "ns"), side="right")) - 1
+    return first, last
+
+
+def sparse_table_argmax(values: np.ndarray) -> list:
+    """
+    This function builds a sparse table of range maximum positions.
+
+    Args:
+        values (np.ndarray): 1-D array.
+
+    Returns:
+        list: Level k holds, for every start i, the position of the first maximum of values[i : i + 2**k].
+    """
+    values = np.asarray(values)
+    table = [np.arange(values.shape[0])]
+    width = 1
+    while 2 * width <= values.shape[0]:
+        previous = table[-1]
+        left, right = previous[:-width], previous[width:]
+        # Keep the left position on ties, so the earliest maximum wins
+        table.append(np.where(values[left] >= values[right], left, right))
+        width *= 2
+    return table
+
+
+def sparse_table_query(values: np.ndarray, table: list, first: int, last: int) -> int:
+    """
+    This function returns the position of the first maximum of values[first : last + 1].
+
+    Args:
+        values (np.ndarray): The array the table was built from.
+        table (list): The result of sparse_table_argmax(values).
+        first (int): First position of the range.
+        last (int): Last position of the range (inclusive, last >= first).
+
+    Returns:
+        int: The position of the first maximum.
+
+    Notes:
+        - The two (possibly overlapping) blocks of size 2**k cover the range, so the query is O(1).
+        - first and last may be NumPy integers (e.g. from np.searchsorted()), they are cast to int.
+    """
+    first, last = int(first), int(last)
+    level = (last - first + 1).bit_length() - 1
+    left = table[level][first]
+    right = table[level][last - (1 << level) + 1]
+    return int(left if values[left] >= values[right] else right)
+
+
+class RangeQueryIndex:
+    """
+    Precomputed index answering best trade and longest run queries over any row or date range.
+
+    Attributes:
+        close (np.ndarray): The closing prices the index was built from.
+        index (pd.Index): Row labels (usually dates) returned in the query results.
+        size (int): Number of leaves of the segment tree (a power of two).
+    """
+
+    def __init__(self, close: np.ndarray, index=None):
+        self.close = np.asarray(close, dtype=float)
+        self.index = pd.RangeIndex(self.close.shape[0]) if index is None else pd.Index(index)
+        if len(self.index) != self.close.shape[0]:
+            raise ValueError("index and close must have the same length")
+
+        # Calendar day of every row, used to turn a date range into row positions
+        self._days = calendar_days(self.index)
+
+        self._build_runs()
+        self._build_trades()
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "RangeQueryIndex":
+        """
+        Build the index from a DataFrame with a 'Close' column, sorted by its (date) index.
+
+        Args:
+            df (pd.DataFrame): DataFrame containing stock data with a 'Close' column.
+
+        Returns:
+            RangeQueryIndex: The index, with the DataFrame index as row labels.
+        """
+        return cls(df["Close"].to_numpy(dtype=float), df.index)
+
+    def _build_runs(self) -> None:
+        """Streak lengths of the up and down moves, the next move ending each streak and their sparse tables."""
+        change = np.diff(self.close)
+        moves = change.shape[0]
+        self._streaks = {}
+        self._next_break = {}
+        self._tables = {}
+        for direction, mask in (("up", change > 0), ("down", change < 0)):
+            streaks = streak_lengths(mask)
+            # For every move, the first move at or after it that is not part of the streak
+            breaks = np.where(mask, moves, np.arange(moves))
+            self._streaks[direction] = streaks
+            self._next_break[direction] = np.minimum.accumulate(breaks[::-1])[::-1] if moves else breaks
+            self._tables[direction] = sparse_table_argmax(streaks)
+
+    def _build_trades(self) -> None:
+        """Segment tree whose nodes hold the lowest and highest close and the best trade of their rows."""
+        n = self.close.shape[0]
+        size = 1
+        while size < max(n, 1):
+            size *= 2
+        self.size = size
+
+        missing = np.isnan(self.close)
+        rows = np.arange(n)
+        self._low = np.full(2 * size, np.inf)
+        self._high = np.full(2 * size, -np.inf)
+        self._low_pos = np.full(2 * size, -1)
+        self._high_pos = np.full(2 * size, -1)
+        self._profit = np.zeros(2 * size)
+        self._buy = np.full(2 * size, -1)
+        self._sell = np.full(2 * size, -1)
+
+        # NaN prices can neither be bought nor sold
+        self._low[size:size + n] = np.where(missing, np.inf, self.close)
+        self._high[size:size + n] = np.where(missing, -np.inf, self.close)
+        self._low_pos[size:size + n] = rows
+        self._high_pos[size:size + n] = rows
+
+        width = size // 2
+        while width >= 1:
+            nodes = np.arange(width, 2 * width)
+            left, right = 2 * nodes, 2 * nodes + 1
+
+            take_left = self._low[left] <= self._low[right]
+            self._low[nodes] = np.where(take_left, self._low[left], self._low[right])
+            self._low_pos[nodes] = np.where(take_left, self._low_pos[left], self._low_pos[right])
+            take_left = self._high[left] >= self._high[right]
+            self._high[nodes] = np.where(take_left, self._high[left], self._high[right])
+            self._high_pos[nodes] = np.where(take_left, self._high_pos[left], self._high_pos[right])
+
+            # Best of: inside the left half, buying left and selling right, inside the right half
+            cross = self._high[right] - self._low[left]
+            use_left = self._profit[left] >= np.maximum(cross, self._profit[right])
+            use_cross = ~use_left & (cross >= self._profit[right])
+            self._profit[nodes] = np.select([use_left, use_cross], [self._profit[left], cross], self._profit[right])
+            self._buy[nodes] = np.select([use_left, use_cross], [self._buy[left], self._low_pos[left]], self._buy[right])
+            self._sell[nodes] = np.select([use_left, use_cross], [self._sell[left], self._high_pos[right]], self._sell[right])
+            width //= 2
+
+    def _node(self, node: int) -> tuple:
+        return (self._low[node], self._low_pos[node], self._high[node], self._high_pos[node],
+                self._profit[node], self._buy[node], self._sell[node])
+
+    @staticmethod
+    def _merge(left: tuple, right: tuple) -> tuple:
+        """Combine two adjacent summaries, left rows before right rows (same rules as the vectorized build)."""
+        low, low_pos = (left[0], left[1]) if left[0] <= right[0] else (right[0], right[1])
+        high, high_pos = (left[2], left[3]) if left[2] >= right[2] else (right[2], right[3])
+        cross = right[2] - left[0]
+        if left[4] >= max(cross, right[4]):
+            trade = left[4:]
+        elif cross >= right[4]:
+            trade = (cross, left[1], right[3])
+        else:
+            trade = right[4:]
+        return (low, low_pos, high, high_pos) + tuple(trade)
+
+    def positions(self, start_date, end_date) -> tuple[int, int]:
+        """Row positions of an inclusive date range, see date_positions()."""
+        return date_positions(self._days, start_date, end_date)
+
+    def best_trade(self, first: int, last: int) -> dict:
+        """
+        Best single buy followed by a sell within rows first..last.
+
+        Args:
+            first (int): First row of the range.
+            last (int): Last row of the range (inclusive).
+
+        Returns:
+            dict: 'profit' (0.0 if prices only fall), 'buy' and 'sell' (index labels, None without a profitable trade).
+
+        Notes:
+            - O(log n): the range is covered by at most 2 log n tree nodes, merged in order.
+        """
+        first, last = max(first, 0), min(last, self.close.shape[0] - 1)
+        if last <= first:
+            return {"profit": 0.0, "buy": None, "sell": None}
+
+        left_nodes, right_nodes = [], []
+        low, high = first + self.size, last + self.size + 1
+        while low < high:
+            if low & 1:
+                left_nodes.append(low)
+                low += 1
+            if high & 1:
+                high -= 1
+                right_nodes.append(high)
+            low //= 2
+            high //= 2
+
+        nodes = left_nodes + right_nodes[::-1]
+        summary = self._node(nodes[0])
+        for node in nodes[1:]:
+            summary = self._merge(summary, self._node(node))
+
+        profit, buy, sell = summary[4:]
+        if profit <= 0:
+            return {"profit": 0.0, "buy": None, "sell": None}
+        return {"profit": float(profit), "buy": self.index[buy], "sell": self.index[sell]}
+
+    def longest_run(self, first: int, last: int, direction: str="up") -> dict:
+        """
+        Longest run of consecutive up (or down) moves within rows first..last.
+
+        Args:
+            first (int): First row of the range.
+            last (int): Last row of the range (inclusive).
+            direction (str, optional): 'up' or 'down'. Defaults to 'up'.
+
+        Returns:
+            dict: 'length' (number of moves), 'start' and 'end' (index labels, None if there is no run),
+            the same as the longest run dictionaries of calculate_upward_and_Downward_runs().
+
+        Notes:
+            - O(1): the run that starts before the range is clipped at its first row, every later
+              run lies fully inside it, so its length is a sparse table range maximum.
+        """
+        if direction not in self._streaks:
+            raise ValueError(f"Unknown run direction: {direction}")
+        streaks = self._streaks[direction]
+        first, last = max(first, 0), min(last, self.close.shape[0] - 1)
+
+        # Move i goes from row i to row i + 1, so rows first..last hold moves first..last - 1
+        first_move, last_move = first, last - 1
+        if last_move < first_move:
+            return {"length": 0, "start": None, "end": None}
+
+        head_end = min(int(self._next_break[direction][first_move]), last_move + 1)
+        length, start_row = head_end - first_move, first_move
+
+        if head_end < last_move:
+            move = sparse_table_query(streaks, self._tables[direction], head_end + 1, last_move)
+            # Ties keep the earlier (clipped) run, like the first maximum in calculate_upward_and_Downward_runs()
+            if streaks[move] > length:
+                length, start_row = int(streaks[move]), move - int(streaks[move]) + 1
+
+        if length == 0:
+            return {"length": 0, "start": None, "end": None}
+        return {"length": int(length), "start": self.index[start_row], "end": self.index[start_row + length]}
+
+    def best_trade_between(self, start_date, end_date) -> dict:
+        """Best single trade between two dates (inclusive), see best_trade()."""
+        return self.best_trade(*self.positions(start_date, end_date))
+
+    def longest_run_between(self, start_date, end_date, direction: str="up") -> dict:
+        """Longest up or down run between two dates (inclusive), see longest_run()."""
+        return self.longest_run(*self.positions(start_date, end_date), direction)
+
+
+class RangeStatsIndex:
+    """
+    Prefix sums of close, close squared, volume and price x volume, answering range statistics in O(1).
+
+    Attributes:
+        index (pd.Index): Row labels (usually dates) of the history.
+        shift (float): Constant subtracted from the closes before summing (the first valid close).
+
+    Notes:
+        - The variance from sums of squares loses precision when the prices are large compared to their spread.
+          Summing close - shift instead keeps the two terms of the difference small.
+        - NaN closes are left out of the counts, means and variances. NaN volumes count as 0.
+    """
+
+    def __init__(self, close: np.ndarray, volume: np.ndarray, high: np.ndarray=None, low: np.ndarray=None, index=None):
+        close = np.asarray(close, dtype=float)
+        volume = np.nan_to_num(np.asarray(volume, dtype=float), nan=0.0)
+        self.index = pd.RangeIndex(close.shape[0]) if index is None else pd.Index(index)
+        if len(self.index) != close.shape[0] or volume.shape != close.shape:
+            raise ValueError("close, volume and index must have the same length")
+        self._days = calendar_days(self.index)
+
+        valid = ~np.isnan(close)
+        self.shift = float(close[valid][0]) if valid.any() else 0.0
+        centred = np.where(valid, close - self.shift, 0.0)
+
+        # Typical price, like calculate_VWAP(), when High and Low are available
+        price = close if high is None or low is None else (np.asarray(high, dtype=float) + np.asarray(low, dtype=float) + close) / 3
+        price_volume = np.nan_to_num(price * volume, nan=0.0)
+        traded_volume = np.where(np.isnan(price), 0.0, volume)
+
+        self._count = self._prefix(valid.astype(float))
+        self._close = self._prefix(centred)
+        self._close_squared = self._prefix(centred * centred)
+        self._volume = self._prefix(volume)
+        self._price_volume = self._prefix(price_volume)
+        self._traded_volume = self._prefix(traded_volume)
+
+    @staticmethod
+    def _prefix(values: np.ndarray) -> np.ndarray:
+        prefix = np.zeros(values.shape[0] + 1)
+        np.cumsum(values, out=prefix[1:])
+        return prefix
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "RangeStatsIndex":
+        """
+        Build the index from a DataFrame with 'Close' and 'Volume' (and optionally 'High' and 'Low') columns, sorted by its index.
+
+        Args:
+            df (pd.DataFrame): DataFrame containing stock data.
+
+        Returns:
+            RangeStatsIndex: The index, with the DataFrame index as row labels.
+        """
+        high = df["High"].to_numpy(dtype=float) if "High" in df.columns else None
+        low = df["Low"].to_numpy(dtype=float) if "Low" in df.columns else None
+        return cls(df["Close"].to_numpy(dtype=float), df["Volume"].to_numpy(dtype=float), high, low, df.index)
+
+    def positions(self, start_date, end_date) -> tuple[int, int]:
+        """Row positions of an inclusive date range, see date_positions()."""
+        return date_positions(self._days, start_date, end_date)
+
+    def stats(self, first: int, last: int) -> dict:
+        """
+        Summary statistics of rows first..last.
+
+        Args:
+            first (int): First row of the range.
+            last (int): Last row of the range (inclusive).
+
+        Returns:
+            dict: 'count' (valid closes), 'mean', 'variance' and 'std' of the close (sample, ddof=1, like pandas),
+            'total_volume' and 'vwap'. Values that are undefined for the range are NaN.
+        """
+        first, last = max(first, 0), min(last, len(self.index) - 1)
+        if last < first:
+            return {"count": 0, "mean": np.nan, "variance": np.nan, "std": np.nan, "total_volume": 0.0, "vwap": np.nan}
+
+        stop = last + 1
+        count = self._count[stop] - self._count[first]
+        total = self._close[stop] - self._close[first]
+        total_squared = self._close_squared[stop] - self._close_squared[first]
+        total_volume = self._volume[stop] - self._volume[first]
+        traded_volume = self._traded_volume[stop] - self._traded_volume[first]
+
+        mean = self.shift + total / count if count else np.nan
+        # Clip tiny negative values left by rounding
+        variance = max(total_squared - total * total / count, 0.0) / (count - 1) if count > 1 else np.nan
+        vwap = (self._price_volume[stop] - self._price_volume[first]) / traded_volume if traded_volume else np.nan
+
+        return {
+            "count": int(count),
+            "mean": float(mean),
+            "variance": float(variance),
+            "std": float(np.sqrt(variance)),
+            "total_volume": float(total_volume),
+            "vwap": float(vwap),
+        }
+
+    def sma(self, window: int, last: int) -> float:
+        """
+        Simple Moving Average of the 'window' closes ending at row last.
+
+        Args:
+            window (int): Number of rows in the average.
+            last (int): Row the window ends at (inclusive).
+
+        Returns:
+            float: The average, or NaN if the window starts before the first row or holds a NaN close
+            (the same as Series.rolling(window).mean()).
+
+        Notes:
+            - This differs from calculate_SMA() (sma_array in src/indicator_engine.py), which counts a
+              NaN close as 0. For closes [nan, 2, 3, 4, 5] and window 2 the index gives NaN at row 1,
+              while calculate_SMA() gives [nan, 1.0, 2.5, 3.5, 4.5].
+        """
+        first = last - window + 1
+        if window < 1 or first < 0 or last >= len(self.index):
+            return np.nan
+        if self._count[last + 1] - self._count[first] < window:
+            return np.nan
+        return float(self.shift + (self._close[last + 1] - self._close[first]) / window)
+
+    def stats_between(self, start_date, end_date) -> dict:
+        """Summary statistics between two dates (inclusive), see stats()."""
+        return self.stats(*self.positions(start_date, end_date))
+
+    def sma_at(self, date, window: int) -> float:
+        """Simple Moving Average of the 'window' closes ending at the last row on or before date, see sma()."""
+        # The last row of the one day range is the last row on or before date
+        _, last = self.positions(date, date)
+        return self.sma(window, last)
@@ -5,23 +5,114 @@ Purpose:
     This module is responsible for running the data loading functions to fetch and update stock data.
 
 Functions:
-    Functions are from the data_loader module
+    - refresh_history(ticker: str) -> int
+    - refresh_indicators(ticker: str, new_rows: pd.DataFrame) -> int
+    - refresh_latest_price(ticker: str) -> float
+    - run(tickers: list=config.TICKERS, max_workers: int=config.REFRESH_WORKERS) -> RefreshReport
+    Other functions are from the data_loader, streaming_indicators and universe_refresh modules
 
 Notes:
     It uses functions from the data_loader module to fetch historical stock data and the latest prices.
+    After each update, the streaming indicator state saved next to the CSV is carried forward
+    with only the new rows and the row count of the CSV sidecar, so the history is not read again.
+    Histories are first downloaded in batched multi-ticker requests (fetch_stock_data_batch), then
+    tickers are refreshed concurrently in a thread pool (see src/universe_refresh.py), with per host
+    rate limiting, retries and timeouts, and a summary report is printed at the end. Tickers whose
+    batch failed are downloaded one by one in the pool.
+    Run it from the project root with: python -m src.run_loader [--workers N] [--serial] [--no-batch]
 """
 
 
 
-from data_loader import fetch_stock_data, fetch_latest_price
-import config
+import sys
+import pandas as pd
+from src.data_loader import fetch_stock_data, fetch_stock_data_batch, fetch_latest_price, history_rows
+from src.streaming_indicators import update_indicator_state
+from src.universe_refresh import refresh_universe
+import src.config as config
 
-# Incrementally update historical data for all tickers
-for ticker in config.TICKERS:
-    df = fetch_stock_data(ticker)
-    print(f"{ticker} now has {len(df)} rows")
 
-# Update latest prices
-for ticker in config.TICKERS:
+def refresh_history(ticker: str) -> int:
+    """
+    This function incrementally updates the history of a ticker and carries its indicator state forward.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+
+    Returns:
+        int: The number of rows in the history.
+
+    Raises:
+        LookupError: If the provider returned no rows for weekdays that have ended since the last stored date,
+            so the refresh is retried and reported as failed instead of ok.
+    """
+    new_rows = fetch_stock_data(ticker, require_data=True, return_history=False)
+    rows = history_rows(ticker)
+
+    # Carry the indicator state forward with the new rows only
+    state = update_indicator_state(ticker, new_rows, rows=rows)
+    print(f"{ticker} now has {rows} rows, indicators up to {state.get('last_date')}")
+    return rows
+
+
+def refresh_indicators(ticker: str, new_rows: pd.DataFrame) -> int:
+    """
+    This function carries the indicator state of a ticker forward after its history was updated by a batch download.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+        new_rows (pd.DataFrame): The rows the batch download added, as returned by fetch_stock_data_batch().
+
+    Returns:
+        int: The number of rows in the history.
+    """
+    rows = history_rows(ticker)
+    state = update_indicator_state(ticker, new_rows, rows=rows)
+    print(f"{ticker} now has {rows} rows, indicators up to {state.get('last_date')}")
+    return rows
+
+
+def refresh_latest_price(ticker: str) -> float:
+    """
+    This function updates the latest price of a ticker.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+
+    Returns:
+        float: The latest price.
+    """
     price = fetch_latest_price(ticker)
     print(f"{ticker} latest price: {price}")
+    return price
+
+
+def run(tickers: list=config.TICKERS, max_workers: int=config.REFRESH_WORKERS, batch: bool=config.REFRESH_BATCH_DOWNLOAD):
+    """
+    This function refreshes the history and the latest price of every ticker and prints a summary.
+
+    Args:
+        tickers (list, optional): The tickers to refresh. Defaults to config.TICKERS.
+        max_workers (int, optional): Size of the thread pool, 1 refreshes one task at a time. Defaults to config.REFRESH_WORKERS.
+        batch (bool, optional): Download the histories in batched requests first. Defaults to config.REFRESH_BATCH_DOWNLOAD.
+
+    Returns:
+        RefreshReport: The outcome of every task.
+    """
+    batched = fetch_stock_data_batch(tickers) if batch else {}
+
+    def history(ticker):
+        return refresh_indicators(ticker, batched[ticker]) if ticker in batched else refresh_history(ticker)
+
+    report = refresh_universe(tickers, {"history": history, "latest": refresh_latest_price}, max_workers=max_workers)
+    print(report.format())
+    return report
+
+
+if __name__ == "__main__":
+    workers = config.REFRESH_WORKERS
+    if "--serial" in sys.argv:
+        workers = 1
+    elif "--workers" in sys.argv:
+        workers = int(sys.argv[sys.argv.index("--workers") + 1])
+    run(max_workers=workers, batch="--no-batch" not in sys.argv and config.REFRESH_BATCH_DOWNLOAD)
@@ -0,0 +1,650 @@
+"""
+streaming_indicators.py
+
+Purpose:
+    This module implements incremental (streaming) versions of the technical indicators.
+    Each calculator keeps a small state and folds in one new bar at a time in O(1), so a
+    daily update does not need to recompute the indicators over the full history.
+
+Classes:
+    - StreamingSMA(window: int)
+    - StreamingEMA(window: int)
+    - StreamingRSI(window: int)
+    - StreamingMACD(short_period: int=12, long_period: int=26, signal_period: int=9)
+    - StreamingVWAP()
+    - RollingExtreme(window: int, highest: bool=True)
+    - StreamingDonchian(window: int=20)
+    - StreamingStochastic(window: int=14, smooth_period: int=3)
+    - StreamingWilliamsR(window: int=14)
+    - StreamingAnchoredVWAP(period: str="M")
+    - StreamingRollingVWAP(window: int=20)
+
+Functions:
+    - indicator_from_dict(data: dict) -> StreamingIndicator
+    - build_streaming_indicators(selected_indicators: list=TECHNICAL_INDICATOR_OPTIONS) -> dict
+    - load_indicator_state(ticker: str) -> dict
+    - save_indicator_state(ticker: str, state: dict) -> None
+    - update_indicator_state(ticker: str, df: pd.DataFrame, selected_indicators: list=TECHNICAL_INDICATOR_OPTIONS, rows: int=None) -> dict
+
+Notes:
+    - Every calculator implements update(bar) -> dict (abstract in StreamingIndicator), where bar is a mapping with at least 'Close'
+      (the VWAPs also need 'High', 'Low' and 'Volume', plus 'Date' for the anchored VWAP, and the
+      channel indicators 'High' and 'Low'). The returned dict uses the same column
+      names as src/technical_indicators.py, with None until there is enough data.
+    - The formulas and warm-up rules are the same as the full recompute, so folding in a
+      history bar by bar gives the same values as the calculate_* functions.
+    - Rolling highs and lows use a monotonic deque (RollingExtreme), O(1) amortized per bar.
+    - Calculators are dataclasses and serialize to plain JSON through to_dict()/from_dict().
+      The state of a ticker is saved as data/CSV/{ticker}_indicators.json next to its CSV.
+"""
+
+
+import json
+import math
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from functools import partial
+import numpy as np
+import pandas as pd
+from src.config import *
+from src.indicator_engine import period_keys
+from src.price_store import load_price_history
+
+
+def _value_or_none(value: float):
+    """Convert NaN to None so that outputs look like the warm-up rows."""
+    return None if value is None or math.isnan(value) else value
+
+
+def _json_fields(items: list) -> dict:
+    """dict_factory for asdict(): deques are not JSON serializable, so they are stored as lists."""
+    return {key: list(value) if isinstance(value, deque) else value for key, value in items}
+
+
+class StreamingIndicator(ABC):
+    """
+    Base class for the streaming calculators. Subclasses are dataclasses holding their state.
+    """
+
+    @abstractmethod
+    def update(self, bar) -> dict:
+        """Fold one bar in and return the new indicator values (None during warm-up)."""
+
+    def to_dict(self) -> dict:
+        """Return the state as a JSON serializable dictionary (deques become lists)."""
+        return {"type": type(self).__name__, **asdict(self, dict_factory=_json_fields)}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Rebuild a calculator from the output of to_dict()."""
+        fields = {key: value for key, value in data.items() if key != "type"}
+        return cls(**fields)
+
+
+@dataclass
+class StreamingSMA(StreamingIndicator):
+    """
+    Simple Moving Average over the last 'window' closes, kept as a ring buffer and a running sum.
+    """
+    window: int
+    buffer: list = field(default_factory=list)
+    position: int = 0
+    total: float = 0.0
+
+    def update(self, bar) -> dict:
+        close = float(bar["Close"])
+        # NaN counts as 0 in the window sum, the same as calculate_SMA
+        value = 0.0 if math.isnan(close) else close
+
+        if len(self.buffer) < self.window:
+            self.buffer.append(value)
+            self.total += value
+        else:
+            self.total += value - self.buffer[self.position]
+            self.buffer[self.position] = value
+            self.position = (self.position + 1) % self.window
+            # Re-sum once per full cycle so rounding errors in the running sum cannot build up (amortized O(1))
+            if self.position == 0:
+                self.total = math.fsum(self.buffer)
+
+        average = self.total / self.window if len(self.buffer) == self.window else None
+        return {f"SMA_{self.window}": average}
+
+
+@dataclass
+class StreamingEMA(StreamingIndicator):
+    """
+    Exponential Moving Average seeded with the average of the first 'window' closes.
+    """
+    window: int
+    column: str = "Close"
+    count: int = 0
+    seed_sum: float = 0.0
+    value: float = None
+
+    def step(self, price: float) -> float:
+        """Fold one price into the EMA and return the new EMA (None during warm-up)."""
+        self.count += 1
+        if self.count < self.window:
+            self.seed_sum += price
+            return None
+        if self.count == self.window:
+            self.seed_sum += price
+            self.value = self.seed_sum / self.window
+        else:
+            k = 2 / (self.window + 1)
+            self.value = (price - self.value) * k + self.value
+        return self.value
+
+    def update(self, bar) -> dict:
+        return {f"EMA_{self.window}": _value_or_none(self.step(float(bar[self.column])))}
+
+
+@dataclass
+class StreamingRSI(StreamingIndicator):
+    """
+    Relative Strength Index with Wilder's smoothing of the average gains and losses.
+    """
+    window: int
+    previous_close: float = None
+    count: int = 0
+    gain_sum: float = 0.0
+    loss_sum: float = 0.0
+    avg_gain: float = None
+    avg_loss: float = None
+
+    def update(self, bar) -> dict:
+        close = float(bar["Close"])
+        previous_close, self.previous_close = self.previous_close, close
+        if previous_close is None:
+            return {"RSI": None}
+
+        change = close - previous_close
+        # Positive changes -> gains, everything else (including NaN) -> losses
+        gain, loss = (change, 0.0) if change > 0 else (0.0, -change)
+
+        self.count += 1
+        if self.count < self.window:
+            self.gain_sum += gain
+            self.loss_sum += loss
+            return {"RSI": None}
+        if self.count == self.window:
+            self.avg_gain = (self.gain_sum + gain) / self.window
+            self.avg_loss = (self.loss_sum + loss) / self.window
+        else:
+            self.avg_gain = ((self.avg_gain * (self.window - 1)) + gain) / self.window
+            self.avg_loss = ((self.avg_loss * (self.window - 1)) + loss) / self.window
+
+        if self.avg_loss == 0:
+            return {"RSI": 100.0}
+        rs = self.avg_gain / self.avg_loss
+        return {"RSI": _value_or_none(100 - (100 / (1 + rs)))}
+
+
+@dataclass
+class StreamingMACD(StreamingIndicator):
+    """
+    MACD line (short EMA - long EMA), its signal line and the histogram.
+    """
+    short_period: int = 12
+    long_period: int = 26
+    signal_period: int = 9
+    short_ema: StreamingEMA = None
+    long_ema: StreamingEMA = None
+    signal_count: int = 0
+    signal: float = None
+    signal_weight: float = 1.0
+
+    def __post_init__(self):
+        if self.short_ema is None:
+            self.short_ema = StreamingEMA(self.short_period)
+        if self.long_ema is None:
+            self.long_ema = StreamingEMA(self.long_period)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        fields = {key: value for key, value in data.items() if key != "type"}
+        fields["short_ema"] = StreamingEMA(**fields["short_ema"])
+        fields["long_ema"] = StreamingEMA(**fields["long_ema"])
+        return cls(**fields)
+
+    def update(self, bar) -> dict:
+        price = float(bar["Close"])
+        short_value = self.short_ema.step(price)
+        long_value = self.long_ema.step(price)
+        if short_value is None or long_value is None:
+            return {"MACD": None, "Signal_Line": None, "MACD_Histogram": None}
+
+        macd = short_value - long_value
+
+        # Signal line follows pandas' ewm(span=signal_period, adjust=False, min_periods=signal_period): a NaN MACD
+        # keeps the signal and is not counted for min_periods, but the bar still decays the weight of the signal
+        alpha = 2 / (self.signal_period + 1)
+        if self.signal is not None:
+            self.signal_weight *= 1 - alpha
+        if not math.isnan(macd):
+            self.signal_count += 1
+            if self.signal is None:
+                self.signal = macd
+            else:
+                self.signal = (self.signal_weight * self.signal + alpha * macd) / (self.signal_weight + alpha)
+            self.signal_weight = 1.0
+
+        if self.signal_count < self.signal_period:
+            return {"MACD": _value_or_none(macd), "Signal_Line": None, "MACD_Histogram": None}
+        return {
+            "MACD": _value_or_none(macd),
+            "Signal_Line": _value_or_none(self.signal),
+            "MACD_Histogram": _value_or_none(macd - self.signal),
+        }
+
+
+@dataclass
+class StreamingVWAP(StreamingIndicator):
+    """
+    Cumulative Volume Weighted Average Price from the first bar seen.
+    """
+    total_vol: float = 0.0
+    total_vol_price: float = 0.0
+
+    def update(self, bar) -> dict:
+        volume = float(bar["Volume"])
+        price = (float(bar["High"]) + float(bar["Low"]) + float(bar["Close"])) / 3
+        price_volume = price * volume
+
+        # NaN rows are skipped in the cumulative sums, the same as pandas' cumsum()
+        if not math.isnan(volume):
+            self.total_vol += volume
+        if math.isnan(price_volume):
+            return {"VWAP": None}
+        self.total_vol_price += price_volume
+
+        if self.total_vol == 0:
+            return {"VWAP": None}
+        return {"VWAP": self.total_vol_price / self.total_vol}
+
+
+@dataclass
+class RollingExtreme:
+    """
+    Highest (or lowest) value of the last 'window' values, kept as a monotonic deque.
+
+    entries holds [position, value] pairs with decreasing values (increasing for the lowest), so the
+    front is always the current extreme. Each value is appended and removed at most once: O(1) amortized.
+    """
+    window: int
+    highest: bool = True
+    count: int = 0
+    last_nan: int = -1
+    entries: deque = field(default_factory=deque)
+
+    def __post_init__(self):
+        # from_dict() passes the entries back as a list
+        self.entries = deque(self.entries)
+
+    def step(self, value: float) -> float:
+        """Fold one value in and return the extreme of the window (None during warm-up or if the window holds a NaN)."""
+        position = self.count
+        self.count += 1
+
+        if math.isnan(value):
+            self.last_nan = position
+        else:
+            # Drop values that can never be the extreme again, they are older and not better than the new one
+            while self.entries and (self.entries[-1][1] <= value if self.highest else self.entries[-1][1] >= value):
+                self.entries.pop()
+            self.entries.append([position, value])
+
+        # Drop the front once it falls out of the window
+        while self.entries and self.entries[0][0] <= position - self.window:
+            self.entries.popleft()
+
+        # A NaN inside the window gives NaN, the same as rolling_max_array/rolling_min_array
+        if self.count < self.window or self.last_nan > position - self.window:
+            return None
+        return self.entries[0][1]
+
+
+def _extremes_from_dict(fields: dict) -> dict:
+    """Rebuild the nested RollingExtreme states of a channel calculator."""
+    fields = {key: value for key, value in fields.items() if key != "type"}
+    fields["highest_high"] = RollingExtreme(**fields["highest_high"])
+    fields["lowest_low"] = RollingExtreme(**fields["lowest_low"])
+    return fields
+
+
+@dataclass
+class StreamingDonchian(StreamingIndicator):
+    """
+    Donchian channel: highest high, lowest low and their average over the last 'window' bars.
+    """
+    window: int = 20
+    highest_high: RollingExtreme = None
+    lowest_low: RollingExtreme = None
+
+    def __post_init__(self):
+        if self.highest_high is None:
+            self.highest_high = RollingExtreme(self.window, highest=True)
+        if self.lowest_low is None:
+            self.lowest_low = RollingExtreme(self.window, highest=False)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(**_extremes_from_dict(data))
+
+    def update(self, bar) -> dict:
+        upper = self.highest_high.step(float(bar["High"]))
+        lower = self.lowest_low.step(float(bar["Low"]))
+        middle = (upper + lower) / 2 if upper is not None and lower is not None else None
+        return {"Donchian_Upper": upper, "Donchian_Lower": lower, "Donchian_Middle": middle}
+
+
+@dataclass
+class StreamingStochastic(StreamingIndicator):
+    """
+    Stochastic Oscillator %K over the last 'window' bars and %D, the average of the last 'smooth_period' %K values.
+    """
+    window: int = 14
+    smooth_period: int = 3
+    highest_high: RollingExtreme = None
+    lowest_low: RollingExtreme = None
+    recent_k: deque = field(default_factory=deque)
+
+    def __post_init__(self):
+        # The oldest %K drops out on append, from_dict() passes the values back as a list
+        self.recent_k = deque(self.recent_k, maxlen=self.smooth_period)
+        if self.highest_high is None:
+            self.highest_high = RollingExtreme(self.window, highest=True)
+        if self.lowest_low is None:
+            self.lowest_low = RollingExtreme(self.window, highest=False)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(**_extremes_from_dict(data))
+
+    def update(self, bar) -> dict:
+        highest = self.highest_high.step(float(bar["High"]))
+        lowest = self.lowest_low.step(float(bar["Low"]))
+
+        percent_k = None
+        # A flat window has no range and gives None, the same as stochastic_from_extremes
+        if highest is not None and lowest is not None and highest > lowest:
+            percent_k = _value_or_none(100 * (float(bar["Close"]) - lowest) / (highest - lowest))
+
+        self.recent_k.append(percent_k)
+
+        percent_d = None
+        if len(self.recent_k) == self.smooth_period and None not in self.recent_k:
+            percent_d = sum(self.recent_k) / self.smooth_period
+        return {"Stochastic_K": percent_k, "Stochastic_D": percent_d}
+
+
+@dataclass
+class StreamingWilliamsR(StreamingIndicator):
+    """
+    Williams %R over the last 'window' bars.
+    """
+    window: int = 14
+    highest_high: RollingExtreme = None
+    lowest_low: RollingExtreme = None
+
+    def __post_init__(self):
+        if self.highest_high is None:
+            self.highest_high = RollingExtreme(self.window, highest=True)
+        if self.lowest_low is None:
+            self.lowest_low = RollingExtreme(self.window, highest=False)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(**_extremes_from_dict(data))
+
+    def update(self, bar) -> dict:
+        highest = self.highest_high.step(float(bar["High"]))
+        lowest = self.lowest_low.step(float(bar["Low"]))
+        if highest is None or lowest is None or highest == lowest:
+            return {"Williams_R": None}
+        return {"Williams_R": _value_or_none(-100 * (highest - float(bar["Close"])) / (highest - lowest))}
+
+
+@dataclass
+class StreamingAnchoredVWAP(StreamingIndicator):
+    """
+    VWAP accumulated since the start of the current day, week or month of the bar's 'Date'.
+    """
+    period: str = "M"
+    key: int = None
+    total_vol: float = 0.0
+    total_vol_price: float = 0.0
+
+    def update(self, bar) -> dict:
+        date = pd.Timestamp(bar["Date"])
+        if date.tz is not None:
+            date = date.tz_localize(None)
+        key = int(period_keys(np.array([date.to_datetime64()]), self.period)[0])
+
+        # A new period resets the sums, the same as a segment start in anchored_vwap_array
+        if key != self.key:
+            self.key = key
+            self.total_vol = self.total_vol_price = 0.0
+
+        volume = float(bar["Volume"])
+        price_volume = (float(bar["High"]) + float(bar["Low"]) + float(bar["Close"])) / 3 * volume
+        if not math.isnan(volume):
+            self.total_vol += volume
+        if math.isnan(price_volume):
+            return {f"VWAP_{self.period}": None}
+        self.total_vol_price += price_volume
+
+        if self.total_vol == 0:
+            return {f"VWAP_{self.period}": None}
+        return {f"VWAP_{self.period}": self.total_vol_price / self.total_vol}
+
+
+@dataclass
+class StreamingRollingVWAP(StreamingIndicator):
+    """
+    VWAP over the last 'window' bars, kept as ring buffers of price x volume and volume with running sums.
+    """
+    window: int = 20
+    price_volumes: list = field(default_factory=list)
+    volumes: list = field(default_factory=list)
+    position: int = 0
+    total_vol: float = 0.0
+    total_vol_price: float = 0.0
+
+    def update(self, bar) -> dict:
+        volume = float(bar["Volume"])
+        price_volume = (float(bar["High"]) + float(bar["Low"]) + float(bar["Close"])) / 3 * volume
+        # NaN counts as 0 in the window sums, the same as rolling_vwap_array
+        new_vol = 0.0 if math.isnan(volume) else volume
+        new_vol_price = 0.0 if math.isnan(price_volume) else price_volume
+
+        if len(self.volumes) < self.window:
+            self.volumes.append(new_vol)
+            self.price_volumes.append(new_vol_price)
+            self.total_vol += new_vol
+            self.total_vol_price += new_vol_price
+        else:
+            self.total_vol += new_vol - self.volumes[self.position]
+            self.total_vol_price += new_vol_price - self.price_volumes[self.position]
+            self.volumes[self.position] = new_vol
+            self.price_volumes[self.position] = new_vol_price
+            self.position = (self.position + 1) % self.window
+            # Re-sum once per full cycle so rounding errors in the running sums cannot build up
+            if self.position == 0:
+                self.total_vol = math.fsum(self.volumes)
+                self.total_vol_price = math.fsum(self.price_volumes)
+
+        if len(self.volumes) < self.window or math.isnan(price_volume) or self.total_vol == 0:
+            return {f"VWAP_{self.window}": None}
+        return {f"VWAP_{self.window}": self.total_vol_price / self.total_vol}
+
+
+STREAMING_CLASSES = {
+    cls.__name__: cls for cls in (
+        StreamingSMA, StreamingEMA, StreamingRSI, StreamingMACD, StreamingVWAP,
+        StreamingDonchian, StreamingStochastic, StreamingWilliamsR, StreamingAnchoredVWAP, StreamingRollingVWAP,
+    )
+}
+
+
+def indicator_from_dict(data: dict) -> StreamingIndicator:
+    """
+    This function rebuilds a streaming calculator from its serialized state.
+
+    Args:
+        data (dict): The output of StreamingIndicator.to_dict().
+
+    Returns:
+        StreamingIndicator: The calculator with its state restored.
+
+    Raises:
+        ValueError: If the 'type' field does not name a known streaming calculator.
+    """
+    cls = STREAMING_CLASSES.get(data.get("type"))
+    if cls is None:
+        raise ValueError(f"Unknown streaming indicator type: {data.get('type')}")
+    return cls.from_dict(data)
+
+
+"""
+    STREAMING_INDICATORS mirrors the TECHNICAL_INDICATORS dictionary in src/technical_indicators.py.
+    Each entry creates a fresh calculator with the same parameters as the batch function.
+"""
+
+STREAMING_INDICATORS = {
+    SMA_20: partial(StreamingSMA, window=20),
+    SMA_50: partial(StreamingSMA, window=50),
+    SMA_200: partial(StreamingSMA, window=200),
+    RSI_14: partial(StreamingRSI, window=14),
+    MACD: partial(StreamingMACD, short_period=12, long_period=26, signal_period=9),
+    VWAP: partial(StreamingVWAP),
+    EMA12: partial(StreamingEMA, window=12),
+    EMA26: partial(StreamingEMA, window=26),
+    DONCHIAN_20: partial(StreamingDonchian, window=20),
+    STOCHASTIC: partial(StreamingStochastic, window=14, smooth_period=3),
+    WILLIAMS_R: partial(StreamingWilliamsR, window=14),
+    VWAP_MONTHLY: partial(StreamingAnchoredVWAP, period="M"),
+    VWAP_20: partial(StreamingRollingVWAP, window=20)
+}
+
+
+def build_streaming_indicators(selected_indicators: list=TECHNICAL_INDICATOR_OPTIONS) -> dict:
+    """
+    This function creates fresh streaming calculators for the selected indicators.
+
+    Args:
+        selected_indicators (list, optional): Indicator names (keys of STREAMING_INDICATORS). Defaults to all options.
+
+    Returns:
+        dict: A dictionary mapping each indicator name to its calculator.
+    """
+    return {indicator: STREAMING_INDICATORS[indicator]() for indicator in selected_indicators}
+
+
+def _state_filename(ticker: str) -> str:
+    from src.data_loader import DATA_DIR
+    return os.path.join(DATA_DIR, f"{ticker}_indicators.json")
+
+
+def load_indicator_state(ticker: str) -> dict:
+    """
+    This function loads the saved streaming indicator state of a ticker.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+
+    Returns:
+        dict: A dictionary with 'last_date' (str), 'rows' (int), 'indicators' (name -> calculator)
+        and 'latest' (name -> last output). Returns an empty dictionary if no state is saved.
+    """
+    filename = _state_filename(ticker)
+    if not os.path.exists(filename):
+        return {}
+
+    with open(filename, "r") as file:
+        data = json.load(file)
+    data["indicators"] = {name: indicator_from_dict(state) for name, state in data["indicators"].items()}
+    return data
+
+
+def save_indicator_state(ticker: str, state: dict) -> None:
+    """
+    This function saves the streaming indicator state of a ticker next to its CSV file.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+        state (dict): The state dictionary, as returned by update_indicator_state().
+
+    Notes:
+        - The file is written to a temporary name and then renamed, so a crash never leaves a half written state.
+    """
+    filename = _state_filename(ticker)
+    data = dict(state)
+    data["indicators"] = {name: calculator.to_dict() for name, calculator in state["indicators"].items()}
+
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, "w") as file:
+        json.dump(data, file)
+    os.replace(temp_filename, filename)
+
+
+def update_indicator_state(ticker: str, df: pd.DataFrame, selected_indicators: list=TECHNICAL_INDICATOR_OPTIONS, rows: int=None) -> dict:
+    """
+    This function carries the streaming indicators of a ticker forward to the end of its history.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+        df (pd.DataFrame): The full stock history with 'Date', 'Close', 'High', 'Low' and 'Volume' columns,
+            e.g. the DataFrame returned by fetch_stock_data(), or only its newest rows if rows is given.
+        selected_indicators (list, optional): Indicators to maintain. Defaults to all options.
+        rows (int, optional): The number of rows of the whole history (e.g. the row count of the CSV sidecar),
+            when df holds only the rows added since the last update. Defaults to None (df is the whole history).
+
+    Returns:
+        dict: The updated state, with 'latest' holding the newest value of every indicator column.
+
+    Notes:
+        - Only rows dated after the saved 'last_date' are folded in, so a daily update costs O(new rows).
+          With rows given, the history is not read at all.
+        - If no state is saved yet, or the saved state tracks different indicators or does not line up
+          with the history, the state is rebuilt from the first row (with rows given, the whole history
+          is loaded with load_price_history() for that).
+    """
+    state = load_indicator_state(ticker)
+    if state and set(state["indicators"]) != set(selected_indicators):
+        state = {}
+
+    if rows is not None:
+        # The new rows line up if the saved state covers every row before them
+        if not (state
+                and state["rows"] + len(df) == rows
+                and (df.empty or pd.Timestamp(df["Date"].iloc[0]) > pd.Timestamp(state["last_date"]))):
+            df = load_price_history(ticker)
+            state = {}
+        new_rows = df
+    elif state:
+        dates = pd.to_datetime(df["Date"])
+        if int((dates <= pd.Timestamp(state["last_date"])).sum()) == state["rows"]:
+            new_rows = df.loc[dates > pd.Timestamp(state["last_date"])]
+        else:
+            state = {}
+
+    if not state:
+        if df.empty:
+            return {}
+        state = {"last_date": None, "rows": 0, "indicators": build_streaming_indicators(selected_indicators), "latest": {}}
+        new_rows = df
+
+    for bar in new_rows.to_dict("records"):
+        for calculator in state["indicators"].values():
+            state["latest"].update(calculator.update(bar))
+
+    if not new_rows.empty:
+        state["last_date"] = pd.Timestamp(new_rows["Date"].iloc[-1]).strftime("%Y-%m-%d")
+        state["rows"] += len(new_rows)
+        save_indicator_state(ticker, state)
+
+    return state
@@ -0,0 +1,101 @@
+"""
+streamlit_adapter.py
+
+Purpose:
+    This module is the thin Streamlit layer over the headless indicator core in
+    src/technical_indicators.py. It runs the indicator functions and shows their
+    structured warnings and errors as messages in the UI.
+
+Functions:
+    - show_indicator_warnings(caught: list) -> None
+    - apply_selected_technical_indicators_with_alerts(df: pd.DataFrame, selected_indicators: list) -> pd.DataFrame
+    - run_indicator_with_alerts(indicator_function, df: pd.DataFrame) -> pd.DataFrame
+    - cached_range_index(stock_name: str, data: pd.DataFrame, index_class=RangeQueryIndex)
+
+Notes:
+    Only the Streamlit pages import this module, so batch jobs (run_loader.py, validation.py)
+    and worker processes never pay the Streamlit import cost.
+"""
+
+
+import warnings
+import pandas as pd
+import streamlit as st
+from src.technical_indicators import (
+    InsufficientDataError, InsufficientDataWarning, apply_selected_technical_indicators,
+)
+from src.range_index import RangeQueryIndex, RangeStatsIndex
+
+
+def show_indicator_warnings(caught: list) -> None:
+    """
+    This function shows recorded InsufficientDataWarning messages with st.error. Any other warning is re-emitted unchanged.
+
+    Args:
+        caught (list): Warnings recorded by warnings.catch_warnings(record=True).
+    """
+    for warning in caught:
+        if issubclass(warning.category, InsufficientDataWarning):
+            st.error(str(warning.message))
+        else:
+            warnings.warn_explicit(warning.message, warning.category, warning.filename, warning.lineno)
+
+
+def apply_selected_technical_indicators_with_alerts(df: pd.DataFrame, selected_indicators: list) -> pd.DataFrame:
+    """
+    This function applies the selected technical indicators and shows a message for every indicator that has too few rows.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing stock data with necessary columns.
+        selected_indicators (list): List of technical indicators to apply.
+
+    Returns:
+        pd.DataFrame: The DataFrame returned by apply_selected_technical_indicators().
+    """
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", InsufficientDataWarning)
+        df = apply_selected_technical_indicators(df, selected_indicators)
+    show_indicator_warnings(caught)
+    return df
+
+
+def run_indicator_with_alerts(indicator_function, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    This function runs one indicator function (e.g. an entry of TECHNICAL_INDICATORS) and shows an error instead of raising when there is too little data.
+
+    Args:
+        indicator_function (callable): A function taking the DataFrame and returning it with the indicator columns.
+        df (pd.DataFrame): DataFrame containing stock data with necessary columns.
+
+    Returns:
+        pd.DataFrame: The DataFrame with the indicator columns, or the unchanged DataFrame if there was too little data.
+    """
+    try:
+        return indicator_function(df)
+    except InsufficientDataError as error:
+        st.error(str(error))
+        return df
+
+
+def cached_range_index(stock_name: str, data: pd.DataFrame, index_class=RangeQueryIndex):
+    """
+    This function returns a range index of the loaded history, building it only when a new history is loaded.
+
+    Args:
+        stock_name (str): Name of the loaded stock.
+        data (pd.DataFrame): The full history, indexed by date, with the columns the index reads.
+        index_class (type, optional): RangeQueryIndex or RangeStatsIndex. Defaults to RangeQueryIndex.
+
+    Returns:
+        RangeQueryIndex or RangeStatsIndex: The index kept in st.session_state.
+
+    Notes:
+        - The session key is the stock name, row count and first and last date, so a rerun caused by
+          moving the date range reuses the index without hashing the whole DataFrame.
+    """
+    key = (stock_name, len(data), data.index[0], data.index[-1]) if len(data) else (stock_name, 0)
+    name = f"range_index_{index_class.__name__}"
+    if st.session_state.get(f"{name}_key") != key:
+        st.session_state[name] = index_class.from_dataframe(data)
+        st.session_state[f"{name}_key"] = key
+    return st.session_state[name]
@@ -0,0 +1,222 @@
+"""
+synthetic_data.py
+
+Purpose:
+    This module generates synthetic daily OHLCV histories for load and scaling tests. Prices follow a
+    geometric Brownian motion with Poisson jumps (Merton jump diffusion) and volumes rise on large moves.
+    The rows have the schema of the data/CSV files (Date, Close, High, Low, Open, Volume).
+
+Functions:
+    - synthetic_ticker(index: int) -> str
+    - ticker_parameters(index: int, seed: int=SYNTHETIC_SEED) -> dict
+    - generate_ohlcv(index: int, rows: int, seed: int=SYNTHETIC_SEED, start_date: str=SYNTHETIC_START_DATE, chunk_rows: int=SYNTHETIC_CHUNK_ROWS) -> iterator of pd.DataFrame
+    - generate_universe(tickers: int, rows: int, seed: int=SYNTHETIC_SEED, start_date: str=SYNTHETIC_START_DATE, chunk_rows: int=SYNTHETIC_CHUNK_ROWS) -> iterator of (str, pd.DataFrame)
+    - write_synthetic_universe(directory, tickers: int, rows: int, seed: int=SYNTHETIC_SEED, file_format: str="csv", start_date: str=SYNTHETIC_START_DATE, chunk_rows: int=SYNTHETIC_CHUNK_ROWS) -> int
+
+Notes:
+    - Everything is generated in chunks of at most chunk_rows rows, so memory use does not depend on the
+      total size. A billion rows is e.g. 20,000 tickers of 50,000 rows, written one chunk at a time.
+    - Output is deterministic: the random numbers of every ticker and every block of SYNTHETIC_BLOCK_ROWS
+      rows come from their own streams seeded with (seed, ticker index, block index). The same seed gives the
+      same data whatever chunk_rows is, a longer history starts with the rows of a shorter one, and any
+      ticker can be generated on its own (e.g. in another process).
+    - Dates are business days (Monday to Friday) from start_date, so one ticker holds at most about
+      70,000 rows before the dates run past the year 2262 (the pandas limit).
+    - Run it from the project root with:
+      python -m src.synthetic_data TICKERS ROWS [--seed N] [--out DIR] [--store]
+"""
+
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+from src.config import *
+from src.price_store import store_filename, write_price_store
+
+# Trading days per year, used to scale the yearly drift and volatility to one day
+TRADING_DAYS = 252
+
+
+def synthetic_ticker(index: int) -> str:
+    """Returns the symbol of a synthetic ticker (e.g. 'SYN000042')."""
+    return f"SYN{index:06d}"
+
+
+def ticker_parameters(index: int, seed: int=SYNTHETIC_SEED) -> dict:
+    """
+    This function draws the model parameters of one ticker, so the universe mixes calm and volatile names.
+
+    Args:
+        index (int): The ticker number.
+        seed (int): The universe seed. Default is SYNTHETIC_SEED.
+
+    Returns:
+        dict: 'start_price', 'drift' (expected yearly log return, jumps included), 'volatility' (yearly), 'jump_intensity' (jumps per year),
+        'jump_mean' and 'jump_std' (of the log jump size) and 'base_volume' (shares per day).
+    """
+    rng = np.random.default_rng([seed, index])
+    return {
+        "start_price": float(np.exp(rng.uniform(np.log(5), np.log(500)))),
+        "drift": float(rng.normal(0.03, 0.02)),
+        "volatility": float(rng.uniform(0.15, 0.6)),
+        "jump_intensity": float(rng.uniform(0.0, 4.0)),
+        "jump_mean": float(rng.normal(-0.02, 0.02)),
+        "jump_std": float(rng.uniform(0.02, 0.1)),
+        "base_volume": float(np.exp(rng.uniform(np.log(1e5), np.log(5e7)))),
+    }
+
+
+def _block(seed: list, rows: int, last_close: float, params: dict) -> dict:
+    """
+    The price and volume columns of one block of rows, continuing from the previous close.
+
+    Every variate has its own random stream, so the first n rows are the same whatever the block length is.
+    """
+    normal, poisson, jump, gap, high_range, low_range, noise = [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(7)]
+    dt = 1.0 / TRADING_DAYS
+    sigma = params["volatility"]
+    # The drift is the expected log return, so the mean of the jumps is taken out of the diffusion
+    mean = (params["drift"] - params["jump_intensity"] * params["jump_mean"]) * dt
+    diffusion = mean + sigma * np.sqrt(dt) * normal.standard_normal(rows)
+    jumps = poisson.poisson(params["jump_intensity"] * dt, rows)
+    jump_sizes = params["jump_mean"] * jumps + params["jump_std"] * np.sqrt(jumps) * jump.standard_normal(rows)
+    log_returns = diffusion + jump_sizes
+
+    # Part of each day's move happens overnight, between the previous close and the open
+    overnight = log_returns * gap.uniform(0.0, 0.5, rows)
+    close = last_close * np.exp(np.cumsum(log_returns))
+    previous_close = np.concatenate(([last_close], close[:-1]))
+    open_ = previous_close * np.exp(overnight)
+
+    # High and low reach past the open and close by a half normal intraday range
+    intraday = sigma * np.sqrt(dt) * 0.5
+    high = np.maximum(open_, close) * np.exp(np.abs(high_range.standard_normal(rows)) * intraday)
+    low = np.minimum(open_, close) * np.exp(-np.abs(low_range.standard_normal(rows)) * intraday)
+
+    # More shares trade on days with large moves
+    activity = 1.0 + 2.0 * np.abs(log_returns) / (sigma * np.sqrt(dt))
+    volume = params["base_volume"] * activity * noise.lognormal(0.0, 0.3, rows)
+    return {"Close": close, "High": high, "Low": low, "Open": open_, "Volume": volume.astype(np.int64)}
+
+
+def generate_ohlcv(index: int, rows: int, seed: int=SYNTHETIC_SEED, start_date: str=SYNTHETIC_START_DATE, chunk_rows: int=SYNTHETIC_CHUNK_ROWS):
+    """
+    This function generates the history of one synthetic ticker in chunks.
+
+    Args:
+        index (int): The ticker number (its symbol is synthetic_ticker(index)).
+        rows (int): Number of trading days.
+        seed (int): The universe seed. Default is SYNTHETIC_SEED.
+        start_date (str): The first date ('YYYY-MM-DD', moved to the next business day if needed). Default is SYNTHETIC_START_DATE.
+        chunk_rows (int): Most rows per yielded DataFrame. Default is SYNTHETIC_CHUNK_ROWS.
+
+    Yields:
+        pd.DataFrame: Consecutive rows with the columns of the data/CSV files (Date, Close, High, Low, Open, Volume).
+
+    Raises:
+        ValueError: If rows or chunk_rows is negative or zero, or the dates would run past the pandas date limit.
+    """
+    if rows <= 0 or chunk_rows <= 0:
+        raise ValueError("rows and chunk_rows must be positive")
+    first_day = np.busday_offset(np.datetime64(start_date, "D"), 0, roll="forward")
+    if np.busday_offset(first_day, rows - 1) > np.datetime64(pd.Timestamp.max.date(), "D"):
+        raise ValueError(f"{rows} business days from {start_date} run past {pd.Timestamp.max.date()}")
+
+    params = ticker_parameters(index, seed)
+    last_close = params["start_price"]
+    pending, pending_rows, done = [], 0, 0
+    for block_index, block_start in enumerate(range(0, rows, SYNTHETIC_BLOCK_ROWS)):
+        block_rows = min(SYNTHETIC_BLOCK_ROWS, rows - block_start)
+        block = _block([seed, index, block_index], block_rows, last_close, params)
+        last_close = float(block["Close"][-1])
+        pending.append(block)
+        pending_rows += block_rows
+
+        # Yield full chunks, the rest waits for the next block (or the end)
+        last_block = block_start + block_rows == rows
+        if pending_rows < chunk_rows and not last_block:
+            continue
+        columns = {name: np.concatenate([part[name] for part in pending]) for name in pending[0]}
+        offset = 0
+        while pending_rows - offset >= chunk_rows or (last_block and offset < pending_rows):
+            size = min(chunk_rows, pending_rows - offset)
+            dates = np.busday_offset(first_day, np.arange(done, done + size))
+            yield pd.DataFrame({"Date": dates.astype("datetime64[ns]"), **{name: values[offset:offset + size] for name, values in columns.items()}})
+            offset += size
+            done += size
+        pending = [{name: values[offset:] for name, values in columns.items()}]
+        pending_rows -= offset
+
+
+def generate_universe(tickers: int, rows: int, seed: int=SYNTHETIC_SEED, start_date: str=SYNTHETIC_START_DATE, chunk_rows: int=SYNTHETIC_CHUNK_ROWS):
+    """
+    This function generates the histories of a synthetic universe, one ticker after the other.
+
+    Args:
+        tickers (int): Number of tickers.
+        rows (int): Number of trading days per ticker.
+        seed (int): The universe seed. Default is SYNTHETIC_SEED.
+        start_date (str): The first date. Default is SYNTHETIC_START_DATE.
+        chunk_rows (int): Most rows per yielded DataFrame. Default is SYNTHETIC_CHUNK_ROWS.
+
+    Yields:
+        tuple: (ticker symbol, pd.DataFrame chunk in the data/CSV schema).
+    """
+    for index in range(tickers):
+        ticker = synthetic_ticker(index)
+        for chunk in generate_ohlcv(index, rows, seed=seed, start_date=start_date, chunk_rows=chunk_rows):
+            yield ticker, chunk
+
+
+def write_synthetic_universe(directory, tickers: int, rows: int, seed: int=SYNTHETIC_SEED, file_format: str="csv", start_date: str=SYNTHETIC_START_DATE, chunk_rows: int=SYNTHETIC_CHUNK_ROWS) -> int:
+    """
+    This function writes a synthetic universe to disk, one chunk at a time.
+
+    Args:
+        directory (str or Path): The output folder (created if needed).
+        tickers (int): Number of tickers.
+        rows (int): Number of trading days per ticker.
+        seed (int): The universe seed. Default is SYNTHETIC_SEED.
+        file_format (str): "csv" for '{ticker}.csv' files like data/CSV, "store" for binary price store
+            files like data/STORE (see src/price_store.py). Default is "csv".
+        start_date (str): The first date. Default is SYNTHETIC_START_DATE.
+        chunk_rows (int): Most rows held in memory at once. Default is SYNTHETIC_CHUNK_ROWS.
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        ValueError: If file_format is not "csv" or "store".
+    """
+    if file_format not in ("csv", "store"):
+        raise ValueError(f"Unknown file format: {file_format}")
+    directory = str(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    written, current, store = 0, None, None
+    for ticker, chunk in generate_universe(tickers, rows, seed=seed, start_date=start_date, chunk_rows=chunk_rows):
+        first = ticker != current
+        current = ticker
+        if file_format == "csv":
+            filename = os.path.join(directory, f"{ticker}.csv")
+            chunk.to_csv(filename, mode="w" if first else "a", header=first, index=False, date_format="%Y-%m-%d")
+        elif first:
+            # The store has room for every row, so the following chunks are appended in place
+            store = write_price_store(store_filename(ticker, directory), chunk, capacity=rows)
+        else:
+            store.append(chunk)
+        written += len(chunk)
+    return written
+
+
+if __name__ == "__main__":
+    # Example: python -m src.synthetic_data 1000 5000 --seed 7 --out data/SYNTHETIC --store
+    if len(sys.argv) < 3:
+        print("Usage: python -m src.synthetic_data TICKERS ROWS [--seed N] [--out DIR] [--store]")
+        sys.exit(1)
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else SYNTHETIC_SEED
+    out = sys.argv[sys.argv.index("--out") + 1] if "--out" in sys.argv else SYNTHETIC_DIR
+    file_format = "store" if "--store" in sys.argv else "csv"
+    total = write_synthetic_universe(out, int(sys.argv[1]), int(sys.argv[2]), seed=seed, file_format=file_format)
+    print(f"✅ {total} rows written to {out}")
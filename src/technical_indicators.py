@@ -5,31 +5,102 @@ Purpose:
     This module implements calculations for various technical indicators
     used in stock market analysis.
 
+Classes:
+    - InsufficientDataError(indicator: str, min_rows: int, rows: int)
+    - InsufficientDataWarning(indicator: str, min_rows: int, rows: int)
+
 Functions:
+    - insufficient_data_message(indicator: str, min_rows: int) -> str
     - calculate_RSI(df: pd.DataFrame, time_period: int) -> pd.DataFrame
     - calculate_SMA(df: pd.DataFrame, user_window: int) -> pd.DataFrame
+    - calculate_SMA_windows(df: pd.DataFrame, windows: list, column: str="Close") -> np.ndarray
+    - calculate_EMA_windows(df: pd.DataFrame, windows: list, column: str="Close") -> np.ndarray
     - calculate_EMA(df: pd.DataFrame, period: int, column: str="Close", ema_col: str=None) -> pd.DataFrame
     - calculate_MACD(df: pd.DataFrame, short_period: int=12, long_period: int=26, signal_period: int=9, column: str="Close") -> pd.DataFrame
     - calculate_VWAP(df: pd.DataFrame) -> pd.DataFrame
+    - calculate_anchored_VWAP(df: pd.DataFrame, anchor="M") -> pd.DataFrame
+    - calculate_rolling_VWAP(df: pd.DataFrame, window: int=20) -> pd.DataFrame
+    - calculate_Donchian(df: pd.DataFrame, window: int=20) -> pd.DataFrame
+    - calculate_Stochastic(df: pd.DataFrame, window: int=14, smooth_period: int=3) -> pd.DataFrame
+    - calculate_Williams_R(df: pd.DataFrame, window: int=14) -> pd.DataFrame
     - apply_selected_technical_indicators(df: pd.DataFrame, selected_indicators) -> pd.DataFrame    
 
 Notes:
     Each function modifies the input DataFrame in-place by adding new columns
     with the calculated indicator values.
+    SMA, EMA and RSI values are computed by the vectorized NumPy engine in
+    src/indicator_engine.py, so the TECHNICAL_INDICATORS registry runs on it.
+    Donchian, Stochastic and Williams %R use the engine's O(n) rolling highest high /
+    lowest low, so their cost does not grow with the window size.
+    The module does not import Streamlit, so batch jobs and worker processes can use it.
+    Too little data raises InsufficientDataError in the single indicator functions and emits
+    an InsufficientDataWarning in apply_selected_technical_indicators; src/streamlit_adapter.py
+    turns those into messages in the UI.
 """
 
 
 
 
 
+import warnings
 import pandas as pd
 import numpy as np
-import timeit
-import os
-import talib
 from functools import partial
 from src.config import *
-import streamlit as st
+from src.indicator_engine import (
+    sma_array, ema_array, rsi_array, sma_windows_array, ema_windows_array,
+    donchian_arrays, stochastic_arrays, williams_r_array,
+    VWAP_ANCHOR_PERIODS, period_keys, segment_starts, anchored_vwap_array, rolling_vwap_array,
+)
+from src.indicator_planner import input_array
+from src.indicator_cache import cached_compute_selected_indicators
+
+
+def insufficient_data_message(indicator: str, min_rows: int) -> str:
+    """Message shown when there are too few rows to calculate an indicator."""
+    return f"Not enough data to calculate {indicator}. Please provide at least {min_rows} rows(days) of historical stock data to view {indicator}."
+
+
+class InsufficientDataError(ValueError):
+    """
+    Raised by the single indicator functions when the DataFrame has fewer rows than the indicator needs.
+
+    Attributes:
+        indicator (str): The indicator name used in the message, e.g. 'RSI'.
+        min_rows (int): The number of rows needed.
+        rows (int): The number of rows given.
+    """
+
+    def __init__(self, indicator: str, min_rows: int, rows: int):
+        self.indicator = indicator
+        self.min_rows = min_rows
+        self.rows = rows
+        super().__init__(insufficient_data_message(indicator, min_rows))
+
+
+class InsufficientDataWarning(UserWarning):
+    """
+    Emitted by apply_selected_technical_indicators when a selected indicator has too few rows. The columns are still added (filled with NaN).
+
+    Attributes:
+        indicator (str): The indicator name used in the message, e.g. 'RSI'.
+        min_rows (int): The number of rows needed.
+        rows (int): The number of rows given.
+    """
+
+    def __init__(self, indicator: str, min_rows: int, rows: int):
+        self.indicator = indicator
+        self.min_rows = min_rows
+        self.rows = rows
+        super().__init__(insufficient_data_message(indicator, min_rows))
+
+
+def _require_rows(df: pd.DataFrame, min_rows: int, indicator: str) -> None:
+    """Raise InsufficientDataError if df has fewer than min_rows rows."""
+    if len(df) < min_rows:
+        raise InsufficientDataError(indicator, min_rows, len(df))
+
+
 def apply_selected_technical_indicators(df: pd.DataFrame, selected_indicators: list) -> pd.DataFrame:
     """
     This function applies the selected technical indicators to the given DataFrame. The Dataframe is modified in-place to include new columns for each selected indicator.
@@ -42,20 +113,34 @@ def apply_selected_technical_indicators(df: pd.DataFrame, selected_indicators: l
         pd.DataFrame: The modified DataFrame with new columns for each selected technical indicator.
     
     Notes:
-        - The function uses a dictionary mapping indicator names to their corresponding functions. These is hardcoded in the TECHNICAL_INDICATORS dictionary. The dictionary uses functools.partial to pre-fill parameters for each indicator function.
-        - Each indicator function is called with the DataFrame and any required parameters.
+        - The selected indicators are computed together by src/indicator_planner.py. Intermediate series shared by several indicators (e.g. EMA_12 for EMA12 and MACD, the price changes for RSI) are computed only once.
+        - The values and columns are the same as calling each function in the TECHNICAL_INDICATORS dictionary one by one.
+          The planner reads its indicators and parameters from that dictionary.
+        - EMA and MACD convert the 'Close' column to numbers in the DataFrame, the same as calculate_EMA and calculate_MACD.
+        - Results are cached by src/indicator_cache.py, keyed on the price data and the indicator parameters, so Streamlit reruns on the same data do not recompute them.
         - The function assumes that the input DataFrame has the necessary columns for the selected indicators.
+        - Indicators with too few rows emit an InsufficientDataWarning and get NaN columns.
         
     """
     df_with_indicators = df
-    # Loop through the user's selection and apply the corresponding function
-
-    
-    for indicator_func in selected_indicators:
 
-        indicator_function = TECHNICAL_INDICATORS[indicator_func]
-        
-        df_with_indicators = indicator_function(df_with_indicators)
+    # Warn (instead of raising like the single indicator functions) so the other indicators are still shown
+    for indicator in selected_indicators:
+        for name, min_rows in INDICATOR_MIN_ROWS[indicator]:
+            if len(df_with_indicators) < min_rows:
+                warnings.warn(InsufficientDataWarning(name, min_rows, len(df_with_indicators)), stacklevel=2)
+
+    # Compute every selected indicator in one plan, sharing EMAs, price changes, gains/losses and typical price.
+    # Indicators already computed on identical prices are returned from the indicator cache.
+    for column, values in cached_compute_selected_indicators(df_with_indicators, selected_indicators).items():
+        df_with_indicators[column] = values
+
+    # calculate_EMA and calculate_MACD write their numeric coerced price column back, keep doing that
+    for indicator in selected_indicators:
+        function = TECHNICAL_INDICATORS[indicator]
+        if function.func in (calculate_EMA, calculate_MACD):
+            column = function.keywords.get("column", "Close")
+            df_with_indicators[column] = pd.to_numeric(df_with_indicators[column], errors="coerce")
     
     # Format dates to clean strings for display (after all calculations)
     df_with_indicators['Date'] = df_with_indicators['Date'].dt.strftime('%Y-%m-%d')
@@ -73,74 +158,27 @@ def calculate_RSI(df: pd.DataFrame, window: int) -> pd.DataFrame:
     Returns:
         pd.DataFrame: The modified DataFrame with a new column 'RSI'.
     
+    Raises:
+        InsufficientDataError: If the DataFrame has too few rows for the window.
+    
     Notes:
         - RSI is a momentum oscillator that measures the speed and change of price movements.
         - The function assumes that the input DataFrame has a 'Close' column.
         - The first (time_period) rows will have NaN values for the RSI since there is insufficient data to calculate the average gains and losses.
-        - The function uses a sliding window approach to efficiently compute the RSI for each row.
-        - This is O(n) implementation of RSI calculation cause it uses the sliding window approach.
+        - The values are computed by rsi_array in src/indicator_engine.py, which works on NumPy arrays instead of Python lists.
+        - This is O(n) implementation of RSI calculation cause Wilder's smoothing is solved as a vectorized recurrence.
         - RSI > 70 -> Overbought condition.
         - RSI < 30 -> Oversold condition.
         - The function uses the wilders smoothing method for calculating average gains and losses.
         
     """
     # Ensure dataframe has enough rows for RSI calculation
-    if len(df) < window + 1:
-        st.error(f"Not enough data to calculate RSI. Please provide at least 15 rows(days) of historical stock data to view RSI.")
-        df["RSI"] = [None] * len(df)
-        return df
+    _require_rows(df, window + 1, "RSI")
     
         
     try:
-    
-        # Extract closing prices as a list for easier access
-        closes = list(df["Close"])
-        
-        # Compute price changes between consecutive days
-        price_change = []
-        for i in range(1, len(closes)):
-            price_change.append(closes[i] - closes[i-1])
-        
-        # Positive changes -> gains, Negative changes -> losses
-        gains = []
-        losses = []
-        for change in price_change:
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(-change)
-                
-        # Intialize average gains and losses lists to store smoothed averages using Wilder's formula
-        avg_gains = [None] * len(gains)
-        avg_losses = [None] * len(losses)
-        
-        # Compute the first average gain and loss
-        first_avg_gain = sum(gains[:window]) / window
-        first_avg_loss = sum(losses[:window]) / window
-        avg_gains[window-1] = first_avg_gain
-        avg_losses[window-1] = first_avg_loss  
-        
-        # Apply wilder's smoothing formula
-        for i in range(window, len(gains)):
-            avg_gains[i] = ((avg_gains[i-1] * (window - 1)) + gains[i]) / window
-            avg_losses[i] = ((avg_losses[i-1] * (window - 1)) + losses[i]) / window
-        
-        
-        # Compute RSI for each period
-        rsi_values = [None] * (len(closes))
-        for i in range(len(avg_gains)):
-            if avg_gains[i] is None or avg_losses[i] is None:
-                continue
-            if avg_losses[i] == 0:
-                rs = float('inf')
-            else:
-                rs = avg_gains[i] / avg_losses[i]
-            rsi_values[i+1] = 100 - (100 / (1 + rs))
-        
-        # Added RSI column to the dataframe
-        df['RSI'] = rsi_values
+        # Gains/losses and Wilder's smoothing are computed on NumPy arrays by the indicator engine
+        df['RSI'] = rsi_array(df["Close"].to_numpy(dtype=float), window)
     except Exception as e:
         raise Exception(f"Error Occured while calculating RSI: {e}")
     
@@ -161,18 +199,19 @@ def calculate_EMA(df: pd.DataFrame, window, column: str="Close", ema_col: str=No
     Returns:
         od: pd.DataFrame: The modified DataFrame with a new column for the EMA values.
     
+    Raises:
+        InsufficientDataError: If the DataFrame has too few rows for the window.
+    
     Notes:
         - EMA gives more weight to recent prices, making it more responsive to new information.
         - The function assumes that the input DataFrame has the specified column.
+        - The values are computed by ema_array in src/indicator_engine.py.
         
     """
     if ema_col is None:
         ema_col = f"EMA_{window}"
 
-    if len(df) < window:
-        st.error(f"Not enough data to calculate EMA. Please provide at least {window} rows(days) of historical stock data to view EMA.")
-        df[ema_col] = [None] * len(df)
-        return df
+    _require_rows(df, window, "EMA")
         
     
     
@@ -180,25 +219,8 @@ def calculate_EMA(df: pd.DataFrame, window, column: str="Close", ema_col: str=No
     # Ensure numeric values
     df[column] = pd.to_numeric(df[column], errors="coerce")
     
-    prices = df[column].tolist()
-    ema_values = [None] * len(prices)
-    
-    # Step 1: first EMA = average of first 'window' prices
-    first_ema = sum(prices[:window]) / window
-    ema_values[window-1] = first_ema
-    
-    # Step 2: loop for remaining prices
-    k = 2 / (window + 1)
-    for i in range(window, len(prices)):
-        prev_ema = ema_values[i-1]
-        price = prices[i]
-        ema_values[i] = (price - prev_ema) * k + prev_ema
-    
-    # Add raw EMA values to DataFrame
-    df[ema_col] = ema_values
-    
-    # When saving, round to 2 decimals for cleaner CSV
-    df[ema_col] = df[ema_col]
+    # First EMA = average of first 'window' prices, then the EMA recurrence is solved by the indicator engine
+    df[ema_col] = ema_array(df[column].to_numpy(dtype=float), window)
     
     return df
 
@@ -215,39 +237,79 @@ def calculate_SMA(df: pd.DataFrame, window: int) -> pd.DataFrame:
     Returns:
         pd.DataFrame: The modified DataFrame with a new column 'SMA_{user_window}'.
     
+    Raises:
+        InsufficientDataError: If the DataFrame has too few rows for the window.
+    
     Notes:
         - SMA is calculated as the average of the closing prices over the specified window.
         - The function assumes that the input DataFrame has a 'Close' column.
         - The first (user_window - 1) rows will have NaN values for the SMA since there is insufficient data to calculate the average.
-        - The function uses a sliding window approach to efficiently compute the SMA for each row.
+        - The function uses a prefix sum (sma_array in src/indicator_engine.py), so each row costs O(1) instead of re-summing the window.
         
     """
 
     if 'Close' not in df.columns:
         raise ValueError("DataFrame must contain 'Close' column")
     
-    if len(df) < window + 1:
-        st.error(f"Not enough data to calculate SMA. Please provide at least {window + 1} rows(days) of historical stock data to view SMA.")
+    _require_rows(df, window, "SMA")
 
 
 
-    avg_prices = []
+    # Prefix sum over the closing prices, each window average is a difference of two prefix sums
+    column_name = f"SMA_{window}"
+    df[column_name] = sma_array(df['Close'].to_numpy(dtype=float), window)
 
-    slider = len(df)
+    return df
 
-    
-    for i in range(len(df)):
-        if i + 1 < window:
-            avg_prices.append(None)
-        else:
-            window_average = (df['Close'].iloc[i+1-window: i+1]).sum() / window
 
-            avg_prices.append(window_average)
-    
-    column_name = f"SMA_{window}"
-    df[column_name] = avg_prices
 
-    return df
+def calculate_SMA_windows(df: pd.DataFrame, windows: list, column: str="Close") -> np.ndarray:
+    """
+    This function calculates the Simple Moving Average (SMA) for many window sizes at once, e.g. for a parameter sweep.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing stock data with necessary columns.
+        windows (list): The window sizes, e.g. range(5, 251).
+        column (str, optional): The column name to calculate the SMAs on. Defaults to "Close".
+
+    Returns:
+        np.ndarray: Array of shape (len(df), len(windows)). Column j holds the SMA for windows[j].
+
+    Notes:
+        - The DataFrame is not modified. Inserting hundreds of DataFrame columns one by one is slow, so the result is a single 2-D array.
+        - One prefix sum is shared by every window (sma_windows_array in src/indicator_engine.py).
+        - Column j is the same as calculate_SMA(df, windows[j])[f"SMA_{windows[j]}"].
+        
+    """
+    if column not in df.columns:
+        raise ValueError(f"DataFrame must contain '{column}' column")
+
+    return sma_windows_array(pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float), windows)
+
+
+
+def calculate_EMA_windows(df: pd.DataFrame, windows: list, column: str="Close") -> np.ndarray:
+    """
+    This function calculates the Exponential Moving Average (EMA) for many window sizes at once, e.g. for a parameter sweep.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing stock data with necessary columns.
+        windows (list): The window sizes, e.g. range(5, 251).
+        column (str, optional): The column name to calculate the EMAs on. Defaults to "Close".
+
+    Returns:
+        np.ndarray: Array of shape (len(df), len(windows)). Column j holds the EMA for windows[j].
+
+    Notes:
+        - The DataFrame is not modified, the result is a single 2-D array.
+        - All windows run as one batched recurrence (ema_windows_array in src/indicator_engine.py).
+        - Column j is the same as calculate_EMA(df, windows[j])[f"EMA_{windows[j]}"]. Windows longer than the data give a column of NaN.
+        
+    """
+    if column not in df.columns:
+        raise ValueError(f"DataFrame must contain '{column}' column")
+
+    return ema_windows_array(pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float), windows)
 
 
 
@@ -265,6 +327,8 @@ def calculate_VWAP(df: pd.DataFrame) -> pd.DataFrame:
         - VWAP is calculated using the formula: VWAP = (Cumulative Price * Volume) / Cumulative Volume
         - The function assumes that the input DataFrame has the necessary columns: 'High', 'Low', 'Close', and 'Volume'.
         - The function uses cumulative sums to efficiently compute VWAP for each row.
+        - The sums start at the first row of the DataFrame, so the values depend on the selected date range.
+          calculate_anchored_VWAP and calculate_rolling_VWAP do not have this problem.
         
     """
     required_cols = ['High','Low','Close','Volume']
@@ -282,6 +346,178 @@ def calculate_VWAP(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def calculate_anchored_VWAP(df: pd.DataFrame, anchor="M") -> pd.DataFrame:
+    """
+    This function calculates the anchored Volume Weighted Average Price (VWAP) for the given DataFrame. The DataFrame is modified in-place to include a new column 'VWAP_{anchor}' (e.g. 'VWAP_M'), or 'VWAP_Anchored' for an anchor date.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing stock data with necessary columns.
+        anchor (str or date, optional): 'D', 'W' or 'M' to reset the VWAP at the start of every day, week (Monday) or month,
+            or a date (e.g. '2024-03-01') to accumulate from that date onwards. Defaults to "M".
+
+    Returns:
+        pd.DataFrame: The modified DataFrame with the anchored VWAP column.
+    
+    Notes:
+        - The cumulative sums restart at each period boundary, found with np.diff on the period keys (src/indicator_engine.py),
+          so there is no groupby and a year of minute bars is computed in milliseconds.
+        - Values only depend on the rows since the last anchor, not on the first row of the DataFrame.
+        - Rows before an anchor date are NaN.
+        - The function assumes that the input DataFrame has the necessary columns: 'Date', 'High', 'Low', 'Close', and 'Volume'.
+        
+    """
+    required_cols = ['Date', 'High', 'Low', 'Close', 'Volume']
+    for col in required_cols:
+        if col not in df.columns:
+            raise ValueError(f"DataFrame must contain column '{col}'")
+
+    dates = input_array(df, 'Date')
+    high, low, close, volume = (pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float) for col in required_cols[1:])
+
+    if isinstance(anchor, str) and anchor in VWAP_ANCHOR_PERIODS:
+        column_name = f"VWAP_{anchor}"
+        df[column_name] = anchored_vwap_array(high, low, close, volume, segment_starts(period_keys(dates, anchor)))
+        return df
+
+    # A single segment starting at the anchor date, nothing before it
+    after_anchor = dates >= pd.Timestamp(anchor).to_datetime64()
+    vwap = anchored_vwap_array(high, low, close, volume, segment_starts(after_anchor))
+    vwap[~after_anchor] = np.nan
+    df['VWAP_Anchored'] = vwap
+    return df
+
+
+def calculate_rolling_VWAP(df: pd.DataFrame, window: int=20) -> pd.DataFrame:
+    """
+    This function calculates the Volume Weighted Average Price (VWAP) over the last (window) rows. The DataFrame is modified in-place to include a new column 'VWAP_{window}'.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing stock data with necessary columns.
+        window (int, optional): The number of rows in each window. Defaults to 20.
+
+    Returns:
+        pd.DataFrame: The modified DataFrame with a new column 'VWAP_{window}'.
+    
+    Raises:
+        InsufficientDataError: If the DataFrame has too few rows for the window.
+    
+    Notes:
+        - The window sums come from prefix sums, so each row costs O(1) for any window size.
+        - The first (window - 1) rows will have NaN values.
+        - The function assumes that the input DataFrame has the necessary columns: 'High', 'Low', 'Close', and 'Volume'.
+        
+    """
+    required_cols = ['High', 'Low', 'Close', 'Volume']
+    for col in required_cols:
+        if col not in df.columns:
+            raise ValueError(f"DataFrame must contain column '{col}'")
+
+    _require_rows(df, window, "VWAP")
+
+    high, low, close, volume = (pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float) for col in required_cols)
+    df[f'VWAP_{window}'] = rolling_vwap_array(high, low, close, volume, window)
+    return df
+
+
+def calculate_Donchian(df: pd.DataFrame, window: int=20) -> pd.DataFrame:
+    """
+    This function calculates the Donchian channel for the given DataFrame. The DataFrame is modified in-place to include new columns 'Donchian_Upper', 'Donchian_Lower' and 'Donchian_Middle'.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing stock data with necessary columns.
+        window (int, optional): The channel length. Defaults to 20.
+
+    Returns:
+        pd.DataFrame: The modified DataFrame with the three channel columns.
+    
+    Raises:
+        InsufficientDataError: If the DataFrame has too few rows for the window.
+    
+    Notes:
+        - The upper band is the highest high and the lower band the lowest low of the last (window) rows. The middle line is their average.
+        - The function assumes that the input DataFrame has the necessary columns: 'High' and 'Low'.
+        - The rolling highs and lows are computed by src/indicator_engine.py in O(n), independent of the window size.
+        - The first (window - 1) rows will have NaN values.
+        
+    """
+    for col in ['High', 'Low']:
+        if col not in df.columns:
+            raise ValueError(f"DataFrame must contain column '{col}'")
+
+    _require_rows(df, window, "Donchian Channel")
+
+    high = pd.to_numeric(df['High'], errors="coerce").to_numpy(dtype=float)
+    low = pd.to_numeric(df['Low'], errors="coerce").to_numpy(dtype=float)
+    df['Donchian_Upper'], df['Donchian_Lower'], df['Donchian_Middle'] = donchian_arrays(high, low, window)
+    return df
+
+
+def calculate_Stochastic(df: pd.DataFrame, window: int=14, smooth_period: int=3) -> pd.DataFrame:
+    """
+    This function calculates the Stochastic Oscillator for the given DataFrame. The DataFrame is modified in-place to include new columns 'Stochastic_K' and 'Stochastic_D'.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing stock data with necessary columns.
+        window (int, optional): The look-back period of %K. Defaults to 14.
+        smooth_period (int, optional): The number of %K values averaged into %D. Defaults to 3.
+
+    Returns:
+        pd.DataFrame: The modified DataFrame with new columns 'Stochastic_K' and 'Stochastic_D'.
+    
+    Raises:
+        InsufficientDataError: If the DataFrame has too few rows for the window.
+    
+    Notes:
+        - %K = 100 * (Close - lowest low) / (highest high - lowest low) over the last (window) rows, %D is the SMA of %K.
+        - The function assumes that the input DataFrame has the necessary columns: 'High', 'Low' and 'Close'.
+        - %K > 80 -> Overbought condition.
+        - %K < 20 -> Oversold condition.
+        - Rows where the high and low of the window are equal have no range and are NaN.
+        
+    """
+    for col in ['High', 'Low', 'Close']:
+        if col not in df.columns:
+            raise ValueError(f"DataFrame must contain column '{col}'")
+
+    _require_rows(df, window + smooth_period - 1, "Stochastic")
+
+    high, low, close = (pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float) for col in ['High', 'Low', 'Close'])
+    df['Stochastic_K'], df['Stochastic_D'] = stochastic_arrays(high, low, close, window, smooth_period)
+    return df
+
+
+def calculate_Williams_R(df: pd.DataFrame, window: int=14) -> pd.DataFrame:
+    """
+    This function calculates Williams %R for the given DataFrame. The DataFrame is modified in-place to include a new column 'Williams_R'.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing stock data with necessary columns.
+        window (int, optional): The look-back period. Defaults to 14.
+
+    Returns:
+        pd.DataFrame: The modified DataFrame with a new column 'Williams_R'.
+    
+    Raises:
+        InsufficientDataError: If the DataFrame has too few rows for the window.
+    
+    Notes:
+        - %R = -100 * (highest high - Close) / (highest high - lowest low) over the last (window) rows, so it ranges from -100 to 0.
+        - The function assumes that the input DataFrame has the necessary columns: 'High', 'Low' and 'Close'.
+        - %R > -20 -> Overbought condition.
+        - %R < -80 -> Oversold condition.
+        
+    """
+    for col in ['High', 'Low', 'Close']:
+        if col not in df.columns:
+            raise ValueError(f"DataFrame must contain column '{col}'")
+
+    _require_rows(df, window, "Williams %R")
+
+    high, low, close = (pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float) for col in ['High', 'Low', 'Close'])
+    df['Williams_R'] = williams_r_array(high, low, close, window)
+    return df
+
+
 def calculate_MACD(df: pd.DataFrame, short_period: int=12, long_period: int=26, signal_period: int=9, column: str="Close") -> pd.DataFrame:
     """
     This function calculates the Moving Average Convergence Divergence (MACD) for the given DataFrame. The DataFrame is modified in-place to include new columns 'MACD', 'Signal_Line', and 'MACD_Histogram'.
@@ -343,5 +579,27 @@ TECHNICAL_INDICATORS = {
     MACD: partial(calculate_MACD, short_period=12, long_period=26, signal_period=9, column="Close"),
     VWAP: partial(calculate_VWAP),
     EMA12: partial(calculate_EMA, window = 12),
-    EMA26: partial(calculate_EMA, window = 26)
+    EMA26: partial(calculate_EMA, window = 26),
+    DONCHIAN_20: partial(calculate_Donchian, window=20),
+    STOCHASTIC: partial(calculate_Stochastic, window=14, smooth_period=3),
+    WILLIAMS_R: partial(calculate_Williams_R, window=14),
+    VWAP_MONTHLY: partial(calculate_anchored_VWAP, anchor="M"),
+    VWAP_20: partial(calculate_rolling_VWAP, window=20)
+}
+
+# Minimum number of rows before each indicator has values, with the name used in the warning message
+INDICATOR_MIN_ROWS = {
+    SMA_20: [("SMA", 20)],
+    SMA_50: [("SMA", 50)],
+    SMA_200: [("SMA", 200)],
+    RSI_14: [("RSI", 15)],
+    MACD: [("EMA", 12), ("EMA", 26)],
+    VWAP: [],
+    EMA12: [("EMA", 12)],
+    EMA26: [("EMA", 26)],
+    DONCHIAN_20: [("Donchian Channel", 20)],
+    STOCHASTIC: [("Stochastic", 16)],
+    WILLIAMS_R: [("Williams %R", 14)],
+    VWAP_MONTHLY: [],
+    VWAP_20: [("VWAP", 20)]
 }
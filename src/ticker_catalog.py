@@ -0,0 +1,242 @@
+"""
+ticker_catalog.py
+
+Purpose:
+    This module contains a persistent catalog of ticker metadata (currency, exchange,
+    quote type and name). yf.Ticker(ticker).info is one of the slowest yfinance calls, so
+    each symbol is looked up once, stored on disk and answered from memory afterwards.
+
+Classes:
+    - TickerCatalog(path=TICKER_CATALOG_PATH, negative_ttl_seconds: float=TICKER_CATALOG_NEGATIVE_TTL_SECONDS, max_workers: int=TICKER_CATALOG_WORKERS)
+
+Functions:
+    - fetch_ticker_metadata(ticker: str) -> dict
+
+Notes:
+    - The catalog file is read once when the catalog is created. Lookups are dictionary reads (O(1)).
+    - Symbols whose lookup failed are remembered (negative caching) and not retried until
+      negative_ttl_seconds have passed, so a mistyped ticker does not cost an .info call per render.
+    - Unknown symbols are looked up in parallel threads, either while the caller waits (enrich)
+      or in the background (enrich_in_background).
+"""
+
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.config import *
+from src.market_data import get_provider
+
+
+def fetch_ticker_metadata(ticker: str) -> dict:
+    """
+    This function looks up the metadata of one ticker with yfinance.
+
+    Args:
+        ticker (str): The ticker symbol.
+
+    Returns:
+        dict: 'currency', 'exchange', 'quote_type' and 'name' (None where yfinance has no value).
+
+    Raises:
+        LookupError: If yfinance returns no currency for the ticker (e.g. an unknown symbol).
+    """
+    info = get_provider().info(ticker)
+    if not info.get("currency"):
+        raise LookupError(f"No metadata found for ticker: {ticker}")
+    return {
+        "currency": info.get("currency"),
+        "exchange": info.get("exchange"),
+        "quote_type": info.get("quoteType"),
+        "name": info.get("longName") or info.get("shortName"),
+    }
+
+
+class TickerCatalog:
+    """
+    Ticker metadata kept in memory and in a JSON file.
+
+    Attributes:
+        path (str or None): The catalog file. None keeps the catalog in memory only.
+        negative_ttl_seconds (float): How long a failed lookup is remembered.
+        max_workers (int): Threads used to look up several unknown symbols.
+        hits (int): Lookups answered from the catalog.
+        negative_hits (int): Lookups skipped because the symbol failed recently.
+        misses (int): Lookups that needed yfinance.
+        enrich_thread (threading.Thread or None): The most recent background enrichment.
+    """
+
+    def __init__(self, path=TICKER_CATALOG_PATH, negative_ttl_seconds: float=TICKER_CATALOG_NEGATIVE_TTL_SECONDS, max_workers: int=TICKER_CATALOG_WORKERS):
+        self.path = None if path is None else str(path)
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_workers = max_workers
+        self._entries = {}
+        self._failures = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.enrich_thread = None
+        if self.path is not None and os.path.exists(self.path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, ticker: str) -> bool:
+        return str(ticker).upper() in self._entries
+
+    def load(self) -> None:
+        """Read the catalog file."""
+        with open(self.path, "r") as file:
+            stored = json.load(file)
+        with self._lock:
+            self._entries.update(stored.get("tickers", {}))
+            self._failures.update(stored.get("failures", {}))
+
+    def save(self) -> None:
+        """Write the catalog file (to a temporary file first, then renamed)."""
+        if self.path is None:
+            return
+        with self._lock:
+            stored = {"tickers": dict(self._entries), "failures": dict(self._failures)}
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(stored, file, indent=4)
+        os.replace(temp_path, self.path)
+
+    def get(self, ticker: str):
+        """
+        Return the metadata of a ticker.
+
+        Args:
+            ticker (str): The ticker symbol (any case).
+
+        Returns:
+            dict or None: 'currency', 'exchange', 'quote_type', 'name' and 'fetched_at', or None if it is not catalogued.
+        """
+        return self._entries.get(str(ticker).upper())
+
+    def put(self, ticker: str, metadata: dict, persist: bool=True) -> None:
+        """
+        Store the metadata of a ticker and forget an earlier failure.
+
+        Args:
+            ticker (str): The ticker symbol.
+            metadata (dict): 'currency', 'exchange', 'quote_type' and 'name'.
+            persist (bool): Write the catalog file afterwards. Default is True.
+        """
+        ticker = str(ticker).upper()
+        with self._lock:
+            self._entries[ticker] = {**metadata, "fetched_at": time.time()}
+            self._failures.pop(ticker, None)
+        if persist:
+            self.save()
+
+    def mark_failed(self, ticker: str, persist: bool=True) -> None:
+        """Remember that the lookup of a ticker failed (negative caching)."""
+        with self._lock:
+            self._failures[str(ticker).upper()] = time.time()
+        if persist:
+            self.save()
+
+    def recently_failed(self, ticker: str) -> bool:
+        """True if the last lookup of the ticker failed less than negative_ttl_seconds ago."""
+        failed_at = self._failures.get(str(ticker).upper())
+        return failed_at is not None and time.time() - failed_at < self.negative_ttl_seconds
+
+    def lookup(self, tickers: list) -> tuple[dict, list, list]:
+        """
+        Split tickers into catalogued, recently failed and unknown ones, without any network call.
+
+        Args:
+            tickers (list): Ticker symbols.
+
+        Returns:
+            tuple: A dictionary of ticker -> metadata for the catalogued tickers, the list of
+            recently failed tickers and the list of tickers that still need a lookup.
+        """
+        found, failed, unknown = {}, [], []
+        for ticker in dict.fromkeys(tickers):
+            metadata = self.get(ticker)
+            if metadata is not None:
+                found[ticker] = metadata
+                self.hits += 1
+            elif self.recently_failed(ticker):
+                failed.append(ticker)
+                self.negative_hits += 1
+            else:
+                unknown.append(ticker)
+                self.misses += 1
+        return found, failed, unknown
+
+    def enrich(self, tickers: list) -> dict:
+        """
+        Look up tickers with yfinance (in parallel) and store the results.
+
+        Args:
+            tickers (list): Ticker symbols to look up.
+
+        Returns:
+            dict: Ticker -> metadata for the lookups that succeeded. Failures are negatively cached.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+
+        def attempt(ticker):
+            try:
+                return ticker, fetch_ticker_metadata(ticker)
+            except Exception as e:
+                print(f"Could not fetch metadata for {ticker}: {e}")
+                return ticker, None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(tickers)))) as executor:
+            results = list(executor.map(attempt, tickers))
+
+        found = {}
+        for ticker, metadata in results:
+            if metadata is None:
+                self.mark_failed(ticker, persist=False)
+            else:
+                self.put(ticker, metadata, persist=False)
+                found[ticker] = self.get(ticker)
+        self.save()
+        return found
+
+    def enrich_in_background(self, tickers: list) -> None:
+        """Look up the unknown tickers among 'tickers' in a background thread (see enrich())."""
+        _, _, unknown = self.lookup(tickers)
+        if not unknown:
+            return
+
+        def run():
+            try:
+                self.enrich(unknown)
+            except Exception as e:
+                print(f"Background ticker enrichment failed: {e}")
+
+        self.enrich_thread = threading.Thread(target=run, daemon=True)
+        self.enrich_thread.start()
+
+    def stats(self) -> dict:
+        """
+        Return the catalog counters.
+
+        Returns:
+            dict: 'hits', 'negative_hits', 'misses', 'entries' and 'failures'.
+        """
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "failures": len(self._failures),
+        }
+
+
+# Process wide catalog used by resolve_unknown_currency
+TICKER_CATALOG = TickerCatalog()
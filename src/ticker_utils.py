@@ -8,27 +8,52 @@ Purpose:
 Functions:
     - categorize_tickers(tickers_list: list, exchange_map: dict) -> dict
     - get_prices(tickers_list: list, period="5d", interval="1d") -> dict
-    - resolve_unknown_currency(tickers_list: list, ticker_currency: dict) -> dict
+    - resolve_unknown_currency(tickers_list: list, ticker_currency: dict, catalog=None, wait: bool=True) -> dict
     - get_prices_and_currency(tickers_list: list, ticker_prices:dict, ticker_currency:dict ) -> dict
+    - fx_pair_symbol(currency: str, target_currency: str="SGD") -> str
+    - is_currency_code(currency) -> bool
+    - last_closes(data: pd.DataFrame, symbol: str, count: int=2) -> list
+    - pivot_quote_symbols(currencies: list, pivot: str=FX_PIVOT_CURRENCY) -> dict
+    - read_pivot_rates(data: pd.DataFrame, symbols: dict) -> dict
+    - download_pivot_rates(currencies: list, pivot: str=FX_PIVOT_CURRENCY) -> dict
+    - download_fx_rates(currencies: list, target_currency: str="SGD") -> dict
     - convert_current_prices_to_sgd(price_data:dict) -> dict
     - get_fx_rates(currencies: list, target_currency: str = "SGD") -> dict
+    - gather_fx_rates(currencies, fx_rates: dict, default: float=1.0) -> np.ndarray
     - convert_invested_values(df: pd.DataFrame, fx_rates: dict, target_col="invested_value_sgd") -> pd.DataFrame
     
 Notes:
     - Each function is designed to be modular and reusable.
     - Designed to work for the scope of this project.
-    - Uses yfinance to fetch stock and forex data.
-    - Handles unknown ticker currencies by attempting to fetch from yfinance info.
+    - Fetches stock and forex data through the market data provider (src/market_data.py, yfinance by default).
+    - Handles unknown ticker currencies through the ticker metadata catalog (src/ticker_catalog.py),
+      which fetches yfinance info once per symbol and keeps it on disk.
     - Converts prices to SGD using fetched forex rates.
-    - Improvements can be made by adding caching for forex rates.
+    - Forex rates are downloaded as quotes against one pivot currency (FX_PIVOT_CURRENCY, e.g. 'USDSGD=X'),
+      and cross rates are derived from them with the CrossRateTable in src/fx_engine.py. Switching the
+      target currency needs no new download when its pivot quote is cached.
+    - Forex rates are cached process wide in FX_CACHE (FXRateCache) with a time to live. Stale rates are
+      returned while a background thread refreshes them, and FX_CACHE_PATH persists them across restarts.
+
+Classes:
+    - FXRateCache(ttl_seconds: float=FX_CACHE_TTL_SECONDS, path=FX_CACHE_PATH, background_refresh: bool=True, pivot: str=FX_PIVOT_CURRENCY)
+    - MissingFXRateWarning(currencies: list, default: float)
 
 """
 
 from src.config import *
-import yfinance as yf
+import json
+import os
+import sqlite3
+import threading
+import time
+import warnings
 import pandas as pd
 import numpy as np
 from datetime import date, timedelta
+from src.ticker_catalog import TICKER_CATALOG
+from src.fx_engine import CrossRateTable
+from src.market_data import get_provider
 
 
 def categorize_tickers(tickers_list: list, exchange_map: dict) -> dict:
@@ -94,7 +119,7 @@ def get_prices(tickers_list: list, period="5d", interval="1d") -> dict:
         return {}
 
     try:
-        data = yf.download(tickers_list, period=period, interval=interval, group_by="ticker", progress=False)
+        data = get_provider().download(tickers_list, period=period, interval=interval, group_by="ticker")
     except Exception as e:
         print(f"Error fetching prices: {e}")
         return {ticker: float("nan") for ticker in tickers_list}
@@ -112,8 +137,7 @@ def get_prices(tickers_list: list, period="5d", interval="1d") -> dict:
 
             # If bulk failed or 0, fallback to ticker.history()
             print(f"Retrying {ticker} with direct fetch...")
-            t = yf.Ticker(ticker)
-            hist = t.history(period=period, interval=interval)
+            hist = get_provider().history(ticker, period=period, interval=interval)
             if not hist.empty and "Close" in hist.columns:
                 last_close = hist["Close"].dropna().iloc[-1]
                 prices_data[ticker] = float(last_close)
@@ -148,37 +172,45 @@ def get_prices(tickers_list: list, period="5d", interval="1d") -> dict:
     return prices_data
 
 
-def resolve_unknown_currency(tickers_list: list, ticker_currency: dict):
+def resolve_unknown_currency(tickers_list: list, ticker_currency: dict, catalog=None, wait: bool=True):
     """
-    Resolves unknown currencies for tickers by fetching their info from yfinance.
+    Resolves unknown currencies for tickers from the ticker metadata catalog.
 
     Args:
         tickers_list (list): A list of stock tickers to resolve currencies for.
         ticker_currency (dict): A dictionary mapping tickers to their known currencies. Tickers with unknown currencies should not be in this dictionary.
+        catalog (TickerCatalog): The catalog to read from. Default is the process wide TICKER_CATALOG.
+        wait (bool): Look up uncatalogued tickers before returning. If False they are looked up in the background
+            and set to "UNKNOWN" for this call. Default is True.
 
     Returns:
         dict: An updated dictionary mapping each ticker to its resolved currency.
 
     Notes:
         - If a ticker's currency cannot be determined, it will be set to "UNKNOWN".
-        - Uses yfinance to fetch ticker information.
+        - Catalogued tickers are answered without a network call. Uncatalogued tickers are looked up with yfinance
+          in parallel and stored in the catalog, and failed lookups are not retried until the negative cache expires.
         - This function modifies the input dictionary in place and also returns it for convenience.
         - Errors during data fetching or processing are caught and logged, with "UNKNOWN" assigned to problematic tickers.
     """
+    catalog = TICKER_CATALOG if catalog is None else catalog
 
     try:
-        for ticker in tickers_list:
-            if ticker not in ticker_currency:
-                try:
-                    info = yf.Ticker(ticker).info
-                    ticker_currency[ticker] = info.get("currency"," UNKNOWN")
-                except Exception as e:
-                    print(f"An Error Occured: {e}")
-                    ticker_currency[ticker] = "UNKNOWN"
+        pending = [ticker for ticker in dict.fromkeys(tickers_list) if ticker not in ticker_currency]
+        found, _, unknown = catalog.lookup(pending)
+        if unknown:
+            if wait:
+                found.update(catalog.enrich(unknown))
+            else:
+                catalog.enrich_in_background(unknown)
+        for ticker in pending:
+            metadata = found.get(ticker)
+            ticker_currency[ticker] = (metadata.get("currency") or "UNKNOWN") if metadata else "UNKNOWN"
     except Exception as e:
         print(f"Error resolving currencies: {e}")
-        ticker_currency = {ticker: "UNKNOWN" for ticker in tickers_list if ticker not in ticker_currency}
-        
+        for ticker in tickers_list:
+            ticker_currency.setdefault(ticker, "UNKNOWN")
+
     return ticker_currency
 
 
@@ -211,6 +243,374 @@ def get_prices_and_currency(tickers_list: list, ticker_prices:dict, ticker_curre
 
 
 
+def fx_pair_symbol(currency: str, target_currency: str="SGD") -> str:
+    """
+    Returns the yfinance symbol of a currency pair (e.g. 'USDSGD=X').
+
+    Args:
+        currency (str): The currency to convert from.
+        target_currency (str): The currency to convert to. Default is "SGD".
+
+    Returns:
+        str: The yfinance forex symbol.
+    """
+    return f"{currency}{target_currency}=X"
+
+
+def is_currency_code(currency) -> bool:
+    """True for three letter codes such as 'USD' ('UNKNOWN' and None are not)."""
+    return isinstance(currency, str) and len(currency) == 3 and currency.isalpha()
+
+
+def last_closes(data: pd.DataFrame, symbol: str, count: int=2) -> list:
+    """
+    Returns the last non-missing, non-zero closes of one symbol from a yf.download() result.
+
+    Args:
+        data (pd.DataFrame): The download, with (symbol, field) columns (group_by="ticker") or flat columns for one symbol.
+        symbol (str): The symbol to read.
+        count (int): Number of closes to return. Default is 2.
+
+    Returns:
+        list: Up to 'count' closes as floats, oldest first (an empty list if the symbol is missing).
+    """
+    if isinstance(data.columns, pd.MultiIndex):
+        if symbol not in data.columns.get_level_values(0):
+            return []
+        close = data[symbol]["Close"]
+    elif "Close" in data.columns:
+        close = data["Close"]
+    else:
+        return []
+
+    close = pd.to_numeric(close, errors="coerce").dropna()
+    close = close[close != 0]
+    return [float(value) for value in close.iloc[-count:]]
+
+
+def pivot_quote_symbols(currencies: list, pivot: str=FX_PIVOT_CURRENCY) -> dict:
+    """
+    Returns the yfinance symbols quoting currencies against the pivot (e.g. 'USDSGD=X', SGD per USD).
+
+    Args:
+        currencies (list): Currency codes (invalid codes such as 'UNKNOWN' and the pivot itself are skipped).
+        pivot (str): The pivot currency. Default is FX_PIVOT_CURRENCY.
+
+    Returns:
+        dict: Currency -> symbol.
+    """
+    return {currency: fx_pair_symbol(pivot, currency) for currency in dict.fromkeys(currencies)
+            if is_currency_code(currency) and currency != pivot}
+
+
+def read_pivot_rates(data: pd.DataFrame, symbols: dict) -> dict:
+    """
+    Reads the latest pivot quotes out of a yf.download() result.
+
+    Args:
+        data (pd.DataFrame): The download (see last_closes()).
+        symbols (dict): Currency -> pivot quote symbol, from pivot_quote_symbols().
+
+    Returns:
+        dict: Currency -> units of the currency per pivot unit, only for the quotes that were found.
+    """
+    rates = {}
+    for currency, symbol in symbols.items():
+        closes = last_closes(data, symbol, count=1)
+        if closes:
+            rates[currency] = closes[-1]
+    return rates
+
+
+class FXRateCache:
+    """
+    Process wide cache of forex rates with a time to live and optional persistence.
+
+    Attributes:
+        ttl_seconds (float): Age after which a rate is stale.
+        path (str or None): JSON file, or SQLite database for '.db', '.sqlite' or '.sqlite3' paths. None keeps the cache in memory only.
+        background_refresh (bool): Return stale rates immediately and refresh them in a background thread.
+        hits (int): Lookups answered with a fresh rate.
+        stale_hits (int): Lookups answered with a stale rate while it was being refreshed.
+        misses (int): Lookups that had to download the rate.
+        refresh_thread (threading.Thread or None): The most recent background refresh.
+        pivot (str): The currency downloads are quoted against.
+
+    Notes:
+        - Every rate is stored with the time it was fetched (seconds since the epoch), so ages survive a restart.
+        - Failed downloads are not cached, the next lookup tries again.
+        - Downloads store pivot quotes, (pivot, currency) entries. A (currency, target) rate that was not
+          stored itself is derived from the two quotes, with the age of the older one.
+    """
+
+    def __init__(self, ttl_seconds: float=FX_CACHE_TTL_SECONDS, path=FX_CACHE_PATH, background_refresh: bool=True, pivot: str=FX_PIVOT_CURRENCY):
+        self.ttl_seconds = ttl_seconds
+        self.path = None if path is None else str(path)
+        self.background_refresh = background_refresh
+        self.pivot = pivot
+        self._rates = {}
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_thread = None
+        if self.path is not None and os.path.exists(self.path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._rates)
+
+    def _uses_sqlite(self) -> bool:
+        return self.path.endswith((".db", ".sqlite", ".sqlite3"))
+
+    def load(self) -> None:
+        """Read the persisted rates, keeping newer rates already in memory."""
+        if self._uses_sqlite():
+            with sqlite3.connect(self.path) as connection:
+                connection.execute("CREATE TABLE IF NOT EXISTS fx_rates (currency TEXT, target TEXT, rate REAL, fetched_at REAL, PRIMARY KEY (currency, target))")
+                rows = connection.execute("SELECT currency, target, rate, fetched_at FROM fx_rates").fetchall()
+        else:
+            with open(self.path, "r") as file:
+                rows = [(*pair.split("/"), entry["rate"], entry["fetched_at"]) for pair, entry in json.load(file).items()]
+
+        with self._lock:
+            for currency, target, rate, fetched_at in rows:
+                current = self._rates.get((currency, target))
+                if current is None or current[1] < fetched_at:
+                    self._rates[(currency, target)] = (float(rate), float(fetched_at))
+
+    def save(self) -> None:
+        """Write all rates to the persistence file (atomically for JSON)."""
+        if self.path is None:
+            return
+        with self._lock:
+            rows = [(currency, target, rate, fetched_at) for (currency, target), (rate, fetched_at) in self._rates.items()]
+
+        if self._uses_sqlite():
+            with sqlite3.connect(self.path) as connection:
+                connection.execute("CREATE TABLE IF NOT EXISTS fx_rates (currency TEXT, target TEXT, rate REAL, fetched_at REAL, PRIMARY KEY (currency, target))")
+                connection.executemany("INSERT OR REPLACE INTO fx_rates VALUES (?, ?, ?, ?)", rows)
+        else:
+            # Write to a temporary file and rename, so a crash never leaves a partial file
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w") as file:
+                json.dump({f"{currency}/{target}": {"rate": rate, "fetched_at": fetched_at} for currency, target, rate, fetched_at in rows}, file, indent=4)
+            os.replace(temp_path, self.path)
+
+    def put(self, currency: str, target_currency: str, rate: float, fetched_at: float=None, persist: bool=True) -> None:
+        """
+        Store one rate.
+
+        Args:
+            currency (str): The currency converted from.
+            target_currency (str): The currency converted to.
+            rate (float): The rate. NaN or None is ignored.
+            fetched_at (float, optional): Fetch time in seconds since the epoch. Defaults to now.
+            persist (bool): Write the persistence file afterwards. Default is True.
+        """
+        if rate is None or np.isnan(rate):
+            return
+        with self._lock:
+            self._rates[(currency, target_currency)] = (float(rate), time.time() if fetched_at is None else fetched_at)
+        if persist:
+            self.save()
+
+    def put_pivot_rates(self, pivot_rates: dict, fetched_at: float=None, persist: bool=True) -> None:
+        """
+        Store pivot quotes, e.g. from read_pivot_rates().
+
+        Args:
+            pivot_rates (dict): Currency -> units of the currency per pivot unit. NaN or None rates are ignored.
+            fetched_at (float, optional): Fetch time in seconds since the epoch. Defaults to now.
+            persist (bool): Write the persistence file afterwards. Default is True.
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        for currency, rate in pivot_rates.items():
+            if currency != self.pivot:
+                self.put(self.pivot, currency, rate, fetched_at, persist=False)
+        if persist and pivot_rates:
+            self.save()
+
+    def _pivot_quote(self, currency: str):
+        if currency == self.pivot:
+            return (1.0, np.inf)
+        return self._rates.get((self.pivot, currency))
+
+    def _entry(self, currency: str, target_currency: str):
+        """The stored (rate, fetched_at) of a pair, or the one derived from pivot quotes if that is newer."""
+        stored = self._rates.get((currency, target_currency))
+        quote, target_quote = self._pivot_quote(currency), self._pivot_quote(target_currency)
+        if quote is None or target_quote is None:
+            return stored
+        derived = (target_quote[0] / quote[0], min(quote[1], target_quote[1]))
+        return derived if stored is None or stored[1] < derived[1] else stored
+
+    def cross_rate_table(self) -> CrossRateTable:
+        """
+        Return the cached pivot quotes as a CrossRateTable (fresh or not), e.g. for the full cross rate matrix.
+
+        Returns:
+            CrossRateTable: The cross rates between all currencies with a cached pivot quote.
+        """
+        with self._lock:
+            quotes = {currency: rate for (pivot, currency), (rate, _) in self._rates.items() if pivot == self.pivot}
+        return CrossRateTable(quotes, pivot=self.pivot)
+
+    def fetched_at(self, currency: str, target_currency: str="SGD"):
+        """Fetch time (seconds since the epoch) of a cached rate, or None if it is not cached."""
+        entry = self._entry(currency, target_currency)
+        return None if entry is None else entry[1]
+
+    def lookup(self, currencies: list, target_currency: str="SGD") -> tuple[dict, list]:
+        """
+        Look up cached rates without downloading.
+
+        Args:
+            currencies (list): Currency codes to look up.
+            target_currency (str): The currency to convert to. Default is "SGD".
+
+        Returns:
+            tuple: A dictionary of the rates found (fresh, or stale while they are refreshed in the background)
+            and the list of currencies that still have to be downloaded.
+        """
+        rates, missing, stale = {}, [], []
+        now = time.time()
+        for currency in dict.fromkeys(currencies):
+            if currency == target_currency:
+                rates[currency] = 1.0
+                continue
+            entry = self._entry(currency, target_currency)
+            if entry is not None and now - entry[1] <= self.ttl_seconds:
+                rates[currency] = entry[0]
+                self.hits += 1
+            elif entry is not None and self.background_refresh:
+                rates[currency] = entry[0]
+                stale.append(currency)
+                self.stale_hits += 1
+            else:
+                missing.append(currency)
+                self.misses += 1
+
+        if stale:
+            self._refresh_in_background(stale, target_currency)
+        return rates, missing
+
+    def refresh(self, currencies: list, target_currency: str="SGD") -> dict:
+        """
+        Download the pivot quotes of the currencies and the target (one batched request) and store the ones that were found.
+
+        Args:
+            currencies (list): Currency codes to download.
+            target_currency (str): The currency to convert to. Default is "SGD".
+
+        Returns:
+            dict: The refreshed rates into target_currency (currencies that failed are left out).
+        """
+        self.put_pivot_rates(download_pivot_rates(list(currencies) + [target_currency], pivot=self.pivot))
+        requested = [currency for currency in currencies if currency != target_currency]
+        return self.cross_rate_table().to_dict(requested, target_currency)
+
+    def _refresh_in_background(self, currencies: list, target_currency: str) -> None:
+        with self._lock:
+            pending = [currency for currency in currencies if (currency, target_currency) not in self._refreshing]
+            self._refreshing.update((currency, target_currency) for currency in pending)
+        if not pending:
+            return
+
+        def run():
+            try:
+                self.refresh(pending, target_currency)
+            except Exception as e:
+                print(f"Background FX refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update((currency, target_currency) for currency in pending)
+
+        self.refresh_thread = threading.Thread(target=run, daemon=True)
+        self.refresh_thread.start()
+
+    def get_rates(self, currencies: list, target_currency: str="SGD") -> dict:
+        """
+        Return the rates of the given currencies, downloading only the ones that are not cached.
+
+        Args:
+            currencies (list): Currency codes.
+            target_currency (str): The currency to convert to. Default is "SGD".
+
+        Returns:
+            dict: Currency -> rate. Currencies whose rate could not be fetched are left out.
+        """
+        rates, missing = self.lookup(currencies, target_currency)
+        if missing:
+            rates.update(self.refresh(missing, target_currency))
+        return rates
+
+    def clear(self) -> None:
+        """Drop all memory entries and reset the counters. The persistence file is kept."""
+        with self._lock:
+            self._rates.clear()
+        self.hits = self.stale_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: 'hits', 'stale_hits', 'misses' and 'entries'.
+        """
+        return {"hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses, "entries": len(self._rates)}
+
+
+def download_pivot_rates(currencies: list, pivot: str=FX_PIVOT_CURRENCY) -> dict:
+    """
+    Downloads the latest quotes of several currencies against the pivot in one batched yfinance request.
+
+    Args:
+        currencies (list): Currency codes to download (invalid codes such as 'UNKNOWN' are skipped).
+        pivot (str): The pivot currency. Default is FX_PIVOT_CURRENCY.
+
+    Returns:
+        dict: Currency -> units of the currency per pivot unit, only for the currencies that were found.
+    """
+    symbols = pivot_quote_symbols(currencies, pivot)
+    if not symbols:
+        return {}
+
+    try:
+        data = get_provider().download(list(symbols.values()), period="5d", interval="1d", group_by="ticker")
+    except Exception as e:
+        print(f"Could not fetch FX rates for {list(symbols.values())}: {e}")
+        return {}
+    return read_pivot_rates(data, symbols)
+
+
+def download_fx_rates(currencies: list, target_currency: str="SGD") -> dict:
+    """
+    Downloads the latest forex rates of several currencies into one target currency.
+
+    Args:
+        currencies (list): Currency codes to download (invalid codes such as 'UNKNOWN' are skipped).
+        target_currency (str): The currency to convert to. Default is "SGD".
+
+    Returns:
+        dict: Currency -> rate, only for the currencies that were found.
+
+    Notes:
+        - One batched request downloads the pivot quotes of the currencies and of the target,
+          the rates are derived from them (see src/fx_engine.py).
+    """
+    requested = [currency for currency in dict.fromkeys(currencies) if is_currency_code(currency) and currency != target_currency]
+    if not requested:
+        return {}
+    table = CrossRateTable(download_pivot_rates(requested + [target_currency]))
+    return table.to_dict(requested, target_currency)
+
+
+# Process wide FX cache shared by convert_current_prices_to_sgd, get_fx_rates and build_market_snapshot
+FX_CACHE = FXRateCache()
+
+
 def convert_current_prices_to_sgd(price_data:dict) -> dict:
     """
     Converts current prices of tickers to SGD using forex rates.
@@ -225,10 +625,13 @@ def convert_current_prices_to_sgd(price_data:dict) -> dict:
 
     Notes:
         - If a ticker's price or currency is not found, or if conversion fails, price_sgd will be set to None.
-        - Uses yfinance to fetch forex rates.
+        - Uses yfinance to fetch forex rates, through the shared FX_CACHE.
     """
     result = {}
-    fx_cache = {}
+    
+    # One cache lookup (and at most one batched download) for all currencies
+    currencies = [data.get("currency") for data in price_data.values() if isinstance(data, dict)]
+    fx_cache = FX_CACHE.get_rates(currencies, target_currency="SGD")
     
     for ticker, data in price_data.items():
         try:
@@ -240,22 +643,9 @@ def convert_current_prices_to_sgd(price_data:dict) -> dict:
             elif currency == "SGD":
                 price_sgd = price
             else:
-            
-                if currency in fx_cache:
-                    fx_rate = fx_cache[currency]
-                else:
-                    fx_ticker = f"{currency}SGD=X"
-                    
-                    try:
-                        fx_data = yf.download(fx_ticker, period="5d",interval="1d")
-                        fx_rate = fx_data["Close"].dropna().iloc[-1]
-                        fx_cache[currency] = fx_rate
-                    except Exception as e:
-                        print(f"Could not fetch FX rate for {fx_ticker}: {e}")
-                        fx_rate = None
-
-                        
+                fx_rate = fx_cache.get(currency)
                 if fx_rate is None:
+                    print(f"Could not fetch FX rate for {fx_pair_symbol(currency)}")
                     price_sgd = None
                 else:
                     price_sgd = float(price) * float(fx_rate)
@@ -291,29 +681,71 @@ def get_fx_rates(currencies: list, target_currency: str = "SGD") -> dict:
     Notes:
         - If a currency is the same as the target currency, its rate will be set to 1.0.
         - If a currency's rate cannot be fetched, it will be set to 1.
+        - Rates come from the shared FX_CACHE, missing or expired ones are downloaded in one batched request.
     """
+    cached_rates = FX_CACHE.get_rates(currencies, target_currency=target_currency)
     fx_rates = {}
     
     for curr in currencies:
-        if curr == target_currency:
-            fx_rates[curr] = 1.0
-            continue
-        
-        pair = f"{curr}{target_currency}=X"
-        
-        try:
-            data = yf.download(pair, period="5d", interval="1d", progress=False)
-            rate = data["Close"].dropna().iloc[-1]
-            fx_rates[curr] = float(rate)
-        except Exception as e:
-            print(f" Cound not fetch rate for {pair}")
-            print(f"Error occured: {e}")
+        if curr in cached_rates:
+            fx_rates[curr] = float(cached_rates[curr])
+        else:
+            print(f" Cound not fetch rate for {fx_pair_symbol(curr, target_currency)}")
             fx_rates[curr] = 1.0
         
     return fx_rates
     
     
     
+class MissingFXRateWarning(UserWarning):
+    """
+    Emitted by gather_fx_rates when rows have no forex rate and get the default instead (1.0, i.e. the value is not converted).
+
+    Attributes:
+        currencies (list): The currencies without a rate (None for rows without a currency).
+        default (float): The rate the rows got.
+    """
+
+    def __init__(self, currencies: list, default: float):
+        self.currencies = currencies
+        self.default = default
+        names = ", ".join(str(currency) for currency in currencies)
+        super().__init__(f"No forex rate for {names}, these values use a rate of {default} and are not converted.")
+
+
+def gather_fx_rates(currencies, fx_rates: dict, default: float=1.0) -> np.ndarray:
+    """
+    Looks up the forex rate of every row of a currency column with array operations.
+
+    Args:
+        currencies (array-like): The currency code of every row (e.g. a DataFrame column).
+        fx_rates (dict): A dictionary mapping currencies to their forex rates.
+        default (float): Rate used for currencies missing from fx_rates (and missing currencies). Default is 1.0.
+
+    Returns:
+        np.ndarray: The rate of every row, as floats.
+
+    Notes:
+        - The currencies are factorized (pd.factorize), so the dictionary is only read once per distinct currency
+          and the rows are filled with a single NumPy gather. 100k rows in dozens of currencies take about a millisecond.
+        - A rate of None or NaN (e.g. a failed FX download) counts as missing and gets the default.
+        - If rows get a non-NaN default, a MissingFXRateWarning names their currencies. Pass default=np.nan
+          to keep the missing rates as NaN instead.
+    """
+    codes, uniques = pd.factorize(pd.Series(currencies, dtype=object))
+    # The extra last slot holds the default, which is where the missing (code -1) rows point
+    table = np.array([fx_rates.get(currency) for currency in uniques] + [np.nan], dtype=float)
+    # Index -1 is the last slot, so the rows without a currency mark the default as used
+    used = np.zeros(len(table), dtype=bool)
+    used[codes] = True
+    missing = np.isnan(table)
+    if not np.isnan(default) and (missing & used).any():
+        names = [currency for currency, absent, needed in zip(list(uniques) + [None], missing, used) if absent and needed]
+        warnings.warn(MissingFXRateWarning(names, default), stacklevel=2)
+    table[missing] = default
+    return table[codes]
+
+
 def convert_invested_values(df: pd.DataFrame, fx_rates: dict, target_col="invested_value_sgd") -> pd.DataFrame:
     """
     Converts the invested values in a DataFrame to SGD using provided forex rates.
@@ -326,17 +758,21 @@ def convert_invested_values(df: pd.DataFrame, fx_rates: dict, target_col="invest
         pd.DataFrame: The input DataFrame with an additional column for invested values in SGD.
 
     Notes:
-        - If a currency is not found in fx_rates, a rate of 1.0 will be used (no conversion).
+        - If a currency is not found in fx_rates, a rate of 1.0 will be used (no conversion). These rows are
+          marked True in the 'fx_rate_missing' column and a MissingFXRateWarning names their currencies.
         - If an error occurs during conversion, the target column will be filled with NaN.
+        - The rates are gathered with gather_fx_rates(), so no Python function runs per row.
     """
     try:
-        df[target_col] = df.apply(
-            lambda row: row["invested_value"] * fx_rates.get(row["currency"], 1.0),
-            axis=1
-            
-        )
+        invested_value = pd.to_numeric(df["invested_value"], errors="coerce").to_numpy(dtype=float)
+        rates = gather_fx_rates(df["currency"], fx_rates, default=np.nan)
+        df["fx_rate_missing"] = np.isnan(rates)
+        if df["fx_rate_missing"].any():
+            currencies = pd.unique(df.loc[df["fx_rate_missing"], "currency"]).tolist()
+            warnings.warn(MissingFXRateWarning(currencies, 1.0), stacklevel=2)
+        df[target_col] = invested_value * np.where(df["fx_rate_missing"], 1.0, rates)
     except Exception as e:
         print(f"Error converting invested values: {e}")
         df[target_col] = np.nan
         
-    return df
\ No newline at end of file
+    return df
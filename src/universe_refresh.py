@@ -0,0 +1,256 @@
+"""
+universe_refresh.py
+
+Purpose:
+    This module runs per ticker refresh tasks (history download, latest price, ...) for a whole
+    ticker universe in a bounded thread pool. Requests are rate limited per host, failed tasks are
+    retried with jittered exponential backoff, slow tasks are given up after a timeout, and every
+    outcome is collected in a RefreshReport.
+
+Classes:
+    - RateLimiter(rate_per_second: float, burst: int=1)
+    - HostRateLimiters(rates: dict=REFRESH_HOST_RATE_LIMITS, default_rate: float=REFRESH_DEFAULT_RATE)
+    - TaskResult
+    - RefreshReport
+
+Functions:
+    - backoff_delay(attempt: int, base_delay: float=REFRESH_BACKOFF_SECONDS, max_delay: float=REFRESH_MAX_BACKOFF_SECONDS, rng=random) -> float
+    - refresh_universe(tickers: list, tasks: dict, max_workers: int=REFRESH_WORKERS, retries: int=REFRESH_RETRIES, timeout: float=REFRESH_TIMEOUT_SECONDS, limiters: HostRateLimiters=None, host: str=YAHOO_HOST, rng=random, sleep=time.sleep) -> RefreshReport
+
+Notes:
+    - The work is network bound, so threads overlap the waits. Python threads cannot be stopped,
+      so a task past its timeout is reported as 'timeout' and its result is ignored when it finishes.
+      Its thread is not freed: the interpreter joins pool threads at exit, so a request that never
+      returns would still block exit. The provider's request timeout (MARKET_DATA_TIMEOUT_SECONDS,
+      see src/market_data.py) is what ends hung requests.
+    - Every attempt (including retries) takes a token from the rate limiter of its host first.
+"""
+
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from src.config import *
+
+
+class RateLimiter:
+    """
+    Token bucket allowing 'rate_per_second' requests per second on average and bursts of 'burst' requests.
+
+    Attributes:
+        rate_per_second (float): Tokens added per second.
+        burst (int): Most tokens the bucket holds.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int=1, clock=time.monotonic, sleep=time.sleep):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, waiting until one is available.
+
+        Returns:
+            float: Seconds waited.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_second)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate_per_second
+            self._sleep(delay)
+            waited += delay
+
+
+class HostRateLimiters:
+    """
+    One RateLimiter per host, created on first use.
+
+    Attributes:
+        rates (dict): Host -> requests per second.
+        default_rate (float): Requests per second for hosts not in rates.
+    """
+
+    def __init__(self, rates: dict=REFRESH_HOST_RATE_LIMITS, default_rate: float=REFRESH_DEFAULT_RATE):
+        self.rates = dict(rates)
+        self.default_rate = default_rate
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def for_host(self, host: str) -> RateLimiter:
+        """Return the limiter of a host."""
+        with self._lock:
+            if host not in self._limiters:
+                rate = self.rates.get(host, self.default_rate)
+                self._limiters[host] = RateLimiter(rate, burst=max(1, int(rate)))
+            return self._limiters[host]
+
+
+def backoff_delay(attempt: int, base_delay: float=REFRESH_BACKOFF_SECONDS, max_delay: float=REFRESH_MAX_BACKOFF_SECONDS, rng=random) -> float:
+    """
+    This function returns the wait before retry number 'attempt' (0 for the first retry).
+
+    Args:
+        attempt (int): The retry number, starting at 0.
+        base_delay (float): The delay scale in seconds.
+        max_delay (float): The longest delay in seconds.
+        rng: Random number source with a uniform() method. Default is the random module.
+
+    Returns:
+        float: A delay drawn uniformly from [0, min(max_delay, base_delay * 2 ** attempt)] ("full jitter"),
+        so retries of many tickers do not hit the host at the same moment.
+    """
+    return rng.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+@dataclass
+class TaskResult:
+    """
+    The outcome of one task for one ticker.
+
+    Attributes:
+        ticker (str): The ticker.
+        task (str): The task name (a key of the tasks passed to refresh_universe()).
+        status (str): 'ok', 'failed' or 'timeout'.
+        attempts (int): Attempts made (1 if the first attempt succeeded).
+        seconds (float): Time from the first attempt to the outcome, including retries and rate limit waits.
+        value: The task's return value ('ok' only).
+        error (str): The last error message ('failed' and 'timeout' only).
+    """
+    ticker: str
+    task: str
+    status: str
+    attempts: int = 0
+    seconds: float = 0.0
+    value: object = None
+    error: str = None
+
+
+@dataclass
+class RefreshReport:
+    """
+    All task outcomes of one refresh.
+
+    Attributes:
+        results (list): TaskResult of every (ticker, task).
+        seconds (float): Wall clock time of the refresh.
+    """
+    results: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    def by_status(self, status: str) -> list:
+        """Return the results with the given status."""
+        return [result for result in self.results if result.status == status]
+
+    def summary(self) -> dict:
+        """
+        Return the counts of the refresh.
+
+        Returns:
+            dict: 'tasks', 'ok', 'failed', 'timeout', 'retried' (tasks needing more than one attempt) and 'seconds'.
+        """
+        return {
+            "tasks": len(self.results),
+            "ok": len(self.by_status("ok")),
+            "failed": len(self.by_status("failed")),
+            "timeout": len(self.by_status("timeout")),
+            "retried": sum(result.attempts > 1 for result in self.results),
+            "seconds": round(self.seconds, 2),
+        }
+
+    def format(self) -> str:
+        """Return the summary and every failed or timed out task as printable text."""
+        summary = self.summary()
+        lines = [f"Refreshed {summary['tasks']} tasks in {summary['seconds']}s: "
+                 f"{summary['ok']} ok, {summary['failed']} failed, {summary['timeout']} timed out, {summary['retried']} retried"]
+        for result in self.results:
+            if result.status != "ok":
+                lines.append(f"  {result.status.upper():8} {result.ticker} {result.task} after {result.attempts} attempt(s): {result.error}")
+        return "\n".join(lines)
+
+
+def _run_with_retries(func, ticker: str, limiter: RateLimiter, retries: int, started: dict, key, rng, sleep) -> tuple:
+    """Run func(ticker) up to retries + 1 times. Returns (value, attempts) or raises the last error with its attempt count."""
+    started[key] = time.monotonic()
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        try:
+            return func(ticker), attempt + 1
+        except Exception as e:
+            if attempt == retries:
+                e.attempts = attempt + 1
+                raise
+            sleep(backoff_delay(attempt, rng=rng))
+
+
+def refresh_universe(tickers: list, tasks: dict, max_workers: int=REFRESH_WORKERS, retries: int=REFRESH_RETRIES, timeout: float=REFRESH_TIMEOUT_SECONDS, limiters: HostRateLimiters=None, host: str=YAHOO_HOST, rng=random, sleep=time.sleep) -> RefreshReport:
+    """
+    This function runs every task for every ticker in a thread pool and reports the outcomes.
+
+    Args:
+        tickers (list): The tickers to refresh.
+        tasks (dict): Task name -> function called with the ticker (e.g. {"history": fetch_stock_data}).
+        max_workers (int): Size of the thread pool. Default is REFRESH_WORKERS.
+        retries (int): Retries after a failed attempt. Default is REFRESH_RETRIES.
+        timeout (float): Seconds a task may take (retries included) before it is reported as 'timeout'. None waits forever.
+        limiters (HostRateLimiters, optional): Shared rate limiters. Defaults to new limiters with the configured rates.
+        host (str): The host the tasks call, used to pick the rate limiter. Default is YAHOO_HOST.
+        rng: Random number source for the backoff jitter. Default is the random module.
+        sleep: Function used to wait between retries. Default is time.sleep.
+
+    Returns:
+        RefreshReport: One TaskResult per (ticker, task), in ticker then task order.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    limiter = (HostRateLimiters() if limiters is None else limiters).for_host(host)
+    begin = time.monotonic()
+    started = {}
+    results = {}
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    futures = {}
+    for ticker in tickers:
+        for name, func in tasks.items():
+            key = (ticker, name)
+            futures[executor.submit(_run_with_retries, func, ticker, limiter, retries, started, key, rng, sleep)] = key
+
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=None if timeout is None else min(1.0, timeout), return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future in done:
+                ticker, name = futures[future]
+                seconds = now - started.get(futures[future], now)
+                try:
+                    value, attempts = future.result()
+                    results[futures[future]] = TaskResult(ticker, name, "ok", attempts, seconds, value=value)
+                except Exception as e:
+                    results[futures[future]] = TaskResult(ticker, name, "failed", getattr(e, "attempts", retries + 1), seconds, error=str(e))
+
+            if timeout is not None:
+                for future in list(pending):
+                    key = futures[future]
+                    if key in started and now - started[key] > timeout:
+                        pending.discard(future)
+                        results[key] = TaskResult(key[0], key[1], "timeout", seconds=now - started[key], error=f"no result after {timeout}s")
+    finally:
+        # Tasks that timed out keep running in their threads and their results are ignored. Their
+        # threads are still joined at interpreter exit, the provider's request timeout ends them.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    ordered = [results[(ticker, name)] for ticker in tickers for name in tasks if (ticker, name) in results]
+    return RefreshReport(results=ordered, seconds=time.monotonic() - begin)
@@ -52,6 +52,22 @@ def create_indicator_traces(df, indicators, indicator_positions):
                 ), row, 1
             ))
         
+        # Indicators with several lines and optional reference levels (e.g., Donchian, Stochastic, Williams %R)
+        elif 'lines' in config:
+            for column, color_key in config['lines']:
+                traces.append((
+                    go.Scatter(
+                        x=df['Date'], y=df[column], mode='lines',
+                        line=dict(color=COLORS[color_key], width=1), name=column, showlegend=False
+                    ), row, 1
+                ))
+            for level, color_key, name in config.get('levels', []):
+                traces.append((
+                    go.Scatter(x=[df['Date'].iloc[0], df['Date'].iloc[-1]], y=[level, level], mode='lines',
+                        line=dict(color=COLORS[color_key], width=1, dash='dash'), name=f'{indicator} {name}', showlegend=False
+                    ), row, 1
+                ))
+        
         # RSI indicator
         elif indicator == RSI_14:
             rsi_traces = [
@@ -0,0 +1,39 @@
+"""
+tests/conftest.py
+
+Purpose:
+    This module contains the pytest fixtures shared by several test modules.
+
+Functions (fixtures):
+    - make_history
+
+Notes:
+    Fixtures defined here are available to every test module without an import.
+"""
+
+
+import pytest
+import numpy as np
+import pandas as pd
+
+
+@pytest.fixture
+def make_history():
+    """
+    Factory of seeded random walk price histories in the data/CSV schema (Date, Close, High, Low, Open, Volume).
+
+    Returns:
+        function: make(rows: int, seed: int=0, start: str="2024-01-01") -> pd.DataFrame with one row per business day.
+    """
+    def make(rows: int, seed: int=0, start: str="2024-01-01") -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        close = 100 + np.cumsum(rng.normal(size=rows))
+        return pd.DataFrame({
+            "Date": pd.bdate_range(start, periods=rows),
+            "Close": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Open": close + 0.5,
+            "Volume": rng.integers(1_000, 100_000, size=rows),
+        })
+    return make
@@ -7,6 +7,8 @@ Purpose:
 Functions (classes):
     - Test_upward_downward_runs
     - Test_max_profit_calculation
+    - Test_max_profit_with_constraints
+    - Test_calculate_networth
     - Test_calculate_daily_returns
 
 Notes:
@@ -75,6 +77,25 @@ class Test_upward_downward_runs:
         assert longest_down["length"] == 2 # 3→1 downward
         assert longest_down["end"] == result_df.index[4]
 
+    def test_trend_columns(self):
+        df = pd.DataFrame({"Close": [1, 2, 3, 2, 1, 2, 3, 4]},
+                          index=pd.date_range("2024-01-01", periods=8))
+        result_df, _, _ = calculate_upward_and_Downward_runs(df)
+        assert result_df["Up_Trend"].tolist() == [0, 1, 2, 0, 0, 1, 2, 3]
+        assert result_df["Down_Trend"].tolist() == [0, 0, 0, 1, 2, 0, 0, 0]
+
+    def test_runs_table(self):
+        """Every run is listed with its dates, length and return."""
+        df = pd.DataFrame({"Close": [1, 2, 3, 2, 1, 2, 3, 4]},
+                          index=pd.date_range("2024-01-01", periods=8))
+        _, longest_up, _, runs = calculate_upward_and_Downward_runs(df, return_runs=True)
+
+        assert runs["direction"].tolist() == ["up", "down", "up"]
+        assert runs["length"].tolist() == [2, 2, 3]
+        assert runs["start"].tolist() == [df.index[0], df.index[2], df.index[4]]
+        assert runs["return"].tolist() == pytest.approx([2.0, -2 / 3, 3.0])
+        assert runs.nlargest(1, "length")["end"].iloc[0] == longest_up["end"]
+
 class Test_max_profit_calculation:
 
     def test_increasing_prices(self):
@@ -120,13 +141,115 @@ class Test_max_profit_calculation:
         assert result_df["Buy_Signal"].iloc[0] == True
         assert result_df["Buy_Signal"].iloc[2] == True
 
+    def test_sell_signals(self):
+        """Test case for the sell signal placed on the day of each increase."""
+        df = pd.DataFrame({"Close": [1, 3, 2, 4]}, 
+                          index=pd.date_range("2024-01-01", periods=4))
+        result_df, _, _ = max_profit_calculation(df)
+
+        assert result_df["Sell_Signal"].tolist() == [False, True, False, True]
+
+
+class Test_max_profit_with_constraints:
+
+    def test_limited_transactions(self):
+        """Test case for one transaction: buy at the lowest point before the highest later price."""
+        df = pd.DataFrame({"Close": [3, 1, 4, 2, 6, 5]}, 
+                          index=pd.date_range("2024-01-01", periods=6))
+        result_df, profit, buy_signals = max_profit_with_constraints(df, max_transactions=1)
+
+        assert profit == 5
+        assert buy_signals == 1
+        assert result_df["Buy_Signal"].iloc[1] == True
+        assert result_df["Sell_Signal"].iloc[4] == True
+
+    def test_fee_reduces_profit(self):
+        """Test case for a fee charged on every transaction."""
+        df = pd.DataFrame({"Close": [1, 3, 2, 4]}, 
+                          index=pd.date_range("2024-01-01", periods=4))
+        _, profit, buy_signals = max_profit_with_constraints(df, fee=1.5)
+
+        assert profit == 1.5
+        assert buy_signals == 1
+
+    def test_invalid_arguments(self):
+        """Test case for rejected constraint values."""
+        df = pd.DataFrame({"Close": [1, 2]})
+        with pytest.raises(ValueError):
+            max_profit_with_constraints(df, max_transactions=0)
+        with pytest.raises(ValueError):
+            max_profit_with_constraints(df, cooldown=-1)
+
+
+class Test_calculate_networth:
+
+    def test_lots_valued_from_snapshot(self):
+        """Test case for several lots of the same ticker valued from one snapshot."""
+        df_input = pd.DataFrame({
+            "ticker": ["aapl", "D05.SI", "AAPL"],
+            "price_per_share": [100.0, 30.0, 120.0],
+            "quantity": [1, 10, 2],
+        })
+        snapshot = MarketSnapshot(
+            latest_close={"AAPL": 150.0, "D05.SI": 35.0},
+            currency={"AAPL": "USD", "D05.SI": "SGD"},
+            fx_rates={"USD": 1.5, "SGD": 1.0},
+        )
+
+        result = calculate_networth(df_input, snapshot)
+        table = result["table"]
+
+        assert table["current_invested_value_sgd"].tolist() == [225.0, 350.0, 450.0]
+        assert table["invested_value_sgd"].tolist() == [150.0, 300.0, 360.0]
+        assert table["profit_loss"].tolist() == [75.0, 50.0, 90.0]
+        assert result["total_current_value_in_sgd"] == 1025.0
+        assert result["total_invested_value_in_sgd"] == 810.0
+
+    def test_missing_price(self):
+        """Test case for a ticker without a current price."""
+        snapshot = MarketSnapshot(latest_close={"AAPL": float("nan")}, currency={"AAPL": "USD"}, fx_rates={"USD": 1.5})
+        df_input = pd.DataFrame({"ticker": ["AAPL"], "price_per_share": [100.0], "quantity": [1]})
+
+        table = calculate_networth(df_input, snapshot)["table"]
+
+        assert table["current_price_in_sgd"].isna().all()
+        assert table["invested_value_sgd"].tolist() == [150.0]
+
+    def test_missing_fx_rate_is_marked(self):
+        """Test case for a currency whose FX download failed: the lot is flagged and a warning names the currency."""
+        snapshot = MarketSnapshot(
+            latest_close={"AAPL": 150.0, "D05.SI": 35.0},
+            currency={"AAPL": "USD", "D05.SI": "SGD"},
+            fx_rates={"USD": float("nan"), "SGD": 1.0},
+        )
+        df_input = pd.DataFrame({"ticker": ["AAPL", "D05.SI"], "price_per_share": [100.0, 30.0], "quantity": [1, 1]})
+
+        with pytest.warns(MissingFXRateWarning) as caught:
+            table = calculate_networth(df_input, snapshot)["table"]
+
+        assert caught[0].message.currencies == ["USD"]
+        assert table["fx_rate_missing"].tolist() == [True, False]
+        assert table["invested_value_sgd"].tolist() == [100.0, 30.0]
+
+    @patch("src.analytics.build_market_snapshot", side_effect=Exception("API Error"))
+    def test_fetch_failure(self, mock_build):
+        """Test case for a failed fetch: no current values, the invested values are kept unconverted."""
+        df_input = pd.DataFrame({"ticker": ["AAPL"], "price_per_share": [100.0], "quantity": [2]})
+
+        with pytest.warns(MissingFXRateWarning):
+            result = calculate_networth(df_input)
+
+        assert result["total_invested_value_in_sgd"] == 200.0
+        assert result["table"]["fx_rate_missing"].all()
+        assert result["table"]["current_price_in_sgd"].isna().all()
+
+
 class Test_calculate_daily_returns:
     
-    @patch("src.ticker_utils.convert_current_prices_to_sgd")
-    @patch("src.ticker_utils.resolve_unknown_currency")
-    @patch("src.ticker_utils.categorize_tickers")
-    @patch("src.analytics.yf.download")
-    def test_successful_returns_calculation(self, mock_download, mock_categorize, mock_resolve, mock_convert):
+    @patch("src.market_snapshot.resolve_unknown_currency")
+    @patch("src.market_snapshot.categorize_tickers")
+    @patch("src.market_data.yf.download")
+    def test_successful_returns_calculation(self, mock_download, mock_categorize, mock_resolve):
         "Test successful daily return calculation for multiple tickers."
         
         tickers = ["AAPL","TSLA"]
@@ -143,11 +266,7 @@ class Test_calculate_daily_returns:
         # Mock currency mapping
         mock_categorize.return_value = {"AAPL": "USD", "TSLA": "USD"}
         mock_resolve.return_value = {"AAPL": "USD", "TSLA": "USD"}
-        mock_convert.return_value = {
-            "AAPL": {"price_sgd": 150.0, "currency": "SGD"},
-            "TSLA": {"price_sgd": 250.0, "currency": "SGD"},
-        }
-        
+
         result = calculate_daily_returns(df_input)
         print(result)
         # --- Assert statements ---
@@ -155,8 +274,10 @@ class Test_calculate_daily_returns:
         assert "TSLA" in result
         assert result["AAPL"]["daily_return"] == 10.0
         assert result["TSLA"]["daily_return"] == -10.0
+        mock_categorize.assert_called_once()
+        mock_resolve.assert_called_once()
 
-    @patch("src.analytics.yf.download", side_effect=Exception("API Error"))
+    @patch("src.market_data.yf.download", side_effect=Exception("API Error"))
     def test_yfinance_failure(self, mock_download):
         "Test function gracefully handles API failure."
         df_input = pd.DataFrame({"ticker": ["AAPL"]})
@@ -165,5 +286,21 @@ class Test_calculate_daily_returns:
         assert result == {}
         
         mock_download.assert_called_once()
+
+    @patch("src.market_data.yf.download")
+    def test_uses_given_snapshot(self, mock_download):
+        "Test that a snapshot shared with calculate_networth is used without a new download."
+        snapshot = MarketSnapshot(
+            latest_close={"AAPL": 110.0, "D05.SI": 35.0},
+            previous_close={"AAPL": 100.0},
+            currency={"AAPL": "USD", "D05.SI": "SGD"},
+            fx_rates={"USD": 1.5, "SGD": 1.0},
+        )
+        result = calculate_daily_returns(pd.DataFrame({"ticker": ["AAPL", "D05.SI"]}), snapshot)
+
+        mock_download.assert_not_called()
+        assert result["AAPL"]["daily_return"] == pytest.approx(10.0)
+        assert result["AAPL"]["value_sgd"] == pytest.approx(165.0)
+        assert result["D05.SI"]["daily_return"] is None
         
     
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+tests/test_analytics_engine.py
+
+Purpose:
+    This module contains unit tests for the vectorized analytics engine in src/analytics_engine.py.
+
+Functions (classes):
+    - TestRuns
+    - TestOptimalTrades
+
+Notes:
+    The engine results are compared against small hand-checked examples, and the trade
+    dynamic programming against a day-by-day reference implementation. The timing test holds the
+    target of 10M intraday rows within a second for each kind of trade search.
+"""
+
+
+import time
+import pytest
+import numpy as np
+from src.analytics_engine import *
+
+
+class TestRuns:
+
+    def test_streak_lengths(self):
+        mask = np.array([True, True, False, True, True, True, False])
+        assert streak_lengths(mask).tolist() == [1, 2, 0, 1, 2, 3, 0]
+
+    def test_run_length_encode_splits_nan(self):
+        starts, lengths, values = run_length_encode(np.array([1.0, 1.0, np.nan, np.nan, -1.0]))
+        assert starts.tolist() == [0, 2, 3, 4]
+        assert lengths.tolist() == [2, 1, 1, 1]
+
+    def test_flat_and_nan_prices_end_runs(self):
+        runs = trend_runs_arrays([1, 2, 2, 3, np.nan, 4, 5])
+        assert runs["direction"].tolist() == [1, 1, 1]
+        assert runs["start"].tolist() == [0, 2, 5]
+        assert runs["end"].tolist() == [1, 3, 6]
+
+    def test_empty_input(self):
+        runs = trend_runs_arrays([])
+        assert all(len(values) == 0 for values in runs.values())
+
+
+def reference_profit(close, max_transactions, fee, cooldown):
+    """Day-by-day state machine over (transactions left, holding), used as the reference."""
+    n = len(close)
+    best = {}
+
+    def solve(day, left, bought_at):
+        if day >= n:
+            return 0.0 if bought_at is None else -np.inf
+        key = (day, left, bought_at)
+        if key not in best:
+            result = solve(day + 1, left, bought_at)
+            if not np.isnan(close[day]):
+                if bought_at is not None:
+                    result = max(result, close[day] - close[bought_at] - fee + solve(day + 1 + cooldown, left, None))
+                elif left > 0:
+                    result = max(result, solve(day + 1, left - 1, day))
+            best[key] = result
+        return best[key]
+
+    return solve(0, max_transactions, None)
+
+
+class TestOptimalTrades:
+
+    def test_greedy_signals(self):
+        buy, sell, profit = greedy_signals_arrays(np.array([1.0, 3, 2, 4]))
+        assert buy.tolist() == [True, False, True, False]
+        assert sell.tolist() == [False, True, False, True]
+        assert profit == 4
+
+    def test_single_transaction_takes_widest_swing(self):
+        buy, sell, profit = optimal_trades_arrays(np.array([3.0, 1, 4, 2, 6, 5]), max_transactions=1)
+        assert np.flatnonzero(buy).tolist() == [1]
+        assert np.flatnonzero(sell).tolist() == [4]
+        assert profit == 5
+
+    def test_fee_merges_small_swings(self):
+        """With a fee of 1, selling at 4 and buying back at 3.5 is worse than holding through."""
+        buy, sell, profit = optimal_trades_arrays(np.array([1.0, 4, 3.5, 6]), fee=1.0)
+        assert np.flatnonzero(buy).tolist() == [0]
+        assert np.flatnonzero(sell).tolist() == [3]
+        assert profit == 4
+
+    def test_unlimited_without_constraints_matches_greedy_profit(self):
+        close = 100 + np.cumsum(np.random.default_rng(4).normal(size=300))
+        assert optimal_trades_arrays(close)[2] == pytest.approx(greedy_signals_arrays(close)[2])
+
+    @pytest.mark.parametrize("seed", range(40))
+    def test_matches_reference(self, seed):
+        rng = np.random.default_rng(seed)
+        close = np.round(10 + np.cumsum(rng.normal(size=rng.integers(2, 12))), 1)
+        if seed % 5 == 0:
+            close[rng.integers(len(close))] = np.nan
+        max_transactions = int(rng.integers(1, 4))
+        fee = float(rng.choice([0.0, 0.3]))
+        cooldown = int(rng.integers(0, 3))
+
+        buy, sell, profit = optimal_trades_arrays(close, max_transactions, fee, cooldown)
+        assert profit == pytest.approx(reference_profit(close, max_transactions, fee, cooldown))
+
+        # The markers describe valid trades that realise the profit
+        buy_days, sell_days = np.flatnonzero(buy), np.flatnonzero(sell)
+        assert len(buy_days) == len(sell_days) <= max_transactions
+        assert np.all(buy_days < sell_days)
+        assert np.all(buy_days[1:] > sell_days[:-1] + cooldown)
+        realised = np.sum(close[sell_days] - close[buy_days] - fee)
+        assert realised == pytest.approx(profit)
+
+    @pytest.mark.parametrize("seed", range(30))
+    def test_unlimited_matches_reference(self, seed):
+        rng = np.random.default_rng(100 + seed)
+        close = np.round(10 + np.cumsum(rng.normal(size=rng.integers(2, 16))), 1)
+        if seed % 4 == 0:
+            close[rng.integers(len(close))] = np.nan
+        fee = float(rng.choice([0.0, 0.3]))
+        cooldown = int(rng.integers(0, 3))
+
+        buy, sell, profit = optimal_trades_arrays(close, None, fee, cooldown)
+        assert profit == pytest.approx(reference_profit(close, len(close), fee, cooldown))
+        buy_days, sell_days = np.flatnonzero(buy), np.flatnonzero(sell)
+        assert len(buy_days) == len(sell_days)
+        assert np.all(buy_days < sell_days)
+        assert np.all(buy_days[1:] > sell_days[:-1] + cooldown)
+        assert np.sum(close[sell_days] - close[buy_days] - fee) == pytest.approx(profit)
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_limited_chunks_match_reference(self, seed, monkeypatch):
+        """Chunks of 8 days, so that the layers carry their cash and holding across many chunk boundaries."""
+        monkeypatch.setattr("src.analytics_engine.TRADE_CHUNK_DAYS", 8)
+        rng = np.random.default_rng(200 + seed)
+        close = np.round(10 + np.cumsum(rng.normal(size=rng.integers(20, 40))), 1)
+        close[rng.integers(len(close))] = np.nan
+        cooldown = int(rng.integers(0, 10))
+
+        buy, sell, profit = optimal_trades_arrays(close, 3, 0.3, cooldown)
+        assert profit == pytest.approx(reference_profit(close, 3, 0.3, cooldown))
+        buy_days, sell_days = np.flatnonzero(buy), np.flatnonzero(sell)
+        assert np.all(buy_days[1:] > sell_days[:-1] + cooldown)
+        assert np.sum(close[sell_days] - close[buy_days] - 0.3) == pytest.approx(profit)
+
+    @pytest.mark.parametrize("options", [{}, {"fee": 0.01}, {"fee": 0.01, "cooldown": 1}, {"max_transactions": 5}])
+    def test_ten_million_rows_within_a_second(self, options):
+        close = 100 + np.cumsum(np.random.default_rng(0).normal(size=10_000_000))
+        start = time.perf_counter()
+        buy, sell, profit = optimal_trades_arrays(close, **options)
+        assert time.perf_counter() - start < 1.0
+        assert buy.sum() == sell.sum() > 0
+
+    def test_limited_layers_agree_with_unlimited_state_machine(self):
+        close = 100 + np.cumsum(np.random.default_rng(9).normal(size=2_000))
+        buy, sell, profit = optimal_trades_arrays(close, fee=0.5, cooldown=1)
+        limited = optimal_trades_arrays(close, max_transactions=int(buy.sum()), fee=0.5, cooldown=1)
+        assert limited[2] == pytest.approx(profit)
+        assert limited[0].sum() == buy.sum()
+
+    def test_short_input(self):
+        buy, sell, profit = optimal_trades_arrays(np.array([5.0]), max_transactions=2)
+        assert not buy.any() and not sell.any() and profit == 0
@@ -0,0 +1,251 @@
+"""
+tests/test_data_loader.py
+
+Purpose:
+    This module contains unit tests for the incremental CSV updates in src/data_loader.py.
+
+Functions (classes):
+    - TestFetchStockData
+    - TestCSVMetadata
+    - TestFetchStockDataBatch
+
+Notes:
+    yf.download (multi-symbol requests) and yf.Ticker (single symbols) are mocked and DATA_DIR points to a
+    pytest temporary directory.
+"""
+
+
+import json
+import os
+import zlib
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+import src.data_loader as data_loader
+from src.data_loader import *
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "DATA_DIR", tmp_path)
+    return tmp_path
+
+
+def make_ticker_history(dates: list, start_price: float=100.0) -> pd.DataFrame:
+    """A yf.Ticker().history() result for one symbol, indexed by exchange time."""
+    close = start_price + np.arange(len(dates), dtype=float)
+    return pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": np.arange(len(dates)) + 1000},
+        index=pd.DatetimeIndex(dates, name="Date").tz_localize("America/New_York"),
+    )
+
+
+def make_batch_download(prices: dict) -> pd.DataFrame:
+    """A multi ticker yf.download(group_by="ticker") result with (ticker, field) columns, NaN where a ticker has no data."""
+    frames = {}
+    for ticker, dates in prices.items():
+        frames[ticker] = make_ticker_history(dates).tz_localize(None)
+    return pd.concat(frames, axis=1)
+
+
+class TestFetchStockData:
+
+    @patch("src.market_data.yf.Ticker")
+    def test_first_fetch_writes_csv_and_sidecar(self, mock_ticker, data_dir):
+        mock_history = mock_ticker.return_value.history
+        mock_history.return_value = make_ticker_history(["2024-01-02", "2024-01-03"])
+        df = fetch_stock_data("TEST", start="2024-01-01", end="2024-01-04")
+
+        assert len(df) == 2
+        metadata = json.loads((data_dir / "TEST.csv.meta.json").read_text())
+        assert metadata["last_date"] == "2024-01-03" and metadata["rows"] == 2
+        assert metadata["columns"] == ["Date", "Close", "High", "Low", "Open", "Volume"]
+        assert metadata["size"] == os.path.getsize(data_dir / "TEST.csv")
+
+    @patch("src.market_data.yf.Ticker")
+    def test_update_appends_only_new_rows(self, mock_ticker, data_dir):
+        mock_history = mock_ticker.return_value.history
+        mock_history.return_value = make_ticker_history(["2024-01-02", "2024-01-03"])
+        fetch_stock_data("TEST", start="2024-01-01", end="2024-01-10")
+        before = (data_dir / "TEST.csv").read_bytes()
+
+        # yfinance may repeat the last stored day, it is not appended again
+        mock_history.return_value = make_ticker_history(["2024-01-03", "2024-01-04", "2024-01-05"], start_price=200.0)
+        with patch("src.data_loader.pd.read_csv", wraps=pd.read_csv) as mock_read:
+            new_rows = fetch_stock_data("TEST", start="2024-01-01", end="2024-01-10", return_history=False)
+            mock_read.assert_not_called()
+
+        assert mock_history.call_args.kwargs["start"] == "2024-01-04"
+        assert len(new_rows) == 2
+        after = (data_dir / "TEST.csv").read_bytes()
+        assert after.startswith(before)
+
+        history = pd.read_csv(data_dir / "TEST.csv", parse_dates=["Date"])
+        assert history["Date"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"]
+        assert history["Close"].tolist() == [100.0, 101.0, 201.0, 202.0]
+        metadata = load_csv_metadata(str(data_dir / "TEST.csv"))
+        assert metadata["rows"] == 4 and metadata["last_date"] == "2024-01-05"
+        assert metadata["checksum"] == zlib.crc32(after)
+
+    @patch("src.market_data.yf.Ticker")
+    def test_up_to_date_file_is_not_touched(self, mock_ticker, data_dir):
+        mock_history = mock_ticker.return_value.history
+        mock_history.return_value = make_ticker_history(["2024-01-02", "2024-01-03"])
+        fetch_stock_data("TEST", start="2024-01-01", end="2024-01-03")
+        mtime = os.path.getmtime(data_dir / "TEST.csv")
+        mock_history.reset_mock()
+
+        df = fetch_stock_data("TEST", start="2024-01-01", end="2024-01-03")
+        mock_history.assert_not_called()
+        assert len(df) == 2 and os.path.getmtime(data_dir / "TEST.csv") == mtime
+
+    @patch("src.market_data.yf.Ticker")
+    def test_without_save(self, mock_ticker, data_dir):
+        mock_history = mock_ticker.return_value.history
+        mock_history.return_value = make_ticker_history(["2024-01-02"])
+        fetch_stock_data("TEST", start="2024-01-01", end="2024-01-04")
+        mock_history.return_value = make_ticker_history(["2024-01-03"])
+
+        df = fetch_stock_data("TEST", start="2024-01-01", end="2024-01-04", save=False)
+        assert len(df) == 2
+        assert len(pd.read_csv(data_dir / "TEST.csv")) == 1
+
+    @patch("src.market_data.yf.Ticker")
+    def test_empty_download_fails_when_data_is_required(self, mock_ticker, data_dir):
+        mock_history = mock_ticker.return_value.history
+        mock_history.return_value = make_ticker_history(["2024-01-02"])
+        fetch_stock_data("TEST", start="2024-01-01", end="2024-01-10")
+
+        # A failed fetch returns an empty frame instead of raising
+        mock_history.return_value = make_ticker_history([])
+        assert len(fetch_stock_data("TEST", start="2024-01-01", end="2024-01-10")) == 1
+        with pytest.raises(LookupError):
+            fetch_stock_data("TEST", start="2024-01-01", end="2024-01-10", require_data=True)
+        # From Saturday to Monday no trading day has ended yet
+        fetch_stock_data("TEST", start="2024-01-01", end="2024-01-03", require_data=True)
+        assert load_csv_metadata(str(data_dir / "TEST.csv"))["rows"] == 1
+
+
+class TestCSVMetadata:
+
+    def write_history(self, data_dir) -> str:
+        filename = str(data_dir / "TEST.csv")
+        pd.DataFrame({"Date": ["2024-01-02", "2024-01-03"], "Close": [1.0, 2.0]}).to_csv(filename, index=False)
+        return filename
+
+    def test_missing_sidecar_is_rebuilt(self, data_dir):
+        filename = self.write_history(data_dir)
+        metadata = load_csv_metadata(filename)
+        assert metadata["last_date"] == "2024-01-03" and metadata["rows"] == 2
+        assert os.path.exists(metadata_filename(filename))
+
+    def test_history_rows_come_from_the_sidecar(self, data_dir):
+        self.write_history(data_dir)
+        assert history_rows("TEST") == 2
+        assert history_rows("MISSING") == 0
+
+    def test_uncommitted_append_is_rolled_back(self, data_dir):
+        filename = self.write_history(data_dir)
+        committed = load_csv_metadata(filename)
+        original = open(filename, "rb").read()
+
+        # Rows written but the process died before the sidecar was replaced
+        write_metadata = data_loader._write_metadata
+        calls = []
+
+        def crash_on_commit(name, metadata):
+            calls.append(metadata)
+            if len(calls) > 1:
+                raise KeyboardInterrupt
+            write_metadata(name, metadata)
+
+        rows = pd.DataFrame({"Date": ["2024-01-04"], "Close": [3.0]})
+        with patch("src.data_loader._write_metadata", side_effect=crash_on_commit), pytest.raises(KeyboardInterrupt):
+            data_loader._append_csv_rows(filename, rows, committed)
+        assert len(open(filename, "rb").read()) > len(original)
+
+        assert load_csv_metadata(filename) == committed
+        assert open(filename, "rb").read() == original
+
+    def test_rows_appended_by_another_tool_are_kept(self, data_dir):
+        filename = self.write_history(data_dir)
+        load_csv_metadata(filename)
+        with open(filename, "a") as file:
+            file.write("2024-01-04,3.0\n2024-01-05,4.0\n")
+
+        metadata = load_csv_metadata(filename)
+        assert metadata["rows"] == 4 and metadata["last_date"] == "2024-01-05"
+        assert pd.read_csv(filename)["Close"].tolist() == [1.0, 2.0, 3.0, 4.0]
+
+    def test_changed_file_is_rebuilt(self, data_dir):
+        filename = self.write_history(data_dir)
+        load_csv_metadata(filename)
+        pd.DataFrame({"Date": ["2024-01-02", "2024-01-03", "2024-02-01"], "Close": [5.0, 6.0, 7.0]}).to_csv(filename, index=False)
+
+        metadata = load_csv_metadata(filename)
+        assert metadata["rows"] == 3 and metadata["last_date"] == "2024-02-01"
+
+    def test_append_after_file_without_trailing_newline(self, data_dir):
+        filename = str(data_dir / "TEST.csv")
+        with open(filename, "w") as file:
+            file.write("Date,Close\n2024-01-02,1.0")
+        metadata = load_csv_metadata(filename)
+
+        with patch("src.market_data.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = make_ticker_history(["2024-01-03"])
+            df = fetch_stock_data("TEST", start="2024-01-01", end="2024-01-04")
+        assert df["Close"].tolist() == [1.0, 100.0]
+        assert load_csv_metadata(filename)["checksum"] != metadata["checksum"]
+
+
+class TestFetchStockDataBatch:
+
+    @patch("src.market_data.yf.Ticker")
+    @patch("src.market_data.yf.download")
+    def test_tickers_are_grouped_by_start_date(self, mock_download, mock_ticker, data_dir):
+        mock_history = mock_ticker.return_value.history
+        mock_history.return_value = make_ticker_history(["2024-01-02"])
+        fetch_stock_data("TEST", start="2024-01-01", end="2024-01-10")
+        mock_ticker.reset_mock()
+
+        # Groups of one symbol are downloaded with Ticker().history()
+        mock_download.side_effect = lambda batch, **kwargs: make_batch_download({ticker: ["2024-01-03"] for ticker in batch})
+        mock_history.return_value = make_ticker_history(["2024-01-03"])
+        results = fetch_stock_data_batch(["AAA", "BBB", "TEST", "CCC"], start="2024-01-01", end="2024-01-10", batch_size=2)
+
+        calls = [(call.args[0], call.kwargs["start"]) for call in mock_download.call_args_list]
+        calls += [(ticker.args[0], history.kwargs["start"]) for ticker, history in zip(mock_ticker.call_args_list, mock_history.call_args_list)]
+        assert calls == [(["AAA", "BBB"], "2024-01-01"), ("CCC", "2024-01-01"), ("TEST", "2024-01-03")]
+        assert sorted(results) == ["AAA", "BBB", "CCC", "TEST"]
+        assert pd.read_csv(data_dir / "TEST.csv")["Date"].tolist() == ["2024-01-02", "2024-01-03"]
+
+    @patch("src.market_data.yf.download")
+    def test_result_is_split_per_ticker(self, mock_download, data_dir):
+        mock_download.return_value = make_batch_download({"AAA": ["2024-01-02", "2024-01-03"], "BBB": ["2024-01-03"]})
+        results = fetch_stock_data_batch(["AAA", "BBB"], start="2024-01-01", end="2024-01-10")
+
+        assert len(results["AAA"]) == 2 and len(results["BBB"]) == 1
+        history = pd.read_csv(data_dir / "BBB.csv")
+        assert list(history.columns) == ["Date", "Close", "High", "Low", "Open", "Volume"]
+        assert history["Date"].tolist() == ["2024-01-03"] and history["Volume"].tolist() == [1000]
+        assert load_csv_metadata(str(data_dir / "AAA.csv"))["rows"] == 2
+
+    @patch("src.market_data.yf.Ticker")
+    def test_up_to_date_and_failed_tickers(self, mock_ticker, data_dir):
+        mock_history = mock_ticker.return_value.history
+        mock_history.return_value = make_ticker_history(["2024-01-02", "2024-01-03"])
+        fetch_stock_data("TEST", start="2024-01-01", end="2024-01-03")
+        mock_history.reset_mock()
+
+        mock_history.side_effect = ConnectionError("rate limited")
+        results = fetch_stock_data_batch(["TEST", "AAA"], start="2024-01-01", end="2024-01-03")
+        assert list(results) == ["TEST"] and results["TEST"].empty
+        assert mock_history.call_count == 1
+
+    @patch("src.market_data.yf.download")
+    def test_tickers_without_data_are_left_out(self, mock_download, data_dir):
+        mock_download.return_value = make_batch_download({"AAA": ["2024-01-02"], "BBB": []})
+        results = fetch_stock_data_batch(["AAA", "BBB", "CCC"], start="2024-01-01", end="2024-01-10")
+        assert list(results) == ["AAA"]
+        assert not (data_dir / "BBB.csv").exists()
@@ -0,0 +1,52 @@
+"""
+tests/test_fx_engine.py
+
+Purpose:
+    This module contains unit tests for the cross rate engine in src/fx_engine.py.
+
+Functions (classes):
+    - TestCrossRateTable
+"""
+
+
+import pytest
+import numpy as np
+from src.fx_engine import *
+
+
+QUOTES = {"SGD": 1.35, "EUR": 0.9, "JPY": 150.0}
+
+
+class TestCrossRateTable:
+
+    def test_matrix_matches_pairwise_division(self):
+        table = CrossRateTable(QUOTES)
+        matrix = table.matrix()
+        for source in table.currencies:
+            for target in table.currencies:
+                expected = (1.0 if target == "USD" else QUOTES[target]) / (1.0 if source == "USD" else QUOTES[source])
+                assert matrix.loc[source, target] == pytest.approx(expected)
+
+    def test_rates_to_handles_unknown_and_target(self):
+        table = CrossRateTable({**QUOTES, "HKD": None, "CAD": 0.0})
+        rates = table.rates_to(["JPY", "SGD", "HKD", "CAD", "UNKNOWN", "USD"], "SGD")
+        assert rates[0] == pytest.approx(1.35 / 150.0)
+        assert rates[1] == 1.0
+        assert np.isnan(rates[2:5]).all()
+        assert rates[5] == pytest.approx(1.35)
+        assert "HKD" not in table and "JPY" in table
+
+    def test_unknown_target_gives_nan(self):
+        table = CrossRateTable(QUOTES)
+        assert np.isnan(table.rate("EUR", "GBP"))
+        assert table.rate("GBP", "GBP") == 1.0
+        assert table.to_dict(["EUR", "USD"], "GBP") == {}
+
+    def test_convert_mixed_currencies(self):
+        table = CrossRateTable(QUOTES)
+        converted = table.convert([100.0, 1500.0, 10.0], ["USD", "JPY", "EUR"], "SGD")
+        assert converted == pytest.approx([135.0, 13.5, 15.0])
+
+    def test_other_pivot(self):
+        table = CrossRateTable({"USD": 1 / 1.35, "EUR": 0.9 / 1.35}, pivot="SGD")
+        assert table.rate("USD", "EUR") == pytest.approx(0.9)
@@ -0,0 +1,138 @@
+"""
+tests/test_fx_history.py
+
+Purpose:
+    This module contains unit tests for the historical FX store and conversion in src/fx_history.py.
+
+Functions (classes):
+    - TestUpdateFXHistory
+    - TestConvertHistory
+
+Notes:
+    yf.download and yf.Ticker (single symbol downloads) are mocked and the CSV files are written to a
+    pytest temporary directory.
+"""
+
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from src.fx_history import *
+
+
+def make_history_download(quotes: dict, dates) -> pd.DataFrame:
+    index = pd.DatetimeIndex(dates, name="Date")
+    return pd.concat({symbol: pd.DataFrame({"Close": values}, index=index) for symbol, values in quotes.items()}, axis=1)
+
+
+class TestUpdateFXHistory:
+
+    @patch("src.market_data.yf.download")
+    def test_first_download_writes_files(self, mock_download, tmp_path):
+        mock_download.return_value = make_history_download(
+            {"USDSGD=X": [1.35, 1.36], "USDJPY=X": [150.0, 151.0]}, ["2024-01-02", "2024-01-03"])
+
+        quotes = update_fx_history(["SGD", "JPY", "USD", "UNKNOWN"], start="2024-01-01", end="2024-01-04", directory=tmp_path)
+
+        mock_download.assert_called_once()
+        assert sorted(mock_download.call_args.args[0]) == ["USDJPY=X", "USDSGD=X"]
+        assert list(quotes.columns) == ["SGD", "JPY"]
+        assert quotes.loc["2024-01-03", "JPY"] == 151.0
+        assert (tmp_path / "USDSGD=X.csv").exists()
+
+    @patch("src.market_data.yf.download")
+    def test_only_new_days_are_fetched(self, mock_download, tmp_path):
+        pd.DataFrame({"Date": ["2024-01-02", "2024-01-03"], "Close": [1.35, 1.36]}).to_csv(tmp_path / "USDSGD=X.csv", index=False)
+        pd.DataFrame({"Date": ["2024-01-02"], "Close": [150.0]}).to_csv(tmp_path / "USDJPY=X.csv", index=False)
+        # The batched download starts at the earliest missing day, rows already stored are ignored
+        mock_download.return_value = make_history_download(
+            {"USDSGD=X": [1.0, 1.37], "USDJPY=X": [151.0, 152.0]}, ["2024-01-03", "2024-01-04"])
+
+        quotes = update_fx_history(["SGD", "JPY"], start="2024-01-01", end="2024-01-05", directory=tmp_path)
+
+        assert mock_download.call_args.kwargs["start"] == "2024-01-03"
+        assert quotes["SGD"].tolist() == [1.35, 1.36, 1.37]
+        assert quotes["JPY"].tolist() == [150.0, 151.0, 152.0]
+        assert len(pd.read_csv(tmp_path / "USDSGD=X.csv")) == 3
+
+    @patch("src.market_data.yf.download")
+    def test_up_to_date_files_are_not_downloaded(self, mock_download, tmp_path):
+        pd.DataFrame({"Date": ["2024-01-04"], "Close": [1.35]}).to_csv(tmp_path / "USDSGD=X.csv", index=False)
+        quotes = update_fx_history(["SGD"], start="2024-01-01", end="2024-01-04", directory=tmp_path)
+        mock_download.assert_not_called()
+        assert quotes["SGD"].tolist() == [1.35]
+
+    @patch("src.market_data.yf.Ticker")
+    def test_earlier_days_are_backfilled(self, mock_ticker, tmp_path):
+        pd.DataFrame({"Date": ["2024-01-02", "2024-01-03"], "Close": [1.35, 1.36]}).to_csv(tmp_path / "USDSGD=X.csv", index=False)
+        mock_history = mock_ticker.return_value.history
+        mock_history.return_value = make_history_download({"USDSGD=X": [1.30, 1.31, 1.0]}, ["2012-01-03", "2012-01-04", "2024-01-02"])["USDSGD=X"]
+
+        quotes = update_fx_history(["SGD"], start="2012-01-01", end="2024-01-03", directory=tmp_path)
+
+        mock_history.assert_called_once()
+        assert mock_history.call_args.kwargs["start"] == "2012-01-01" and mock_history.call_args.kwargs["end"] == "2024-01-02"
+        assert quotes["SGD"].tolist() == [1.30, 1.31, 1.35, 1.36]
+        assert pd.read_csv(tmp_path / "USDSGD=X.csv")["Date"].tolist() == ["2012-01-03", "2012-01-04", "2024-01-02", "2024-01-03"]
+
+        # The next conversion of the same slice finds the quotes on disk
+        mock_history.reset_mock()
+        update_fx_history(["SGD"], start="2012-01-01", end="2024-01-03", directory=tmp_path)
+        mock_history.assert_not_called()
+
+    @patch("src.market_data.yf.download", side_effect=Exception("API Error"))
+    def test_failed_download_keeps_stored_history(self, mock_download, tmp_path):
+        pd.DataFrame({"Date": ["2024-01-02"], "Close": [1.35]}).to_csv(tmp_path / "USDSGD=X.csv", index=False)
+        quotes = update_fx_history(["SGD", "JPY"], start="2024-01-01", end="2024-01-05", directory=tmp_path)
+        assert list(quotes.columns) == ["SGD"]
+        assert load_fx_history(["SGD", "JPY"], directory=tmp_path)["SGD"].tolist() == [1.35]
+
+
+class TestConvertHistory:
+
+    QUOTES = pd.DataFrame(
+        {"SGD": [1.30, 1.40], "JPY": [150.0, 140.0]},
+        index=pd.DatetimeIndex(["2024-01-02", "2024-01-05"], name="Date"),
+    )
+
+    def test_asof_rates_use_previous_quote(self):
+        dates = pd.DatetimeIndex(["2024-01-01", "2024-01-02", "2024-01-04", "2024-01-05", "2024-01-08"])
+        rates = asof_rates(dates, self.QUOTES, "USD", "SGD")
+        assert np.isnan(rates[0])
+        assert rates[1:].tolist() == [1.30, 1.30, 1.40, 1.40]
+
+        cross = asof_rates(dates, self.QUOTES, "JPY", "SGD")
+        assert cross[2] == pytest.approx(1.30 / 150.0)
+        assert asof_rates(dates, self.QUOTES, "SGD", "SGD").tolist() == [1.0] * 5
+        assert np.isnan(asof_rates(dates, self.QUOTES, "EUR", "SGD")).all()
+
+    def test_convert_ohlc_matches_row_by_row(self):
+        rng = np.random.default_rng(0)
+        dates = pd.date_range("2024-01-02", periods=6, freq="D", tz="America/New_York")
+        prices = rng.uniform(100, 200, size=(6, 4))
+        df = pd.DataFrame(prices, columns=["Open", "High", "Low", "Close"], index=dates)
+        df["Volume"] = 1000
+
+        converted = convert_history(df, "USD", "SGD", quotes=self.QUOTES)
+
+        for row, day in enumerate(dates.tz_localize(None)):
+            rate = 1.30 if day < pd.Timestamp("2024-01-05") else 1.40
+            assert converted.iloc[row][["Open", "High", "Low", "Close"]].tolist() == pytest.approx((prices[row] * rate).tolist())
+        assert converted["Volume"].tolist() == [1000] * 6
+        assert df["Close"].tolist() == prices[:, 3].tolist()
+
+    def test_convert_csv_frame_with_date_column(self):
+        df = pd.DataFrame({"Date": ["2024-01-03", "2024-01-05"], "Close": [100.0, 100.0], "Volume": [5, 6]})
+        converted = convert_history(df, "JPY", "SGD", quotes=self.QUOTES)
+        assert converted["Close"].tolist() == pytest.approx([100.0 * 1.30 / 150.0, 100.0 * 1.40 / 140.0])
+        assert converted["FX_Rate"].tolist() == pytest.approx([1.30 / 150.0, 1.40 / 140.0])
+
+    @patch("src.fx_history.update_fx_history")
+    def test_quotes_fetched_for_the_history_dates(self, mock_update):
+        mock_update.return_value = self.QUOTES
+        df = pd.DataFrame({"Date": ["2024-01-03", "2024-01-05"], "Close": [10.0, 10.0]})
+        convert_history(df, "JPY", "SGD")
+        args, kwargs = mock_update.call_args
+        assert args[0] == ["JPY", "SGD"]
+        assert kwargs["start"] == "2023-12-27" and kwargs["end"] == "2024-01-06"
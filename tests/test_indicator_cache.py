@@ -0,0 +1,90 @@
+"""
+tests/test_indicator_cache.py
+
+Purpose:
+    This module contains unit tests for the indicator result cache in src/indicator_cache.py.
+
+Functions (classes):
+    - TestIndicatorCache
+    - TestCachedCompute
+
+Notes:
+    The tests use private IndicatorCache instances so they do not depend on the process wide cache.
+"""
+
+
+import pytest
+import numpy as np
+from src.indicator_cache import *
+
+
+class TestIndicatorCache:
+
+    def test_hit_and_miss_counters(self):
+        cache = IndicatorCache()
+        assert cache.get("a") is None
+        cache.put("a", {"X": np.arange(3.0)})
+        assert np.array_equal(cache.get("a")["X"], np.arange(3.0))
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.5)
+
+    def test_lru_eviction_under_budget(self):
+        """With room for two entries, the least recently used one is evicted."""
+        cache = IndicatorCache(max_bytes=2 * 80)
+        for key in ["a", "b"]:
+            cache.put(key, {"X": np.zeros(10)})
+        cache.get("a")
+        cache.put("c", {"X": np.zeros(10)})
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+        assert cache.current_bytes <= cache.max_bytes
+
+    def test_returned_arrays_are_copies(self):
+        cache = IndicatorCache()
+        cache.put("a", {"X": np.zeros(3)})
+        cache.get("a")["X"][:] = 1
+        assert not cache.get("a")["X"].any()
+
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        IndicatorCache(disk_dir=str(tmp_path)).put("a", {"X": np.arange(4.0)})
+        cache = IndicatorCache(disk_dir=str(tmp_path))
+        assert np.array_equal(cache.get("a")["X"], np.arange(4.0))
+        assert cache.stats()["disk_hits"] == 1
+
+    def test_fingerprint_depends_on_content(self):
+        values = np.arange(5.0)
+        assert array_fingerprint(values) == array_fingerprint(values.copy())
+        changed = values.copy()
+        changed[2] = 7
+        assert array_fingerprint(values) != array_fingerprint(changed)
+
+
+class TestCachedCompute:
+
+    def test_second_call_hits_cache(self, make_history):
+        cache = IndicatorCache()
+        df = make_history(120)
+        first = cached_compute_selected_indicators(df, [SMA_20, MACD], cache)
+        second = cached_compute_selected_indicators(df, [SMA_20, MACD], cache)
+        assert cache.stats()["misses"] == 2
+        assert cache.stats()["hits"] == 2
+        for column in first:
+            assert np.array_equal(first[column], second[column], equal_nan=True)
+
+    def test_changed_prices_miss(self, make_history):
+        cache = IndicatorCache()
+        cached_compute_selected_indicators(make_history(120, seed=1), [RSI_14], cache)
+        cached_compute_selected_indicators(make_history(120, seed=2), [RSI_14], cache)
+        assert cache.stats()["misses"] == 2
+
+    def test_close_only_indicator_ignores_volume(self, make_history):
+        """Changing Volume does not invalidate indicators that only read Close."""
+        cache = IndicatorCache()
+        df = make_history(120)
+        cached_compute_selected_indicators(df, [EMA12, VWAP], cache)
+        df["Volume"] = df["Volume"] * 2
+        cached_compute_selected_indicators(df, [EMA12, VWAP], cache)
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 3
@@ -0,0 +1,187 @@
+"""
+tests/test_indicator_engine.py
+
+Purpose:
+    This module contains unit tests for the vectorized NumPy engine in src/indicator_engine.py.
+
+Functions (classes):
+    - TestLinearRecurrence
+    - TestEngineIndicators
+    - TestMultiWindow
+    - TestRollingExtremes
+    - TestSegmentedVWAP
+
+Notes:
+    The engine results are compared against straightforward loop implementations
+    (the same formulas the original technical indicator functions used).
+"""
+
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.indicator_engine import *
+
+
+def loop_recurrence(x, decay, init):
+    """Reference implementation of y[i] = decay * y[i-1] + x[i]."""
+    result = []
+    previous = init
+    for value in x:
+        previous = decay * previous + value
+        result.append(previous)
+    return np.array(result)
+
+
+def loop_ema(prices, window):
+    """Reference EMA using the original list based loop."""
+    ema_values = [np.nan] * len(prices)
+    ema_values[window-1] = sum(prices[:window]) / window
+    k = 2 / (window + 1)
+    for i in range(window, len(prices)):
+        ema_values[i] = (prices[i] - ema_values[i-1]) * k + ema_values[i-1]
+    return np.array(ema_values)
+
+
+class TestLinearRecurrence:
+
+    @pytest.mark.parametrize("n", [1, 5, 64, 65, 130, 5000])
+    def test_matches_loop(self, n):
+        """Blocked solver should match the sequential loop for any length."""
+        x = np.random.default_rng(n).normal(size=n)
+        expected = loop_recurrence(x, 0.9, 2.0)
+        assert np.allclose(linear_recurrence(x, 0.9, 2.0), expected)
+
+    def test_per_column_decay(self):
+        """Each column of a 2-D input can use its own decay."""
+        x = np.random.default_rng(1).normal(size=(300, 3))
+        decay = np.array([0.5, 0.9, 0.99])
+        result = linear_recurrence(x, decay)
+        for col in range(3):
+            assert np.allclose(result[:, col], loop_recurrence(x[:, col], decay[col], 0.0))
+
+    def test_zero_decay_returns_input(self):
+        """With decay 0 the recurrence is the identity."""
+        x = np.array([3.0, -1.0, 2.5])
+        assert np.array_equal(linear_recurrence(x, 0.0), x)
+
+
+class TestEngineIndicators:
+
+    def test_sma_matches_window_mean(self):
+        """Prefix-sum SMA should equal the mean of each window."""
+        prices = np.random.default_rng(2).normal(100, 5, size=500)
+        result = sma_array(prices, 20)
+        assert np.isnan(result[:19]).all()
+        expected = np.array([prices[i-19:i+1].mean() for i in range(19, 500)])
+        assert np.allclose(result[19:], expected)
+
+    def test_ema_matches_loop(self):
+        """Vectorized EMA should match the original loop implementation."""
+        prices = list(np.random.default_rng(3).normal(100, 5, size=1000))
+        assert np.allclose(ema_array(prices, 12), loop_ema(prices, 12), equal_nan=True)
+
+    def test_ema_nan_propagates(self):
+        """A NaN price makes every later EMA value NaN."""
+        result = ema_array([1, 2, 3, np.nan, 5, 6], 2)
+        assert result[1] == 1.5
+        assert np.isnan(result[3:]).all()
+
+    def test_rsi_bounds_and_warmup(self):
+        """RSI is NaN for the first window rows and within [0, 100] afterwards."""
+        prices = 100 + np.cumsum(np.random.default_rng(4).normal(size=300))
+        result = rsi_array(prices, 14)
+        assert np.isnan(result[:14]).all()
+        assert ((result[14:] >= 0) & (result[14:] <= 100)).all()
+
+    def test_short_input_returns_nan(self):
+        """Inputs shorter than the window give all-NaN output."""
+        assert np.isnan(sma_array([1, 2], 3)).all()
+        assert np.isnan(ema_array([1, 2], 3)).all()
+        assert np.isnan(rsi_array([1, 2, 3], 14)).all()
+
+
+class TestMultiWindow:
+
+    def test_sma_windows_match_single(self):
+        prices = 100 + np.cumsum(np.random.default_rng(5).normal(size=400))
+        windows = [1, 5, 20, 50, 400, 401]
+        result = sma_windows_array(prices, windows)
+        assert result.shape == (400, len(windows))
+        for j, window in enumerate(windows):
+            assert np.allclose(result[:, j], sma_array(prices, window), equal_nan=True), window
+
+    def test_ema_windows_match_single(self):
+        """Every column (more columns than one chunk) matches ema_array for its window."""
+        prices = 100 + np.cumsum(np.random.default_rng(6).normal(size=400))
+        windows = list(range(2, 80)) + [400, 401, 0]
+        result = ema_windows_array(prices, windows)
+        assert result.shape == (400, len(windows))
+        for j, window in enumerate(windows):
+            expected = ema_array(prices, window) if window >= 1 else np.full(400, np.nan)
+            assert np.allclose(result[:, j], expected, equal_nan=True), window
+
+    def test_ema_windows_nan_propagates(self):
+        prices = [1, 2, 3, np.nan, 5, 6]
+        result = ema_windows_array(prices, [2, 5])
+        assert np.allclose(result[:, 0], ema_array(prices, 2), equal_nan=True)
+        assert np.isnan(result[:, 1]).all()
+
+
+class TestRollingExtremes:
+
+    @pytest.mark.parametrize("window", [1, 2, 7, 64, 299, 300])
+    def test_matches_window_loop(self, window):
+        values = np.random.default_rng(9).normal(size=(300, 2))
+        highest = rolling_max_array(values, window)
+        lowest = rolling_min_array(values, window)
+        assert np.isnan(highest[:window - 1]).all()
+        for i in range(window - 1, 300):
+            assert np.array_equal(highest[i], values[i - window + 1:i + 1].max(axis=0))
+            assert np.array_equal(lowest[i], values[i - window + 1:i + 1].min(axis=0))
+
+    def test_nan_only_affects_its_windows(self):
+        values = np.array([1.0, 5.0, np.nan, 2.0, 3.0, 4.0])
+        result = rolling_max_array(values, 2)
+        assert np.isnan(result[[0, 2, 3]]).all()
+        assert result[[1, 4, 5]].tolist() == [5.0, 3.0, 4.0]
+
+    def test_window_longer_than_data(self):
+        assert np.isnan(rolling_max_array([1.0, 2.0], 3)).all()
+        assert np.isnan(rolling_min_array([], 3)).all()
+
+
+class TestSegmentedVWAP:
+
+    def test_segmented_cumsum_restarts(self):
+        starts = np.array([True, False, False, True, False, True])
+        assert segmented_cumsum(np.arange(1.0, 7.0), starts).tolist() == [1, 3, 6, 4, 9, 6]
+
+    def test_week_keys_start_on_monday(self):
+        dates = np.array(["2024-01-07", "2024-01-08", "2024-01-14", "2024-01-15"], dtype="datetime64[ns]")
+        assert segment_starts(period_keys(dates, "W")).tolist() == [True, True, False, True]
+
+    @pytest.mark.parametrize("period, freq", [("D", "D"), ("W", "W-SUN"), ("M", "M")])
+    def test_anchored_matches_groupby(self, period, freq):
+        rng = np.random.default_rng(10)
+        dates = np.arange("2024-01-01T09:30", "2024-03-01T09:30", 37, dtype="datetime64[m]").astype("datetime64[ns]")
+        close = 100 + np.cumsum(rng.normal(size=len(dates))) * 0.1
+        volume = rng.integers(100, 1000, size=len(dates)).astype(float)
+        result = anchored_vwap_array(close + 0.5, close - 0.5, close, volume, segment_starts(period_keys(dates, period)))
+
+        groups = pd.Series(dates).dt.to_period(freq)
+        frame = pd.DataFrame({"pv": close * volume, "v": volume})
+        expected = frame.groupby(groups)["pv"].cumsum() / frame.groupby(groups)["v"].cumsum()
+        assert np.allclose(result, expected)
+
+    def test_rolling_matches_window_sums(self):
+        rng = np.random.default_rng(12)
+        close = 100 + np.cumsum(rng.normal(size=200))
+        volume = rng.integers(100, 1000, size=200).astype(float)
+        result = rolling_vwap_array(close, close, close, volume, 10)
+        expected = pd.Series(close * volume).rolling(10).sum() / pd.Series(volume).rolling(10).sum()
+        assert np.allclose(result, expected, equal_nan=True)
+
+    def test_unknown_period_raises(self):
+        with pytest.raises(ValueError, match="anchor period"):
+            period_keys(np.array(["2024-01-01"], dtype="datetime64[ns]"), "Y")
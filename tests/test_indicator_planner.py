@@ -0,0 +1,80 @@
+"""
+tests/test_indicator_planner.py
+
+Purpose:
+    This module contains unit tests for the dependency planner in src/indicator_planner.py.
+
+Functions (classes):
+    - TestBuildPlan
+    - TestComputeSelectedIndicators
+
+Notes:
+    The planner results are compared against calling each function in TECHNICAL_INDICATORS one by one.
+"""
+
+
+import pytest
+from functools import partial
+import numpy as np
+from src.indicator_planner import *
+from src.technical_indicators import TECHNICAL_INDICATORS
+
+
+class TestBuildPlan:
+
+    def test_shared_nodes_appear_once(self):
+        """EMA12 and MACD share the 12 period EMA; all SMAs share one prefix sum."""
+        plan = build_indicator_plan([EMA12, EMA26, MACD, SMA_20, SMA_50, SMA_200])
+        assert plan.count(("ema", 12)) == 1
+        assert plan.count(("ema", 26)) == 1
+        assert plan.count(("prefix_sum",)) == 1
+        assert len(plan) == len(set(plan))
+
+    def test_topological_order(self):
+        """Every node comes after all of its dependencies."""
+        plan = build_indicator_plan(TECHNICAL_INDICATOR_OPTIONS)
+        position = {node: i for i, node in enumerate(plan)}
+        for node in plan:
+            for dependency in NODE_DEPENDENCIES[node[0]](*node[1:]):
+                assert position[dependency] < position[node]
+
+    def test_outputs_follow_the_registry(self, monkeypatch):
+        """The nodes come from the TECHNICAL_INDICATORS entry, so changed parameters change the plan."""
+        assert indicator_outputs(SMA_20) == [("SMA_20", ("sma", 20))]
+        monkeypatch.setitem(TECHNICAL_INDICATORS, SMA_20, partial(TECHNICAL_INDICATORS[SMA_50].func, window=30))
+        assert indicator_outputs(SMA_20) == [("SMA_30", ("sma", 30))]
+        assert ("sma", 30) in build_indicator_plan([SMA_20])
+
+    def test_every_registry_entry_is_planned(self):
+        for indicator in TECHNICAL_INDICATORS:
+            assert indicator_outputs(indicator)
+
+    def test_only_needed_inputs(self):
+        """A Close-only selection does not need High, Low or Volume."""
+        plan = build_indicator_plan([RSI_14, SMA_20])
+        assert [node for node in plan if node[0] == "input"] == [("input", "Close")]
+
+
+class TestComputeSelectedIndicators:
+
+    def test_matches_single_functions(self, make_history):
+        df = make_history(260)
+        columns = compute_selected_indicators(df, TECHNICAL_INDICATOR_OPTIONS)
+
+        expected = df.copy()
+        for indicator in TECHNICAL_INDICATOR_OPTIONS:
+            expected = TECHNICAL_INDICATORS[indicator](expected)
+
+        assert list(columns) == list(expected.columns[len(df.columns):])
+        for column, values in columns.items():
+            assert np.allclose(values, expected[column].astype(float), equal_nan=True), column
+
+    def test_missing_column_raises(self, make_history):
+        df = make_history(260).drop(columns=["Volume"])
+        with pytest.raises(ValueError, match="DataFrame must contain"):
+            compute_selected_indicators(df, [VWAP])
+
+    def test_empty_dataframe(self, make_history):
+        df = make_history(260).iloc[:0]
+        columns = compute_selected_indicators(df, [RSI_14, MACD])
+        assert all(len(values) == 0 for values in columns.values())
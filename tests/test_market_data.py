@@ -0,0 +1,161 @@
+"""
+tests/test_market_data.py
+
+Purpose:
+    This module contains unit tests for the market data providers in src/market_data.py.
+
+Functions (classes):
+    - TestReplayProvider
+    - TestRecordingProvider
+    - TestProviderSelection
+
+Notes:
+    Fixtures are written to pytest temporary directories, no network calls are made.
+"""
+
+
+import json
+import threading
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+import src.data_loader as data_loader
+from src.market_data import *
+
+
+def write_fixture(directory, symbol: str, dates: list, start_price: float=100.0):
+    close = start_price + np.arange(len(dates), dtype=float)
+    frame = pd.DataFrame({"Date": dates, "Close": close, "High": close + 1, "Low": close - 1, "Open": close, "Volume": np.arange(len(dates)) + 1000})
+    frame.to_csv(directory / f"{symbol}.csv", index=False)
+
+
+@pytest.fixture
+def fixtures(tmp_path):
+    directory = tmp_path / "fixtures"
+    directory.mkdir()
+    write_fixture(directory, "AAA", ["2024-01-02", "2024-01-03", "2024-01-04", "2024-02-05"])
+    write_fixture(directory, "BBB", ["2024-01-03", "2024-02-05"], start_price=50.0)
+    (directory / "info.json").write_text(json.dumps({"AAA": {"currency": "USD", "quoteType": "EQUITY"}}))
+    return directory
+
+
+class TestReplayProvider:
+
+    def test_download_grouped_by_ticker(self, fixtures):
+        data = ReplayProvider(fixtures).download(["AAA", "BBB", "MISSING"], start="2024-01-03", end="2024-02-05", group_by="ticker")
+        assert list(data.columns.get_level_values(0).unique()) == ["AAA", "BBB"]
+        assert data.index.strftime("%Y-%m-%d").tolist() == ["2024-01-03", "2024-01-04"]
+        assert data["AAA"]["Close"].tolist() == [101.0, 102.0]
+        assert np.isnan(data["BBB"]["Close"].iloc[1])
+
+    def test_download_grouped_by_column(self, fixtures):
+        data = ReplayProvider(fixtures).download("AAA", period="max")
+        assert data.columns.tolist()[:2] == [("Close", "AAA"), ("High", "AAA")]
+        assert len(data) == 4
+
+    def test_periods_count_back_from_the_last_fixture_date(self, fixtures):
+        provider = ReplayProvider(fixtures)
+        assert provider.history("AAA", period="1d")["Close"].tolist() == [103.0]
+        assert len(provider.history("AAA", period="5d")) == 4
+        assert provider.history("AAA", period="1mo").index.strftime("%Y-%m-%d").tolist() == ["2024-02-05"]
+        assert provider.history("MISSING", period="1mo").empty
+
+    def test_info_and_unsupported_interval(self, fixtures):
+        provider = ReplayProvider(fixtures)
+        assert provider.info("AAA")["currency"] == "USD"
+        assert provider.info("BBB") == {}
+        with pytest.raises(ValueError):
+            provider.download("AAA", period="5d", interval="1h")
+
+
+class TestRecordingProvider:
+
+    def test_recordings_replay_the_same_data(self, fixtures, tmp_path):
+        recorder = RecordingProvider(ReplayProvider(fixtures), tmp_path / "recorded")
+        recorder.download(["AAA", "BBB"], start="2024-01-01", end="2024-01-04", group_by="ticker")
+        recorder.download("AAA", start="2024-01-04", end="2024-03-01")
+        recorder.info("AAA")
+
+        history = pd.read_csv(tmp_path / "recorded" / "AAA.csv")
+        assert list(history.columns) == ["Date", "Close", "High", "Low", "Open", "Volume"]
+        assert history["Date"].tolist() == ["2024-01-02", "2024-01-03", "2024-01-04", "2024-02-05"]
+        assert pd.read_csv(tmp_path / "recorded" / "BBB.csv")["Volume"].tolist() == [1000]
+
+        replay = ReplayProvider(tmp_path / "recorded")
+        pd.testing.assert_frame_equal(replay.history("AAA", period="max"), ReplayProvider(fixtures).history("AAA", period="max"))
+        assert replay.info("AAA") == {"currency": "USD", "quoteType": "EQUITY"}
+
+
+class TestProviderSelection:
+
+    def test_create_provider(self):
+        assert isinstance(create_provider("yfinance"), YFinanceProvider)
+        assert isinstance(create_provider("record").upstream, YFinanceProvider)
+        with pytest.raises(ValueError):
+            create_provider("bloomberg")
+
+    def test_provider_must_implement_every_request(self):
+        class HistoryOnly(MarketDataProvider):
+            def history(self, ticker, period="1mo", interval="1d", start=None, end=None):
+                return pd.DataFrame()
+
+        with pytest.raises(TypeError):
+            MarketDataProvider()
+        with pytest.raises(TypeError):
+            HistoryOnly()
+
+    def test_yfinance_requests_have_a_timeout(self):
+        with patch("src.market_data.yf.download", return_value=pd.DataFrame()) as mock_download, patch("src.market_data.yf.Ticker") as mock_ticker:
+            YFinanceProvider(timeout=5.0).download(["AAA", "BBB"], period="5d")
+            YFinanceProvider(timeout=5.0).download("AAA", period="5d")
+            assert mock_ticker.return_value.history.call_args.kwargs["timeout"] == 5.0
+            YFinanceProvider().history("AAA", start="2024-01-01")
+        assert mock_download.call_args.kwargs["timeout"] == 5.0
+        assert mock_ticker.return_value.history.call_args.kwargs["timeout"] == MARKET_DATA_TIMEOUT_SECONDS
+
+    def test_single_symbol_download_has_the_yf_download_shape(self):
+        index = pd.DatetimeIndex(["2024-01-02", "2024-01-03"], name="Date").tz_localize("America/New_York")
+        history = pd.DataFrame({"Open": [1.0, 2.0], "High": [1.5, 2.5], "Low": [0.5, 1.5], "Close": [1.2, 2.2], "Volume": [10, 20]}, index=index)
+        with patch("src.market_data.yf.Ticker") as mock_ticker, patch("src.market_data.yf.download") as mock_download:
+            mock_ticker.return_value.history.return_value = history
+            by_column = YFinanceProvider().download("aaa", start="2024-01-01")
+            by_ticker = YFinanceProvider().download(["aaa"], start="2024-01-01", group_by="ticker")
+            intraday = YFinanceProvider().download("aaa", period="1d", interval="1h")
+        mock_download.assert_not_called()
+        assert by_column.columns.tolist() == [("Close", "AAA"), ("High", "AAA"), ("Low", "AAA"), ("Open", "AAA"), ("Volume", "AAA")]
+        assert by_column.columns.names == ["Price", "Ticker"]
+        assert by_column.index.tz is None and by_column.index.strftime("%Y-%m-%d").tolist() == ["2024-01-02", "2024-01-03"]
+        assert by_ticker["AAA"]["Close"].tolist() == [1.2, 2.2]
+        assert str(intraday.index.tz) == "UTC"
+
+    def test_single_symbol_downloads_overlap(self):
+        # Both requests must be inside history() at the same time to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+
+        def history(**kwargs):
+            barrier.wait()
+            return pd.DataFrame({"Close": [1.0]}, index=pd.DatetimeIndex(["2024-01-02"], name="Date"))
+
+        results = {}
+        with patch("src.market_data.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.side_effect = history
+            threads = [threading.Thread(target=lambda symbol=symbol: results.update({symbol: YFinanceProvider().download(symbol, period="5d")})) for symbol in ["AAA", "BBB"]]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert not barrier.broken
+        assert results["AAA"]["Close"]["AAA"].tolist() == [1.0] and results["BBB"]["Close"]["BBB"].tolist() == [1.0]
+
+    def test_fetch_paths_use_the_provider(self, fixtures, tmp_path, monkeypatch):
+        monkeypatch.setattr(data_loader, "DATA_DIR", tmp_path)
+        previous = get_provider()
+        with use_provider(ReplayProvider(fixtures)):
+            results = data_loader.fetch_stock_data_batch(["AAA", "BBB"], start="2024-01-01", end="2024-02-01")
+            latest = data_loader.fetch_latest_price("AAA", save=False)
+        assert get_provider() is previous
+
+        assert len(results["AAA"]) == 3 and len(results["BBB"]) == 1
+        assert pd.read_csv(tmp_path / "AAA.csv")["Close"].tolist() == [100.0, 101.0, 102.0]
+        assert latest == 103.0
@@ -0,0 +1,103 @@
+"""
+tests/test_market_snapshot.py
+
+Purpose:
+    This module contains unit tests for the market data snapshot in src/market_snapshot.py.
+
+Functions (classes):
+    - TestMarketSnapshot
+    - TestBuildMarketSnapshot
+
+Notes:
+    yf.download is mocked with a (symbol, field) column frame like the real group_by="ticker" result,
+    and yf.Ticker where a single symbol is downloaded.
+    Every test gets an empty FX cache, so rates never leak between tests.
+"""
+
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from src.market_snapshot import *
+from src.ticker_utils import FXRateCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_fx_cache(monkeypatch):
+    cache = FXRateCache(path=None)
+    monkeypatch.setattr("src.market_snapshot.FX_CACHE", cache)
+    return cache
+
+
+def make_download(closes: dict) -> pd.DataFrame:
+    return pd.concat({symbol: pd.DataFrame({"Close": values}) for symbol, values in closes.items()}, axis=1)
+
+
+class TestMarketSnapshot:
+
+    def test_conversion_and_returns(self):
+        snapshot = MarketSnapshot(
+            latest_close={"AAPL": 110.0},
+            previous_close={"AAPL": 100.0},
+            currency={"AAPL": "USD"},
+            fx_rates={"USD": 1.3},
+        )
+        assert snapshot.converted_price("aapl") == pytest.approx(143.0)
+        assert snapshot.daily_return("AAPL") == pytest.approx(10.0)
+        assert snapshot.fx_rate("SGD") == 1.0
+        assert np.isnan(snapshot.converted_price("MSFT"))
+
+    def test_last_closes_skips_missing_and_zero(self):
+        data = make_download({"AAPL": [100.0, np.nan, 101.0, 0.0]})
+        assert last_closes(data, "AAPL") == [100.0, 101.0]
+        assert last_closes(data, "TSLA") == []
+
+
+class TestBuildMarketSnapshot:
+
+    @patch("src.market_data.yf.download")
+    def test_single_download_with_fx_pairs(self, mock_download):
+        mock_download.return_value = make_download({
+            "AAPL": [100.0, 110.0],
+            "D05.SI": [35.0, 36.0],
+            "USDSGD=X": [1.34, 1.35],
+        })
+
+        snapshot = build_market_snapshot(["aapl", "D05.SI", "AAPL"])
+
+        mock_download.assert_called_once()
+        assert mock_download.call_args.args[0] == ["AAPL", "D05.SI", "USDSGD=X"]
+        assert snapshot.currency == {"AAPL": "USD", "D05.SI": "SGD"}
+        assert snapshot.fx_rates == {"SGD": 1.0, "USD": 1.35}
+        assert snapshot.previous_close["AAPL"] == 100.0
+        assert snapshot.converted_price("AAPL") == pytest.approx(148.5)
+
+    @patch("src.market_data.yf.Ticker")
+    def test_cached_rate_not_downloaded(self, mock_ticker, fresh_fx_cache):
+        fresh_fx_cache.put("USD", "SGD", 1.3)
+        mock_ticker.return_value.history.return_value = pd.DataFrame({"Close": [100.0, 110.0]})
+
+        snapshot = build_market_snapshot(["AAPL"])
+
+        mock_ticker.assert_called_once_with("AAPL")
+        assert snapshot.converted_price("AAPL") == pytest.approx(143.0)
+
+    @patch("src.market_data.yf.download")
+    def test_downloaded_rate_is_cached(self, mock_download, fresh_fx_cache):
+        mock_download.return_value = make_download({"AAPL": [100.0, 110.0], "USDSGD=X": [1.35]})
+        build_market_snapshot(["AAPL"])
+        assert fresh_fx_cache.get_rates(["USD"]) == {"USD": 1.35}
+
+    @patch("src.market_data.yf.download")
+    def test_missing_fx_pair(self, mock_download):
+        mock_download.return_value = make_download({"AAPL": [100.0, 110.0]})
+        snapshot = build_market_snapshot(["AAPL"])
+        assert np.isnan(snapshot.fx_rates["USD"])
+        assert np.isnan(snapshot.converted_price("AAPL"))
+
+    @patch("src.market_data.yf.download")
+    def test_empty_list(self, mock_download):
+        snapshot = build_market_snapshot([])
+        mock_download.assert_not_called()
+        assert snapshot.latest_close == {}
@@ -0,0 +1,87 @@
+"""
+tests/test_panel_indicators.py
+
+Purpose:
+    This module contains unit tests for the multi-ticker panel functions in src/panel_indicators.py.
+
+Functions (classes):
+    - TestPanelAlignment
+    - TestPanelRegistry
+
+Notes:
+    Panel results are compared against the single-ticker functions in src/technical_indicators.py,
+    including tickers with different listing dates and exchange holidays.
+"""
+
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.panel_indicators import *
+from src.technical_indicators import calculate_SMA, calculate_EMA, calculate_RSI, calculate_MACD
+
+
+def make_panel():
+    """Three tickers on a shared calendar: one listed late and one with holidays."""
+    rng = np.random.default_rng(7)
+    dates = pd.date_range("2024-01-01", periods=120)
+    close = pd.DataFrame(100 + np.cumsum(rng.normal(size=(120, 3)), axis=0),
+                         index=dates, columns=["AAPL", "C6L.SI", "NEW"])
+    close.iloc[[10, 11, 40, 77], 1] = np.nan   # exchange holidays
+    close.iloc[:30, 2] = np.nan                 # listed later
+    return close
+
+
+class TestPanelAlignment:
+
+    @pytest.mark.parametrize("ticker", ["AAPL", "C6L.SI", "NEW"])
+    def test_matches_single_ticker(self, ticker):
+        """Each column should equal the single-ticker result on that ticker's own bars."""
+        close = make_panel()
+        single = pd.DataFrame({"Close": close[ticker].dropna()})
+        single = calculate_SMA(single, window=5)
+        single = calculate_EMA(single, window=12)
+        single = calculate_RSI(single, window=14)
+        single = calculate_MACD(single)
+
+        checks = {
+            "SMA_5": panel_SMA(close, 5),
+            "EMA_12": panel_EMA(close, 12),
+            "RSI": panel_RSI(close, 14),
+            "Signal_Line": panel_MACD(close)["Signal_Line"],
+        }
+        for column, panel in checks.items():
+            result = panel[ticker].dropna()
+            expected = single[column].dropna()
+            assert result.index.equals(expected.index)
+            assert np.allclose(result, expected)
+
+    def test_missing_bars_stay_nan(self):
+        """Dates without a bar stay NaN in the output."""
+        close = make_panel()
+        result = panel_SMA(close, 3)
+        assert result["C6L.SI"].iloc[[10, 11, 40, 77]].isna().all()
+        assert result["NEW"].iloc[:32].isna().all()
+
+    def test_numpy_input_returns_numpy(self):
+        """A NumPy panel in gives a NumPy panel out."""
+        close = make_panel().to_numpy()
+        result = panel_EMA(close, 5)
+        assert isinstance(result, np.ndarray)
+        assert result.shape == close.shape
+
+    def test_rejects_1d_input(self):
+        with pytest.raises(ValueError, match="2-D"):
+            panel_SMA(np.arange(10.0), 3)
+
+
+class TestPanelRegistry:
+
+    def test_output_column_names(self):
+        """Registry outputs use the same column names as the single-ticker functions."""
+        close = make_panel()
+        panel = {"Close": close, "High": close + 1, "Low": close - 1,
+                 "Volume": pd.DataFrame(1000.0, index=close.index, columns=close.columns)}
+        results = calculate_panel_indicators(panel, [SMA_20, RSI_14, MACD, VWAP, EMA26])
+        assert set(results) == {"SMA_20", "RSI", "MACD", "Signal_Line", "MACD_Histogram", "VWAP", "EMA_26"}
+        assert results["VWAP"].shape == close.shape
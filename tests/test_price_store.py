@@ -0,0 +1,142 @@
+"""
+tests/test_price_store.py
+
+Purpose:
+    This module contains unit tests for the binary price store in src/price_store.py.
+
+Functions (classes):
+    - TestPriceStore
+    - TestMigration
+
+Notes:
+    Store and CSV files are written to a pytest temporary directory.
+"""
+
+
+import json
+import os
+import pytest
+import numpy as np
+import pandas as pd
+from src.price_store import *
+from src.data_loader import load_csv_metadata, metadata_filename
+
+
+class TestPriceStore:
+
+    def test_round_trip(self, make_history, tmp_path):
+        df = make_history(50)
+        store = write_price_store(tmp_path / "AAPL.prices", df)
+
+        assert len(store) == 50 and store.capacity == 50 + PRICE_STORE_GROWTH_ROWS
+        assert store.last_date == df["Date"].iloc[-1]
+        pd.testing.assert_frame_equal(store.to_dataframe(), df, check_dtype=False)
+
+    def test_columns_are_memory_mapped(self, make_history, tmp_path):
+        write_price_store(tmp_path / "AAPL.prices", make_history(10))
+        columns = PriceStore(tmp_path / "AAPL.prices").columns(["Close", "Volume"])
+        assert isinstance(columns["Close"], np.memmap)
+        assert columns["Volume"].dtype == np.int64
+        assert not columns["Close"].flags.writeable
+
+    def test_dataframe_shares_the_mapped_columns(self, make_history, tmp_path):
+        store = write_price_store(tmp_path / "AAPL.prices", make_history(10))
+        df = store.to_dataframe()
+        # Every column is a view into the file mapping, nothing was copied
+        for column in df.columns:
+            base = df[column].to_numpy()
+            while base.base is not None and not isinstance(base, np.memmap):
+                base = base.base
+            assert isinstance(base, np.memmap), column
+        with pytest.raises(ValueError):
+            df.loc[0, "Close"] = 1.0
+        df = df.copy()
+        df.loc[0, "Close"] = 1.0
+
+    def test_append_in_place(self, make_history, tmp_path):
+        df = make_history(30)
+        path = tmp_path / "AAPL.prices"
+        store = write_price_store(path, df.iloc[:20])
+        size = os.path.getsize(path)
+
+        # Overlapping rows are skipped, only days after the last stored date are written
+        assert store.append(df.iloc[15:]) == 10
+        assert os.path.getsize(path) == size
+        reopened = PriceStore(path)
+        assert len(reopened) == 30
+        pd.testing.assert_frame_equal(reopened.to_dataframe(), df, check_dtype=False)
+        assert store.append(df.iloc[25:]) == 0
+
+    def test_append_beyond_capacity_rewrites(self, make_history, tmp_path):
+        df = make_history(40)
+        store = write_price_store(tmp_path / "AAPL.prices", df.iloc[:10], capacity=12)
+        assert store.append(df.iloc[10:]) == 30
+        assert store.capacity == 80
+        pd.testing.assert_frame_equal(PriceStore(store.path).to_dataframe(), df, check_dtype=False)
+
+    def test_missing_values(self, tmp_path):
+        df = pd.DataFrame({"Date": ["2024-01-02", "2024-01-03"], "Close": [1.0, np.nan], "Volume": [np.nan, 5]})
+        result = write_price_store(tmp_path / "X.prices", df).to_dataframe()
+        assert np.isnan(result["Close"].iloc[1]) and np.isnan(result["Open"]).all()
+        assert result["Volume"].tolist() == [0, 5]
+
+    def test_empty_store(self, make_history, tmp_path):
+        store = write_price_store(tmp_path / "X.prices", make_history(0))
+        assert len(store) == 0 and store.last_date is None
+        assert store.append(make_history(3)) == 3
+        assert len(PriceStore(store.path)) == 3
+
+    def test_rejects_other_files(self, tmp_path):
+        (tmp_path / "bad.prices").write_bytes(b"Date,Close\n")
+        with pytest.raises(ValueError):
+            PriceStore(tmp_path / "bad.prices")
+
+
+class TestMigration:
+
+    def test_migrate_and_export(self, make_history, tmp_path):
+        csv_dir, store_dir = tmp_path / "CSV", tmp_path / "STORE"
+        csv_dir.mkdir()
+        store_dir.mkdir()
+        df = make_history(25)
+        csv = df.assign(Date=df["Date"].dt.strftime("%Y-%m-%d"))
+        csv.to_csv(csv_dir / "AAPL.csv", index=False)
+        pd.DataFrame({"Date": ["2024-01-02"], "Close": [1.0]}).to_csv(csv_dir / "AAPL_latest.csv", index=False)
+        pd.DataFrame({"a": [1]}).to_csv(csv_dir / "notes.csv", index=False)
+
+        assert migrate_csv_to_store(csv_directory=csv_dir, directory=store_dir) == ["AAPL"]
+        loaded = load_price_history("AAPL", directory=store_dir, csv_directory=csv_dir)
+        pd.testing.assert_frame_equal(loaded, df, check_dtype=False)
+
+        exported = export_store_to_csv("AAPL", filename=tmp_path / "out.csv", directory=store_dir)
+        original = pd.read_csv(csv_dir / "AAPL.csv")
+        pd.testing.assert_frame_equal(pd.read_csv(exported), original)
+
+    def test_export_rebuilds_the_sidecar(self, make_history, tmp_path):
+        df = make_history(20)
+        filename = tmp_path / "AAPL.csv"
+        df.iloc[:10].to_csv(filename, index=False)
+        load_csv_metadata(str(filename))
+
+        # The sidecar on disk already describes the exported file
+        write_price_store(tmp_path / "AAPL.prices", df)
+        export_store_to_csv("AAPL", filename=filename, directory=tmp_path)
+        with open(metadata_filename(str(filename))) as file:
+            metadata = json.load(file)
+        assert metadata["rows"] == 20 and metadata["size"] == os.path.getsize(filename)
+        assert metadata["last_date"] == df["Date"].iloc[-1].strftime("%Y-%m-%d")
+
+    def test_export_keeps_intraday_timestamps(self, tmp_path):
+        df = pd.DataFrame({"Date": pd.date_range("2024-01-02 09:30", periods=3, freq="30min"), "Close": [1.0, 2.0, 3.0]})
+        write_price_store(tmp_path / "X.prices", df)
+        exported = pd.read_csv(export_store_to_csv("X", filename=tmp_path / "X.csv", directory=tmp_path), parse_dates=["Date"])
+        assert exported["Date"].tolist() == df["Date"].tolist()
+
+    def test_load_falls_back_to_csv(self, make_history, tmp_path):
+        make_history(5).to_csv(tmp_path / "MSFT.csv", index=False)
+        assert len(load_price_history("MSFT", directory=tmp_path, csv_directory=tmp_path)) == 5
+        assert load_price_history("NONE", directory=tmp_path, csv_directory=tmp_path).empty
+
+    def test_export_without_store(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            export_store_to_csv("NONE", directory=tmp_path)
@@ -0,0 +1,156 @@
+"""
+tests/test_range_index.py
+
+Purpose:
+    This module contains unit tests for the range query index in src/range_index.py.
+
+Functions (classes):
+    - TestSparseTable
+    - TestRangeQueryIndex
+    - TestRangeStatsIndex
+
+Notes:
+    Query results are compared against brute force scans, against calculate_upward_and_Downward_runs()
+    and against pandas statistics of the filtered rows.
+"""
+
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.range_index import *
+from src.analytics import calculate_upward_and_Downward_runs
+from src.technical_indicators import calculate_SMA
+
+
+def brute_force_trade(close):
+    best = (0.0, None, None)
+    for buy in range(len(close)):
+        for sell in range(buy + 1, len(close)):
+            if close[sell] - close[buy] > best[0]:
+                best = (close[sell] - close[buy], buy, sell)
+    return best
+
+
+class TestSparseTable:
+
+    def test_first_maximum(self):
+        values = np.array([1, 5, 2, 5, 3, 0, 4])
+        table = sparse_table_argmax(values)
+        for first in range(len(values)):
+            for last in range(first, len(values)):
+                assert sparse_table_query(values, table, first, last) == first + int(np.argmax(values[first:last + 1]))
+
+    def test_numpy_positions(self):
+        values = np.array([1, 5, 2, 5, 3, 0, 4])
+        days = np.arange(len(values)) * 10
+        first, last = np.searchsorted(days, [15, 60])
+        assert isinstance(first, np.int64)
+        assert sparse_table_query(values, sparse_table_argmax(values), first, last - 1) == 3
+
+
+class TestRangeQueryIndex:
+
+    def test_best_trade_small_example(self):
+        index = RangeQueryIndex(np.array([7.0, 1, 5, 3, 6, 4]), pd.date_range("2024-01-01", periods=6))
+        trade = index.best_trade(0, 5)
+        assert trade["profit"] == 5
+        assert trade["buy"] == pd.Timestamp("2024-01-02")
+        assert trade["sell"] == pd.Timestamp("2024-01-05")
+        # Falling prices only
+        assert index.best_trade(0, 1) == {"profit": 0.0, "buy": None, "sell": None}
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_matches_brute_force_and_runs(self, seed):
+        rng = np.random.default_rng(seed)
+        rows = int(rng.integers(2, 50))
+        # Rounded prices so flat days and ties occur
+        close = np.round(10 + np.cumsum(rng.normal(size=rows)))
+        if seed % 3 == 0:
+            close[rng.integers(rows)] = np.nan
+        dates = pd.date_range("2024-01-01", periods=rows)
+        index = RangeQueryIndex(close, dates)
+
+        for _ in range(20):
+            first = int(rng.integers(0, rows))
+            last = int(rng.integers(first, rows))
+            profit, buy, sell = brute_force_trade(close[first:last + 1])
+            assert index.best_trade(first, last)["profit"] == pytest.approx(profit)
+
+            df = pd.DataFrame({"Close": close[first:last + 1]}, index=dates[first:last + 1])
+            _, longest_up, longest_down = calculate_upward_and_Downward_runs(df)
+            assert index.longest_run(first, last, "up") == longest_up
+            assert index.longest_run(first, last, "down") == longest_down
+
+    def test_date_queries(self):
+        dates = pd.date_range("2024-01-01", periods=10, freq="D", tz="America/New_York")
+        index = RangeQueryIndex(np.arange(10.0), dates)
+        assert index.positions(pd.Timestamp("2024-01-03").date(), pd.Timestamp("2024-01-05").date()) == (2, 4)
+        run = index.longest_run_between("2024-01-03", "2024-01-05")
+        assert run["length"] == 2 and run["start"] == dates[2] and run["end"] == dates[4]
+        assert index.best_trade_between("2024-01-03", "2024-01-05")["profit"] == 2
+
+    def test_empty_range_and_invalid_direction(self):
+        index = RangeQueryIndex(np.arange(5.0), pd.date_range("2024-01-01", periods=5))
+        assert index.longest_run_between("2025-01-01", "2025-02-01") == {"length": 0, "start": None, "end": None}
+        with pytest.raises(ValueError):
+            index.longest_run(0, 4, "sideways")
+
+    def test_date_query_needs_dates(self):
+        with pytest.raises(ValueError, match="DatetimeIndex"):
+            RangeQueryIndex(np.arange(5.0)).positions("2024-01-01", "2024-01-02")
+
+
+class TestRangeStatsIndex:
+
+    def make_history(self, rows=300, level=100.0):
+        rng = np.random.default_rng(8)
+        close = level + np.cumsum(rng.normal(size=rows)) * 0.01
+        close[5] = np.nan
+        return pd.DataFrame({
+            "Close": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Volume": rng.integers(1000, 5000, size=rows).astype(float),
+        }, index=pd.date_range("2024-01-01", periods=rows))
+
+    @pytest.mark.parametrize("level", [100.0, 1e6])
+    def test_matches_pandas(self, level):
+        """Large prices with a small spread still give the pandas variance."""
+        df = self.make_history(level=level)
+        index = RangeStatsIndex.from_dataframe(df)
+        rng = np.random.default_rng(1)
+        for _ in range(50):
+            first = int(rng.integers(0, len(df)))
+            last = int(rng.integers(first, len(df)))
+            rows = df.iloc[first:last + 1]
+            stats = index.stats(first, last)
+            typical = (rows["High"] + rows["Low"] + rows["Close"]) / 3
+            traded = typical.notna()
+
+            assert stats["count"] == rows["Close"].count()
+            assert stats["mean"] == pytest.approx(rows["Close"].mean(), rel=1e-12)
+            assert np.isclose(stats["variance"], rows["Close"].var(), rtol=1e-6, equal_nan=True)
+            assert stats["total_volume"] == rows["Volume"].sum()
+            assert stats["vwap"] == pytest.approx((typical[traded] * rows["Volume"][traded]).sum() / rows["Volume"][traded].sum())
+
+    def test_sma_matches_rolling_mean(self):
+        df = self.make_history()
+        index = RangeStatsIndex.from_dataframe(df)
+        expected = df["Close"].rolling(20).mean()
+        result = [index.sma(20, row) for row in range(len(df))]
+        assert np.allclose(result, expected, equal_nan=True)
+        assert index.sma_at("2024-03-01", 20) == pytest.approx(expected.loc["2024-03-01"])
+
+    def test_sma_nan_close_differs_from_calculate_sma(self):
+        """A NaN close makes the windows holding it NaN, calculate_SMA() counts it as 0."""
+        df = pd.DataFrame({"Close": [np.nan, 2.0, 3.0, 4.0, 5.0], "High": 6.0, "Low": 1.0, "Volume": 100.0},
+                          index=pd.date_range("2024-01-01", periods=5))
+        index = RangeStatsIndex.from_dataframe(df)
+        assert np.allclose([index.sma(2, row) for row in range(5)], [np.nan, np.nan, 2.5, 3.5, 4.5], equal_nan=True)
+        assert np.allclose(calculate_SMA(df.copy(), 2)["SMA_2"], [np.nan, 1.0, 2.5, 3.5, 4.5], equal_nan=True)
+
+    def test_empty_range(self):
+        index = RangeStatsIndex.from_dataframe(self.make_history())
+        stats = index.stats_between("2030-01-01", "2030-02-01")
+        assert stats["count"] == 0 and np.isnan(stats["mean"]) and stats["total_volume"] == 0
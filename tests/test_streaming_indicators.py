@@ -0,0 +1,155 @@
+"""
+tests/test_streaming_indicators.py
+
+Purpose:
+    This module contains unit tests for the incremental calculators in src/streaming_indicators.py.
+
+Functions (classes):
+    - TestStreamingMatchesBatch
+    - TestIndicatorState
+
+Notes:
+    Streaming results are compared against a full recompute with the functions in
+    src/technical_indicators.py, including a save/restore of the state part way through.
+"""
+
+
+import json
+import pytest
+from collections import deque
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from src.streaming_indicators import *
+from src.technical_indicators import TECHNICAL_INDICATORS, calculate_MACD
+
+
+def batch_indicators(df):
+    result = df.copy()
+    for indicator in TECHNICAL_INDICATOR_OPTIONS:
+        result = TECHNICAL_INDICATORS[indicator](result)
+    return result
+
+
+class TestStreamingMatchesBatch:
+
+    def test_fold_matches_full_recompute(self, make_history):
+        """Folding bars one by one (with a JSON round trip midway) matches the batch functions."""
+        df = make_history(300)
+        expected = batch_indicators(df)
+
+        calculators = build_streaming_indicators()
+        rows = []
+        for i, bar in enumerate(df.to_dict("records")):
+            if i == 150:
+                calculators = {name: indicator_from_dict(json.loads(json.dumps(calc.to_dict())))
+                               for name, calc in calculators.items()}
+            output = {}
+            for calculator in calculators.values():
+                output.update(calculator.update(bar))
+            rows.append(output)
+        streamed = pd.DataFrame(rows).astype(float)
+
+        for column in streamed.columns:
+            assert np.allclose(streamed[column], expected[column], equal_nan=True), column
+
+    @pytest.mark.parametrize("missing", [10, 30, 120])
+    def test_macd_signal_carries_over_nan_closes(self, make_history, missing):
+        """A NaN close during the EMA warm-up, the signal warm-up or later: the signal line is carried like pandas' ewm."""
+        df = make_history(200)
+        df.loc[missing, "Close"] = np.nan
+        expected = calculate_MACD(df.copy())
+
+        macd = StreamingMACD()
+        streamed = pd.DataFrame([macd.update(bar) for bar in df.to_dict("records")]).astype(float)
+        for column in ["MACD", "Signal_Line", "MACD_Histogram"]:
+            assert np.allclose(streamed[column], expected[column], equal_nan=True), column
+        # Once the signal line is warmed up (row 33), it holds its last value from the NaN close on
+        if missing > 33:
+            assert (streamed["Signal_Line"].iloc[missing:] == streamed["Signal_Line"].iloc[missing - 1]).all()
+
+    def test_warmup_returns_none(self):
+        sma = StreamingSMA(window=3)
+        assert sma.update({"Close": 1})["SMA_3"] is None
+        assert sma.update({"Close": 2})["SMA_3"] is None
+        assert sma.update({"Close": 3})["SMA_3"] == pytest.approx(2.0)
+
+    def test_windows_are_deques_restored_from_lists(self):
+        stochastic = StreamingStochastic(window=3, smooth_period=2)
+        for close in [1.0, 3.0, 2.0, 5.0, 4.0]:
+            stochastic.update({"High": close + 1, "Low": close - 1, "Close": close})
+        data = stochastic.to_dict()
+        assert data["recent_k"] == list(stochastic.recent_k) and len(data["recent_k"]) == 2
+        assert data["highest_high"]["entries"] == [[3, 6.0], [4, 5.0]]
+
+        restored = indicator_from_dict(json.loads(json.dumps(data)))
+        assert isinstance(restored.recent_k, deque) and restored.recent_k.maxlen == 2
+        assert isinstance(restored.highest_high.entries, deque)
+        assert restored.update({"High": 3.0, "Low": 1.0, "Close": 2.0}) == stochastic.update({"High": 3.0, "Low": 1.0, "Close": 2.0})
+
+    def test_calculator_without_update_cannot_be_created(self):
+        @dataclass
+        class StreamingNothing(StreamingIndicator):
+            window: int = 3
+
+        with pytest.raises(TypeError):
+            StreamingNothing()
+        assert StreamingSMA(window=3).to_dict()["type"] == "StreamingSMA"
+
+    def test_unknown_type_raises(self):
+        with pytest.raises(ValueError, match="Unknown"):
+            indicator_from_dict({"type": "StreamingFoo"})
+
+
+class TestIndicatorState:
+
+    def test_incremental_update_matches_rebuild(self, make_history, tmp_path, monkeypatch):
+        """Carrying the saved state forward gives the same latest values as a rebuild."""
+        monkeypatch.setattr("src.data_loader.DATA_DIR", tmp_path)
+        df = make_history(300)
+
+        update_indicator_state("TEST", df.iloc[:250])
+        state = update_indicator_state("TEST", df)
+        assert state["rows"] == 300
+        assert state["last_date"] == df["Date"].iloc[-1].strftime("%Y-%m-%d")
+
+        expected = batch_indicators(df).iloc[-1]
+        for column, value in state["latest"].items():
+            assert value == pytest.approx(expected[column])
+
+    def test_mismatched_history_rebuilds(self, make_history, tmp_path, monkeypatch):
+        """If the saved row count does not match the history, the state is rebuilt."""
+        monkeypatch.setattr("src.data_loader.DATA_DIR", tmp_path)
+        df = make_history(300)
+        update_indicator_state("TEST", df.iloc[:250])
+
+        state = update_indicator_state("TEST", df.iloc[10:])
+        assert state["rows"] == 290
+
+    def test_new_rows_with_row_count_do_not_read_history(self, make_history, tmp_path, monkeypatch):
+        """With the row count of the history, only the new rows are folded in and the history is not loaded."""
+        monkeypatch.setattr("src.data_loader.DATA_DIR", tmp_path)
+        df = make_history(300)
+        update_indicator_state("TEST", df.iloc[:250])
+
+        def no_history(ticker):
+            raise AssertionError("the history should not be loaded")
+
+        monkeypatch.setattr("src.streaming_indicators.load_price_history", no_history)
+        state = update_indicator_state("TEST", df.iloc[250:], rows=300)
+        assert state["rows"] == 300
+        expected = update_indicator_state("TEST_FULL", df)
+        assert state["latest"] == pytest.approx(expected["latest"])
+
+        assert update_indicator_state("TEST", df.iloc[:0], rows=300)["rows"] == 300
+
+    def test_new_rows_that_do_not_line_up_reload_history(self, make_history, tmp_path, monkeypatch):
+        """If the row count does not match the saved state, the whole history is loaded and the state rebuilt."""
+        monkeypatch.setattr("src.data_loader.DATA_DIR", tmp_path)
+        df = make_history(300)
+        update_indicator_state("TEST", df.iloc[:250])
+        monkeypatch.setattr("src.streaming_indicators.load_price_history", lambda ticker: df)
+
+        state = update_indicator_state("TEST", df.iloc[260:], rows=300)
+        assert state["rows"] == 300
+        assert state["last_date"] == df["Date"].iloc[-1].strftime("%Y-%m-%d")
@@ -0,0 +1,52 @@
+"""
+tests/test_streamlit_adapter.py
+
+Purpose:
+    This module contains unit tests for the Streamlit adapter in src/streamlit_adapter.py.
+
+Functions (classes):
+    - TestStreamlitAdapter
+
+Notes:
+    st.error is mocked, so the tests check which messages would be shown without running a Streamlit app.
+"""
+
+
+import pandas as pd
+from functools import partial
+from unittest.mock import patch
+from src.streamlit_adapter import *
+from src.technical_indicators import calculate_RSI
+from src.config import *
+
+
+class TestStreamlitAdapter:
+
+    @patch("src.streamlit_adapter.st.error")
+    def test_warnings_become_messages(self, mock_error):
+        df = pd.DataFrame({"Date": pd.date_range("2024-01-01", periods=5), "Close": [1.0, 2, 3, 4, 5]})
+        result = apply_selected_technical_indicators_with_alerts(df, [EMA12, RSI_14])
+        assert mock_error.call_count == 2
+        assert "EMA_12" in result.columns and "RSI" in result.columns
+
+    @patch("src.streamlit_adapter.st.error")
+    def test_error_becomes_message(self, mock_error):
+        df = pd.DataFrame({"Close": [1, 2, 3]})
+        result = run_indicator_with_alerts(partial(calculate_RSI, window=14), df)
+        mock_error.assert_called_once()
+        assert "RSI" not in result.columns
+
+    @patch("src.streamlit_adapter.st.session_state", new_callable=dict)
+    def test_range_index_built_once(self, mock_session_state):
+        data = pd.DataFrame({"Close": [1.0, 2, 3]}, index=pd.date_range("2024-01-01", periods=3))
+        first = cached_range_index("AAA", data)
+        assert cached_range_index("AAA", data) is first
+        assert cached_range_index("BBB", data) is not first
+
+    @patch("src.streamlit_adapter.st.session_state", new_callable=dict)
+    def test_range_indexes_cached_per_class(self, mock_session_state):
+        data = pd.DataFrame({"Close": [1.0, 2, 3], "Volume": [10.0, 20, 30]}, index=pd.date_range("2024-01-01", periods=3))
+        query_index = cached_range_index("AAA", data)
+        stats_index = cached_range_index("AAA", data, RangeStatsIndex)
+        assert isinstance(stats_index, RangeStatsIndex)
+        assert cached_range_index("AAA", data) is query_index
@@ -0,0 +1,84 @@
+"""
+tests/test_synthetic_data.py
+
+Purpose:
+    This module contains unit tests for the synthetic OHLCV generator in src/synthetic_data.py.
+
+Functions (classes):
+    - TestGenerateOHLCV
+    - TestWriteSyntheticUniverse
+
+Notes:
+    Files are written to a pytest temporary directory.
+"""
+
+
+import pytest
+import numpy as np
+import pandas as pd
+import src.synthetic_data as synthetic_data
+from src.synthetic_data import *
+from src.price_store import open_price_store
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # Several blocks per history without generating hundreds of thousands of rows
+    monkeypatch.setattr(synthetic_data, "SYNTHETIC_BLOCK_ROWS", 64)
+
+
+def history(index: int, rows: int, **kwargs) -> pd.DataFrame:
+    return pd.concat(generate_ohlcv(index, rows, **kwargs), ignore_index=True)
+
+
+class TestGenerateOHLCV:
+
+    def test_schema_and_price_bounds(self):
+        df = history(0, 500, start_date="2024-01-06")
+        assert list(df.columns) == ["Date", "Close", "High", "Low", "Open", "Volume"]
+        assert df["Volume"].dtype == np.int64 and (df["Volume"] > 0).all()
+        assert (df["High"] >= df[["Open", "Close"]].max(axis=1)).all()
+        assert (df["Low"] <= df[["Open", "Close"]].min(axis=1)).all()
+        # 2024-01-06 is a Saturday, the history starts on the Monday after it and skips weekends
+        assert df["Date"].iloc[0] == pd.Timestamp("2024-01-08")
+        assert df["Date"].is_monotonic_increasing and df["Date"].dt.dayofweek.max() == 4
+
+    def test_chunks_are_bounded_and_do_not_change_the_data(self, small_blocks):
+        chunks = list(generate_ohlcv(1, 300, chunk_rows=50))
+        assert [len(chunk) for chunk in chunks] == [50] * 6
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), history(1, 300, chunk_rows=1000))
+        pd.testing.assert_frame_equal(history(1, 300, chunk_rows=7), history(1, 300, chunk_rows=1000))
+
+    def test_seeded_and_reproducible(self, small_blocks):
+        pd.testing.assert_frame_equal(history(2, 200), history(2, 200))
+        assert not history(2, 200)["Close"].equals(history(2, 200, seed=7)["Close"])
+        assert not history(2, 200)["Close"].equals(history(3, 200)["Close"])
+        # A longer history starts with the rows of a shorter one
+        pd.testing.assert_frame_equal(history(2, 300).iloc[:130], history(2, 130))
+
+    def test_invalid_sizes(self):
+        with pytest.raises(ValueError):
+            list(generate_ohlcv(0, 0))
+        with pytest.raises(ValueError):
+            list(generate_ohlcv(0, 200_000))
+
+
+class TestWriteSyntheticUniverse:
+
+    def test_csv_files(self, tmp_path, small_blocks):
+        assert write_synthetic_universe(tmp_path, tickers=3, rows=150, chunk_rows=40) == 450
+        df = pd.read_csv(tmp_path / "SYN000002.csv", parse_dates=["Date"])
+        expected = history(2, 150)
+        assert list(df.columns) == list(expected.columns)
+        np.testing.assert_allclose(df["Close"], expected["Close"])
+        assert df["Volume"].tolist() == expected["Volume"].tolist()
+
+    def test_store_files(self, tmp_path, small_blocks):
+        write_synthetic_universe(tmp_path, tickers=2, rows=150, file_format="store", chunk_rows=40)
+        store = open_price_store("SYN000001", tmp_path)
+        assert len(store) == 150 and store.capacity == 150
+        pd.testing.assert_frame_equal(store.to_dataframe(), history(1, 150), check_dtype=False)
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            write_synthetic_universe(tmp_path, tickers=1, rows=10, file_format="parquet")
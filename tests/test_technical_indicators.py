@@ -10,6 +10,9 @@ Functions (classes):
     - TestVWAP
     - TestEMA
     - TestMACD
+    - TestChannelIndicators
+    - TestAnchoredVWAP
+    - TestHeadlessCore
 
 Notes:
     Each test class contains multiple test cases to validate the correctness of the corresponding technical indicator functions.
@@ -17,6 +20,9 @@ Notes:
 """
 
 
+import os
+import subprocess
+import sys
 import pytest
 from unittest.mock import patch
 import pandas as pd
@@ -247,3 +253,104 @@ class TestMACD:
 
 
         
+
+
+class TestChannelIndicators:
+
+    def make_df(self):
+        return pd.DataFrame({
+            "High": [10, 12, 11, 15, 14, 13],
+            "Low": [8, 9, 7, 12, 11, 10],
+            "Close": [9, 11, 10, 14, 12, 11],
+        })
+
+    def test_donchian_bands(self):
+        result = calculate_Donchian(self.make_df(), window=3)
+        assert result["Donchian_Upper"].isna()[:2].all()
+        assert result["Donchian_Upper"].tolist()[2:] == [12, 15, 15, 15]
+        assert result["Donchian_Lower"].tolist()[2:] == [7, 7, 7, 10]
+        assert result["Donchian_Middle"].iloc[-1] == pytest.approx(12.5)
+
+    def test_stochastic_and_williams_r(self):
+        """%K and Williams %R are the same position in the range, on 0..100 and -100..0 scales."""
+        df = calculate_Williams_R(calculate_Stochastic(self.make_df(), window=3, smooth_period=2), window=3)
+        # Last window: highest high 15, lowest low 10, close 11
+        assert df["Stochastic_K"].iloc[-1] == pytest.approx(20.0)
+        assert df["Williams_R"].iloc[-1] == pytest.approx(-80.0)
+        assert df["Stochastic_D"].iloc[-1] == pytest.approx((df["Stochastic_K"].iloc[-1] + df["Stochastic_K"].iloc[-2]) / 2)
+        assert df["Stochastic_D"].isna()[:3].all()
+
+    def test_matches_pandas_rolling(self):
+        rng = np.random.default_rng(8)
+        close = 100 + np.cumsum(rng.normal(size=500))
+        df = pd.DataFrame({"Close": close, "High": close + rng.random(500), "Low": close - rng.random(500)})
+        result = calculate_Stochastic(df.copy(), window=14)
+        highest = df["High"].rolling(14).max()
+        lowest = df["Low"].rolling(14).min()
+        expected = 100 * (df["Close"] - lowest) / (highest - lowest)
+        assert np.allclose(result["Stochastic_K"], expected, equal_nan=True)
+        assert np.allclose(result["Stochastic_D"], expected.rolling(3).mean(), equal_nan=True)
+
+    def test_missing_columns(self):
+        with pytest.raises(ValueError, match="DataFrame must contain"):
+            calculate_Williams_R(pd.DataFrame({"Close": [1, 2, 3]}))
+
+
+class TestAnchoredVWAP:
+
+    def make_df(self):
+        return pd.DataFrame({
+            "Date": pd.to_datetime(["2024-01-30", "2024-01-31", "2024-02-01", "2024-02-02"]),
+            "High": [11, 12, 21, 22],
+            "Low": [9, 10, 19, 20],
+            "Close": [10, 11, 20, 21],
+            "Volume": [100, 300, 200, 200],
+        })
+
+    def test_monthly_resets_at_month_start(self):
+        result = calculate_anchored_VWAP(self.make_df(), anchor="M")
+        assert result["VWAP_M"].tolist() == pytest.approx([10, 10.75, 20, 20.5])
+
+    def test_anchor_date(self):
+        result = calculate_anchored_VWAP(self.make_df(), anchor="2024-01-31")
+        assert np.isnan(result["VWAP_Anchored"].iloc[0])
+        assert result["VWAP_Anchored"].iloc[1] == pytest.approx(11)
+        assert result["VWAP_Anchored"].iloc[2] == pytest.approx((11 * 300 + 20 * 200) / 500)
+
+    def test_rolling_independent_of_start_row(self):
+        """Unlike calculate_VWAP, dropping the first rows does not change later rolling values."""
+        df = self.make_df()
+        full = calculate_rolling_VWAP(df.copy(), window=2)["VWAP_2"]
+        later = calculate_rolling_VWAP(df.iloc[1:].copy(), window=2)["VWAP_2"]
+        assert later.iloc[1:].tolist() == pytest.approx(full.iloc[2:].tolist())
+
+
+class TestHeadlessCore:
+
+    def test_import_does_not_load_streamlit(self):
+        """The indicator core can be imported by batch jobs and worker processes without Streamlit."""
+        code = "import sys, src.technical_indicators; assert 'streamlit' not in sys.modules"
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+
+    def test_error_carries_details(self):
+        with pytest.raises(InsufficientDataError) as error:
+            calculate_SMA(pd.DataFrame({"Close": [1, 2]}), window=3)
+        assert (error.value.indicator, error.value.min_rows, error.value.rows) == ("SMA", 3, 2)
+
+    def test_apply_selected_warns_and_still_adds_columns(self):
+        df = pd.DataFrame({"Date": pd.date_range("2024-01-01", periods=5), "Close": [1.0, 2, 3, 4, 5]})
+        with pytest.warns(InsufficientDataWarning, match="at least 26 rows"):
+            result = apply_selected_technical_indicators(df, [EMA26])
+        assert result["EMA_26"].isna().all()
+
+    def test_apply_selected_writes_back_numeric_close(self):
+        """EMA and MACD coerce 'Close' to numbers in place, the same as calling calculate_EMA/calculate_MACD."""
+        close = ["1", "2", "x", "4", "5"]
+        df = pd.DataFrame({"Date": pd.date_range("2024-01-01", periods=5), "Close": close})
+        with pytest.warns(InsufficientDataWarning):
+            result = apply_selected_technical_indicators(df, [SMA_20])
+        assert result["Close"].tolist() == close
+
+        with pytest.warns(InsufficientDataWarning):
+            result = apply_selected_technical_indicators(pd.DataFrame({"Date": pd.date_range("2024-01-01", periods=5), "Close": close}), [EMA12])
+        assert result["Close"].dtype == float and pd.isna(result["Close"].iloc[2])
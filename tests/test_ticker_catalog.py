@@ -0,0 +1,122 @@
+"""
+tests/test_ticker_catalog.py
+
+Purpose:
+    This module contains unit tests for the ticker metadata catalog in src/ticker_catalog.py
+    and its use by resolve_unknown_currency() in src/ticker_utils.py.
+
+Functions (classes):
+    - TestTickerCatalog
+    - TestResolveUnknownCurrency
+
+Notes:
+    yf.Ticker is mocked, so no test makes a network call.
+"""
+
+
+import json
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from src.ticker_catalog import *
+from src.ticker_utils import resolve_unknown_currency
+
+
+INFO = {
+    "AAPL": {"currency": "USD", "exchange": "NMS", "quoteType": "EQUITY", "longName": "Apple Inc."},
+    "ASML": {"currency": "EUR", "exchange": "AMS", "quoteType": "EQUITY", "shortName": "ASML Holding"},
+}
+
+
+def fake_ticker(symbol):
+    ticker = MagicMock()
+    if symbol == "BROKEN":
+        type(ticker).info = property(lambda self: (_ for _ in ()).throw(RuntimeError("boom")))
+    else:
+        ticker.info = INFO.get(symbol, {"trailingPegRatio": None})
+    return ticker
+
+
+class TestTickerCatalog:
+
+    @patch("src.market_data.yf.Ticker", side_effect=fake_ticker)
+    def test_enrich_stores_metadata(self, mock_ticker):
+        catalog = TickerCatalog(path=None)
+        found = catalog.enrich(["AAPL", "ASML"])
+        assert found["AAPL"]["name"] == "Apple Inc."
+        assert catalog.get("asml")["name"] == "ASML Holding"
+        assert catalog.get("ASML")["quote_type"] == "EQUITY"
+        assert "AAPL" in catalog and len(catalog) == 2
+
+    @patch("src.market_data.yf.Ticker", side_effect=fake_ticker)
+    def test_failures_are_negatively_cached(self, mock_ticker):
+        catalog = TickerCatalog(path=None)
+        assert catalog.enrich(["NOPE", "BROKEN"]) == {}
+        found, failed, unknown = catalog.lookup(["NOPE", "BROKEN", "AAPL"])
+        assert found == {}
+        assert failed == ["NOPE", "BROKEN"]
+        assert unknown == ["AAPL"]
+        assert catalog.stats()["negative_hits"] == 2
+
+    def test_failures_expire(self):
+        catalog = TickerCatalog(path=None, negative_ttl_seconds=60)
+        catalog.mark_failed("NOPE")
+        assert catalog.recently_failed("NOPE")
+        catalog._failures["NOPE"] = time.time() - 120
+        assert not catalog.recently_failed("NOPE")
+        assert catalog.lookup(["NOPE"])[2] == ["NOPE"]
+
+    def test_put_clears_failure(self):
+        catalog = TickerCatalog(path=None)
+        catalog.mark_failed("ASML")
+        catalog.put("ASML", {"currency": "EUR", "exchange": "AMS", "quote_type": "EQUITY", "name": None})
+        assert not catalog.recently_failed("ASML")
+        assert catalog.lookup(["ASML"])[0]["ASML"]["currency"] == "EUR"
+
+    @patch("src.market_data.yf.Ticker", side_effect=fake_ticker)
+    def test_persistence(self, mock_ticker, tmp_path):
+        path = tmp_path / "catalog.json"
+        TickerCatalog(path=path).enrich(["AAPL", "NOPE"])
+        stored = json.loads(path.read_text())
+        assert set(stored) == {"tickers", "failures"}
+
+        reloaded = TickerCatalog(path=path)
+        mock_ticker.reset_mock()
+        found, failed, unknown = reloaded.lookup(["AAPL", "NOPE"])
+        assert found["AAPL"]["currency"] == "USD"
+        assert failed == ["NOPE"] and unknown == []
+        mock_ticker.assert_not_called()
+
+    @patch("src.market_data.yf.Ticker", side_effect=fake_ticker)
+    def test_enrich_in_background(self, mock_ticker):
+        catalog = TickerCatalog(path=None)
+        catalog.enrich_in_background(["AAPL"])
+        catalog.enrich_thread.join(timeout=5)
+        assert catalog.get("AAPL")["currency"] == "USD"
+
+        catalog.enrich_thread = None
+        catalog.enrich_in_background(["AAPL"])
+        assert catalog.enrich_thread is None
+
+
+class TestResolveUnknownCurrency:
+
+    @patch("src.market_data.yf.Ticker", side_effect=fake_ticker)
+    def test_resolves_and_caches(self, mock_ticker):
+        catalog = TickerCatalog(path=None)
+        ticker_currency = {"D05.SI": "SGD"}
+        result = resolve_unknown_currency(["D05.SI", "ASML", "NOPE"], ticker_currency, catalog=catalog)
+        assert result is ticker_currency
+        assert result == {"D05.SI": "SGD", "ASML": "EUR", "NOPE": "UNKNOWN"}
+        assert mock_ticker.call_count == 2
+
+        mock_ticker.reset_mock()
+        assert resolve_unknown_currency(["ASML", "NOPE"], {}, catalog=catalog) == {"ASML": "EUR", "NOPE": "UNKNOWN"}
+        mock_ticker.assert_not_called()
+
+    @patch("src.market_data.yf.Ticker", side_effect=fake_ticker)
+    def test_without_waiting(self, mock_ticker):
+        catalog = TickerCatalog(path=None)
+        assert resolve_unknown_currency(["ASML"], {}, catalog=catalog, wait=False) == {"ASML": "UNKNOWN"}
+        catalog.enrich_thread.join(timeout=5)
+        assert resolve_unknown_currency(["ASML"], {}, catalog=catalog, wait=False) == {"ASML": "EUR"}
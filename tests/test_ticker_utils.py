@@ -0,0 +1,148 @@
+"""
+tests/test_ticker_utils.py
+
+Purpose:
+    This module contains unit tests for the currency helpers in src/ticker_utils.py.
+
+Functions (classes):
+    - TestCurrencyConversion
+    - TestFXRateCache
+    - TestCrossRates
+
+Notes:
+    yf.download and yf.Ticker (single symbol downloads) are mocked, so no network calls are made. The FX cache tests use private
+    FXRateCache instances so they do not depend on the process wide FX_CACHE.
+"""
+
+
+import time
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from src.ticker_utils import *
+
+
+def make_fx_download(quotes: dict) -> pd.DataFrame:
+    """Download of USD pivot quotes, e.g. {"SGD": 1.35} gives the 'USDSGD=X' column."""
+    return pd.concat({fx_pair_symbol("USD", currency): pd.DataFrame({"Close": [rate]}) for currency, rate in quotes.items()}, axis=1)
+
+
+def make_fx_history(rate: float) -> pd.DataFrame:
+    """Ticker().history() of a single pivot quote, used when only one pair is downloaded."""
+    return pd.DataFrame({"Close": [rate]}, index=pd.DatetimeIndex(["2024-01-02"], name="Date"))
+
+
+class TestCurrencyConversion:
+
+    def test_gather_fx_rates(self):
+        with pytest.warns(MissingFXRateWarning) as caught:
+            rates = gather_fx_rates(["USD", "SGD", None, "EUR", "USD"], {"USD": 1.35, "SGD": 1.0, "EUR": None})
+        assert rates.tolist() == [1.35, 1.0, 1.0, 1.0, 1.35]
+        assert caught[0].message.currencies == ["EUR", None]
+
+    def test_gather_fx_rates_nan_default(self, recwarn):
+        rates = gather_fx_rates(["USD", "EUR"], {"USD": 1.35, "EUR": np.nan}, default=np.nan)
+        assert rates[0] == 1.35 and np.isnan(rates[1])
+        assert len(recwarn) == 0
+
+    def test_convert_invested_values_matches_row_lookup(self):
+        rng = np.random.default_rng(0)
+        currencies = np.array(["USD", "SGD", "HKD", "JPY", "GBP"])
+        df = pd.DataFrame({
+            "invested_value": rng.uniform(100, 1000, size=1000),
+            "currency": currencies[rng.integers(0, 5, size=1000)],
+        })
+        fx_rates = {"USD": 1.35, "SGD": 1.0, "HKD": 0.17, "JPY": 0.009}
+
+        with pytest.warns(MissingFXRateWarning, match="GBP"):
+            result = convert_invested_values(df.copy(), fx_rates)
+        expected = [value * fx_rates.get(currency, 1.0) for value, currency in zip(df["invested_value"], df["currency"])]
+        assert np.allclose(result["invested_value_sgd"], expected)
+        assert (result["fx_rate_missing"] == (df["currency"] == "GBP")).all()
+
+    def test_convert_invested_values_error_gives_nan(self):
+        df = pd.DataFrame({"invested_value": [1.0, 2.0]})
+        result = convert_invested_values(df, {"USD": 1.35})
+        assert result["invested_value_sgd"].isna().all()
+
+
+class TestFXRateCache:
+
+    @patch("src.market_data.yf.download")
+    def test_second_lookup_is_a_hit(self, mock_download):
+        mock_download.return_value = make_fx_download({"SGD": 1.35, "HKD": 7.8})
+        cache = FXRateCache(path=None)
+
+        assert cache.get_rates(["USD", "HKD", "SGD"]) == pytest.approx({"USD": 1.35, "HKD": 1.35 / 7.8, "SGD": 1.0})
+        assert cache.get_rates(["USD", "HKD"]) == pytest.approx({"USD": 1.35, "HKD": 1.35 / 7.8})
+
+        # Both pivot quotes came from one batched download
+        mock_download.assert_called_once()
+        assert sorted(mock_download.call_args.args[0]) == ["USDHKD=X", "USDSGD=X"]
+        assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 2
+
+    @patch("src.market_data.yf.Ticker")
+    def test_stale_rate_refreshed_in_background(self, mock_ticker):
+        mock_ticker.return_value.history.return_value = make_fx_history(1.40)
+        cache = FXRateCache(ttl_seconds=60, path=None)
+        cache.put("USD", "SGD", 1.35, fetched_at=time.time() - 120)
+
+        # The stale rate is returned at once, the new one arrives after the refresh
+        assert cache.get_rates(["USD"]) == {"USD": 1.35}
+        cache.refresh_thread.join(timeout=5)
+        assert cache.get_rates(["USD"]) == {"USD": 1.40}
+        assert cache.fetched_at("USD", "SGD") > time.time() - 60
+
+    @patch("src.market_data.yf.Ticker", side_effect=Exception("API Error"))
+    def test_failures_are_not_cached(self, mock_ticker):
+        cache = FXRateCache(path=None)
+        assert cache.get_rates(["USD"]) == {}
+        assert len(cache) == 0
+
+    @pytest.mark.parametrize("file_name", ["fx_rates.json", "fx_rates.db"])
+    def test_persistence_survives_new_instance(self, tmp_path, file_name):
+        path = tmp_path / file_name
+        fetched_at = time.time() - 10
+        FXRateCache(path=path).put("USD", "SGD", 1.35, fetched_at=fetched_at)
+
+        cache = FXRateCache(path=path)
+        assert cache.get_rates(["USD"]) == {"USD": 1.35}
+        assert cache.fetched_at("USD", "SGD") == pytest.approx(fetched_at)
+
+    @patch("src.ticker_utils.FX_CACHE", new_callable=lambda: FXRateCache(path=None))
+    @patch("src.market_data.yf.Ticker")
+    def test_functions_share_the_cache(self, mock_ticker, mock_cache):
+        mock_ticker.return_value.history.return_value = make_fx_history(1.35)
+        assert get_fx_rates(["USD", "SGD"]) == {"USD": 1.35, "SGD": 1.0}
+        converted = convert_current_prices_to_sgd({"AAPL": {"price": 100.0, "currency": "USD"}})
+        assert converted["AAPL"]["price_sgd"] == pytest.approx(135.0)
+        mock_ticker.return_value.history.assert_called_once()
+
+
+class TestCrossRates:
+
+    @patch("src.market_data.yf.download")
+    def test_other_target_needs_no_download(self, mock_download):
+        mock_download.return_value = make_fx_download({"SGD": 1.35, "HKD": 7.8, "EUR": 0.9})
+        cache = FXRateCache(path=None)
+        cache.get_rates(["HKD", "EUR"], target_currency="SGD")
+
+        assert cache.get_rates(["SGD", "HKD", "USD"], target_currency="EUR") == pytest.approx(
+            {"SGD": 0.9 / 1.35, "HKD": 0.9 / 7.8, "USD": 0.9})
+        mock_download.assert_called_once()
+
+    @patch("src.market_data.yf.download")
+    def test_download_fx_rates(self, mock_download):
+        mock_download.return_value = make_fx_download({"SGD": 1.35, "JPY": 150.0})
+        rates = download_fx_rates(["USD", "JPY", "SGD", "UNKNOWN"])
+        assert rates == pytest.approx({"USD": 1.35, "JPY": 1.35 / 150.0})
+        assert sorted(mock_download.call_args.args[0]) == ["USDJPY=X", "USDSGD=X"]
+
+    def test_cache_table_matrix(self):
+        cache = FXRateCache(path=None)
+        cache.put_pivot_rates({"SGD": 1.35, "EUR": 0.9, "JPY": np.nan})
+        matrix = cache.cross_rate_table().matrix()
+        assert list(matrix.index) == ["USD", "SGD", "EUR"]
+        assert matrix.loc["EUR", "SGD"] == pytest.approx(1.35 / 0.9)
+        assert np.allclose(np.diag(matrix.values), 1.0)
@@ -0,0 +1,135 @@
+"""
+tests/test_universe_refresh.py
+
+Purpose:
+    This module contains unit tests for the concurrent universe refresh in src/universe_refresh.py.
+
+Functions (classes):
+    - TestRateLimiter
+    - TestBackoff
+    - TestRefreshUniverse
+
+Notes:
+    Tasks are plain Python functions, so no network calls are made. Retries use a no-op sleep.
+"""
+
+
+import random
+import threading
+import time
+import pytest
+from src.universe_refresh import *
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def no_sleep(seconds):
+    pass
+
+
+def fast_limiters():
+    return HostRateLimiters(rates={}, default_rate=1_000_000.0)
+
+
+class TestRateLimiter:
+
+    def test_rate_is_respected(self):
+        clock = FakeClock()
+        limiter = RateLimiter(2.0, burst=2, clock=clock, sleep=clock.sleep)
+        waits = [limiter.acquire() for _ in range(6)]
+        assert waits[:2] == [0.0, 0.0]
+        # After the burst, one token every half second
+        assert clock.now == pytest.approx(2.0)
+
+    def test_hosts_get_their_own_limiter(self):
+        limiters = HostRateLimiters(rates={"a.example": 4.0}, default_rate=1.0)
+        assert limiters.for_host("a.example").rate_per_second == 4.0
+        assert limiters.for_host("b.example").rate_per_second == 1.0
+        assert limiters.for_host("a.example") is limiters.for_host("a.example")
+
+    def test_rate_must_be_positive(self):
+        with pytest.raises(ValueError):
+            RateLimiter(0)
+
+
+class TestBackoff:
+
+    def test_delays_are_jittered_and_capped(self):
+        rng = random.Random(0)
+        delays = [backoff_delay(attempt, base_delay=1.0, max_delay=5.0, rng=rng) for attempt in range(10) for _ in range(50)]
+        assert all(0 <= delay <= 5.0 for delay in delays)
+        assert len(set(delays)) == len(delays)
+        assert max(backoff_delay(0, base_delay=1.0, max_delay=5.0, rng=rng) for _ in range(50)) <= 1.0
+
+
+class TestRefreshUniverse:
+
+    def test_all_tasks_run(self):
+        tickers = [f"T{i}" for i in range(40)]
+        report = refresh_universe(tickers + ["T0"], {"history": len, "latest": str.lower}, max_workers=8, limiters=fast_limiters())
+
+        assert report.summary()["tasks"] == 80 and report.summary()["ok"] == 80
+        assert [result.ticker for result in report.results[:4]] == ["T0", "T0", "T1", "T1"]
+        assert report.results[1].value == "t0"
+
+    def test_tasks_run_concurrently(self):
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def task(ticker):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        start = time.monotonic()
+        refresh_universe([f"T{i}" for i in range(16)], {"history": task}, max_workers=8, limiters=fast_limiters())
+        assert peak[0] == 8
+        assert time.monotonic() - start < 0.05 * 16 / 2
+
+    def test_retries_then_success(self):
+        calls = {}
+
+        def flaky(ticker):
+            calls[ticker] = calls.get(ticker, 0) + 1
+            if calls[ticker] < 3:
+                raise ConnectionError("rate limited")
+            return ticker
+
+        report = refresh_universe(["AAPL"], {"history": flaky}, retries=3, limiters=fast_limiters(), sleep=no_sleep)
+        assert report.results[0].status == "ok" and report.results[0].attempts == 3
+        assert report.summary()["retried"] == 1
+
+    def test_failure_after_retries(self):
+        def broken(ticker):
+            raise ValueError(f"no data for {ticker}")
+
+        report = refresh_universe(["AAPL", "MSFT"], {"history": broken, "latest": len}, retries=2, limiters=fast_limiters(), sleep=no_sleep)
+        failed = report.by_status("failed")
+        assert [result.ticker for result in failed] == ["AAPL", "MSFT"]
+        assert failed[0].attempts == 3 and failed[0].error == "no data for AAPL"
+        assert "FAILED   AAPL history after 3 attempt(s)" in report.format()
+
+    def test_slow_task_times_out(self):
+        release = threading.Event()
+
+        def slow(ticker):
+            if ticker == "SLOW":
+                release.wait(5)
+            return ticker
+
+        report = refresh_universe(["SLOW", "FAST"], {"history": slow}, timeout=0.2, limiters=fast_limiters())
+        release.set()
+        assert report.results[0].status == "timeout"
+        assert report.results[1].status == "ok"
+        assert report.summary()["timeout"] == 1
@@ -10,6 +10,7 @@ Functions:
     - validate_MACD_results(df: pd.DataFrame) -> pd.DataFrame
     - validate_EMA_results(df: pd.DataFrame, user_window: int) -> pd.DataFrame
     - validate_rsi_against_library(historical_stock_data: pd.DataFrame) -> pd.DataFrame
+    - validate_Williams_R_results(df: pd.DataFrame, window: int) -> pd.DataFrame
 
 Notes:
     Each function compares the results of custom implemented technical indicators functions with those from TA-Lib for validation purposes.
@@ -216,6 +217,28 @@ def validate_rsi_against_library(historical_stock_data: pd.DataFrame, window: in
     '''
 
 
+def validate_Williams_R_results(df: pd.DataFrame, window: int) -> pd.DataFrame:
+    """
+    This function validates the Williams %R calculation by comparing the results with TA-Lib's WILLR.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing stock data with 'High', 'Low' and 'Close' columns.
+        window (int): The look-back period.
+
+    Returns:
+        pd.DataFrame: DataFrame with both custom and TA-Lib Williams %R columns for comparison, or None if they differ.
+    """
+    print('Running Williams %R Validation')
+    df = calculate_Williams_R(df, window)
+    df["Williams_R_talib"] = talib.WILLR(df['High'], df['Low'], df['Close'], timeperiod=window)
+
+    if not np.allclose(df["Williams_R"], df["Williams_R_talib"], equal_nan=True):
+        validation_results.append(["Williams %R", "❌ Failed", "Calculated values do not tally with Talib Values"])
+        return None
+    validation_results.append(["Williams %R", "✅ Passed", "Calculated values tally with Talib Values"])
+    return df
+
+
 # Example usage
 """
 Run this validation.py file to validate the technical indicators calculations.
@@ -242,5 +265,6 @@ validate_SMA_results(df, user_window)
 validate_EMA_results(df, user_window)
 validate_rsi_against_library(df, user_window)
 validate_MACD_results(df)
+validate_Williams_R_results(df, user_window)
 print(tabulate(validation_results, headers=["Function", "Status", "Remarks"],tablefmt="double_grid"))
 #df.to_csv("test.csv", index=False)
\ No newline at end of file